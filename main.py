@@ -10,6 +10,7 @@ import sys
 import os
 import importlib
 import logging
+import threading
 import functools
 import types as _types
 import random as _random
@@ -44,31 +45,11 @@ src_dir = Path(__file__).parent / 'src'
 if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
-# ---------------------------------------------------------------------------
-# torchvision compat shim — must run BEFORE any import of basicsr/realesrgan
-# ---------------------------------------------------------------------------
-# torchvision 0.16+ removed torchvision.transforms.functional_tensor.
-# basicsr ≤ 1.4.2 imports it at module level, causing ImportError on modern
-# torchvision.  Inject a thin shim so basicsr imports cleanly everywhere.
-try:
-    import torchvision.transforms.functional_tensor as _tvft_early  # noqa: F401
-except (ImportError, ModuleNotFoundError):
-    try:
-        import torchvision.transforms.functional as _tvtf_early  # noqa: F401
-        _compat_early = _types.ModuleType('torchvision.transforms.functional_tensor')
-        for _attr_early in (
-            'rgb_to_grayscale', 'adjust_brightness', 'adjust_contrast',
-            'adjust_saturation', 'adjust_hue', 'normalize',
-            'pad', 'crop', 'center_crop', 'resize',
-            'to_tensor', 'to_pil_image',
-        ):
-            if hasattr(_tvtf_early, _attr_early):
-                setattr(_compat_early, _attr_early, getattr(_tvtf_early, _attr_early))
-        sys.modules['torchvision.transforms.functional_tensor'] = _compat_early
-        del _compat_early, _tvtf_early
-    except Exception:
-        pass  # torchvision not installed; basicsr/realesrgan checks handle this gracefully
-# ---------------------------------------------------------------------------
+# The torchvision compat shim basicsr/realesrgan need (torchvision 0.16+ removed
+# torchvision.transforms.functional_tensor) is applied by
+# startup_validation._apply_torchvision_compat_shim() right before anything
+# imports them: on the background import thread or when the upscaler panel
+# is first opened.  Probing torchvision here would import torch at start-up.
 
 # Handle lightweight CLI flags BEFORE importing Qt (no display needed)
 # These must run early — before any module-level Qt import — so they work
@@ -191,6 +172,10 @@ def _handle_early_cli() -> None:
 
 _handle_early_cli()
 
+# Start-up timeline: checkpoints and per-module import cost, written to the
+# log once the background imports started after window.show() have finished.
+from utils.startup_timeline import startup_timeline, BackgroundImporter
+
 # Qt imports - REQUIRED, no fallbacks
 def _ensure_qt_platform():
     """
@@ -226,6 +211,7 @@ try:
     )
     from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QSize, QByteArray, QObject, QEvent, QPoint
     from PyQt6.QtGui import QAction, QIcon, QFont, QPalette, QColor
+    startup_timeline.mark('PyQt6 imported')
 except (ImportError, OSError) as e:
     _err = str(e)
     print("=" * 70)
@@ -328,6 +314,7 @@ from lod_detector import LODDetector
 from file_handler import FileHandler
 from database import TextureDatabase
 from organizer import OrganizationEngine, ORGANIZATION_STYLES
+startup_timeline.mark('core modules imported')
 
 # ── EXE: configure PyOpenGL BEFORE any GL import fires ───────────────────────
 # This MUST run at module level (not in main()) so that the environment is
@@ -409,10 +396,9 @@ PandaOpenGLWidget = None
 PANDA_WIDGET_AVAILABLE = False
 _OPENGL_RUNTIME_OK = False
 
-# Import each UI panel independently so one bad import does not disable all tools.
-
-# Import each UI panel independently so one bad import does not disable all tools.
-# Each name is set to None on failure; callers guard with `if PanelClass is not None`.
+# Tool panels are imported on first use: their modules pull in torch, cv2,
+# rembg and transformers at import time, and most sessions open only a few
+# tools.  LazyToolPanel builds each panel the first time it is shown.
 def _try_import(module_path: str, class_name: str):
     """Return the named class from module_path, or None on import/attribute failure.
 
@@ -429,30 +415,97 @@ def _try_import(module_path: str, class_name: str):
         logger.warning(f"Optional UI panel {class_name} not available: {_e}", exc_info=True)
         return None
 
-BackgroundRemoverPanelQt  = _try_import('ui.background_remover_panel_qt',  'BackgroundRemoverPanelQt')
-ColorCorrectionPanelQt    = _try_import('ui.color_correction_panel_qt',    'ColorCorrectionPanelQt')
-BatchNormalizerPanelQt    = _try_import('ui.batch_normalizer_panel_qt',     'BatchNormalizerPanelQt')
-QualityCheckerPanelQt     = _try_import('ui.quality_checker_panel_qt',      'QualityCheckerPanelQt')
-LineArtConverterPanelQt   = _try_import('ui.lineart_converter_panel_qt',   'LineArtConverterPanelQt')
-AlphaFixerPanelQt         = _try_import('ui.alpha_fixer_panel_qt',         'AlphaFixerPanelQt')
-BatchRenamePanelQt        = _try_import('ui.batch_rename_panel_qt',        'BatchRenamePanelQt')
-ImageRepairPanelQt        = _try_import('ui.image_repair_panel_qt',        'ImageRepairPanelQt')
-FormatConverterPanelQt    = _try_import('ui.format_converter_panel_qt',    'FormatConverterPanelQt')
-CustomizationPanelQt      = _try_import('ui.customization_panel_qt',       'CustomizationPanelQt')
-ImageUpscalerPanelQt      = _try_import('ui.upscaler_panel_qt',            'ImageUpscalerPanelQt')
-OrganizerPanelQt          = _try_import('ui.organizer_panel_qt',           'OrganizerPanelQt')
-SettingsPanelQt           = _try_import('ui.settings_panel_qt',            'SettingsPanelQt')
-FileBrowserPanelQt        = _try_import('ui.file_browser_panel_qt',        'FileBrowserPanelQt')
-NotepadPanelQt            = _try_import('ui.notepad_panel_qt',             'NotepadPanelQt')
-
-# UI_PANELS_AVAILABLE = True if at least the core tool panels loaded correctly.
-_core_panels = [BackgroundRemoverPanelQt, AlphaFixerPanelQt, ImageUpscalerPanelQt,
-                FileBrowserPanelQt, NotepadPanelQt, SettingsPanelQt]
-UI_PANELS_AVAILABLE = any(p is not None for p in _core_panels)
+# class name -> module, imported by _load_panel_class()
+_PANEL_MODULES: dict = {
+    'BackgroundRemoverPanelQt': 'ui.background_remover_panel_qt',
+    'ColorCorrectionPanelQt':   'ui.color_correction_panel_qt',
+    'BatchNormalizerPanelQt':   'ui.batch_normalizer_panel_qt',
+    'QualityCheckerPanelQt':    'ui.quality_checker_panel_qt',
+    'LineArtConverterPanelQt':  'ui.lineart_converter_panel_qt',
+    'AlphaFixerPanelQt':        'ui.alpha_fixer_panel_qt',
+    'BatchRenamePanelQt':       'ui.batch_rename_panel_qt',
+    'ImageRepairPanelQt':       'ui.image_repair_panel_qt',
+    'FormatConverterPanelQt':   'ui.format_converter_panel_qt',
+    'CustomizationPanelQt':     'ui.customization_panel_qt',
+    'ImageUpscalerPanelQt':     'ui.upscaler_panel_qt',
+    'OrganizerPanelQt':         'ui.organizer_panel_qt',
+    'SettingsPanelQt':          'ui.settings_panel_qt',
+    'FileBrowserPanelQt':       'ui.file_browser_panel_qt',
+    'NotepadPanelQt':           'ui.notepad_panel_qt',
+}
+# Panels whose modules import basicsr/realesrgan (need the torchvision shim)
+_PANELS_NEEDING_TV_SHIM = ('ImageUpscalerPanelQt',)
+_panel_classes: dict = {}  # class name -> class, or None if the import failed
+
+
+def _load_panel_class(class_name: str):
+    """Import (once) and return a tool panel class, or None if it is unavailable."""
+    if class_name not in _panel_classes:
+        if class_name in _PANELS_NEEDING_TV_SHIM:
+            try:
+                from startup_validation import _apply_torchvision_compat_shim
+                _apply_torchvision_compat_shim()
+            except Exception:
+                pass
+        module_path = _PANEL_MODULES[class_name]
+        with startup_timeline.measure(module_path):
+            _panel_classes[class_name] = _try_import(module_path, class_name)
+    return _panel_classes[class_name]
+
+
+# UI_PANELS_AVAILABLE = True if the core tool panel modules are present
+# (checked without importing them).
+_core_panels = ['BackgroundRemoverPanelQt', 'AlphaFixerPanelQt', 'ImageUpscalerPanelQt',
+                'FileBrowserPanelQt', 'NotepadPanelQt', 'SettingsPanelQt']
+try:
+    import importlib.util as _importlib_util
+    UI_PANELS_AVAILABLE = any(
+        _importlib_util.find_spec(_PANEL_MODULES[_name]) is not None for _name in _core_panels
+    )
+except Exception:
+    UI_PANELS_AVAILABLE = False
 if UI_PANELS_AVAILABLE:
-    logger.info("✅ UI panels loaded (individual failures are non-fatal)")
+    logger.info("✅ UI panels found (each is imported when first opened)")
 else:
-    logger.warning("⚠️  All UI panels failed to load — check PyQt6 installation")
+    logger.warning("⚠️  No UI panel modules found — check the installation")
+
+
+class LazyToolPanel(QWidget):
+    """Tools-stack page that builds its panel the first time it is shown.
+
+    ``factory`` returns the real panel (or an error placeholder); it runs at
+    most once, on the first ``showEvent`` or explicit ``ensure()`` call.
+    """
+
+    built = pyqtSignal(str, QWidget)  # tool_id, panel
+
+    def __init__(self, tool_id: str, factory, parent=None):
+        super().__init__(parent)
+        self.tool_id = tool_id
+        self._factory = factory
+        self._panel = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def panel(self):
+        """The built panel, or None before first activation."""
+        return self._panel
+
+    def ensure(self):
+        """Build the panel now if it has not been built yet, and return it."""
+        if self._panel is None:
+            with startup_timeline.measure(f"panel:{self.tool_id}"):
+                panel = self._factory()
+            self._factory = None
+            self._panel = panel
+            self._layout.addWidget(panel)
+            self.built.emit(self.tool_id, panel)
+        return self._panel
+
+    def showEvent(self, event):
+        self.ensure()
+        super().showEvent(event)
 
 
 class DraggableTabWidget(QTabWidget):
@@ -1222,6 +1275,34 @@ class WorkerThread(QThread):
         self.cancelled = True
 
 
+# Window attributes holding QObjects installed as QApplication event filters.
+_APP_EVENT_FILTER_ATTRS = (
+    '_gore_splatter_filter', '_vampire_bat_filter', '_ocean_ripple_filter',
+    '_goth_skull_filter', '_dracula_drop_filter', '_panda_paw_filter',
+    '_cursor_trail_overlay', 'environment_monitor',
+)
+
+
+def _remove_app_event_filters(window_state: dict, *_args) -> None:
+    """Remove a window's application-wide event filters (see _APP_EVENT_FILTER_ATTRS).
+
+    Connected to the main window's ``destroyed`` signal with the window's
+    ``__dict__``.  If the window is still alive when QApplication is torn
+    down, Qt deletes it there and every filter would be handed destroy
+    events for half-deleted widgets, which can crash PyQt.
+    """
+    app = QApplication.instance()
+    if app is None:
+        return
+    for name in _APP_EVENT_FILTER_ATTRS:
+        obj = window_state.get(name)
+        if obj is not None:
+            try:
+                app.removeEventFilter(obj)
+            except (RuntimeError, TypeError):
+                pass
+
+
 class TextureSorterMainWindow(QMainWindow):
     """
     Main application window for Panda Sorter Converter Upscaler.
@@ -1416,6 +1497,9 @@ class TextureSorterMainWindow(QMainWindow):
             QApplication.instance().installEventFilter(self)
         except Exception:
             pass
+        # Drop the app-wide filters installed later (themes, cursor trail,
+        # environment monitor) as soon as this window is destroyed.
+        self.destroyed.connect(functools.partial(_remove_app_event_filters, vars(self)))
         # Set window icon
         icon_path = Path(__file__).parent / 'assets' / 'icon.ico'
         if icon_path.exists():
@@ -1714,13 +1798,17 @@ class TextureSorterMainWindow(QMainWindow):
         self._tool_btn_group: list = []       # (tool_id, QPushButton)
 
         def _select_tool(idx: int, tool_id: str):
+            page = self._tool_pages.get(tool_id)
+            if page is not None:
+                page.ensure()
             tool_stack.setCurrentIndex(idx)
             for _tid, _btn in self._tool_btn_group:
                 _btn.setChecked(_tid == tool_id)
 
         # Tools — each panel is guarded individually so one failure
-        #    does NOT prevent the other tools from loading.
-        tool_tab_defs = []  # (panel_instance, label, tool_id) triples
+        #    does NOT prevent the other tools from loading.  Panels are
+        #    given as factories and built when first shown (LazyToolPanel).
+        tool_tab_defs = []  # (panel_or_factory, label, tool_id) triples
 
         def _make_error_label(cls_name: str, err) -> 'QLabel':
             """Create a visible placeholder tab when a panel fails to load."""
@@ -1742,7 +1830,10 @@ class TextureSorterMainWindow(QMainWindow):
             lbl.setTextFormat(Qt.TextFormat.RichText)
             return lbl
 
-        if BackgroundRemoverPanelQt is not None:
+        def _build_bg_remover():
+            BackgroundRemoverPanelQt = _load_panel_class('BackgroundRemoverPanelQt')
+            if BackgroundRemoverPanelQt is None:
+                return _make_error_label('BackgroundRemoverPanelQt', None)
             try:
                 bg_panel = BackgroundRemoverPanelQt(tooltip_manager=self.tooltip_manager)
                 bg_panel.processing_complete.connect(
@@ -1751,14 +1842,16 @@ class TextureSorterMainWindow(QMainWindow):
                     lambda: self._on_tool_finished(True, 'bg_remover', 1))
                 bg_panel.image_loaded.connect(
                     lambda p: self.statusBar().showMessage(f"🎭 Loaded: {p}", 3000))
-                tool_tab_defs.append((bg_panel, "🎭 Background Remover", 'bg_remover'))
+                return bg_panel
             except Exception as _e:
                 logger.warning(f"BackgroundRemoverPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('BackgroundRemoverPanelQt', _e), "🎭 Background Remover", 'bg_remover'))
-        else:
-            tool_tab_defs.append((_make_error_label('BackgroundRemoverPanelQt', None), "🎭 Background Remover", 'bg_remover'))
+                return _make_error_label('BackgroundRemoverPanelQt', _e)
+        tool_tab_defs.append((_build_bg_remover, "🎭 Background Remover", 'bg_remover'))
 
-        if AlphaFixerPanelQt is not None:
+        def _build_alpha_fixer():
+            AlphaFixerPanelQt = _load_panel_class('AlphaFixerPanelQt')
+            if AlphaFixerPanelQt is None:
+                return _make_error_label('AlphaFixerPanelQt', None)
             try:
                 alpha_panel = AlphaFixerPanelQt(tooltip_manager=self.tooltip_manager)
                 alpha_panel.finished.connect(lambda ok, msg, cnt, _tid='alpha_fixer': (
@@ -1766,14 +1859,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((alpha_panel, "✨ Alpha Fixer", 'alpha_fixer'))
+                return alpha_panel
             except Exception as _e:
                 logger.warning(f"AlphaFixerPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('AlphaFixerPanelQt', _e), "✨ Alpha Fixer", 'alpha_fixer'))
-        else:
-            tool_tab_defs.append((_make_error_label('AlphaFixerPanelQt', None), "✨ Alpha Fixer", 'alpha_fixer'))
+                return _make_error_label('AlphaFixerPanelQt', _e)
+        tool_tab_defs.append((_build_alpha_fixer, "✨ Alpha Fixer", 'alpha_fixer'))
 
-        if ColorCorrectionPanelQt is not None:
+        def _build_color():
+            ColorCorrectionPanelQt = _load_panel_class('ColorCorrectionPanelQt')
+            if ColorCorrectionPanelQt is None:
+                return _make_error_label('ColorCorrectionPanelQt', None)
             try:
                 color_panel = ColorCorrectionPanelQt(tooltip_manager=self.tooltip_manager)
                 color_panel.finished.connect(lambda ok, msg, cnt, _tid='color': (
@@ -1781,14 +1876,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((color_panel, "🎨 Color Correction", 'color'))
+                return color_panel
             except Exception as _e:
                 logger.warning(f"ColorCorrectionPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('ColorCorrectionPanelQt', _e), "🎨 Color Correction", 'color'))
-        else:
-            tool_tab_defs.append((_make_error_label('ColorCorrectionPanelQt', None), "🎨 Color Correction", 'color'))
+                return _make_error_label('ColorCorrectionPanelQt', _e)
+        tool_tab_defs.append((_build_color, "🎨 Color Correction", 'color'))
 
-        if BatchNormalizerPanelQt is not None:
+        def _build_normalizer():
+            BatchNormalizerPanelQt = _load_panel_class('BatchNormalizerPanelQt')
+            if BatchNormalizerPanelQt is None:
+                return _make_error_label('BatchNormalizerPanelQt', None)
             try:
                 norm_panel = BatchNormalizerPanelQt(tooltip_manager=self.tooltip_manager)
                 norm_panel.finished.connect(lambda ok, msg, cnt, _tid='normalizer': (
@@ -1796,28 +1893,32 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((norm_panel, "⚙️ Batch Normalizer", 'normalizer'))
+                return norm_panel
             except Exception as _e:
                 logger.warning(f"BatchNormalizerPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('BatchNormalizerPanelQt', _e), "⚙️ Batch Normalizer", 'normalizer'))
-        else:
-            tool_tab_defs.append((_make_error_label('BatchNormalizerPanelQt', None), "⚙️ Batch Normalizer", 'normalizer'))
+                return _make_error_label('BatchNormalizerPanelQt', _e)
+        tool_tab_defs.append((_build_normalizer, "⚙️ Batch Normalizer", 'normalizer'))
 
-        if QualityCheckerPanelQt is not None:
+        def _build_quality():
+            QualityCheckerPanelQt = _load_panel_class('QualityCheckerPanelQt')
+            if QualityCheckerPanelQt is None:
+                return _make_error_label('QualityCheckerPanelQt', None)
             try:
                 quality_panel = QualityCheckerPanelQt(tooltip_manager=self.tooltip_manager)
                 quality_panel.finished.connect(lambda ok, msg, _tid='quality': (
                     self.statusBar().showMessage(f"{'✅' if ok else '❌'} Quality Check: {msg}", 4000),
                     self._on_tool_finished(ok, _tid),
                 ))
-                tool_tab_defs.append((quality_panel, "✓ Quality Checker", 'quality'))
+                return quality_panel
             except Exception as _e:
                 logger.warning(f"QualityCheckerPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('QualityCheckerPanelQt', _e), "✓ Quality Checker", 'quality'))
-        else:
-            tool_tab_defs.append((_make_error_label('QualityCheckerPanelQt', None), "✓ Quality Checker", 'quality'))
+                return _make_error_label('QualityCheckerPanelQt', _e)
+        tool_tab_defs.append((_build_quality, "✓ Quality Checker", 'quality'))
 
-        if ImageUpscalerPanelQt is not None:
+        def _build_upscaler():
+            ImageUpscalerPanelQt = _load_panel_class('ImageUpscalerPanelQt')
+            if ImageUpscalerPanelQt is None:
+                return _make_error_label('ImageUpscalerPanelQt', None)
             try:
                 upscaler_panel = ImageUpscalerPanelQt(tooltip_manager=self.tooltip_manager)
                 upscaler_panel.error.connect(
@@ -1827,14 +1928,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((upscaler_panel, "🔍 Image Upscaler", 'upscaler'))
+                return upscaler_panel
             except Exception as _e:
                 logger.warning(f"ImageUpscalerPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('ImageUpscalerPanelQt', _e), "🔍 Image Upscaler", 'upscaler'))
-        else:
-            tool_tab_defs.append((_make_error_label('ImageUpscalerPanelQt', None), "🔍 Image Upscaler", 'upscaler'))
+                return _make_error_label('ImageUpscalerPanelQt', _e)
+        tool_tab_defs.append((_build_upscaler, "🔍 Image Upscaler", 'upscaler'))
 
-        if LineArtConverterPanelQt is not None:
+        def _build_lineart():
+            LineArtConverterPanelQt = _load_panel_class('LineArtConverterPanelQt')
+            if LineArtConverterPanelQt is None:
+                return _make_error_label('LineArtConverterPanelQt', None)
             try:
                 line_panel = LineArtConverterPanelQt(tooltip_manager=self.tooltip_manager)
                 line_panel.error.connect(
@@ -1844,14 +1947,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((line_panel, "✏️ Line Art", 'lineart'))
+                return line_panel
             except Exception as _e:
                 logger.warning(f"LineArtConverterPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('LineArtConverterPanelQt', _e), "✏️ Line Art", 'lineart'))
-        else:
-            tool_tab_defs.append((_make_error_label('LineArtConverterPanelQt', None), "✏️ Line Art", 'lineart'))
+                return _make_error_label('LineArtConverterPanelQt', _e)
+        tool_tab_defs.append((_build_lineart, "✏️ Line Art", 'lineart'))
 
-        if BatchRenamePanelQt is not None:
+        def _build_rename():
+            BatchRenamePanelQt = _load_panel_class('BatchRenamePanelQt')
+            if BatchRenamePanelQt is None:
+                return _make_error_label('BatchRenamePanelQt', None)
             try:
                 rename_panel = BatchRenamePanelQt(tooltip_manager=self.tooltip_manager)
                 rename_panel.finished.connect(lambda ok, errs, _tid='rename': (
@@ -1860,14 +1965,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(bool(ok), _tid, ok),
                     self.operation_finished(bool(ok), f"Renamed {ok} files", ok) if ok > 0 else None,
                 ))
-                tool_tab_defs.append((rename_panel, "📝 Batch Rename", 'rename'))
+                return rename_panel
             except Exception as _e:
                 logger.warning(f"BatchRenamePanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('BatchRenamePanelQt', _e), "📝 Batch Rename", 'rename'))
-        else:
-            tool_tab_defs.append((_make_error_label('BatchRenamePanelQt', None), "📝 Batch Rename", 'rename'))
+                return _make_error_label('BatchRenamePanelQt', _e)
+        tool_tab_defs.append((_build_rename, "📝 Batch Rename", 'rename'))
 
-        if ImageRepairPanelQt is not None:
+        def _build_repair():
+            ImageRepairPanelQt = _load_panel_class('ImageRepairPanelQt')
+            if ImageRepairPanelQt is None:
+                return _make_error_label('ImageRepairPanelQt', None)
             try:
                 repair_panel = ImageRepairPanelQt(tooltip_manager=self.tooltip_manager)
                 repair_panel.error.connect(
@@ -1877,14 +1984,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((repair_panel, "🔧 Image Repair", 'repair'))
+                return repair_panel
             except Exception as _e:
                 logger.warning(f"ImageRepairPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('ImageRepairPanelQt', _e), "🔧 Image Repair", 'repair'))
-        else:
-            tool_tab_defs.append((_make_error_label('ImageRepairPanelQt', None), "🔧 Image Repair", 'repair'))
+                return _make_error_label('ImageRepairPanelQt', _e)
+        tool_tab_defs.append((_build_repair, "🔧 Image Repair", 'repair'))
 
-        if FormatConverterPanelQt is not None:
+        def _build_converter():
+            FormatConverterPanelQt = _load_panel_class('FormatConverterPanelQt')
+            if FormatConverterPanelQt is None:
+                return _make_error_label('FormatConverterPanelQt', None)
             try:
                 conv_panel = FormatConverterPanelQt(tooltip_manager=self.tooltip_manager)
                 conv_panel.finished.connect(lambda ok, msg, cnt, _tid='converter': (
@@ -1892,14 +2001,16 @@ class TextureSorterMainWindow(QMainWindow):
                     self._on_tool_finished(ok, _tid, cnt if ok else 0),
                     self.operation_finished(ok, msg, cnt) if ok and cnt > 0 else None,
                 ))
-                tool_tab_defs.append((conv_panel, "🔄 Format Converter", 'converter'))
+                return conv_panel
             except Exception as _e:
                 logger.warning(f"FormatConverterPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('FormatConverterPanelQt', _e), "🔄 Format Converter", 'converter'))
-        else:
-            tool_tab_defs.append((_make_error_label('FormatConverterPanelQt', None), "🔄 Format Converter", 'converter'))
+                return _make_error_label('FormatConverterPanelQt', _e)
+        tool_tab_defs.append((_build_converter, "🔄 Format Converter", 'converter'))
 
-        if OrganizerPanelQt is not None:
+        def _build_organizer():
+            OrganizerPanelQt = _load_panel_class('OrganizerPanelQt')
+            if OrganizerPanelQt is None:
+                return _make_error_label('OrganizerPanelQt', None)
             try:
                 organizer_panel = OrganizerPanelQt(tooltip_manager=self.tooltip_manager)
                 organizer_panel.log.connect(lambda msg: self.log(msg))
@@ -1912,15 +2023,17 @@ class TextureSorterMainWindow(QMainWindow):
                         float(_stats.get('elapsed_time', 0.0)),
                     ),
                 ))
-                tool_tab_defs.append((organizer_panel, "📁 Organizer", 'organizer'))
+                return organizer_panel
             except Exception as _e:
                 logger.warning(f"OrganizerPanelQt unavailable: {_e}")
-                tool_tab_defs.append((_make_error_label('OrganizerPanelQt', _e), "📁 Organizer", 'organizer'))
-        else:
-            tool_tab_defs.append((_make_error_label('OrganizerPanelQt', None), "📁 Organizer", 'organizer'))
+                return _make_error_label('OrganizerPanelQt', _e)
+        tool_tab_defs.append((_build_organizer, "📁 Organizer", 'organizer'))
 
         # ── File Browser and Notepad as tool entries ────────────────────────
-        if FileBrowserPanelQt is not None:
+        def _build_file_browser():
+            FileBrowserPanelQt = _load_panel_class('FileBrowserPanelQt')
+            if FileBrowserPanelQt is None:
+                return _make_error_label('FileBrowserPanelQt', None)
             try:
                 tooltip_manager = getattr(self, 'tooltip_manager', None)
                 fb_panel = FileBrowserPanelQt(config, tooltip_manager)
@@ -1929,22 +2042,23 @@ class TextureSorterMainWindow(QMainWindow):
                 if hasattr(fb_panel, 'folder_changed'):
                     fb_panel.folder_changed.connect(self._on_file_browser_folder_changed)
                 self.file_browser_panel = fb_panel
-                tool_tab_defs.append((fb_panel, "📁 File Browser", 'file_browser'))
+                return fb_panel
             except Exception as _e:
-                tool_tab_defs.append((_make_error_label('FileBrowserPanelQt', _e), "📁 File Browser", 'file_browser'))
-        else:
-            tool_tab_defs.append((_make_error_label('FileBrowserPanelQt', None), "📁 File Browser", 'file_browser'))
+                return _make_error_label('FileBrowserPanelQt', _e)
+        tool_tab_defs.append((_build_file_browser, "📁 File Browser", 'file_browser'))
 
-        if NotepadPanelQt is not None:
+        def _build_notepad():
+            NotepadPanelQt = _load_panel_class('NotepadPanelQt')
+            if NotepadPanelQt is None:
+                return _make_error_label('NotepadPanelQt', None)
             try:
                 tooltip_manager = getattr(self, 'tooltip_manager', None)
                 np_panel = NotepadPanelQt(config, tooltip_manager)
                 self.notepad_panel = np_panel
-                tool_tab_defs.append((np_panel, "📝 Notepad", 'notepad'))
+                return np_panel
             except Exception as _e:
-                tool_tab_defs.append((_make_error_label('NotepadPanelQt', _e), "📝 Notepad", 'notepad'))
-        else:
-            tool_tab_defs.append((_make_error_label('NotepadPanelQt', None), "📝 Notepad", 'notepad'))
+                return _make_error_label('NotepadPanelQt', _e)
+        tool_tab_defs.append((_build_notepad, "📝 Notepad", 'notepad'))
 
         # ── Activity Log panel ───────────────────────────────────────────────
         # Shares the same QTextDocument as the home-page log so both panels
@@ -1982,8 +2096,15 @@ class TextureSorterMainWindow(QMainWindow):
 
         # ── Wire buttons and stacked panels ─────────────────────────────────
         _COLS = 3
+        self._tool_pages: dict = {}  # tool_id -> LazyToolPanel
         for _idx, (panel, label, tool_id) in enumerate(tool_tab_defs):
-            # Add panel to stack
+            # Add panel to stack; factories become LazyToolPanel pages and
+            # tool_panels[tool_id] switches to the real panel once built.
+            if callable(panel) and not isinstance(panel, QWidget):
+                page = LazyToolPanel(tool_id, panel)
+                page.built.connect(self._on_tool_panel_built)
+                self._tool_pages[tool_id] = page
+                panel = page
             stack_idx = tool_stack.addWidget(panel)
             self.tool_panels[tool_id] = panel
 
@@ -2088,6 +2209,11 @@ class TextureSorterMainWindow(QMainWindow):
         # Update View menu with tool panel toggles
         self._update_tool_panels_menu()
     
+    def _on_tool_panel_built(self, tool_id: str, panel: QWidget):
+        """Record a lazily-built tool panel once its page is first shown."""
+        self.tool_panels[tool_id] = panel
+        logger.info(f"Tool panel built on first use: {tool_id}")
+
     def _add_tool_dock(self, tool_id: str, title: str, widget: QWidget, area: Qt.DockWidgetArea):
         """Add a tool panel as a dockable widget."""
         # Store panel reference
@@ -2200,7 +2326,12 @@ class TextureSorterMainWindow(QMainWindow):
             self.tabs.setCurrentIndex(tools_tab_index)
 
         # Select the matching panel in the stacked widget and highlight its button
-        tool_widget = self.tool_panels.get(tool_id)
+        # Lazily-built tools live inside their LazyToolPanel stack page.
+        tool_widget = getattr(self, '_tool_pages', {}).get(tool_id)
+        if tool_widget is not None:
+            tool_widget.ensure()
+        else:
+            tool_widget = self.tool_panels.get(tool_id)
         if tool_widget is not None and self.tool_tabs_widget is not None:
             idx = self.tool_tabs_widget.indexOf(tool_widget)
             if idx >= 0:
@@ -2937,6 +3068,7 @@ class TextureSorterMainWindow(QMainWindow):
         layout.setContentsMargins(0, 0, 0, 0)
         
         try:
+            SettingsPanelQt = _load_panel_class('SettingsPanelQt')
             if SettingsPanelQt is not None:
                 # Create comprehensive settings panel
                 self.settings_panel = SettingsPanelQt(config, self, tooltip_manager=self.tooltip_manager)
@@ -5022,9 +5154,10 @@ class TextureSorterMainWindow(QMainWindow):
             
             # Initialize cache manager
             try:
-                from utils.cache_manager import CacheManager
+                from utils.cache_manager import get_cache_manager
                 cache_size = config.get('performance', 'cache_size_mb', default=512)
-                self.cache_manager = CacheManager(max_size_mb=cache_size)
+                # Shared with preview, analysis, classification and the tools
+                self.cache_manager = get_cache_manager(max_size_mb=cache_size)
                 logger.info(f"Cache manager initialized with {cache_size}MB cache")
             except Exception as e:
                 logger.warning(f"Could not initialize cache manager: {e}")
@@ -5034,6 +5167,8 @@ class TextureSorterMainWindow(QMainWindow):
                 from utils.memory_manager import MemoryManager
                 memory_limit_mb = config.get('performance', 'memory_limit_mb', default=2048)
                 self.memory_manager = MemoryManager(max_memory_mb=memory_limit_mb)
+                if self.cache_manager:
+                    self.memory_manager.register_cleanup_callback(self.cache_manager.clear)
                 self.memory_manager.start_monitoring()
                 logger.info(f"Memory manager initialized with {memory_limit_mb}MB limit")
             except Exception as e:
@@ -8198,6 +8333,11 @@ class TextureSorterMainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event."""
+        # Stop preloading ML modules (finishes the import in progress only)
+        _importer = getattr(self, '_background_importer', None)
+        if _importer is not None:
+            _importer.cancel()
+
         # Save dock layout before closing
         try:
             self.save_dock_layout()
@@ -8290,6 +8430,11 @@ class TextureSorterMainWindow(QMainWindow):
                     self.threading_manager.stop()
             except Exception:
                 pass
+            try:
+                if self.cache_manager:
+                    self.cache_manager.close()
+            except Exception:
+                pass
             # Save skill tree progression
             try:
                 if self.skill_tree:
@@ -8733,19 +8878,62 @@ def check_feature_availability():
     return features
 
 
-def log_startup_diagnostics(window):
+class _DiagnosticsRelay(QObject):
+    """Carries feature-availability results from a worker thread to the UI thread."""
+    ready = pyqtSignal(dict)
+
+
+def start_startup_diagnostics(window, importer=None):
+    """
+    Check optional features off the UI thread, then log them in the window.
+
+    ``check_feature_availability()`` imports torch, onnxruntime, transformers
+    and friends; run on the GUI thread before ``app.exec()`` it delayed the
+    first interactive frame by the full cost of those imports. With a
+    ``BackgroundImporter`` the check runs after its imports finish (so the
+    modules are already loaded); otherwise on its own daemon thread.
+
+    Args:
+        window: Main window to log messages to
+        importer: BackgroundImporter to chain onto (not yet started), or None
+    """
+    relay = _DiagnosticsRelay(window)  # lives on the UI thread: emits are queued
+    relay.ready.connect(lambda features: log_startup_diagnostics(window, features))
+    window._diagnostics_relay = relay
+
+    def _check(*_args):
+        try:
+            relay.ready.emit(check_feature_availability())
+        except Exception as e:
+            logger.debug(f"Startup diagnostics failed: {e}")
+
+    if importer is not None:
+        previous = importer.on_done
+
+        def _on_done(results):
+            if previous is not None:
+                previous(results)
+            _check()
+        importer.on_done = _on_done
+    else:
+        threading.Thread(target=_check, name='StartupDiagnostics', daemon=True).start()
+
+
+def log_startup_diagnostics(window, features=None):
     """
     Log startup diagnostics showing which features are available.
     
     Args:
         window: Main window to log messages to
+        features: Result of check_feature_availability() (None: check now)
     """
     window.log("=" * 60)
     window.log("🔍 STARTUP DIAGNOSTICS")
     window.log("=" * 60)
     
     # Check features
-    features = check_feature_availability()
+    if features is None:
+        features = check_feature_availability()
     
     # Core features (always available)
     window.log("✅ Core Features:")
@@ -9186,8 +9374,29 @@ def main():
         logger.debug(f"U2NET_HOME setup skipped: {_u2err}")
 
     # Create and show main window
+    startup_timeline.mark('QApplication ready')
     window = TextureSorterMainWindow()
+    startup_timeline.mark('main window constructed')
     window.show()
+    startup_timeline.mark('main window shown')
+    QTimer.singleShot(0, lambda: startup_timeline.mark('event loop running'))
+
+    # Import the heavy ML stacks (torch, onnxruntime, rembg, …) on a daemon
+    # thread now that the window is up, so the first tool that needs them
+    # does not freeze the UI.  Disable with performance.preload_ml_modules.
+    if config.get('performance', 'preload_ml_modules', default=True):
+        try:
+            from startup_validation import _apply_torchvision_compat_shim as _tv_shim
+        except Exception:
+            _tv_shim = None
+        window._background_importer = BackgroundImporter(
+            startup_timeline,
+            before=_tv_shim,
+            on_done=lambda _results: logger.info(startup_timeline.format_report()),
+        )
+        QTimer.singleShot(250, window._background_importer.start)
+    else:
+        QTimer.singleShot(0, lambda: logger.info(startup_timeline.format_report()))
 
     # Close splash screen now that the main window is visible
     if _splash is not None:
@@ -9249,8 +9458,9 @@ def main():
     window.log("✅ Qt6 UI loaded successfully")
     window.log("✅ No tkinter, no canvas - pure Qt!")
     
-    # Log startup diagnostics
-    log_startup_diagnostics(window)
+    # Log startup diagnostics once the optional modules are probed in the
+    # background (see start_startup_diagnostics)
+    start_startup_diagnostics(window, getattr(window, '_background_importer', None))
     
     # Start event loop
     _exit_code = app.exec()
@@ -2,14 +2,18 @@
 //!
 //! Provides high-performance implementations of:
 //! - Lanczos image upscaling
+//! - Area-averaging image downscaling (thumbnails)
 //! - Image feature extraction (perceptual hash, color histogram, edge density)
 //! - Batch parallel image processing via Rayon
 //! - Bitmap to SVG vector tracing (via vtracer)
+//! - Parallel file CRC-32 for game image identification
 //!
 //! Built with PyO3 for seamless Python integration.
 
 use pyo3::prelude::*;
 use rayon::prelude::*;
+use std::fs::File;
+use std::io::{Read, Seek, SeekFrom};
 use vtracer::{convert, Config, ColorMode, Hierarchical, ColorImage};
 use visioncortex::PathSimplifyMode;
 
@@ -153,6 +157,132 @@ fn lanczos_upscale(
     Ok((out, new_w, new_h))
 }
 
+// ---------------------------------------------------------------------------
+// Downscaling
+// ---------------------------------------------------------------------------
+
+/// For each destination pixel along one axis, the source pixels it covers
+/// and the fraction of the destination pixel each one contributes.
+fn area_weights(src: usize, dst: usize) -> Vec<Vec<(usize, f32)>> {
+    let scale = src as f64 / dst as f64;
+    (0..dst)
+        .map(|d| {
+            let start = d as f64 * scale;
+            let end = ((d + 1) as f64 * scale).min(src as f64);
+            let first = start.floor() as usize;
+            let last = (end.ceil() as usize).clamp(first + 1, src);
+            (first..last)
+                .filter_map(|s| {
+                    let overlap = (end.min((s + 1) as f64) - start.max(s as f64)) / scale;
+                    if overlap > 1e-9 {
+                        Some((s, overlap as f32))
+                    } else {
+                        None
+                    }
+                })
+                .collect()
+        })
+        .collect()
+}
+
+/// Shrink a flat 8-bit pixel buffer by area averaging (like OpenCV's
+/// INTER_AREA), which is alias-free for any reduction factor.
+///
+/// Rows are processed in parallel and the GIL is released, so several
+/// Python threads can downscale different images at the same time.
+///
+/// Parameters
+/// ----------
+/// data : bytes
+///     Raw pixel data in row-major order, ``channels`` bytes per pixel.
+/// width : int
+///     Source image width in pixels.
+/// height : int
+///     Source image height in pixels.
+/// channels : int
+///     Number of channels (1-4).
+/// new_width : int
+///     Destination width (1..=width).
+/// new_height : int
+///     Destination height (1..=height).
+///
+/// Returns
+/// -------
+/// bytes
+///     Downscaled pixel data, ``new_width * new_height * channels`` bytes.
+#[pyfunction]
+fn area_downscale(
+    py: Python<'_>,
+    data: &[u8],
+    width: usize,
+    height: usize,
+    channels: usize,
+    new_width: usize,
+    new_height: usize,
+) -> PyResult<Vec<u8>> {
+    if channels == 0 || channels > 4 {
+        return Err(pyo3::exceptions::PyValueError::new_err(
+            "channels must be between 1 and 4",
+        ));
+    }
+    let expected_len = width * height * channels;
+    if data.len() != expected_len {
+        return Err(pyo3::exceptions::PyValueError::new_err(format!(
+            "data length {} does not match {}x{}x{}={}",
+            data.len(),
+            width,
+            height,
+            channels,
+            expected_len,
+        )));
+    }
+    if new_width == 0 || new_height == 0 || new_width > width || new_height > height {
+        return Err(pyo3::exceptions::PyValueError::new_err(
+            "target size must be between 1x1 and the source size",
+        ));
+    }
+
+    Ok(py.allow_threads(|| {
+        let x_weights = area_weights(width, new_width);
+        let y_weights = area_weights(height, new_height);
+        let row_len = new_width * channels;
+
+        // --- horizontal pass: every source row shrunk to new_width ---
+        let rows: Vec<Vec<f32>> = (0..height)
+            .into_par_iter()
+            .map(|y| {
+                let src = &data[y * width * channels..(y + 1) * width * channels];
+                let mut out = vec![0.0f32; row_len];
+                for (x, taps) in x_weights.iter().enumerate() {
+                    let dst = &mut out[x * channels..(x + 1) * channels];
+                    for &(sx, w) in taps {
+                        let px = &src[sx * channels..(sx + 1) * channels];
+                        for c in 0..channels {
+                            dst[c] += w * px[c] as f32;
+                        }
+                    }
+                }
+                out
+            })
+            .collect();
+
+        // --- vertical pass: blend the covering rows of each output row ---
+        let mut out = vec![0u8; new_height * row_len];
+        out.par_chunks_mut(row_len).enumerate().for_each(|(y, dst)| {
+            let mut acc = vec![0.0f32; row_len];
+            for &(sy, w) in &y_weights[y] {
+                for (a, v) in acc.iter_mut().zip(&rows[sy]) {
+                    *a += w * v;
+                }
+            }
+            for (d, a) in dst.iter_mut().zip(acc) {
+                *d = a.round().clamp(0.0, 255.0) as u8;
+            }
+        });
+        out
+    }))
+}
+
 // ---------------------------------------------------------------------------
 // Feature extraction helpers
 // ---------------------------------------------------------------------------
@@ -531,18 +661,90 @@ fn batch_color_histogram(
     results.into_iter().collect()
 }
 
+// ---------------------------------------------------------------------------
+// File hashing
+// ---------------------------------------------------------------------------
+
+/// CRC-32 of `len` bytes of `path` starting at `start`.
+///
+/// Returns the CRC and the number of bytes actually read (less than `len`
+/// if the file was truncated meanwhile).
+fn crc32_range(path: &str, start: u64, len: u64) -> std::io::Result<(u32, u64)> {
+    let mut file = File::open(path)?;
+    file.seek(SeekFrom::Start(start))?;
+    let mut hasher = crc32fast::Hasher::new();
+    let mut buf = vec![0u8; (4usize << 20).min(len.max(1) as usize)];
+    let mut remaining = len;
+    while remaining > 0 {
+        let want = remaining.min(buf.len() as u64) as usize;
+        let n = file.read(&mut buf[..want])?;
+        if n == 0 {
+            break;
+        }
+        hasher.update(&buf[..n]);
+        remaining -= n as u64;
+    }
+    Ok((hasher.finalize(), len - remaining))
+}
+
+/// Compute the zlib-compatible CRC-32 of a file.
+///
+/// The file is split into segments that are read and hashed in parallel
+/// (SIMD CRC via crc32fast), then the segment CRCs are combined in order.
+/// The GIL is released for the whole computation.
+///
+/// Parameters
+/// ----------
+/// path : str
+///     File to hash.
+/// segment_size : int, default 64 MiB
+///     Bytes hashed per parallel task.
+///
+/// Returns
+/// -------
+/// int
+///     CRC-32 as an unsigned 32-bit integer (same as ``zlib.crc32``).
+#[pyfunction]
+#[pyo3(signature = (path, segment_size=64 * 1024 * 1024))]
+fn file_crc32(py: Python<'_>, path: &str, segment_size: u64) -> PyResult<u32> {
+    let path = path.to_owned();
+    py.allow_threads(move || -> std::io::Result<u32> {
+        let size = std::fs::metadata(&path)?.len();
+        let segment_size = segment_size.max(1 << 20);
+        if size <= segment_size {
+            return crc32_range(&path, 0, size).map(|(crc, _)| crc);
+        }
+        let ranges: Vec<(u64, u64)> = (0..size)
+            .step_by(segment_size as usize)
+            .map(|start| (start, segment_size.min(size - start)))
+            .collect();
+        let parts: Vec<std::io::Result<(u32, u64)>> = ranges
+            .par_iter()
+            .map(|&(start, len)| crc32_range(&path, start, len))
+            .collect();
+        let mut combined = crc32fast::Hasher::new();
+        for part in parts {
+            let (crc, len) = part?;
+            combined.combine(&crc32fast::Hasher::new_with_initial_len(crc, len));
+        }
+        Ok(combined.finalize())
+    })
+    .map_err(|e| pyo3::exceptions::PyOSError::new_err(e.to_string()))
+}
+
 // ---------------------------------------------------------------------------
 // Python module
 // ---------------------------------------------------------------------------
 
 /// Native Rust acceleration module for PS2 texture processing.
 ///
-/// Provides fast Lanczos upscaling, perceptual hashing, color histograms,
+/// Provides fast Lanczos upscaling, area downscaling, perceptual hashing, color histograms,
 /// edge density computation, vector tracing, and parallel batch operations.
 #[pymodule]
 fn texture_ops(m: &Bound<'_, PyModule>) -> PyResult<()> {
     // Upscaling
     m.add_function(wrap_pyfunction!(lanczos_upscale, m)?)?;
+    m.add_function(wrap_pyfunction!(area_downscale, m)?)?;
 
     // Feature extraction
     m.add_function(wrap_pyfunction!(perceptual_hash, m)?)?;
@@ -558,5 +760,8 @@ fn texture_ops(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(batch_perceptual_hash, m)?)?;
     m.add_function(wrap_pyfunction!(batch_color_histogram, m)?)?;
 
+    // File hashing
+    m.add_function(wrap_pyfunction!(file_crc32, m)?)?;
+
     Ok(())
 }
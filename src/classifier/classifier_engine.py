@@ -7,7 +7,8 @@ Automatically classifies textures into 50+ categories using:
 - Metadata examination
 """
 
-import re
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Tuple, Optional
 import logging
@@ -49,7 +50,18 @@ except (ImportError, OSError) as e:
     native_edge_density = None
     native_color_histogram = None
 
+try:
+    from utils.image_processing import prepare_reduced_decode
+except (ImportError, OSError):
+    prepare_reduced_decode = None
+
+try:
+    from utils.cache_manager import cached_array, get_cache_manager, image_key
+except (ImportError, OSError):
+    cached_array = get_cache_manager = image_key = None
+
 from .categories import ALL_CATEGORIES, get_category_info
+from .keyword_matcher import FilenameKeywordMatcher
 
 
 class TextureClassifier:
@@ -57,6 +69,9 @@ class TextureClassifier:
     
     # Classification confidence thresholds
     HIGH_CONFIDENCE_THRESHOLD = 0.7  # Threshold for accepting filename-based classification
+    # Image heuristics (colour stats, UV-layout and pattern checks) are
+    # stable at this size, so analysis decodes no more than this many pixels.
+    ANALYSIS_SIZE = 128
     
     def __init__(self, config=None, model_manager=None, game_profile=None):
         self.config = config
@@ -67,6 +82,7 @@ class TextureClassifier:
         # Game-specific texture profile (NEW)
         self.game_profile = game_profile or {}
         self.game_specific_keywords = self._load_game_keywords()
+        self._keyword_matcher: Optional[FilenameKeywordMatcher] = None
         
         # Get AI preferences from config
         if config:
@@ -122,6 +138,7 @@ class TextureClassifier:
         """
         self.game_profile = game_profile
         self.game_specific_keywords = self._load_game_keywords()
+        self._keyword_matcher = None
         # Clear cache when profile changes
         self.classification_cache.clear()
     
@@ -154,10 +171,16 @@ class TextureClassifier:
                     import logging
                     logging.debug(f"File not found for AI classification: {file_path}")
                 else:
-                    with Image.open(file_path) as img:
-                        if img.mode != 'RGB':
-                            img = img.convert('RGB')
-                        img_array = np.array(img)
+                    def _decode_rgb():
+                        with Image.open(file_path) as img:
+                            if img.mode != 'RGB':
+                                img = img.convert('RGB')
+                            return np.array(img)
+                    
+                    if cached_array is not None:
+                        img_array = cached_array(file_path, 'rgb', _decode_rgb)
+                    else:
+                        img_array = _decode_rgb()
                     
                     # Get predictions from AI model
                     predictions = self.model_manager.predict(img_array, list(self.categories.keys()))
@@ -193,91 +216,49 @@ class TextureClassifier:
         return category, confidence
     
     def _classify_by_filename(self, file_path: Path) -> Tuple[str, float]:
-        """Classify based on filename patterns"""
-        filename = file_path.stem.lower()
-        best_match = "unclassified"
-        best_score = 0.0
-        
-        # Common video game texture naming conventions to strip before matching
-        # These prefixes/suffixes are used in game engines (Unreal, Unity, Source, etc.)
-        # Strip common prefixes like tex_, t_, mat_, m_ 
-        cleaned = re.sub(r'^(tex_|t_|mat_|m_|uv_|tx_)', '', filename)
-        # Strip common suffixes like _diffuse, _diff, _d, _col, _color, _albedo, _base
-        cleaned = re.sub(r'(_diffuse|_diff|_d|_col|_color|_albedo|_base|_basecolor|_bc|_tex)$', '', cleaned)
-        # Strip resolution suffixes like _512, _1024, _2k, _4k
-        cleaned = re.sub(r'(_\d+x\d+|_\d{3,4}|_[124]k)$', '', cleaned)
-        # Strip LOD suffixes like _lod0, _lod1
-        cleaned = re.sub(r'_lod\d+$', '', cleaned)
-        
-        # Names to check: both original and cleaned versions
-        names_to_check = {filename}
-        if cleaned != filename:
-            names_to_check.add(cleaned)
-        
-        # Also try splitting on underscores and numbers to match individual parts
-        # This helps with names like "char_head_skin_01" -> matches "head", "skin"
-        parts = re.split(r'[_\-\s]+', cleaned)
-        
-        # NEW: Check game-specific keywords first (higher priority)
-        if self.game_specific_keywords:
-            for keyword, category in self.game_specific_keywords.items():
-                if category:  # Only if mapped to a category
-                    for name in names_to_check:
-                        if keyword in name:
-                            # High confidence for game-specific matches
-                            score = 0.9
-                            if name.startswith(keyword):
-                                score = 1.0
-                            if score > best_score:
-                                best_score = score
-                                best_match = category
-                    
-                    # Check parts
-                    for part in parts:
-                        if part and keyword == part:
-                            score = 0.95
-                            if score > best_score:
-                                best_score = score
-                                best_match = category
-        
-        # Check each category's keywords
-        for category_id, category_info in self.categories.items():
-            keywords = category_info.get("keywords", [])
-            for keyword in keywords:
-                kw_lower = keyword.lower()
-                
-                for name in names_to_check:
-                    if kw_lower in name:
-                        # Score based on keyword match length and position
-                        score = len(keyword) / max(len(name), 1)
-                        # Bonus for exact matches or start of filename
-                        if name.startswith(kw_lower):
-                            score += 0.2
-                        if name == kw_lower:
-                            score = 1.0
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_match = category_id
-                
-                # Also check individual parts for matches
-                for part in parts:
-                    if part and kw_lower == part:
-                        # Exact part match is a strong signal
-                        score = 0.8
-                        if score > best_score:
-                            best_score = score
-                            best_match = category_id
-                    elif part and kw_lower in part and len(kw_lower) >= 3:
-                        score = len(keyword) / max(len(part), 1) * 0.7
-                        if score > best_score:
-                            best_score = score
-                            best_match = category_id
-        
-        # Normalize score to 0-1 range
-        confidence = min(1.0, best_score + 0.3)  # Add base confidence
-        
-        return best_match, confidence
+        """Classify based on filename patterns.
+
+        Common game-engine prefixes/suffixes (tex_, _diffuse, _2k, _lod0, ...)
+        are stripped, then the original and cleaned names and their
+        underscore-separated parts are matched against the game-profile and
+        category keywords in one automaton scan (see keyword_matcher).
+        """
+        return self._get_keyword_matcher().classify(Path(file_path).stem.lower())
+
+    def _get_keyword_matcher(self) -> FilenameKeywordMatcher:
+        """Compile the keyword tables on first use (and after profile changes)."""
+        matcher = self._keyword_matcher
+        if matcher is None:
+            matcher = FilenameKeywordMatcher(self.categories, self.game_specific_keywords)
+            self._keyword_matcher = matcher
+        return matcher
+
+    def classify_filenames(self, filenames: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify many files by filename only.
+
+        Uses the compiled keyword automaton directly, skipping the per-file
+        cache and image analysis of ``classify_texture``; repeated stems are
+        scored once.
+
+        Args:
+            filenames: File names or paths (str or Path)
+
+        Returns:
+            List of (category_id, confidence), in input order
+        """
+        stem_of = self._stem_of
+        return self._get_keyword_matcher().classify_many(stem_of(name) for name in filenames)
+
+    @staticmethod
+    def _stem_of(name) -> str:
+        """Lower-cased ``Path(name).stem`` without building a Path for plain names."""
+        if not isinstance(name, str) or '/' in name or '\\' in name:
+            return Path(name).stem.lower()
+        if name.endswith('.') or name in ('', '..'):
+            return Path(name).stem.lower()
+        dot = name.rfind('.')
+        return (name[:dot] if dot > 0 else name).lower()
     
     def _classify_by_image(self, file_path: Path) -> Tuple[str, float]:
         """Classify based on image analysis"""
@@ -285,22 +266,11 @@ class TextureClassifier:
             return "unclassified", 0.0
         
         try:
-            # Load image
-            img = Image.open(file_path)
-            
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Analyze image properties
-            width, height = img.size
+            img, width, height = self._load_analysis_image(file_path)
             aspect_ratio = width / height if height > 0 else 1.0
             
-            # Get color histogram
-            histogram = img.histogram()
-            
-            # Analyze dominant colors
-            img_array = np.array(img)
+            # One decoded array shared by every heuristic below
+            img_array = np.asarray(img)
             avg_color = np.mean(img_array, axis=(0, 1))
             color_std = np.std(img_array, axis=(0, 1))
             
@@ -365,6 +335,34 @@ class TextureClassifier:
             logger.error(f"Error analyzing image {file_path}: {e}")
             return "unclassified", 0.0
     
+    def _load_analysis_image(self, file_path: Path):
+        """
+        Decode ``file_path`` as RGB at roughly ``ANALYSIS_SIZE`` px.
+
+        JPEGs are scaled during decode, DDS files decode their smallest
+        sufficient mip level and other formats are box-reduced on load.
+        The result is kept in the shared image cache for reclassification.
+
+        Returns:
+            Tuple of (reduced RGB image, original width, original height)
+        """
+        key = image_key(file_path, f"analysis:{self.ANALYSIS_SIZE}") if image_key else None
+        if key is None:
+            return self._decode_analysis_image(file_path)
+        return get_cache_manager().get_or_create(
+            key, lambda: self._decode_analysis_image(file_path))
+    
+    def _decode_analysis_image(self, file_path: Path):
+        """Uncached body of :meth:`_load_analysis_image`."""
+        box = (self.ANALYSIS_SIZE, self.ANALYSIS_SIZE)
+        with Image.open(file_path) as img:
+            width, height = img.size
+            if prepare_reduced_decode is not None:
+                prepare_reduced_decode(img, box)
+            img.thumbnail(box, reducing_gap=2.0)
+            reduced = img.convert('RGB') if img.mode != 'RGB' else img.copy()
+        return reduced, width, height
+    
     def _is_simple_image(self, img_array: 'np.ndarray') -> bool:
         """Check if image has simple/flat colors (typical of UI)"""
         # Calculate color variance
@@ -440,7 +438,7 @@ class TextureClassifier:
         return False
     
     def batch_classify(self, file_paths: List[Path], use_image_analysis=True, 
-                      progress_callback=None) -> dict:
+                      progress_callback=None, max_workers: Optional[int] = None) -> dict:
         """
         Classify multiple textures
         
@@ -448,22 +446,54 @@ class TextureClassifier:
             file_paths: List of file paths to classify
             use_image_analysis: Whether to use image analysis
             progress_callback: Callback function for progress updates
+            max_workers: Worker threads (default: up to 8, or 1 when an AI
+                model manager is attached)
         
         Returns:
             Dictionary mapping file paths to (category, confidence) tuples
         """
-        results = {}
         total = len(file_paths)
         
-        for i, file_path in enumerate(file_paths):
-            category, confidence = self.classify_texture(file_path, use_image_analysis)
-            results[str(file_path)] = (category, confidence)
-            
-            if progress_callback:
-                progress_callback(i + 1, total)
+        # Filename-only classification is the compiled keyword matcher.
+        if not use_image_analysis:
+            keys = [str(Path(p)) for p in file_paths]
+            todo = [k for k in dict.fromkeys(keys) if k not in self.classification_cache]
+            for key, result in zip(todo, self.classify_filenames(todo)):
+                self.classification_cache[key] = result
+            if progress_callback and total:
+                progress_callback(total, total)
+            return {key: self.classification_cache[key] for key in keys}
+        
+        # AI model inference is not guaranteed to be thread-safe.
+        if max_workers is None:
+            max_workers = 1 if self.model_manager else min(8, os.cpu_count() or 1)
+        if max_workers <= 1 or total <= 1:
+            results = {}
+            for i, file_path in enumerate(file_paths):
+                results[str(file_path)] = self.classify_texture(file_path, use_image_analysis)
+                if progress_callback:
+                    progress_callback(i + 1, total)
+            return results
         
-        return results
+        # Decoding and NumPy reductions release the GIL, so threads scale.
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Classify") as pool:
+            futures = {
+                pool.submit(self.classify_texture, file_path, use_image_analysis): i
+                for i, file_path in enumerate(file_paths)
+            }
+            ordered: List[Tuple[str, float]] = [None] * total  # type: ignore[list-item]
+            for done, future in enumerate(as_completed(futures), 1):
+                ordered[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback(done, total)
+        
+        return {str(file_path): result for file_path, result in zip(file_paths, ordered)}
     
     def clear_cache(self):
         """Clear the classification cache"""
         self.classification_cache.clear()
+    
+    def invalidate(self, file_paths):
+        """Drop cached classifications for files that changed or were removed"""
+        for file_path in file_paths:
+            self.classification_cache.pop(str(file_path), None)
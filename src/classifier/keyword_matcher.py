@@ -0,0 +1,510 @@
+"""
+Keyword Matcher
+Compiles the category and game-profile keyword tables into one
+Aho-Corasick automaton so a filename is matched against every keyword
+in a single left-to-right scan. Bulk classification runs the automaton
+as a dense transition table over many names at once with NumPy.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except (ImportError, OSError, RuntimeError):
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+# Naming conventions stripped before matching (see _clean_stem).
+_PREFIX_RE = re.compile(r'^(tex_|t_|mat_|m_|uv_|tx_)')
+_SUFFIX_RE = re.compile(r'(_diffuse|_diff|_d|_col|_color|_albedo|_base|_basecolor|_bc|_tex)$')
+_RESOLUTION_RE = re.compile(r'(_\d+x\d+|_\d{3,4}|_[124]k)$')
+_LOD_RE = re.compile(r'_lod\d+$')
+_PART_RE = re.compile(r'[^_\-\s]+')
+
+
+_SEPARATOR_CODEPOINTS = None
+
+
+def _separator_codepoints():
+    """Code points ``_PART_RE`` treats as separators ('_', '-', Unicode \\s)."""
+    global _SEPARATOR_CODEPOINTS
+    if _SEPARATOR_CODEPOINTS is None:
+        # U+3000 is the highest code point matched by \\s.
+        space = re.compile(r'\s')
+        points = [c for c in range(0x3001) if space.match(chr(c))]
+        _SEPARATOR_CODEPOINTS = np.array(sorted(points + [ord('_'), ord('-')]), dtype=np.uint32)
+    return _SEPARATOR_CODEPOINTS
+
+
+def _expand(starts, counts):
+    """Expand CSR ranges: (owner index, flat index) for every element."""
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(counts.shape[0]), counts)
+    before = np.cumsum(counts) - counts
+    flat = np.repeat(starts - before, counts) + np.arange(total)
+    return owner, flat
+
+
+def _clean_stem(filename: str) -> str:
+    """Strip engine prefixes and diffuse/resolution/LOD suffixes."""
+    cleaned = _PREFIX_RE.sub('', filename)
+    cleaned = _SUFFIX_RE.sub('', cleaned)
+    cleaned = _RESOLUTION_RE.sub('', cleaned)
+    return _LOD_RE.sub('', cleaned)
+
+
+class AhoCorasick:
+    """
+    Minimal Aho-Corasick automaton over string patterns.
+
+    ``find_all`` reports every (start, pattern_id) occurrence, overlapping
+    ones included, in a single pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        # state -> ((pattern_id, pattern_length), ...) ending at that state
+        self._out: List[Tuple[Tuple[int, int], ...]] = [()]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        pid = len(self.patterns)
+        self.patterns.append(pattern)
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + ((pid, len(pattern)),)
+
+    def _build(self) -> None:
+        """Compute failure links and merge each state's suffix outputs."""
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                target = self._goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[fail[nxt]]
+        self._fail = fail
+        self._order = queue
+        self._dense = None
+        self.lengths = [len(p) for p in self.patterns]
+
+    def find_all(self, text: str) -> List[Tuple[int, int]]:
+        """Return (start, pattern_id) for every occurrence in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        occurrences = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                for pid, length in out[state]:
+                    occurrences.append((end - length, pid))
+        return occurrences
+
+
+    def dense(self):
+        """
+        Dense DFA form of the automaton for vectorized scanning.
+
+        Returns:
+            Tuple of (sorted alphabet code points, transition table of shape
+            (states, len(alphabet) + 1) where column 0 is "any other
+            character", output counts per state, output offsets per state,
+            flat output pattern ids)
+        """
+        if self._dense is None:
+            alphabet = sorted({ch for pattern in self.patterns for ch in pattern})
+            column = {ch: i + 1 for i, ch in enumerate(alphabet)}
+            delta = np.zeros((len(self._goto), len(alphabet) + 1), dtype=np.int32)
+            for ch, nxt in self._goto[0].items():
+                delta[0, column[ch]] = nxt
+            # BFS order guarantees each failure state is filled in first.
+            for state in self._order:
+                delta[state] = delta[self._fail[state]]
+                for ch, nxt in self._goto[state].items():
+                    delta[state, column[ch]] = nxt
+            counts = np.array([len(out) for out in self._out], dtype=np.int64)
+            offsets = np.cumsum(counts) - counts
+            pids = np.array([pid for out in self._out for pid, _ in out], dtype=np.int64)
+            self._dense = (
+                np.array([ord(ch) for ch in alphabet], dtype=np.uint32),
+                delta, counts, offsets, pids,
+            )
+        return self._dense
+
+
+class FilenameKeywordMatcher:
+    """
+    Filename classifier over compiled category and game-profile keywords.
+
+    Scoring is identical to the original per-keyword loops in
+    ``TextureClassifier._classify_by_filename``: every (keyword, category)
+    entry is scored from its hits, and the highest score wins, with ties
+    going to the entry that comes first (game keywords, then categories in
+    table order).
+    """
+
+    CACHE_SIZE = 200_000
+    VECTOR_MIN = 256
+    VECTOR_CHUNK = 16384
+
+    def __init__(self, categories: Dict[str, dict],
+                 game_keywords: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Compile the keyword tables.
+
+        Args:
+            categories: Category table (``classifier.categories.ALL_CATEGORIES``)
+            game_keywords: Lower-cased game keyword -> category (or None)
+        """
+        pattern_ids: Dict[str, int] = {}
+        # Per pattern: list of (ordinal, is_game, category, keyword length)
+        entries: List[List[Tuple[int, bool, str, int]]] = []
+
+        def register(pattern: str, entry) -> None:
+            pid = pattern_ids.get(pattern)
+            if pid is None:
+                pid = pattern_ids[pattern] = len(entries)
+                entries.append([])
+            entries[pid].append(entry)
+
+        ordinal = 0
+        for keyword, category in (game_keywords or {}).items():
+            if category:
+                register(keyword, (ordinal, True, category, len(keyword)))
+                ordinal += 1
+        for category_id, category_info in categories.items():
+            for keyword in category_info.get("keywords", []):
+                register(keyword.lower(), (ordinal, False, category_id, len(keyword)))
+                ordinal += 1
+
+        patterns = sorted(pattern_ids, key=pattern_ids.get)
+        # The empty keyword matches every name at position 0; the automaton
+        # cannot represent it, so it is added to every scan by hand.
+        self._empty_pid = pattern_ids.get('')
+        self._automaton = AhoCorasick(p for p in patterns if p)
+        self._entries = [entries[pattern_ids[p]] for p in self._automaton.patterns]
+        self._empty_entries = entries[self._empty_pid] if self._empty_pid is not None else []
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        self._entry_arrays = None
+
+    def classify(self, stem: str) -> Tuple[str, float]:
+        """
+        Classify a lower-cased filename stem.
+
+        Returns:
+            Tuple of (category_id, confidence)
+        """
+        cached = self._cache.get(stem)
+        if cached is not None:
+            return cached
+
+        filename = stem
+        cleaned = _clean_stem(filename)
+        find_all = self._automaton.find_all
+        lengths = self._automaton.lengths
+
+        # Stripping only removes a prefix and suffixes, so ``cleaned`` is
+        # normally a slice of ``filename`` and one scan serves both names.
+        occurrences = find_all(filename)
+        if cleaned == filename:
+            names = (filename,)
+            cleaned_occurrences = occurrences
+        else:
+            names = (filename, cleaned)
+            prefix = _PREFIX_RE.match(filename)
+            offset = prefix.end() if prefix else 0
+            if filename.startswith(cleaned, offset):
+                limit = offset + len(cleaned)
+                cleaned_occurrences = [
+                    (start - offset, pid) for start, pid in occurrences
+                    if start >= offset and start + lengths[pid] <= limit
+                ]
+            else:
+                cleaned_occurrences = find_all(cleaned)
+
+        # name -> {pid: some occurrence starts the name}
+        name_hits = []
+        for name, name_occurrences in zip(names, (occurrences, cleaned_occurrences)):
+            hits: Dict[int, bool] = {}
+            for start, pid in name_occurrences:
+                if start == 0 or pid not in hits:
+                    hits[pid] = start == 0
+            name_hits.append((name, hits))
+
+        # Occurrences in ``cleaned`` that lie inside one underscore/dash/space
+        # separated part: pid -> [(part length, whole part)]
+        part_hits: Dict[int, List[Tuple[int, bool]]] = {}
+        if cleaned_occurrences:
+            owner = [-1] * len(cleaned)
+            parts = []
+            for index, match in enumerate(_PART_RE.finditer(cleaned)):
+                start, end = match.span()
+                parts.append((start, end))
+                owner[start:end] = [index] * (end - start)
+            for start, pid in cleaned_occurrences:
+                index = owner[start]
+                last = start + lengths[pid] - 1
+                if index >= 0 and owner[last] == index:
+                    p_start, p_end = parts[index]
+                    part_hits.setdefault(pid, []).append(
+                        (p_end - p_start, start == p_start and last + 1 == p_end)
+                    )
+
+        candidates = set(part_hits)
+        for _, hits in name_hits:
+            candidates.update(hits)
+
+        # Highest score wins; on a tie the earlier entry (lower ordinal) wins,
+        # exactly as the original sequential strict ">" updates did.
+        best_score = 0.0
+        best_ordinal = -1
+        best_match = "unclassified"
+        for pid in candidates:
+            keyword_len = lengths[pid]
+            pid_parts = part_hits.get(pid, ())
+            for ordinal, is_game, category, kw_len in self._entries[pid]:
+                score = 0.0
+                for name, hits in name_hits:
+                    starts = hits.get(pid)
+                    if starts is None:
+                        continue
+                    if is_game:
+                        value = 1.0 if starts else 0.9
+                    elif starts and len(name) == keyword_len:
+                        value = 1.0
+                    else:
+                        value = kw_len / max(len(name), 1)
+                        if starts:
+                            value += 0.2
+                    if value > score:
+                        score = value
+                for part_len, exact in pid_parts:
+                    if exact:
+                        value = 0.95 if is_game else 0.8
+                    elif is_game or keyword_len < 3:
+                        continue
+                    else:
+                        value = kw_len / max(part_len, 1) * 0.7
+                    if value > score:
+                        score = value
+                if score > best_score or (score == best_score and score > 0.0
+                                          and ordinal < best_ordinal):
+                    best_score, best_ordinal, best_match = score, ordinal, category
+        for ordinal, is_game, category, _kw_len in self._empty_entries:
+            score = 1.0 if is_game or filename == '' else 0.2
+            if score > best_score or (score == best_score and ordinal < best_ordinal):
+                best_score, best_ordinal, best_match = score, ordinal, category
+
+        result = (best_match, min(1.0, best_score + 0.3))
+        if len(self._cache) < self.CACHE_SIZE:
+            self._cache[stem] = result
+        return result
+
+    def classify_many(self, stems: Iterable[str]) -> List[Tuple[str, float]]:
+        """
+        Classify many lower-cased stems.
+
+        Repeated stems are scored once. With NumPy, uncached stems are scored
+        in vectorized chunks; results are identical to ``classify``.
+
+        Returns:
+            List of (category_id, confidence), in input order
+        """
+        stems = list(stems)
+        if not HAS_NUMPY or len(stems) < self.VECTOR_MIN:
+            classify = self.classify
+            return [classify(stem) for stem in stems]
+
+        cache = self._cache
+        todo = [stem for stem in dict.fromkeys(stems) if stem not in cache]
+        computed: Dict[str, Tuple[str, float]] = {}
+        # Similar lengths per chunk keep the padded character matrix small.
+        todo.sort(key=len)
+        for start in range(0, len(todo), self.VECTOR_CHUNK):
+            computed.update(self._classify_chunk(todo[start:start + self.VECTOR_CHUNK]))
+        for stem, result in computed.items():
+            if len(cache) >= self.CACHE_SIZE:
+                break
+            cache[stem] = result
+        return [computed[stem] if stem in computed else cache[stem] for stem in stems]
+
+    def _entry_tables(self):
+        """Entries as flat arrays with per-pattern offsets (built once)."""
+        if self._entry_arrays is None:
+            categories: Dict[str, int] = {}
+            flat = [entry for entries in self._entries for entry in entries]
+            counts = np.array([len(entries) for entries in self._entries], dtype=np.int64)
+            self._category_names = []
+            for _, _, category, _ in flat + list(self._empty_entries):
+                if category not in categories:
+                    categories[category] = len(self._category_names)
+                    self._category_names.append(category)
+            self._category_ids = categories
+            self._entry_arrays = (
+                counts,
+                np.cumsum(counts) - counts,
+                np.array([e[0] for e in flat], dtype=np.int64),
+                np.array([e[1] for e in flat], dtype=bool),
+                np.array([categories[e[2]] for e in flat], dtype=np.int64),
+                np.array([e[3] for e in flat], dtype=np.float64),
+                np.array(self._automaton.lengths, dtype=np.int64),
+            )
+        return self._entry_arrays
+
+    def _classify_chunk(self, stems: List[str]) -> Dict[str, Tuple[str, float]]:
+        """Vectorized ``classify`` for a list of distinct stems."""
+        results: Dict[str, Tuple[str, float]] = {}
+        names: List[str] = []
+        offsets: List[int] = []
+        clean_lengths: List[int] = []
+        for stem in stems:
+            cleaned = _clean_stem(stem)
+            offset = 0
+            if cleaned != stem:
+                prefix = _PREFIX_RE.match(stem)
+                offset = prefix.end() if prefix else 0
+            # NUL cannot round-trip through a NumPy string array, and a
+            # cleaned name that is not a slice needs its own scan.
+            if '\x00' in stem or not stem.startswith(cleaned, offset):
+                results[stem] = self.classify(stem)
+                continue
+            names.append(stem)
+            offsets.append(offset)
+            clean_lengths.append(len(cleaned))
+        if not names:
+            return results
+
+        n = len(names)
+        width = max(1, max(map(len, names)))
+        codes = np.array(names, dtype=f'<U{width}').view(np.uint32).reshape(n, width)
+        name_len = np.fromiter(map(len, names), dtype=np.int64, count=n)
+        offset = np.array(offsets, dtype=np.int64)
+        clean_len = np.array(clean_lengths, dtype=np.int64)
+        (entry_count, entry_offset, ordinal, is_game, category,
+         kw_len, pattern_len) = self._entry_tables()
+
+        cand_row: List = []
+        cand_value: List = []
+        cand_ordinal: List = []
+        cand_category: List = []
+
+        if self._automaton.patterns:
+            alphabet, delta, out_count, out_offset, out_pids = self._automaton.dense()
+            column = np.minimum(np.searchsorted(alphabet, codes), len(alphabet) - 1)
+            classes = np.where(alphabet[column] == codes, column + 1, 0).astype(np.int32)
+
+            # Step every name through the DFA one column at a time.
+            state = np.zeros(n, dtype=np.int32)
+            hit_rows, hit_ends, hit_states = [], [], []
+            for j in range(width):
+                state = delta[state, classes[:, j]]
+                rows = np.flatnonzero((out_count[state] > 0) & (j < name_len))
+                if rows.size:
+                    hit_rows.append(rows)
+                    hit_ends.append(np.full(rows.size, j + 1, dtype=np.int64))
+                    hit_states.append(state[rows])
+
+            if hit_rows:
+                rows = np.concatenate(hit_rows)
+                ends = np.concatenate(hit_ends)
+                states = np.concatenate(hit_states)
+                owner, flat = _expand(out_offset[states], out_count[states])
+                rows, ends, pids = rows[owner], ends[owner], out_pids[flat]
+                starts = ends - pattern_len[pids]
+                # One candidate per (occurrence, keyword entry)
+                owner, flat = _expand(entry_offset[pids], entry_count[pids])
+                rows, starts, pids = rows[owner], starts[owner], pids[owner]
+                klen = pattern_len[pids]
+                last = starts + klen - 1
+                game = is_game[flat]
+                kwl = kw_len[flat]
+
+                def name_score(begin, length):
+                    at_start = begin == 0
+                    plain = kwl / np.maximum(length, 1) + np.where(at_start, 0.2, 0.0)
+                    return np.where(
+                        game, np.where(at_start, 1.0, 0.9),
+                        np.where(at_start & (length == klen), 1.0, plain),
+                    )
+
+                row_offset = offset[rows]
+                row_clean = clean_len[rows]
+                inside = (starts >= row_offset) & (last < row_offset + row_clean)
+                value = np.maximum(
+                    name_score(starts, name_len[rows]),
+                    np.where(inside, name_score(starts - row_offset, row_clean), 0.0),
+                )
+
+                # Parts of the cleaned name: runs between '_', '-' or spaces.
+                separator = np.isin(codes, _separator_codepoints())
+                index = np.arange(width)
+                prev_sep = np.maximum.accumulate(np.where(separator, index, -1), axis=1)
+                next_sep = np.minimum.accumulate(
+                    np.where(separator, index, width)[:, ::-1], axis=1)[:, ::-1]
+                sep_count = np.zeros((n, width + 1), dtype=np.int32)
+                np.cumsum(separator, axis=1, out=sep_count[:, 1:])
+                in_part = inside & (sep_count[rows, last + 1] == sep_count[rows, starts])
+                part_start = np.maximum(prev_sep[rows, starts] + 1, row_offset)
+                part_end = np.minimum(next_sep[rows, last], row_offset + row_clean)
+                exact = (starts == part_start) & (last + 1 == part_end)
+                part_value = np.where(
+                    exact, np.where(game, 0.95, 0.8),
+                    np.where(~game & (klen >= 3),
+                             kwl / np.maximum(part_end - part_start, 1) * 0.7, 0.0),
+                )
+                value = np.maximum(value, np.where(in_part, part_value, 0.0))
+
+                keep = value > 0.0
+                cand_row.append(rows[keep])
+                cand_value.append(value[keep])
+                cand_ordinal.append(ordinal[flat][keep])
+                cand_category.append(category[flat][keep])
+
+        for entry_ordinal, entry_game, entry_category, _ in self._empty_entries:
+            cand_row.append(np.arange(n))
+            cand_value.append(np.where(entry_game | (name_len == 0), 1.0, 0.2))
+            cand_ordinal.append(np.full(n, entry_ordinal, dtype=np.int64))
+            cand_category.append(np.full(n, self._category_ids[entry_category], dtype=np.int64))
+
+        best_value = [0.0] * n
+        best_category = [None] * n
+        if cand_row:
+            rows = np.concatenate(cand_row)
+            value = np.concatenate(cand_value)
+            order = np.lexsort((np.concatenate(cand_ordinal), -value, rows))
+            rows = rows[order]
+            first = np.ones(rows.size, dtype=bool)
+            first[1:] = rows[1:] != rows[:-1]
+            chosen = order[first]
+            for row, score, cat in zip(rows[first].tolist(), value[chosen].tolist(),
+                                       np.concatenate(cand_category)[chosen].tolist()):
+                best_value[row] = score
+                best_category[row] = self._category_names[cat]
+
+        for name, score, cat in zip(names, best_value, best_category):
+            results[name] = (cat or "unclassified", min(1.0, score + 0.3))
+        return results
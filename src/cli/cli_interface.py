@@ -4,12 +4,14 @@ Supports batch processing and automation workflows
 Author: Dead On The Inside / JosephsDeadish
 """
 
+import os
 import sys
 import argparse
 import logging
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 from datetime import datetime
 import json
 
@@ -20,8 +22,102 @@ except (ImportError, OSError, RuntimeError):
     from config import APP_NAME, APP_VERSION, APP_AUTHOR, config  # type: ignore[no-redef]
     from cli.config_loader import ConfigLoader  # type: ignore[no-redef]
 
+try:
+    from ..organizer.run_journal import (
+        RunJournal, journal_path_for, undo_run, ACTION_COPY, ACTION_MOVE, ACTION_SKIP)
+except (ImportError, ValueError):
+    try:
+        from organizer.run_journal import (  # type: ignore[no-redef]
+            RunJournal, journal_path_for, undo_run, ACTION_COPY, ACTION_MOVE, ACTION_SKIP)
+    except ImportError:
+        RunJournal = None  # type: ignore[assignment,misc]
+        journal_path_for = None  # type: ignore[assignment]
+        undo_run = None  # type: ignore[assignment]
+        ACTION_COPY, ACTION_MOVE, ACTION_SKIP = 'copy', 'move', 'skip'
+
+try:
+    from ..utils.file_transfer import FileTransfer, TRANSFER_MODES, MODE_AUTO, MODE_MOVE
+except (ImportError, ValueError):
+    from utils.file_transfer import FileTransfer, TRANSFER_MODES, MODE_AUTO, MODE_MOVE  # type: ignore[no-redef]
+
+try:
+    from ..database import TextureDatabase, LibraryIndexer
+    from ..database.library_index import default_index_path
+except (ImportError, ValueError):
+    try:
+        from database import TextureDatabase, LibraryIndexer  # type: ignore[no-redef]
+        from database.library_index import default_index_path  # type: ignore[no-redef]
+    except ImportError:
+        LibraryIndexer = None  # type: ignore[assignment,misc]
+
 logger = logging.getLogger(__name__)
 
+# Texture file extensions, matched case-insensitively by _scan_textures()
+TEXTURE_EXTENSIONS = frozenset({'.dds', '.png', '.jpg', '.jpeg', '.bmp', '.tga', '.tif', '.tiff'})
+
+# Report formats; NDJSON is also chosen by a .ndjson/.jsonl report suffix
+REPORT_FORMATS = ('json', 'ndjson')
+
+# Files queued per worker thread in --jobs mode (bounds in-flight results)
+QUEUE_PER_JOB = 4
+
+
+class NDJSONReportWriter:
+    """
+    Append-only report with one JSON object per line.
+
+    Each record is written and flushed as soon as it is produced, so memory
+    use does not grow with the number of files and a crashed run still
+    leaves every completed file in the report.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self.records = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record and flush it to disk."""
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            if record.get('type') == 'file':
+                self.records += 1
+
+    def close(self) -> None:
+        """Close the report file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> 'NDJSONReportWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_ndjson_report(path: Path, record_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read records back from an NDJSON report.
+
+    A truncated last line (left by a crash mid-write) is skipped.
+
+    Args:
+        path: Report written by NDJSONReportWriter
+        record_type: Only yield records of this 'type' ('run', 'file', 'summary')
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record_type is None or record.get('type') == record_type:
+                yield record
 
 
 class CLIInterface:
@@ -44,6 +140,9 @@ Examples:
   {APP_NAME} --cli --input ./textures --output ./sorted
   {APP_NAME} --cli --input ./textures --profile game_preset.json
   {APP_NAME} --cli --config batch_config.json
+  {APP_NAME} --cli --input ./textures --output ./sorted --jobs 4 --report run.ndjson
+  {APP_NAME} --cli --input ./textures --output ./sorted --resume
+  {APP_NAME} --cli --output ./sorted --undo
   {APP_NAME} --version
 
 Author: {APP_AUTHOR}
@@ -157,6 +256,60 @@ Author: {APP_AUTHOR}
             help='Generate processing report to specified file'
         )
         
+        parser.add_argument(
+            '--report-format',
+            choices=REPORT_FORMATS,
+            default=None,
+            help='Report format: json, or ndjson (one line per file, written as '
+                 'files complete). Default: ndjson for .ndjson/.jsonl paths, else json'
+        )
+        
+        # How organized files are placed
+        parser.add_argument(
+            '--transfer',
+            type=str,
+            choices=TRANSFER_MODES,
+            default=MODE_AUTO,
+            help='auto: cheapest independent copy (reflink, copy_file_range, sendfile, copy); '
+                 'hardlink/symlink share the source data; move renames (copy + delete across drives)'
+        )
+        
+        # Journal: resume interrupted runs / undo a whole run
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue an interrupted run into --output, skipping files its journal lists'
+        )
+        
+        parser.add_argument(
+            '--undo',
+            action='store_true',
+            help='Undo the last run into --output using its journal, then exit'
+        )
+        
+        parser.add_argument(
+            '--journal',
+            type=str,
+            help='Journal file (default: one per output directory in the app data folder)'
+        )
+        
+        # Incremental re-index: only process new or changed files
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Process only files added or changed since they were last classified '
+                 '(uses the library index in the app data folder)'
+        )
+        
+        # Parallelism
+        parser.add_argument(
+            '--jobs', '-j',
+            type=int,
+            default=1,
+            metavar='N',
+            help='Process N files in parallel (0 = one per CPU, up to 8; default: 1)'
+        )
+        
         return parser
     
     def run(self, args: Optional[List[str]] = None) -> int:
@@ -198,6 +351,10 @@ Author: {APP_AUTHOR}
                     logger.error(f"Failed to load profile: {parsed_args.profile}")
                     return 1
             
+            # Undo needs only the output directory and its journal
+            if parsed_args.undo:
+                return self._undo_run(parsed_args)
+            
             # Process batch or single directory
             if parsed_args.batch:
                 return self._process_batch(parsed_args, config_data, profile_data)
@@ -291,6 +448,7 @@ Author: {APP_AUTHOR}
             print(f"Dry Run: {args.dry_run}")
             print(f"{'=' * 60}\n")
         
+        indexer = None
         try:
             # Import processing modules
             from ..classifier import TextureClassifier
@@ -329,12 +487,26 @@ Author: {APP_AUTHOR}
                 dry_run=args.dry_run
             )
             
-            # Scan for textures
-            logger.info(f"Scanning for textures in {input_path}...")
-            texture_files = self._scan_textures(
-                input_path,
-                recursive=args.recursive
-            )
+            # Scan for textures (incrementally: only those that changed)
+            if getattr(args, 'incremental', False) and LibraryIndexer is not None:
+                index_db = TextureDatabase(default_index_path())
+                try:
+                    indexer = LibraryIndexer(index_db, extensions=TEXTURE_EXTENSIONS)
+                except Exception:
+                    index_db.close()
+                    raise
+                texture_files = self._scan_incremental(indexer, input_path, args.recursive)
+                if not texture_files:
+                    logger.info("Library index is up to date; nothing to process")
+                    if not args.quiet:
+                        print("No new or changed texture files\n")
+                    return 0
+            else:
+                logger.info(f"Scanning for textures in {input_path}...")
+                texture_files = self._scan_textures(
+                    input_path,
+                    recursive=args.recursive
+                )
             
             if not texture_files:
                 logger.warning("No texture files found")
@@ -346,28 +518,110 @@ Author: {APP_AUTHOR}
             if not args.quiet:
                 print(f"Found {total_files} texture files\n")
             
-            # Process textures with progress display
-            results = self._process_textures(
-                texture_files,
-                output_path,
-                classifier,
-                organizer,
-                args
-            )
+            # Journal completed files so the run can be resumed or undone
+            journal = None
+            if not args.dry_run and RunJournal is not None:
+                journal = RunJournal(self._journal_path(args, output_path))
+                resumed = journal.start(
+                    resume=getattr(args, 'resume', False),
+                    source=str(input_path),
+                    output=str(output_path),
+                    style=args.style
+                )
+                if resumed:
+                    logger.info(f"Resuming: {resumed} files already done ({journal.path})")
+                    if not args.quiet:
+                        print(f"Resuming: {resumed} files already done\n")
+            
+            # Process textures with progress display; per-file results are
+            # streamed to the report as they complete
+            report_format = self._report_format(args)
+            report_path = None
+            if args.report:
+                report_path = Path(args.report)
+                if report_format == 'json':
+                    report_path = report_path.with_name(report_path.name + '.partial.ndjson')
+            try:
+                results = self._process_textures(
+                    texture_files,
+                    output_path,
+                    classifier,
+                    organizer,
+                    args,
+                    report_path=report_path,
+                    journal=journal,
+                    indexer=indexer
+                )
+            except BaseException:
+                if journal is not None:
+                    journal.close()  # left without an end marker: resumable
+                raise
+            if journal is not None:
+                journal.complete(processed=results['processed'], errors=results['errors'],
+                                 skipped=results['skipped'])
             
             # Display summary
             if not args.quiet:
                 self._display_summary(results)
             
             # Generate report if requested
-            if args.report:
+            if args.report and report_format == 'json':
                 self._generate_report(results, args.report)
+            elif args.report:
+                logger.info(f"Report saved to: {args.report}")
+                if not args.quiet:
+                    print(f"Report saved to: {args.report}")
             
             return 0 if results['errors'] == 0 else 1
             
         except Exception as e:
             logger.error(f"Processing failed: {e}", exc_info=True)
             return 1
+        finally:
+            if indexer is not None:
+                self._close_indexer(indexer)
+    
+    @staticmethod
+    def _journal_path(args: argparse.Namespace, output_path: Path) -> Path:
+        """Journal file for a run into ``output_path`` (--journal overrides)."""
+        if getattr(args, 'journal', None):
+            return Path(args.journal)
+        return journal_path_for(output_path)
+    
+    def _undo_run(self, args: argparse.Namespace) -> int:
+        """
+        Undo the last journaled run into --output.
+        
+        Args:
+            args: Parsed command line arguments
+            
+        Returns:
+            Exit code (0 for success)
+        """
+        if not args.output:
+            logger.error("--output directory is required for --undo")
+            return 1
+        if RunJournal is None:
+            logger.error("Run journal support is not available")
+            return 1
+        
+        output_path = Path(args.output)
+        journal_path = self._journal_path(args, output_path)
+        stats = undo_run(output_path, journal_path)
+        if stats is None:
+            logger.error(f"No journal found for {output_path} ({journal_path})")
+            return 1
+        
+        if not args.quiet:
+            print(f"\nUndo of run into {output_path}")
+            print(f"{'=' * 60}")
+            print(f"Removed copies:  {stats['removed']}")
+            print(f"Restored moves:  {stats['restored']}")
+            print(f"Changed (kept):  {stats['changed']}")
+            print(f"Already missing: {stats['missing']}")
+            print(f"Errors:          {len(stats['errors'])}")
+            print(f"{'=' * 60}\n")
+        return 0 if not stats['errors'] else 1
     
     def _process_batch(
         self,
@@ -428,6 +682,9 @@ Author: {APP_AUTHOR}
         """
         Scan directory for texture files.
         
+        One ``os.scandir`` walk with a case-insensitive extension check, so
+        ``.PNG``, ``.png`` and ``.Png`` all match and nothing is listed twice.
+        
         Args:
             directory: Directory to scan
             recursive: Whether to scan subdirectories
@@ -435,48 +692,228 @@ Author: {APP_AUTHOR}
         Returns:
             List of texture file paths
         """
-        extensions = {'.dds', '.png', '.jpg', '.jpeg', '.bmp', '.tga', '.tif', '.tiff'}
         texture_files = []
+        pending = [str(directory)]
         
-        if recursive:
-            for ext in extensions:
-                texture_files.extend(directory.rglob(f'*{ext}'))
-                texture_files.extend(directory.rglob(f'*{ext.upper()}'))
-        else:
-            for ext in extensions:
-                texture_files.extend(directory.glob(f'*{ext}'))
-                texture_files.extend(directory.glob(f'*{ext.upper()}'))
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    pending.append(entry.path)
+                            elif (os.path.splitext(entry.name)[1].lower() in TEXTURE_EXTENSIONS
+                                  and entry.is_file()):
+                                texture_files.append(Path(entry.path))
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.warning(f"Cannot read directory {current}: {e}")
         
         return sorted(texture_files)
     
+    @staticmethod
+    def _close_indexer(indexer: Any) -> None:
+        """Close the library index and the texture database it was opened on."""
+        try:
+            indexer.close()
+        finally:
+            indexer.database.close()
+    
+    @staticmethod
+    def _scan_incremental(indexer: Any, directory: Path, recursive: bool = False) -> List[Path]:
+        """
+        Rescan ``directory`` in the library index and list the texture files
+        that were never classified or changed since they were.
+        
+        Every file is re-stat'ed (a full rescan): a directory's modification
+        time only changes when it gains, loses or renames entries, so files
+        edited in place would otherwise never be reprocessed.
+        
+        Args:
+            indexer: LibraryIndexer for the library index database
+            directory: Directory to scan
+            recursive: Whether to include subdirectories
+            
+        Returns:
+            List of texture file paths needing processing
+        """
+        changes = indexer.rescan(directory, full=True)
+        logger.info(f"Library index: {len(changes.added)} added, {len(changes.modified)} modified, "
+                    f"{len(changes.removed)} removed ({changes.dirs_skipped} directories unchanged)")
+        stale = [Path(p) for p in indexer.stale_files(directory)]
+        if not recursive:
+            top = Path(os.path.abspath(directory))
+            stale = [p for p in stale if p.parent == top]
+        return stale
+    
+    @staticmethod
+    def _report_format(args: argparse.Namespace) -> str:
+        """Report format from --report-format, else from the report suffix."""
+        fmt = getattr(args, 'report_format', None)
+        if fmt:
+            return fmt
+        report = getattr(args, 'report', None)
+        if report and Path(report).suffix.lower() in ('.ndjson', '.jsonl'):
+            return 'ndjson'
+        return 'json'
+    
+    @staticmethod
+    def _resolve_jobs(jobs: Optional[int]) -> int:
+        """Worker count for --jobs (0 or negative: one per CPU, up to 8)."""
+        if jobs is None:
+            return 1
+        if jobs <= 0:
+            return min(8, os.cpu_count() or 1)
+        return jobs
+    
+    def _process_one(
+        self,
+        texture_file: Path,
+        output_path: Path,
+        classifier: Any,
+        organizer: Any,
+        args: argparse.Namespace,
+        state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Classify and copy one texture; safe to run on worker threads.
+        
+        Args:
+            texture_file: File to process
+            output_path: Output directory
+            classifier: Texture classifier instance
+            organizer: Organization engine instance
+            args: CLI arguments
+            state: Shared per-run state (locks, created folders, claimed names)
+            
+        Returns:
+            Per-file result dictionary
+        """
+        file_result = {
+            'file': str(texture_file),
+            'status': 'success',
+            'category': 'unknown'
+        }
+        
+        if args.dry_run:
+            return file_result
+        
+        # Classify the texture
+        # classify_texture() returns (category: str, confidence: float)
+        if classifier is not None:
+            try:
+                classify_lock = state['classify_lock']
+                if classify_lock is not None:
+                    with classify_lock:
+                        category, confidence = classifier.classify_texture(texture_file)
+                else:
+                    category, confidence = classifier.classify_texture(texture_file)
+                file_result['category'] = category or 'unclassified'
+                file_result['confidence'] = confidence
+            except Exception as classify_err:
+                logger.debug(f"Classification failed for {texture_file}: {classify_err}")
+        
+        # Organise (move/copy) the texture into the output directory. A
+        # failure propagates so the file is reported as an error and is
+        # neither journaled nor marked classified: --resume retries it.
+        if organizer is not None:
+            category = file_result.get('category', 'unclassified')
+            dest_folder = output_path / category
+            dest_file = dest_folder / texture_file.name
+            with state['lock']:
+                # Create each folder once, and let only the first file
+                # with a given name claim its destination
+                if dest_folder not in state['folders']:
+                    dest_folder.mkdir(parents=True, exist_ok=True)
+                    state['folders'].add(dest_folder)
+                claimed = dest_file not in state['claimed'] and not dest_file.exists()
+                if claimed:
+                    state['claimed'].add(dest_file)
+            if claimed:
+                try:
+                    file_result['transfer'] = state['transfer'].transfer(texture_file, dest_file)
+                except Exception:
+                    with state['lock']:
+                        state['claimed'].discard(dest_file)
+                    raise
+                file_result['destination'] = str(dest_file)
+        
+        indexer = state.get('indexer')
+        if indexer is not None and 'confidence' in file_result:
+            indexer.mark_classified(texture_file, file_result['category'], file_result['confidence'])
+        
+        journal = state.get('journal')
+        if journal is not None:
+            if 'destination' in file_result:
+                journal.record(texture_file, Path(file_result['destination']),
+                               file_result.get('category', ''),
+                               action=ACTION_MOVE if state['transfer'].mode == MODE_MOVE else ACTION_COPY)
+            else:
+                journal.record(texture_file, None, file_result.get('category', ''),
+                               action=ACTION_SKIP)
+        
+        return file_result
+    
     def _process_textures(
         self,
         texture_files: List[Path],
         output_path: Path,
         classifier: Any,
         organizer: Any,
-        args: argparse.Namespace
+        args: argparse.Namespace,
+        report_path: Optional[Path] = None,
+        journal: Any = None,
+        indexer: Any = None
     ) -> Dict[str, Any]:
         """
         Process texture files with progress display.
         
+        With ``--jobs N`` files are processed on N worker threads. Per-file
+        results are not kept in memory; when ``report_path`` is given they
+        are streamed to it as NDJSON in completion order. Files the
+        ``journal`` already lists (a resumed run) are counted as skipped.
+        
         Args:
             texture_files: List of texture files to process
             output_path: Output directory
             classifier: Texture classifier instance
             organizer: Organization engine instance
             args: CLI arguments
+            report_path: NDJSON file for per-file results (None: no report)
+            journal: Started RunJournal recording finished files (optional)
+            indexer: LibraryIndexer recording classified files (--incremental)
             
         Returns:
             Dictionary with processing results
         """
+        jobs = self._resolve_jobs(getattr(args, 'jobs', 1))
+        total = len(texture_files)
+        if journal is not None and len(journal):
+            texture_files = [f for f in texture_files if not journal.is_done(f)]
         results = {
-            'total': len(texture_files),
+            'total': total,
             'processed': 0,
             'errors': 0,
-            'skipped': 0,
+            'skipped': total - len(texture_files),
+            'jobs': jobs,
             'start_time': datetime.now(),
-            'files': []
+            'report_path': str(report_path) if report_path else None
+        }
+        
+        # AI model inference is not guaranteed to be thread-safe
+        state = {
+            'lock': threading.Lock(),
+            'folders': set(),
+            'claimed': set(),
+            'journal': journal,
+            'indexer': indexer,
+            'transfer': FileTransfer(getattr(args, 'transfer', MODE_AUTO)),
+            'classify_lock': (threading.Lock()
+                              if jobs > 1 and getattr(classifier, 'model_manager', None)
+                              else None)
         }
         
         # Display progress based on style
@@ -488,63 +925,102 @@ Author: {APP_AUTHOR}
         except (ImportError, OSError, RuntimeError):
             use_tqdm = False
         
-        iterator = tqdm(texture_files, desc="Processing") if use_tqdm else texture_files
+        progress_bar = (tqdm(total=results['total'], initial=results['skipped'], desc="Processing")
+                        if use_tqdm else None)
+        report = NDJSONReportWriter(report_path) if report_path else None
+        if report is not None:
+            report.write({
+                'type': 'run',
+                'app_name': APP_NAME,
+                'app_version': APP_VERSION,
+                'timestamp': results['start_time'].isoformat(),
+                'total': results['total'],
+                'jobs': jobs
+            })
         
-        for idx, texture_file in enumerate(iterator, 1):
-            try:
-                # Process texture (simplified for CLI)
+        done = results['skipped']  # files a resumed run already finished
+        
+        def _record(texture_file: Path, file_result: Optional[Dict[str, Any]],
+                    error: Optional[BaseException]) -> None:
+            nonlocal done
+            done += 1
+            if error is not None:
+                logger.error(f"Error processing {texture_file}: {error}")
+                results['errors'] += 1
                 file_result = {
                     'file': str(texture_file),
-                    'status': 'success',
-                    'category': 'unknown'
+                    'status': 'error',
+                    'error': str(error)
                 }
-                
-                if not args.dry_run:
-                    # Classify the texture
-                    # classify_texture() returns (category: str, confidence: float)
-                    if classifier is not None:
-                        try:
-                            category, confidence = classifier.classify_texture(texture_file)
-                            file_result['category'] = category or 'unclassified'
-                            file_result['confidence'] = confidence
-                        except Exception as classify_err:
-                            logger.debug(f"Classification failed for {texture_file}: {classify_err}")
-
-                    # Organise (move/copy) the texture into the output directory
-                    if organizer is not None:
-                        try:
-                            category = file_result.get('category', 'unclassified')
-                            dest_folder = output_path / category
-                            dest_folder.mkdir(parents=True, exist_ok=True)
-                            dest_file = dest_folder / texture_file.name
-                            if not dest_file.exists():
-                                shutil.copy2(texture_file, dest_file)
-                                file_result['destination'] = str(dest_file)
-                        except Exception as org_err:
-                            logger.debug(f"Organisation failed for {texture_file}: {org_err}")
-                
+            else:
                 results['processed'] += 1
-                results['files'].append(file_result)
-                
-                # Update progress for percent display
-                if not use_tqdm and show_progress and args.progress == 'percent':
-                    progress = (idx / results['total']) * 100
-                    print(f"\rProgress: {progress:.1f}% ({idx}/{results['total']})", end='', flush=True)
-                    
-            except Exception as e:
-                logger.error(f"Error processing {texture_file}: {e}")
-                results['errors'] += 1
-                results['files'].append({
-                    'file': str(texture_file),
-                    'status': 'error',
-                    'error': str(e)
-                })
-        
-        if not use_tqdm and show_progress and args.progress == 'percent':
-            print()  # New line after progress
+            if report is not None:
+                report.write({'type': 'file', **file_result})
+            
+            # Update progress
+            if progress_bar is not None:
+                progress_bar.update(1)
+            elif show_progress and args.progress == 'percent':
+                progress = (done / results['total']) * 100
+                print(f"\rProgress: {progress:.1f}% ({done}/{results['total']})", end='', flush=True)
         
-        results['end_time'] = datetime.now()
-        results['duration'] = (results['end_time'] - results['start_time']).total_seconds()
+        try:
+            if jobs <= 1:
+                for texture_file in texture_files:
+                    try:
+                        file_result = self._process_one(
+                            texture_file, output_path, classifier, organizer, args, state)
+                    except Exception as e:
+                        _record(texture_file, None, e)
+                    else:
+                        _record(texture_file, file_result, None)
+            else:
+                # Keep a bounded number of files in flight so results are
+                # written out as they finish rather than queued up in memory
+                max_pending = jobs * QUEUE_PER_JOB
+                files = iter(texture_files)
+                with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="CLIWorker") as pool:
+                    pending = {}
+                    try:
+                        while True:
+                            while len(pending) < max_pending:
+                                texture_file = next(files, None)
+                                if texture_file is None:
+                                    break
+                                future = pool.submit(self._process_one, texture_file, output_path,
+                                                     classifier, organizer, args, state)
+                                pending[future] = texture_file
+                            if not pending:
+                                break
+                            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                texture_file = pending.pop(future)
+                                error = future.exception()
+                                _record(texture_file, None if error else future.result(), error)
+                    except BaseException:
+                        for future in pending:
+                            future.cancel()
+                        raise
+        finally:
+            if progress_bar is not None:
+                progress_bar.close()
+            elif show_progress and args.progress == 'percent':
+                print()  # New line after progress
+            
+            results['end_time'] = datetime.now()
+            results['duration'] = (results['end_time'] - results['start_time']).total_seconds()
+            
+            if report is not None:
+                report.write({
+                    'type': 'summary',
+                    'total': results['total'],
+                    'processed': results['processed'],
+                    'errors': results['errors'],
+                    'skipped': results['skipped'],
+                    'duration_seconds': results['duration'],
+                    'complete': done == results['total']
+                })
+                report.close()
         
         return results
     
@@ -569,6 +1045,10 @@ Author: {APP_AUTHOR}
         """
         Generate JSON report of processing results.
         
+        Per-file entries are copied one at a time from the NDJSON file
+        written during processing (``results['report_path']``), which is
+        then removed, so the report is never held in memory as a whole.
+        
         Args:
             results: Processing results dictionary
             report_path: Path to save report
@@ -584,15 +1064,27 @@ Author: {APP_AUTHOR}
                     'errors': results['errors'],
                     'skipped': results['skipped'],
                     'duration_seconds': results['duration']
-                },
-                'files': results['files']
+                }
             }
             
             report_file = Path(report_path)
             report_file.parent.mkdir(parents=True, exist_ok=True)
+            partial = results.get('report_path')
             
             with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2)
+                # Everything but the closing brace, then the files array
+                head = json.dumps(report_data, indent=2)
+                f.write(head[:-2] + ',\n  "files": [')
+                first = True
+                if partial and Path(partial).exists():
+                    for record in iter_ndjson_report(Path(partial), 'file'):
+                        record.pop('type', None)
+                        f.write(('\n    ' if first else ',\n    ') + json.dumps(record, default=str))
+                        first = False
+                f.write('\n  ]\n}\n' if not first else ']\n}\n')
+            
+            if partial:
+                Path(partial).unlink(missing_ok=True)
             
             logger.info(f"Report saved to: {report_path}")
             print(f"Report saved to: {report_path}")
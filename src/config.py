@@ -163,6 +163,10 @@ class Config:
                 "max_file_size_mb": 0,  # 0 = no limit
                 "file_patterns_include": [],
                 "file_patterns_exclude": [],
+                # How organized files are placed: auto (cheapest independent
+                # copy: reflink > copy_file_range > sendfile > copy), reflink,
+                # hardlink, symlink, copy or move
+                "transfer_mode": "auto",
                 # Archive support
                 "enable_archive_support": True,
                 # SVG handling
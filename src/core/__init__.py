@@ -3,7 +3,9 @@ Core modules for Game Texture Sorter
 Threading, performance management, and engine coordination
 """
 
-from .threading_manager import ThreadingManager
+from .threading_manager import ThreadingManager, ExecutionBackend
+from .process_pool import ProcessPoolBackend, SharedArrayRef, get_worker_resource
 from .performance_manager import PerformanceMode, PerformanceManager, OperationProfiler, ProfileResult
 
-__all__ = ['ThreadingManager', 'PerformanceMode', 'PerformanceManager', 'OperationProfiler', 'ProfileResult']
+__all__ = ['ThreadingManager', 'ExecutionBackend', 'ProcessPoolBackend', 'SharedArrayRef',
+           'get_worker_resource', 'PerformanceMode', 'PerformanceManager', 'OperationProfiler', 'ProfileResult']
@@ -0,0 +1,384 @@
+"""
+Process Pool Backend for Game Texture Sorter.
+
+This module provides a process-based execution backend for CPU-bound work
+(heuristic classification, quality scoring, alpha statistics) that is limited
+by the GIL when run on threads.  Decoded images are transported between
+processes through ``multiprocessing.shared_memory`` segments instead of being
+pickled, and worker processes are kept warm with optional preloaded resources
+such as models.
+
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import logging
+import multiprocessing as mp
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except (ImportError, OSError, RuntimeError):
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except (ImportError, OSError, RuntimeError):
+    Image = None  # type: ignore[assignment]
+    HAS_PIL = False
+
+
+logger = logging.getLogger(__name__)
+
+# Arrays smaller than this are cheaper to pickle than to map.
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+# PIL modes that round-trip losslessly through a plain ndarray.
+_SHAREABLE_IMAGE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'I', 'F')
+
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    """Picklable handle describing an array stored in shared memory."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    image_mode: Optional[str] = None
+
+
+def share_array(array: Any, image_mode: Optional[str] = None
+                ) -> Tuple[SharedArrayRef, shared_memory.SharedMemory]:
+    """
+    Copy an array into a new shared-memory segment.
+
+    The caller owns the returned segment and must ``close()`` and
+    ``unlink()`` it once every consumer is finished.
+
+    Args:
+        array: NumPy array to share
+        image_mode: PIL mode to restore on the receiving side (optional)
+
+    Returns:
+        Tuple of (handle, segment)
+    """
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    ref = SharedArrayRef(
+        name=shm.name,
+        shape=tuple(array.shape),
+        dtype=array.dtype.str,
+        image_mode=image_mode,
+    )
+    return ref, shm
+
+
+def attach_array(ref: SharedArrayRef) -> Tuple[Any, shared_memory.SharedMemory]:
+    """
+    Attach to a shared-memory segment described by ``ref``.
+
+    The returned array is a zero-copy view; it is only valid while the
+    returned segment stays open.
+
+    Args:
+        ref: Handle produced by :func:`share_array`
+
+    Returns:
+        Tuple of (array view, segment)
+    """
+    shm = shared_memory.SharedMemory(name=ref.name)
+    array = np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf)
+    return array, shm
+
+
+def _is_shareable(value: Any) -> bool:
+    """Return True if ``value`` should travel through shared memory."""
+    if not HAS_NUMPY:
+        return False
+    if isinstance(value, np.ndarray):
+        return value.nbytes >= SHARED_MEMORY_THRESHOLD and value.dtype != object
+    if HAS_PIL and isinstance(value, Image.Image):
+        return value.mode in _SHAREABLE_IMAGE_MODES
+    return False
+
+
+def _array_to_image(array: Any, mode: str) -> Any:
+    """
+    Wrap an array from ``np.asarray(image)`` back into an image of ``mode``.
+
+    Uses ``Image.frombuffer`` with the mode given explicitly (the ``mode``
+    argument of ``Image.fromarray`` is deprecated); for L, RGBA, I and F
+    the image shares the array's memory instead of copying it.
+    """
+    array = np.ascontiguousarray(array)
+    size = (array.shape[1], array.shape[0])
+    return Image.frombuffer(mode, size, array, 'raw', mode, 0, 1)
+
+
+def _export(value: Any, segments: List[shared_memory.SharedMemory]) -> Any:
+    """Replace a large array/image with a shared-memory handle."""
+    if not _is_shareable(value):
+        return value
+    if HAS_PIL and isinstance(value, Image.Image):
+        ref, shm = share_array(np.asarray(value), image_mode=value.mode)
+    else:
+        ref, shm = share_array(value)
+    segments.append(shm)
+    return ref
+
+
+def _import(value: Any, segments: List[shared_memory.SharedMemory]) -> Any:
+    """Resolve a shared-memory handle back into an array/image view."""
+    if not isinstance(value, SharedArrayRef):
+        return value
+    array, shm = attach_array(value)
+    segments.append(shm)
+    if value.image_mode is not None:
+        return _array_to_image(array, value.image_mode)
+    return array
+
+
+def _release(segments: List[shared_memory.SharedMemory], unlink: bool) -> None:
+    """Close (and optionally unlink) a list of shared-memory segments."""
+    for shm in segments:
+        try:
+            shm.close()
+            if unlink:
+                shm.unlink()
+        except (FileNotFoundError, BufferError, OSError):
+            pass
+    segments.clear()
+
+
+# ---------------------------------------------------------------------------
+# Worker-side state
+# ---------------------------------------------------------------------------
+
+_WORKER_RESOURCES: Dict[str, Any] = {}
+
+
+def _worker_initializer(preload: Dict[str, Callable[[], Any]]) -> None:
+    """Run once in every worker process to build its warm resources."""
+    for name, loader in preload.items():
+        try:
+            _WORKER_RESOURCES[name] = loader()
+        except Exception as e:
+            logger.error(f"Worker preload '{name}' failed: {e}")
+            _WORKER_RESOURCES[name] = None
+
+
+def get_worker_resource(name: str, default: Any = None) -> Any:
+    """
+    Get a resource preloaded by the pool initializer.
+
+    Task functions running in a worker process call this to reuse models
+    and other expensive objects instead of loading them per task.
+
+    Args:
+        name: Resource name given in ``preload``
+        default: Value returned when the resource is unavailable
+
+    Returns:
+        The preloaded resource or ``default``
+    """
+    value = _WORKER_RESOURCES.get(name)
+    return default if value is None else value
+
+
+def _noop() -> int:
+    """Trivial task used to force worker processes to start."""
+    return 0
+
+
+def _run_in_worker(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Worker trampoline: map shared arrays in, run ``func``, share result out."""
+    inbound: List[shared_memory.SharedMemory] = []
+    try:
+        args = tuple(_import(a, inbound) for a in args)
+        kwargs = {k: _import(v, inbound) for k, v in kwargs.items()}
+        result = func(*args, **kwargs)
+        if _is_shareable(result):
+            outbound: List[shared_memory.SharedMemory] = []
+            ref = _export(result, outbound)
+            # The parent unlinks the segment after copying it out.
+            _release(outbound, unlink=False)
+            return ref
+        return result
+    finally:
+        # Drop views before closing so the buffers are not exported.
+        args = kwargs = None  # noqa: F841
+        _release(inbound, unlink=False)
+
+
+def _collect_result(value: Any) -> Any:
+    """Parent side: copy a shared result out and free its segment."""
+    if not isinstance(value, SharedArrayRef):
+        return value
+    array, shm = attach_array(value)
+    try:
+        copied = array.copy()
+    finally:
+        del array
+        _release([shm], unlink=True)
+    if value.image_mode is not None:
+        return _array_to_image(copied, value.image_mode)
+    return copied
+
+
+class ProcessPoolBackend:
+    """
+    Warm process pool with shared-memory image transport.
+
+    Features:
+    - Worker processes started up front and reused across tasks
+    - Optional per-worker preloaded resources (models, lookup tables)
+    - NumPy arrays and PIL images passed via shared memory, not pickling
+    - ``concurrent.futures`` style ``submit`` returning a Future
+
+    Task functions must be importable module-level callables so they can be
+    sent to the worker processes.
+
+    Example:
+        >>> backend = ProcessPoolBackend(max_workers=4,
+        ...                              preload={'model': load_model})
+        >>> future = backend.submit(score_image, image_array)
+        >>> future.result()
+        >>> backend.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        preload: Optional[Dict[str, Callable[[], Any]]] = None,
+        name: str = "ProcessPool"
+    ):
+        """
+        Initialize the process pool backend.
+
+        Args:
+            max_workers: Number of worker processes (CPU count - 1 if None)
+            preload: Mapping of resource name to a picklable loader that is
+                run once in every worker process
+            name: Name for this backend (used in logging)
+        """
+        if max_workers is None:
+            max_workers = max(1, mp.cpu_count() - 1)
+        self.name = name
+        self.max_workers = max_workers
+        self._preload = dict(preload or {})
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self, warm: bool = True) -> None:
+        """
+        Start the worker processes.
+
+        Args:
+            warm: If True, block until every worker has started and run its
+                preload step, so the first real task pays no startup cost
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_worker_initializer,
+                initargs=(self._preload,),
+            )
+        logger.info(f"{self.name}: Started {self.max_workers} worker processes")
+        if warm:
+            self.warm_up()
+
+    def warm_up(self) -> None:
+        """Force all worker processes to spawn and finish preloading."""
+        executor = self._executor
+        if executor is None:
+            return
+        futures = [executor.submit(_noop) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def is_running(self) -> bool:
+        """Check if the worker processes are running."""
+        return self._executor is not None
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Submit ``func(*args, **kwargs)`` to a worker process.
+
+        Large NumPy arrays and PIL images among the arguments are moved into
+        shared memory; an array/image result comes back the same way.
+
+        Returns:
+            Future resolving to the function result
+        """
+        if self._executor is None:
+            self.start(warm=False)
+
+        segments: List[shared_memory.SharedMemory] = []
+        try:
+            shared_args = tuple(_export(a, segments) for a in args)
+            shared_kwargs = {k: _export(v, segments) for k, v in kwargs.items()}
+            inner = self._executor.submit(
+                _run_in_worker, func, shared_args, shared_kwargs
+            )
+        except Exception:
+            _release(segments, unlink=True)
+            raise
+
+        outer: Future = Future()
+
+        def _done(f: Future) -> None:
+            _release(segments, unlink=True)
+            if f.cancelled():
+                outer.cancel()
+                outer.set_running_or_notify_cancel()
+                return
+            error = f.exception()
+            if error is not None:
+                if not outer.cancelled():
+                    outer.set_exception(error)
+                return
+            try:
+                result = _collect_result(f.result())
+            except Exception as e:
+                if not outer.cancelled():
+                    outer.set_exception(e)
+                return
+            if not outer.cancelled():
+                outer.set_result(result)
+
+        def _cancel(f: Future) -> None:
+            if f.cancelled():
+                inner.cancel()
+
+        outer.add_done_callback(_cancel)
+        inner.add_done_callback(_done)
+        return outer
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Submit a task and block for its result."""
+        return self.submit(func, *args, **kwargs).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shutdown the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            logger.info(f"{self.name}: Shutdown complete")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        return False
@@ -17,6 +17,8 @@ from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import uuid4
 
+from .process_pool import ProcessPoolBackend
+
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,12 @@ class TaskPriority(Enum):
     CRITICAL = 3
 
 
+class ExecutionBackend(Enum):
+    """Where a task type is executed."""
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 class TaskStatus(Enum):
     """Status of a task in the queue."""
     PENDING = "pending"
@@ -55,6 +63,7 @@ class Task:
     completed_at: Optional[float] = None
     result: Any = None
     error: Optional[Exception] = None
+    task_type: Optional[str] = None
 
     def __post_init__(self):
         if self.created_at == 0.0:
@@ -77,6 +86,8 @@ class ThreadingManager:
     - Thread safety with proper locking
     - Pause/resume functionality
     - Graceful shutdown
+    - Optional process-pool backend selected per task type, for CPU-bound
+      work that would otherwise be serialized by the GIL
     
     Example:
         >>> manager = ThreadingManager(thread_count=4)
@@ -87,6 +98,9 @@ class ThreadingManager:
         ...     callback=on_complete,
         ...     priority=TaskPriority.HIGH
         ... )
+        >>> manager.set_task_backend("quality", ExecutionBackend.PROCESS)
+        >>> manager.submit_task(score_quality, args=(image,),
+        ...                     task_type="quality")
         >>> manager.shutdown()
     """
 
@@ -97,7 +111,10 @@ class ThreadingManager:
         self,
         thread_count: int = 4,
         max_queue_size: int = 1000,
-        name: str = "ThreadingManager"
+        name: str = "ThreadingManager",
+        process_count: Optional[int] = None,
+        task_backends: Optional[Dict[str, ExecutionBackend]] = None,
+        process_preload: Optional[Dict[str, Callable[[], Any]]] = None
     ):
         """
         Initialize the ThreadingManager.
@@ -106,6 +123,11 @@ class ThreadingManager:
             thread_count: Number of worker threads (1-16)
             max_queue_size: Maximum size of the task queue
             name: Name for this manager instance (used in logging)
+            process_count: Number of worker processes for the process
+                backend (defaults to thread_count)
+            task_backends: Mapping of task type to ExecutionBackend
+            process_preload: Resources preloaded into every worker process,
+                see ``ProcessPoolBackend``
             
         Raises:
             ValueError: If thread_count is not in valid range
@@ -141,6 +163,15 @@ class ThreadingManager:
         # Worker thread for queue processing
         self._queue_worker: Optional[threading.Thread] = None
         
+        # Process backend (created lazily on first process task)
+        self._process_count = process_count or thread_count
+        self._process_preload = dict(process_preload or {})
+        self._process_backend: Optional[ProcessPoolBackend] = None
+        self._process_lock = threading.Lock()
+        self._task_backends: Dict[str, ExecutionBackend] = dict(
+            task_backends or {}
+        )
+        
         # Statistics
         self._total_submitted = 0
         self._total_completed = 0
@@ -209,6 +240,11 @@ class ThreadingManager:
             self._executor.shutdown(wait=wait, cancel_futures=not wait)
             self._executor = None
         
+        with self._process_lock:
+            backend, self._process_backend = self._process_backend, None
+        if backend:
+            backend.shutdown(wait=wait)
+        
         logger.info(
             f"{self.name}: Shutdown complete. "
             f"Stats - Submitted: {self._total_submitted}, "
@@ -224,7 +260,8 @@ class ThreadingManager:
         kwargs: Optional[dict] = None,
         callback: Optional[Callable[[Any], None]] = None,
         error_callback: Optional[Callable[[Exception], None]] = None,
-        priority: TaskPriority = TaskPriority.NORMAL
+        priority: TaskPriority = TaskPriority.NORMAL,
+        task_type: Optional[str] = None
     ) -> str:
         """
         Submit a task for execution.
@@ -236,6 +273,9 @@ class ThreadingManager:
             callback: Called with result when task completes successfully
             error_callback: Called with exception if task fails
             priority: Task priority level
+            task_type: Optional task type; selects the execution backend
+                registered with ``set_task_backend``. Process-backed
+                functions must be module-level and picklable.
             
         Returns:
             Unique task ID for tracking
@@ -256,7 +296,8 @@ class ThreadingManager:
             callback=callback,
             error_callback=error_callback,
             priority=priority,
-            status=TaskStatus.PENDING
+            status=TaskStatus.PENDING,
+            task_type=task_type
         )
         
         with self._tasks_lock:
@@ -307,6 +348,50 @@ class ThreadingManager:
             priority=TaskPriority.LOW
         )
 
+    def set_task_backend(
+        self,
+        task_type: str,
+        backend: ExecutionBackend
+    ) -> None:
+        """
+        Select the execution backend for a task type.
+        
+        Args:
+            task_type: Task type name passed to ``submit_task``
+            backend: Backend that runs tasks of this type
+        """
+        with self._tasks_lock:
+            self._task_backends[task_type] = backend
+        logger.debug(
+            f"{self.name}: Task type '{task_type}' -> {backend.value}"
+        )
+
+    def get_task_backend(self, task_type: Optional[str]) -> ExecutionBackend:
+        """
+        Get the execution backend for a task type.
+        
+        Args:
+            task_type: Task type name (None for untyped tasks)
+            
+        Returns:
+            Registered backend, THREAD if none was registered
+        """
+        if task_type is None:
+            return ExecutionBackend.THREAD
+        with self._tasks_lock:
+            return self._task_backends.get(task_type, ExecutionBackend.THREAD)
+
+    def start_process_backend(self, warm: bool = True) -> None:
+        """
+        Start the process backend ahead of the first process task.
+        
+        Args:
+            warm: If True, wait until every worker process has started and
+                run its preload step
+        """
+        backend = self._get_process_backend()
+        backend.start(warm=warm)
+
     def cancel_task(self, task_id: str) -> bool:
         """
         Cancel a pending or running task.
@@ -422,7 +507,12 @@ class ThreadingManager:
                 "active_tasks": len(self._active_tasks),
                 "total_tasks": len(self._tasks),
                 "is_running": self._running,
-                "is_paused": self._paused
+                "is_paused": self._paused,
+                "process_count": self._process_count,
+                "process_backend_running": bool(
+                    self._process_backend and
+                    self._process_backend.is_running()
+                )
             }
 
     def get_pending_count(self) -> int:
@@ -576,7 +666,7 @@ class ThreadingManager:
                 task.started_at = time.time()
             
             # Execute function
-            result = task.func(*task.args, **task.kwargs)
+            result = self._invoke(task)
             
             # Update status
             with self._tasks_lock:
@@ -620,6 +710,26 @@ class ThreadingManager:
                         f"{task.task_id}: {callback_error}"
                     )
 
+    def _get_process_backend(self) -> ProcessPoolBackend:
+        """Internal method: Create the process backend on first use."""
+        with self._process_lock:
+            if self._process_backend is None:
+                self._process_backend = ProcessPoolBackend(
+                    max_workers=self._process_count,
+                    preload=self._process_preload,
+                    name=f"{self.name}_Process"
+                )
+            return self._process_backend
+
+    def _invoke(self, task: Task) -> Any:
+        """Internal method: Run a task on its configured backend."""
+        if self.get_task_backend(task.task_type) is ExecutionBackend.PROCESS:
+            # The pool thread waits on the worker process, so status,
+            # callbacks and pause/cancel handling stay identical.
+            backend = self._get_process_backend()
+            return backend.run(task.func, *task.args, **task.kwargs)
+        return task.func(*task.args, **task.kwargs)
+
     def _cancel_pending_tasks(self) -> None:
         """Internal method: Cancel all pending tasks."""
         cancelled_count = 0
@@ -1,4 +1,12 @@
 """Database module"""
 from .texture_db import TextureDatabase
+from .library_index import (
+    LibraryIndexer, LibraryWatcher, LibraryChanges,
+    classifier_invalidator, content_index_invalidator, thumbnail_prewarmer,
+)
 
-__all__ = ['TextureDatabase']
+__all__ = [
+    'TextureDatabase',
+    'LibraryIndexer', 'LibraryWatcher', 'LibraryChanges',
+    'classifier_invalidator', 'content_index_invalidator', 'thumbnail_prewarmer',
+]
@@ -0,0 +1,487 @@
+"""
+Library Index - Incremental re-indexing of texture libraries
+Remembers (path, size, mtime, inode) for every texture under a library root
+and the mtime of every directory, so a rescan only lists directories whose
+entries changed and only compares the files inside them. Changes are pushed
+to subscribers (classification, embedding and thumbnail caches), and a
+watcher keeps the index current from watchdog events or by polling.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .texture_db import TextureDatabase
+
+logger = logging.getLogger(__name__)
+
+try:
+    from utils.archive_handler import TEXTURE_EXTENSIONS
+except ImportError:
+    try:
+        from ..utils.archive_handler import TEXTURE_EXTENSIONS
+    except ImportError:
+        TEXTURE_EXTENSIONS = frozenset({'.dds', '.png', '.jpg', '.jpeg', '.tga', '.bmp', '.tiff', '.tif', '.webp'})
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except (ImportError, OSError, RuntimeError):
+    FileSystemEventHandler = object
+    Observer = None
+    HAS_WATCHDOG = False
+
+# A directory modified this recently may still change within the same
+# timestamp tick, so its mtime is not trusted and it is listed again next scan.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# Watcher timing: events are batched for POLL_INTERVAL seconds; the polling
+# fallback re-stats every file (catching in-place edits, which do not touch
+# directory mtimes) every FULL_RESCAN_EVERY polls.
+POLL_INTERVAL = 2.0
+FULL_RESCAN_EVERY = 30
+
+# Rows written between commits by mark_classified()
+MARK_COMMIT_EVERY = 256
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS library_dirs (
+        path TEXT PRIMARY KEY,
+        parent TEXT,
+        mtime_ns INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_library_dirs_parent ON library_dirs(parent)',
+    '''CREATE TABLE IF NOT EXISTS library_files (
+        path TEXT PRIMARY KEY,
+        dir TEXT NOT NULL,
+        size INTEGER,
+        mtime_ns INTEGER,
+        inode INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_library_files_dir ON library_files(dir)',
+)
+
+
+def default_index_path() -> Path:
+    """Library index database in the application data folder."""
+    try:
+        from config import get_data_dir as _gdd
+        return _gdd() / 'library_index.db'
+    except Exception:
+        return Path.home() / '.ps2_texture_sorter' / 'library_index.db'
+
+
+def _subtree(column: str, root: str) -> Tuple[str, Tuple[str, str, str]]:
+    """SQL condition and parameters for ``column`` being ``root`` or below it."""
+    prefix = root.rstrip(os.sep) + os.sep
+    # Range on the prefix instead of LIKE, whose wildcards may occur in paths
+    upper = prefix[:-1] + chr(ord(os.sep) + 1)
+    return f"({column} = ? OR ({column} >= ? AND {column} < ?))", (root, prefix, upper)
+
+
+@dataclass
+class LibraryChanges:
+    """What one rescan found; paths are absolute strings."""
+    root: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    dirs_listed: int = 0
+    dirs_skipped: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    @property
+    def changed(self) -> List[str]:
+        """Files that need (re-)analysis: added plus modified."""
+        return self.added + self.modified
+
+
+class LibraryIndexer:
+    """
+    Incremental index of the texture files under one or more library roots.
+
+    Shares the TextureDatabase's SQLite file (its own connection, usable
+    from a watcher thread). A rescan stats each known directory; only those
+    whose mtime changed (entries added, removed or renamed) are listed
+    again and have their files compared. Files edited in place do not change
+    their directory's mtime; ``rescan(full=True)`` or a LibraryWatcher
+    catches those.
+    """
+
+    def __init__(self, database: TextureDatabase,
+                 extensions: Optional[Iterable[str]] = TEXTURE_EXTENSIONS):
+        """
+        Args:
+            database: Texture database whose file the index is stored in
+            extensions: Lower-case suffixes to index (None: all files)
+        """
+        self.database = database
+        self.extensions = frozenset(e.lower() for e in extensions) if extensions else None
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[LibraryChanges], None]] = []
+        self._unmarked = 0
+        if str(database.db_path) == ':memory:':
+            self.conn = database.conn
+        else:
+            self.conn = sqlite3.connect(str(database.db_path), check_same_thread=False, timeout=30)
+        for statement in _SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[LibraryChanges], None]) -> None:
+        """Call ``callback(changes)`` after every rescan that found changes."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[LibraryChanges], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, changes: LibraryChanges) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.warning(f"Library change subscriber failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def rescan(self, root: Path, full: bool = False,
+               only: Optional[Iterable[Path]] = None) -> LibraryChanges:
+        """
+        Bring the index for ``root`` up to date.
+
+        Args:
+            root: Library root directory
+            full: List every directory and compare every file, ignoring
+                directory mtimes (catches files edited in place)
+            only: Directories known to have changed (e.g. from file system
+                events); only these, and directories new since the last
+                scan, are listed
+
+        Returns:
+            LibraryChanges (subscribers are notified when it is non-empty)
+        """
+        root = os.path.abspath(root)
+        changes = LibraryChanges(root=root)
+        with self._lock:
+            condition, params = _subtree('path', root)
+            known: Dict[str, Optional[int]] = {}
+            children: Dict[str, List[str]] = {}
+            for path, parent, mtime_ns in self.conn.execute(
+                    f'SELECT path, parent, mtime_ns FROM library_dirs WHERE {condition}', params):
+                known[path] = mtime_ns
+                children.setdefault(parent, []).append(path)
+
+            if only is None:
+                stack = [(root, full)]
+            else:
+                stack = [(d, True) for d in {os.path.abspath(p) for p in only}
+                         if d == root or d.startswith(root.rstrip(os.sep) + os.sep)]
+            now_ns = time.time_ns()
+            while stack:
+                directory, force = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    if directory in known:
+                        self._drop_subtree(directory, changes)
+                    continue
+                if not force and known.get(directory) == mtime_ns:
+                    changes.dirs_skipped += 1
+                    if only is None:
+                        stack.extend((child, False) for child in children.get(directory, ()))
+                    continue
+                subdirs = self._list_directory(directory, changes)
+                changes.dirs_listed += 1
+                for child in set(children.get(directory, ())) - set(subdirs):
+                    self._drop_subtree(child, changes)
+                for child in subdirs:
+                    if child not in known:
+                        stack.append((child, True))   # new directory: list it all
+                    elif only is None:
+                        stack.append((child, full))
+                parent = os.path.dirname(directory) if directory != root else None
+                racy = now_ns - mtime_ns < RACY_MTIME_WINDOW_NS
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO library_dirs (path, parent, mtime_ns) VALUES (?, ?, ?)',
+                    (directory, parent, None if racy else mtime_ns))
+                known[directory] = None if racy else mtime_ns
+
+            self._update_textures(changes)
+            self.conn.commit()
+        logger.debug(f"Rescanned {root}: +{len(changes.added)} ~{len(changes.modified)} "
+                     f"-{len(changes.removed)} ({changes.dirs_listed} dirs listed, "
+                     f"{changes.dirs_skipped} unchanged)")
+        if changes:
+            self._notify(changes)
+        return changes
+
+    def _list_directory(self, directory: str, changes: LibraryChanges) -> List[str]:
+        """List one directory, diff its files against the index; return sub-directories."""
+        subdirs = []
+        current: Dict[str, Tuple[int, int, int]] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file() and (
+                                self.extensions is None
+                                or os.path.splitext(entry.name)[1].lower() in self.extensions):
+                            st = entry.stat()
+                            current[entry.path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Cannot list {directory}: {e}")
+            return subdirs
+
+        indexed = {path: (size, mtime_ns, inode) for path, size, mtime_ns, inode in self.conn.execute(
+            'SELECT path, size, mtime_ns, inode FROM library_files WHERE dir = ?', (directory,))}
+        rows = []
+        for path, signature in current.items():
+            previous = indexed.pop(path, None)
+            if previous is None:
+                changes.added.append(path)
+            elif previous != signature:
+                changes.modified.append(path)
+            else:
+                continue
+            rows.append((path, directory) + signature)
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO library_files (path, dir, size, mtime_ns, inode) '
+            'VALUES (?, ?, ?, ?, ?)', rows)
+        if indexed:
+            changes.removed.extend(indexed)
+            self.conn.executemany('DELETE FROM library_files WHERE path = ?',
+                                  [(path,) for path in indexed])
+        return subdirs
+
+    def _drop_subtree(self, directory: str, changes: LibraryChanges) -> None:
+        """Forget a directory that no longer exists, and everything below it."""
+        condition, params = _subtree('dir', directory)
+        changes.removed.extend(path for (path,) in self.conn.execute(
+            f'SELECT path FROM library_files WHERE {condition}', params))
+        self.conn.execute(f'DELETE FROM library_files WHERE {condition}', params)
+        condition, params = _subtree('path', directory)
+        self.conn.execute(f'DELETE FROM library_dirs WHERE {condition}', params)
+
+    def _update_textures(self, changes: LibraryChanges) -> None:
+        """Drop texture rows of removed files; mark modified ones for re-analysis."""
+        if changes.removed:
+            self.conn.executemany('DELETE FROM textures WHERE file_path = ?',
+                                  [(path,) for path in changes.removed])
+        if changes.modified:
+            self.conn.executemany('UPDATE textures SET last_classified = NULL WHERE file_path = ?',
+                                  [(path,) for path in changes.modified])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def files(self, root: Path) -> List[str]:
+        """Indexed files under ``root``, sorted."""
+        condition, params = _subtree('path', os.path.abspath(root))
+        with self._lock:
+            return [path for (path,) in self.conn.execute(
+                f'SELECT path FROM library_files WHERE {condition} ORDER BY path', params)]
+
+    def stale_files(self, root: Path) -> List[str]:
+        """
+        Indexed files under ``root`` that need analysis: never classified,
+        or modified since they were.
+        """
+        condition, params = _subtree('f.path', os.path.abspath(root))
+        with self._lock:
+            return [path for (path,) in self.conn.execute(
+                'SELECT f.path FROM library_files f LEFT JOIN textures t ON t.file_path = f.path '
+                f'WHERE {condition} AND (t.file_path IS NULL OR t.last_classified IS NULL) '
+                'ORDER BY f.path', params)]
+
+    def mark_classified(self, path: Path, category: str, confidence: float = 0.0) -> None:
+        """Record a classification result so the file is not stale until it changes."""
+        path = str(path)
+        now = datetime.now().isoformat()
+        with self._lock:
+            row = self.conn.execute('SELECT size FROM library_files WHERE path = ?', (path,)).fetchone()
+            self.conn.execute(
+                'INSERT INTO textures (file_path, filename, file_size, category, confidence, '
+                'date_added, date_modified, last_classified) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(file_path) DO UPDATE SET category = excluded.category, '
+                'confidence = excluded.confidence, file_size = excluded.file_size, '
+                'date_modified = excluded.date_modified, last_classified = excluded.last_classified',
+                (path, os.path.basename(path), row[0] if row else 0, category, confidence,
+                 now, now, now))
+            self._unmarked += 1
+            if self._unmarked >= MARK_COMMIT_EVERY:
+                self.conn.commit()
+                self._unmarked = 0
+
+    def forget(self, root: Path) -> None:
+        """Remove ``root`` and everything below it from the index."""
+        root = os.path.abspath(root)
+        with self._lock:
+            self._drop_subtree(root, LibraryChanges(root=root))
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM library_files').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            if self.conn is not self.database.conn:
+                self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# Cache subscribers
+# ----------------------------------------------------------------------
+
+def classifier_invalidator(classifier) -> Callable[[LibraryChanges], None]:
+    """Subscriber dropping cached classifications of modified and removed files."""
+    def _invalidate(changes: LibraryChanges) -> None:
+        classifier.invalidate(changes.modified + changes.removed)
+    return _invalidate
+
+
+def content_index_invalidator(content_index) -> Callable[[LibraryChanges], None]:
+    """Subscriber dropping embeddings of modified and removed files (re-encoded on next update)."""
+    def _invalidate(changes: LibraryChanges) -> None:
+        stale = changes.modified + changes.removed
+        if stale:
+            content_index.remove(stale)
+    return _invalidate
+
+
+def thumbnail_prewarmer(thumbnail_cache, size: int) -> Callable[[LibraryChanges], None]:
+    """
+    Subscriber generating thumbnails of added and modified files.
+
+    Thumbnail keys include size and mtime, so entries for old versions are
+    never served; they are evicted as least recently used when the cache
+    prunes to its max_entries (on open and close).
+    """
+    def _prewarm(changes: LibraryChanges) -> None:
+        for path in changes.changed:
+            thumbnail_cache.get_or_create(Path(path), size)
+    return _prewarm
+
+
+# ----------------------------------------------------------------------
+# Watcher
+# ----------------------------------------------------------------------
+
+class _DirtyDirectories(FileSystemEventHandler):
+    """watchdog handler recording which directories had entries change."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._dirs: Set[str] = set()
+
+    def on_any_event(self, event) -> None:
+        if getattr(event, 'event_type', '') in ('opened', 'closed_no_write'):
+            return
+        with self._lock:
+            for path in (event.src_path, getattr(event, 'dest_path', '')):
+                if not path:
+                    continue
+                path = os.fsdecode(path)
+                if event.is_directory:
+                    self._dirs.add(path)
+                self._dirs.add(os.path.dirname(path))
+
+    def take(self) -> Set[str]:
+        with self._lock:
+            dirs, self._dirs = self._dirs, set()
+        return dirs
+
+
+class LibraryWatcher(threading.Thread):
+    """
+    Keeps a LibraryIndexer current for a set of roots.
+
+    With watchdog installed, file system events mark directories dirty and
+    only those are rescanned, once per ``interval``. Without it the roots are
+    rescanned every ``interval`` (one stat per unchanged directory), with a
+    full rescan every ``full_every`` polls to catch files edited in place.
+    """
+
+    def __init__(self, indexer: LibraryIndexer, roots: Iterable[Path],
+                 interval: float = POLL_INTERVAL, full_every: int = FULL_RESCAN_EVERY,
+                 use_watchdog: bool = True):
+        super().__init__(name='LibraryWatcher', daemon=True)
+        self.indexer = indexer
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.interval = interval
+        self.full_every = max(1, full_every)
+        self.backend = 'watchdog' if use_watchdog and HAS_WATCHDOG else 'polling'
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._handler = None
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop watching and wait for the thread to finish."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self) -> None:
+        if self.backend == 'watchdog':
+            try:
+                self._handler = _DirtyDirectories()
+                self._observer = Observer()
+                for root in self.roots:
+                    self._observer.schedule(self._handler, root, recursive=True)
+                self._observer.start()
+            except Exception as e:
+                logger.warning(f"File system events unavailable ({e}); polling instead")
+                self.backend = 'polling'
+                self._observer = None
+        try:
+            self._rescan_all(full=False)
+            polls = 0
+            while not self._stop_event.wait(self.interval):
+                polls += 1
+                if self._observer is not None:
+                    dirty = self._handler.take()
+                    if dirty:
+                        self._rescan_all(full=False, only=dirty)
+                else:
+                    self._rescan_all(full=polls % self.full_every == 0)
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+
+    def _rescan_all(self, full: bool, only: Optional[Set[str]] = None) -> None:
+        for root in self.roots:
+            try:
+                self.indexer.rescan(root, full=full, only=only)
+            except Exception as e:
+                logger.warning(f"Rescan of {root} failed: {e}")
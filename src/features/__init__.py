@@ -17,20 +17,26 @@ from .texture_analysis import TextureAnalyzer
 __all__.append('TextureAnalyzer')
 
 from .search_filter import SearchFilter, FilterCriteria, SearchPreset
-__all__.extend(['SearchFilter', 'FilterCriteria', 'SearchPreset'])
+from .metadata_index import MetadataIndex
+__all__.extend(['SearchFilter', 'FilterCriteria', 'SearchPreset', 'MetadataIndex'])
 
 from .profile_manager import ProfileManager, OrganizationProfile, GameTemplate
 __all__.extend(['ProfileManager', 'OrganizationProfile', 'GameTemplate'])
 
-from .batch_operations import BatchQueue, Operation, OperationStatus, OperationPriority, BatchOperationHelper
-__all__.extend(['BatchQueue', 'Operation', 'OperationStatus', 'OperationPriority', 'BatchOperationHelper'])
+from .batch_operations import (
+    BatchQueue, Operation, OperationStatus, OperationPriority, BatchOperationHelper,
+    JobGraph, JobStage, JobGraphResult, StageTiming,
+)
+__all__.extend(['BatchQueue', 'Operation', 'OperationStatus', 'OperationPriority', 'BatchOperationHelper',
+                'JobGraph', 'JobStage', 'JobGraphResult', 'StageTiming'])
 
 from .lod_replacement import LODReplacer, LODTexture, LODGroup
 LODReplacement = LODReplacer  # backward-compat alias
 __all__.extend(['LODReplacer', 'LODReplacement', 'LODTexture', 'LODGroup'])
 
 from .backup_system import BackupManager, BackupMetadata, RestorePoint
-__all__.extend(['BackupManager', 'BackupMetadata', 'RestorePoint'])
+from .backup_store import BackupStore
+__all__.extend(['BackupManager', 'BackupMetadata', 'RestorePoint', 'BackupStore'])
 
 # pynput is an optional runtime dep; guard so the package is importable without it
 try:
@@ -79,7 +85,8 @@ from .level_system import LevelSystem, UserLevelSystem, PandaLevelSystem, Level,
 __all__.extend(['LevelSystem', 'UserLevelSystem', 'PandaLevelSystem', 'Level', 'LevelReward'])
 
 from .game_identifier import GameIdentifier, GameInfo
-__all__.extend(['GameIdentifier', 'GameInfo'])
+from .gameindex_cache import GameIndexCache
+__all__.extend(['GameIdentifier', 'GameInfo', 'GameIndexCache'])
 
 from .auto_backup import AutoBackupSystem, BackupConfig
 __all__.extend(['AutoBackupSystem', 'BackupConfig'])
@@ -0,0 +1,418 @@
+"""
+Backup Store
+Content-addressed, deduplicating file store with per-backup manifests
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step while streaming a file into the store.
+CHUNK_SIZE = 1024 * 1024
+# A file is stored compressed only if a sample of its first chunk shrinks
+# below this ratio (already-compressed PNG/DDS data is stored as-is).
+COMPRESS_SAMPLE_SIZE = 16 * 1024
+COMPRESS_MIN_GAIN = 0.9
+
+MANIFEST_VERSION = 1
+
+# One manifest row: (relative posix path, size, mtime_ns, sha256)
+ManifestEntry = Tuple[str, int, int, str]
+
+
+class BackupStore:
+    """
+    Content-addressed storage for backups.
+
+    Every distinct file content is stored once under ``objects/`` named by
+    its SHA-256, which is computed during the single streaming read that
+    copies it in. A backup is a manifest listing (path, size, mtime,
+    digest) for each file, so unchanged files cost nothing in later
+    backups and identical files are shared across all of them.
+
+    Layout::
+
+        <root>/objects/ab/abcdef...      raw object
+        <root>/objects/ab/abcdef....z    zlib-compressed object
+        <root>/manifests/<backup_id>.json
+        <root>/heads/<source hash>       latest backup_id of a source
+    """
+
+    def __init__(self, root: Path, max_workers: int = 4):
+        """
+        Args:
+            root: Store directory
+            max_workers: Files ingested/restored concurrently
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.manifests_dir = self.root / 'manifests'
+        self.heads_dir = self.root / 'heads'
+        self.tmp_dir = self.root / 'tmp'
+        self.max_workers = max(1, max_workers)
+        for directory in (self.objects_dir, self.manifests_dir, self.heads_dir, self.tmp_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        # Snapshots and garbage collection must not interleave
+        self._lock = threading.RLock()
+        self._shards: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str, compressed: bool = False) -> Path:
+        name = digest + ('.z' if compressed else '')
+        return self.objects_dir / digest[:2] / name
+
+    def _shard_dir(self, digest: str) -> Path:
+        shard = self.objects_dir / digest[:2]
+        if digest[:2] not in self._shards:
+            shard.mkdir(parents=True, exist_ok=True)
+            self._shards.add(digest[:2])
+        return shard
+
+    def find_object(self, digest: str) -> Optional[Path]:
+        """Stored file for ``digest`` (raw or compressed), or None."""
+        for compressed in (False, True):
+            path = self._object_path(digest, compressed)
+            if path.exists():
+                return path
+        return None
+
+    def put_file(self, source: Path, compress: bool = True) -> Tuple[str, int]:
+        """
+        Stream ``source`` into the store, hashing it during the same read.
+
+        Args:
+            source: File to store
+            compress: Allow zlib compression when the content compresses
+
+        Returns:
+            Tuple of (sha256 hex digest, bytes added to the store; 0 if the
+            content was already present)
+        """
+        sha256 = hashlib.sha256()
+        with open(source, 'rb') as f:
+            first = f.read(CHUNK_SIZE)
+            sha256.update(first)
+            compressor = None
+            if compress and first:
+                sample = first[:COMPRESS_SAMPLE_SIZE]
+                if len(zlib.compress(sample, 1)) < len(sample) * COMPRESS_MIN_GAIN:
+                    compressor = zlib.compressobj(1)
+
+            if len(first) < CHUNK_SIZE:
+                # Whole file already in memory: skip the write when known
+                digest = sha256.hexdigest()
+                if self.find_object(digest) is not None:
+                    return digest, 0
+                data = first
+                if compressor is not None:
+                    data = compressor.compress(first) + compressor.flush()
+                return digest, self._commit(digest, [data], compressor is not None)
+
+            tmp = self.tmp_dir / f"{uuid.uuid4().hex}.part"
+            try:
+                with open(tmp, 'wb') as out:
+                    chunk = first
+                    while chunk:
+                        out.write(compressor.compress(chunk) if compressor else chunk)
+                        chunk = f.read(CHUNK_SIZE)
+                        sha256.update(chunk)
+                    if compressor is not None:
+                        out.write(compressor.flush())
+                digest = sha256.hexdigest()
+                if self.find_object(digest) is not None:
+                    return digest, 0
+                dest = self._object_path(digest, compressor is not None)
+                self._shard_dir(digest)
+                os.replace(tmp, dest)
+                return digest, dest.stat().st_size
+            finally:
+                tmp.unlink(missing_ok=True)
+
+    def _commit(self, digest: str, blocks: List[bytes], compressed: bool) -> int:
+        dest = self._object_path(digest, compressed)
+        self._shard_dir(digest)
+        tmp = self.tmp_dir / f"{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp, 'wb') as out:
+                for block in blocks:
+                    out.write(block)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return dest.stat().st_size
+
+    def read_object(self, digest: str) -> Iterator[bytes]:
+        """Yield the original content of an object in chunks."""
+        path = self.find_object(digest)
+        if path is None:
+            raise FileNotFoundError(f"Backup object missing: {digest}")
+        decompressor = zlib.decompressobj() if path.suffix == '.z' else None
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+    def restore_object(self, digest: str, dest: Path, verify: bool = True) -> None:
+        """
+        Write object ``digest`` to ``dest`` (atomically replacing it).
+
+        Raises:
+            ValueError: If ``verify`` and the content does not match its digest
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}.restore")
+        sha256 = hashlib.sha256() if verify else None
+        try:
+            with open(tmp, 'wb') as out:
+                for chunk in self.read_object(digest):
+                    if sha256 is not None:
+                        sha256.update(chunk)
+                    out.write(chunk)
+            if sha256 is not None and sha256.hexdigest() != digest:
+                raise ValueError(f"Backup object corrupted: {digest}")
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Manifests
+    # ------------------------------------------------------------------
+
+    def manifest_path(self, backup_id: str) -> Path:
+        return self.manifests_dir / f"{backup_id}.json"
+
+    @staticmethod
+    def manifest_checksum(entries: List[ManifestEntry]) -> str:
+        """SHA-256 over the (path, digest) pairs of a manifest."""
+        hasher = hashlib.sha256()
+        for rel, _size, _mtime, digest in sorted(entries):
+            hasher.update(f"{rel}\0{digest}\n".encode('utf-8'))
+        return hasher.hexdigest()
+
+    def load_manifest(self, backup_id: str) -> Dict:
+        with open(self.manifest_path(backup_id), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest['files'] = [tuple(entry) for entry in manifest['files']]
+        return manifest
+
+    def _head_path(self, source_key: str) -> Path:
+        return self.heads_dir / hashlib.sha1(source_key.encode('utf-8')).hexdigest()
+
+    def latest_manifest_for(self, source: Path) -> Optional[Dict]:
+        """Most recent manifest of ``source`` (used as the incremental base)."""
+        source_key = str(Path(source).resolve())
+        try:
+            backup_id = self._head_path(source_key).read_text(encoding='utf-8').strip()
+            manifest = self.load_manifest(backup_id)
+            if manifest.get('source') == source_key:
+                return manifest
+        except (OSError, ValueError, KeyError):
+            pass
+        # No usable head: pick the newest manifest of this source
+        latest = None
+        for path in self.manifests_dir.glob('*.json'):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if manifest.get('source') != source_key:
+                continue
+            if latest is None or manifest.get('created_ns', 0) > latest.get('created_ns', 0):
+                latest = manifest
+        if latest is not None:
+            latest['files'] = [tuple(entry) for entry in latest['files']]
+        return latest
+
+    def create_snapshot(
+        self,
+        backup_id: str,
+        source: Path,
+        compress: bool = True
+    ) -> Dict:
+        """
+        Back up ``source`` (file or directory) as manifest ``backup_id``.
+
+        Files whose size and mtime match the previous manifest of the same
+        source are not read at all; everything else is streamed in once.
+
+        Returns:
+            The manifest, with 'file_count', 'total_size', 'stored_bytes'
+            (new bytes written to the store) and 'checksum'
+        """
+        with self._lock:
+            return self._create_snapshot(backup_id, Path(source), compress)
+
+    def _create_snapshot(self, backup_id: str, source: Path, compress: bool) -> Dict:
+        if source.is_file():
+            kind = 'file'
+            files = [(source.name, source)]
+        else:
+            kind = 'dir'
+            files = [
+                (path.relative_to(source).as_posix(), path)
+                for path in _walk_files(source)
+            ]
+
+        previous = self.latest_manifest_for(source)
+        known: Dict[str, ManifestEntry] = {}
+        if previous is not None and previous.get('kind') == kind:
+            known = {entry[0]: entry for entry in previous['files']}
+
+        entries: List[Optional[ManifestEntry]] = [None] * len(files)
+        pending: List[Tuple[int, str, Path, os.stat_result]] = []
+        for index, (rel, path) in enumerate(files):
+            st = path.stat()
+            old = known.get(rel)
+            if (old is not None and old[1] == st.st_size and old[2] == st.st_mtime_ns
+                    and self.find_object(old[3]) is not None):
+                entries[index] = old
+            else:
+                pending.append((index, rel, path, st))
+
+        stored = 0
+
+        def _ingest(item):
+            index, rel, path, st = item
+            digest, added = self.put_file(path, compress)
+            return index, (rel, st.st_size, st.st_mtime_ns, digest), added
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix="BackupIngest") as pool:
+                for index, entry, added in pool.map(_ingest, pending):
+                    entries[index] = entry
+                    stored += added
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'backup_id': backup_id,
+            'source': str(source.resolve()),
+            'kind': kind,
+            'created_ns': time.time_ns(),
+            'files': entries,
+        }
+        tmp = self.manifest_path(backup_id).with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(tmp, self.manifest_path(backup_id))
+        self._head_path(manifest['source']).write_text(backup_id, encoding='utf-8')
+
+        manifest['file_count'] = len(entries)
+        manifest['total_size'] = sum(entry[1] for entry in entries)
+        manifest['stored_bytes'] = stored
+        manifest['reused'] = len(files) - len(pending)
+        manifest['checksum'] = self.manifest_checksum(entries)
+        return manifest
+
+    def restore_snapshot(self, backup_id: str, dest: Path, verify: bool = True) -> int:
+        """
+        Make ``dest`` match manifest ``backup_id``.
+
+        Files already at ``dest`` with the recorded size and mtime are kept;
+        files not in the manifest are removed (directory backups).
+
+        Returns:
+            Number of files written
+        """
+        manifest = self.load_manifest(backup_id)
+        dest = Path(dest)
+
+        if manifest['kind'] == 'file':
+            targets = [(dest, manifest['files'][0])]
+        else:
+            targets = [(dest / entry[0], entry) for entry in manifest['files']]
+            wanted = {path for path, _ in targets}
+            if dest.is_dir():
+                for existing in _walk_files(dest):
+                    if existing not in wanted:
+                        existing.unlink()
+
+        todo = []
+        for path, (_rel, size, mtime_ns, digest) in targets:
+            try:
+                st = path.stat()
+                if st.st_size == size and st.st_mtime_ns == mtime_ns:
+                    continue
+            except OSError:
+                pass
+            todo.append((path, size, mtime_ns, digest))
+
+        def _restore(item):
+            path, _size, mtime_ns, digest = item
+            self.restore_object(digest, path, verify)
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="BackupRestore") as pool:
+            list(pool.map(_restore, todo))
+        return len(todo)
+
+    def verify_snapshot(self, backup_id: str, checksum: Optional[str]) -> bool:
+        """Check the manifest checksum and that every object is present."""
+        manifest = self.load_manifest(backup_id)
+        if checksum and self.manifest_checksum(manifest['files']) != checksum:
+            return False
+        return all(self.find_object(entry[3]) is not None for entry in manifest['files'])
+
+    def delete_snapshot(self, backup_id: str) -> int:
+        """
+        Remove a manifest and every object no other manifest references.
+
+        Returns:
+            Number of objects removed
+        """
+        with self._lock:
+            self.manifest_path(backup_id).unlink(missing_ok=True)
+            referenced: Set[str] = set()
+            for path in self.manifests_dir.glob('*.json'):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        referenced.update(entry[3] for entry in json.load(f)['files'])
+                except (OSError, ValueError, KeyError):
+                    # Unreadable manifest: keep everything rather than risk data
+                    logger.warning(f"Skipping object cleanup, unreadable manifest {path}")
+                    return 0
+            removed = 0
+            for shard in self.objects_dir.iterdir():
+                for obj in shard.iterdir():
+                    if obj.name.split('.')[0] not in referenced:
+                        obj.unlink()
+                        removed += 1
+        return removed
+
+
+def _walk_files(root: Path) -> List[Path]:
+    """All regular files under ``root`` via scandir (sorted, symlinks not followed)."""
+    found: List[Path] = []
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        found.append(Path(entry.path))
+        except OSError as e:
+            logger.warning(f"Cannot read {current}: {e}")
+    found.sort()
+    return found
@@ -1,6 +1,6 @@
 """
 Backup and Restore System
-Create and manage backups with restore points and compression
+Create and manage backups with restore points, deduplication and compression
 Author: Dead On The Inside / JosephsDeadish
 """
 
@@ -15,6 +15,8 @@ from datetime import datetime
 from threading import Lock
 import zipfile
 
+from .backup_store import BackupStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +65,11 @@ class BackupManager:
     - Verify backup integrity
     - Thread-safe operations
     - Incremental backup support
+    
+    Backups are manifests in a content-addressed :class:`BackupStore`:
+    each file is hashed while it is copied in, unchanged files are not read
+    again, and identical content is stored once across all backups.
+    Older zip/folder backups listed in the metadata are still restorable.
     """
     
     def __init__(self, backup_dir: Optional[Path] = None):
@@ -81,6 +88,7 @@ class BackupManager:
         
         logger.debug(f"BackupManager initialized with backup_dir={self.backup_dir}")
         self._ensure_backup_dir()
+        self.store = BackupStore(self.backup_dir / "store")
         self._load_metadata()
     
     def _ensure_backup_dir(self):
@@ -128,45 +136,15 @@ class BackupManager:
             
             logger.info(f"Creating backup: {name} (ID: {backup_id})")
             
-            # Create backup directory
-            backup_path = self.backup_dir / backup_id
-            backup_path.mkdir(parents=True, exist_ok=True)
-            
-            # Copy files
-            file_count = 0
-            total_size = 0
+            # One streaming read per new/changed file; unchanged files are reused
+            manifest = self.store.create_snapshot(backup_id, source_path, compress=compress)
+            backup_path = self.store.manifest_path(backup_id)
+            file_count = manifest['file_count']
+            total_size = manifest['total_size']
+            checksum = manifest['checksum']
             
-            if source_path.is_file():
-                dest = backup_path / source_path.name
-                shutil.copy2(source_path, dest)
-                file_count = 1
-                total_size = source_path.stat().st_size
-            else:
-                # Copy entire directory
-                for item in source_path.rglob('*'):
-                    if item.is_file():
-                        rel_path = item.relative_to(source_path)
-                        dest = backup_path / rel_path
-                        dest.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(item, dest)
-                        file_count += 1
-                        total_size += item.stat().st_size
-            
-            # Compress if requested
-            compression_ratio = 1.0
-            compressed_size = total_size
-            
-            if compress:
-                compressed_path = self._compress_backup(backup_path, backup_id)
-                if compressed_path:
-                    # Remove uncompressed backup
-                    shutil.rmtree(backup_path)
-                    backup_path = compressed_path
-                    compressed_size = compressed_path.stat().st_size
-                    compression_ratio = compressed_size / total_size if total_size > 0 else 1.0
-            
-            # Calculate checksum
-            checksum = self._calculate_checksum(backup_path)
+            # Share of the source size this backup added to the store
+            compression_ratio = manifest['stored_bytes'] / total_size if total_size > 0 else 1.0
             
             # Create metadata
             metadata = BackupMetadata(
@@ -191,8 +169,9 @@ class BackupManager:
             
             logger.info(
                 f"Backup created: {name} (ID: {backup_id})\n"
-                f"  Files: {file_count}, Size: {total_size:,} bytes\n"
-                f"  Compressed: {compress}, Ratio: {compression_ratio:.2%}"
+                f"  Files: {file_count} ({manifest['reused']} unchanged), "
+                f"Size: {total_size:,} bytes\n"
+                f"  New data stored: {manifest['stored_bytes']:,} bytes ({compression_ratio:.2%})"
             )
             
             return backup_id
@@ -228,6 +207,10 @@ class BackupManager:
             
             logger.info(f"Restoring backup: {metadata.name} (ID: {backup_id})")
             
+            if self._is_store_backup(metadata):
+                return self._restore_from_store(metadata, restore_path, verify_checksum)
+            
+            # Legacy zip/folder backup
             # Verify checksum if requested
             if verify_checksum and metadata.checksum:
                 current_checksum = self._calculate_checksum(metadata.backup_path)
@@ -311,7 +294,10 @@ class BackupManager:
                 del self.backups[backup_id]
             
             # Delete backup files
-            if metadata.backup_path.exists():
+            if self._is_store_backup(metadata):
+                removed = self.store.delete_snapshot(backup_id)
+                logger.debug(f"Removed {removed} unreferenced backup objects")
+            elif metadata.backup_path.exists():
                 if metadata.backup_path.is_file():
                     metadata.backup_path.unlink()
                 else:
@@ -555,35 +541,46 @@ class BackupManager:
             logger.error(f"Error cleaning up old backups: {e}", exc_info=True)
             return 0
     
-    def _compress_backup(self, backup_path: Path, backup_id: str) -> Optional[Path]:
+    def _is_store_backup(self, metadata: BackupMetadata) -> bool:
+        """Whether a backup is a store manifest (rather than a legacy zip/folder)."""
+        return Path(metadata.backup_path).suffix == '.json'
+    
+    def _restore_from_store(
+        self,
+        metadata: BackupMetadata,
+        restore_path: Optional[Path],
+        verify_checksum: bool
+    ) -> bool:
         """
-        Compress a backup directory.
+        Restore a manifest backup.
         
-        Args:
-            backup_path: Path to backup directory
-            backup_id: Backup ID
-            
-        Returns:
-            Path to compressed file or None on error
+        Only files that differ from the backup (by size/mtime) are written,
+        each verified against its SHA-256 while it is written.
         """
-        try:
-            zip_path = self.backup_dir / f"{backup_id}.zip"
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                if backup_path.is_file():
-                    zf.write(backup_path, backup_path.name)
-                else:
-                    for file in backup_path.rglob('*'):
-                        if file.is_file():
-                            arcname = file.relative_to(backup_path)
-                            zf.write(file, arcname)
-            
-            logger.debug(f"Compressed backup to: {zip_path}")
-            return zip_path
-            
-        except Exception as e:
-            logger.error(f"Error compressing backup: {e}", exc_info=True)
-            return None
+        backup_id = metadata.backup_id
+        if verify_checksum and not self.store.verify_snapshot(backup_id, metadata.checksum):
+            logger.error(f"Backup checksum mismatch! Backup may be corrupted.")
+            return False
+        
+        if restore_path is None:
+            restore_path = metadata.source_path
+        
+        manifest_kind = self.store.load_manifest(backup_id)['kind']
+        if manifest_kind == 'file' and restore_path.is_dir():
+            restore_path = restore_path / Path(metadata.source_path).name
+        elif manifest_kind == 'dir' and restore_path.exists() and restore_path.is_dir():
+            # Backup existing files before overwriting (incremental, so cheap)
+            temp_backup_id = self.create_backup(
+                restore_path,
+                name=f"Pre-restore backup of {restore_path.name}",
+                description="Automatic backup before restore",
+                tags=['auto', 'pre-restore']
+            )
+            logger.info(f"Created pre-restore backup: {temp_backup_id}")
+        
+        written = self.store.restore_snapshot(backup_id, restore_path, verify=verify_checksum)
+        logger.info(f"Backup restored successfully: {backup_id} ({written} files written)")
+        return True
     
     def _calculate_checksum(self, path: Path) -> str:
         """
@@ -664,6 +661,7 @@ class BackupManager:
                 backup_data['backup_path'] = Path(backup_data['backup_path'])
                 backup_data['source_path'] = Path(backup_data['source_path'])
                 self.backups[backup_id] = BackupMetadata(**backup_data)
+            self._backup_counter = len(self.backups)
             
             # Load restore points
             for point_id, rp_data in data.get('restore_points', {}).items():
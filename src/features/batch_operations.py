@@ -472,6 +472,359 @@ class BatchQueue:
         with self._lock:
             if operation_id in self.operations:
                 self.operations[operation_id].progress = max(0.0, min(100.0, progress))
+    
+    def add_job_graph(
+        self,
+        name: str,
+        graph: 'JobGraph',
+        items: List[Any],
+        max_workers: int = 4,
+        outputs: Optional[List[str]] = None,
+        priority: OperationPriority = OperationPriority.NORMAL
+    ) -> str:
+        """
+        Queue a multi-stage job graph as a single operation.
+        
+        The operation's progress follows the number of items that have
+        finished every stage, and its result is the JobGraphResult
+        (including per-stage timings). Cancelling the operation stops the
+        graph from scheduling further stages.
+        
+        Args:
+            name: Operation name/description
+            graph: Job graph to run
+            items: Files to push through the graph
+            max_workers: Worker threads shared by all stages
+            outputs: Stage results to keep (default: the graph's sinks)
+            priority: Operation priority
+            
+        Returns:
+            Operation ID
+        """
+        cancel_event = Event()
+        holder: Dict[str, str] = {}
+        
+        def _progress(done: int, total: int):
+            operation_id = holder.get('id')
+            if not operation_id:
+                return
+            self.update_operation_progress(operation_id, done / total * 100 if total else 100.0)
+            operation = self.operations.get(operation_id)
+            if operation is not None and operation.status == OperationStatus.CANCELLED:
+                cancel_event.set()
+        
+        operation_id = self.add_operation(
+            name,
+            graph.run,
+            args=(items,),
+            kwargs={
+                'max_workers': max_workers,
+                'outputs': outputs,
+                'progress_callback': _progress,
+                'cancel_event': cancel_event,
+            },
+            priority=priority
+        )
+        holder['id'] = operation_id
+        return operation_id
+
+
+@dataclass
+class JobStage:
+    """A single step of a per-file job graph."""
+    name: str
+    function: Callable[[Any, Dict[str, Any]], Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StageTiming:
+    """Accumulated wall-clock timing of one stage across a run."""
+    stage: str
+    count: int = 0
+    failures: int = 0
+    total_time: float = 0.0
+    min_time: float = 0.0
+    max_time: float = 0.0
+
+    def record(self, duration: float, failed: bool = False):
+        """Add one execution to the totals."""
+        if self.count == 0 or duration < self.min_time:
+            self.min_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.count += 1
+        self.total_time += duration
+        if failed:
+            self.failures += 1
+
+    @property
+    def avg_time(self) -> float:
+        """Average time per execution in seconds."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary for display/export."""
+        return {
+            'stage': self.stage,
+            'count': self.count,
+            'failures': self.failures,
+            'total_time': self.total_time,
+            'avg_time': self.avg_time,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+        }
+
+
+@dataclass
+class JobGraphResult:
+    """Outcome of running a job graph over a set of files."""
+    outputs: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+    errors: Dict[Any, Dict[str, str]] = field(default_factory=dict)
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    completed: int = 0
+    failed: int = 0
+    cancelled: bool = False
+    duration: float = 0.0
+
+    def timing_report(self) -> List[Dict[str, Any]]:
+        """Per-stage timings, slowest stage first."""
+        return sorted(
+            (t.to_dict() for t in self.timings.values()),
+            key=lambda t: t['total_time'],
+            reverse=True
+        )
+
+
+class _FileRun:
+    """Per-file scheduling state used by JobGraph.run."""
+
+    __slots__ = ('item', 'waiting', 'results', 'consumers', 'errors', 'pending')
+
+    def __init__(self, item: Any, graph: 'JobGraph'):
+        self.item = item
+        self.waiting = {name: len(stage.depends_on) for name, stage in graph.stages.items()}
+        self.results: Dict[str, Any] = {}
+        self.consumers = {name: len(graph.dependents[name]) for name in graph.stages}
+        self.errors: Dict[str, str] = {}
+        self.pending = len(graph.stages)
+
+
+class JobGraph:
+    """
+    Directed acyclic graph of per-file processing stages.
+    
+    Each file flows through the graph independently: a stage runs as soon
+    as every stage it depends on has finished for that file, so different
+    files occupy different stages at the same time and independent branches
+    (e.g. preview thumbnail and analysis) run in parallel. Intermediate
+    results are shared in memory between dependent stages and dropped once
+    the last consumer has run.
+    
+    Stage functions are called as ``function(item, inputs)`` where ``inputs``
+    maps each dependency name to its result.
+    
+    Example:
+        >>> graph = JobGraph()
+        >>> graph.add_stage('decode', load_image)
+        >>> graph.add_stage('alpha_fix', fix_alpha, depends_on=['decode'])
+        >>> graph.add_stage('upscale', upscale, depends_on=['alpha_fix'])
+        >>> graph.add_stage('thumbnail', make_thumb, depends_on=['decode'])
+        >>> graph.add_stage('encode', save_image, depends_on=['upscale'])
+        >>> result = graph.run(files, max_workers=4)
+        >>> result.timing_report()
+    """
+    
+    def __init__(self):
+        """Initialize an empty job graph."""
+        self.stages: Dict[str, JobStage] = {}
+        self.dependents: Dict[str, List[str]] = {}
+    
+    def add_stage(
+        self,
+        name: str,
+        function: Callable[[Any, Dict[str, Any]], Any],
+        depends_on: Optional[List[str]] = None
+    ) -> 'JobGraph':
+        """
+        Add a stage to the graph.
+        
+        Args:
+            name: Unique stage name
+            function: Callable invoked as ``function(item, inputs)``
+            depends_on: Names of stages whose results this stage consumes
+            
+        Returns:
+            The graph, for chaining
+            
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        depends_on = list(depends_on or [])
+        if name in self.stages:
+            raise ValueError(f"Stage already defined: {name}")
+        for dep in depends_on:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        
+        # Dependencies must already exist, so the graph can never gain a cycle.
+        self.stages[name] = JobStage(name=name, function=function, depends_on=depends_on)
+        self.dependents[name] = []
+        for dep in depends_on:
+            self.dependents[dep].append(name)
+        return self
+    
+    def roots(self) -> List[str]:
+        """Stages without dependencies."""
+        return [name for name, stage in self.stages.items() if not stage.depends_on]
+    
+    def sinks(self) -> List[str]:
+        """Stages no other stage depends on."""
+        return [name for name, deps in self.dependents.items() if not deps]
+    
+    def descendants(self, name: str) -> List[str]:
+        """All stages that directly or indirectly depend on ``name``."""
+        seen: List[str] = []
+        stack = list(self.dependents.get(name, []))
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.append(current)
+                stack.extend(self.dependents[current])
+        return seen
+    
+    def run(
+        self,
+        items: List[Any],
+        max_workers: int = 4,
+        max_in_flight: Optional[int] = None,
+        outputs: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[Event] = None
+    ) -> JobGraphResult:
+        """
+        Run the graph for every item, pipelining items through the stages.
+        
+        Args:
+            items: Files (or any hashable work items) to process
+            max_workers: Worker threads shared by all stages
+            max_in_flight: Maximum items being processed at once; bounds the
+                memory held by intermediates (default: 2 * max_workers)
+            outputs: Stage results to keep in the result (default: sinks)
+            progress_callback: Called with (items_finished, total)
+            cancel_event: Set to stop scheduling new stages
+            
+        Returns:
+            JobGraphResult with kept outputs, per-item errors and timings
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        if not self.stages:
+            raise ValueError("Job graph has no stages")
+        
+        keep = set(outputs if outputs is not None else self.sinks())
+        max_in_flight = max_in_flight or max(1, max_workers * 2)
+        result = JobGraphResult(timings={name: StageTiming(stage=name) for name in self.stages})
+        total = len(items)
+        finished = 0
+        next_item = 0
+        in_flight = 0
+        start_time = time.time()
+        
+        def _run_stage(stage: JobStage, item: Any, inputs: Dict[str, Any]):
+            began = time.perf_counter()
+            try:
+                value = stage.function(item, inputs)
+                return value, None, time.perf_counter() - began
+            except Exception as e:
+                logger.debug(f"Stage '{stage.name}' failed for {item}: {e}", exc_info=True)
+                return None, str(e), time.perf_counter() - began
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="JobGraph") as executor:
+            futures: Dict[Any, Any] = {}
+            
+            def _submit(run: _FileRun, name: str):
+                stage = self.stages[name]
+                inputs = {dep: run.results[dep] for dep in stage.depends_on}
+                future = executor.submit(_run_stage, stage, run.item, inputs)
+                futures[future] = (run, name)
+            
+            def _admit():
+                nonlocal next_item, in_flight
+                while next_item < total and in_flight < max_in_flight:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    run = _FileRun(items[next_item], self)
+                    next_item += 1
+                    in_flight += 1
+                    for name in self.roots():
+                        _submit(run, name)
+            
+            def _skip(run: _FileRun, names: List[str]):
+                for node in names:
+                    if run.waiting[node] >= 0:
+                        run.waiting[node] = -1
+                        run.pending -= 1
+            
+            def _release(run: _FileRun, name: str):
+                # Drop intermediates nobody else will read.
+                for dep in self.stages[name].depends_on:
+                    run.consumers[dep] -= 1
+                    if run.consumers[dep] == 0 and dep not in keep:
+                        run.results.pop(dep, None)
+            
+            _admit()
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    run, name = futures.pop(future)
+                    value, error, duration = future.result()
+                    result.timings[name].record(duration, failed=error is not None)
+                    run.pending -= 1
+                    _release(run, name)
+                    
+                    if error is not None:
+                        run.errors[name] = error
+                        # Dependents of a failed stage cannot run for this item.
+                        _skip(run, self.descendants(name))
+                    else:
+                        run.results[name] = value
+                        cancelled = cancel_event is not None and cancel_event.is_set()
+                        for child in self.dependents[name]:
+                            if run.waiting[child] < 0:
+                                continue
+                            run.waiting[child] -= 1
+                            if run.waiting[child] == 0:
+                                if cancelled:
+                                    _skip(run, [child] + self.descendants(child))
+                                else:
+                                    _submit(run, child)
+                    
+                    if run.pending <= 0:
+                        finished += 1
+                        in_flight -= 1
+                        kept = {k: v for k, v in run.results.items() if k in keep}
+                        if run.errors:
+                            result.errors[run.item] = run.errors
+                            result.failed += 1
+                        else:
+                            result.completed += 1
+                        if kept:
+                            result.outputs[run.item] = kept
+                        if progress_callback:
+                            try:
+                                progress_callback(finished, total)
+                            except Exception as e:
+                                logger.error(f"Job graph progress callback failed: {e}")
+                _admit()
+        
+        result.cancelled = finished < total
+        result.duration = time.time() - start_time
+        logger.info(
+            f"Job graph finished {finished}/{total} items in {result.duration:.2f}s "
+            f"({result.failed} failed)"
+        )
+        return result
 
 
 class BatchOperationHelper:
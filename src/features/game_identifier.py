@@ -6,20 +6,21 @@ Author: Dead On The Inside / JosephsDeadish
 
 import re
 import logging
-import hashlib
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
-# Try to import YAML support for GameIndex.yaml
+from .gameindex_cache import HAS_YAML, GameIndexCache, get_gameindex_cache
+
 try:
-    import yaml
-    HAS_YAML = True
-except (ImportError, OSError, RuntimeError):
-    HAS_YAML = False
-    logger.warning("PyYAML not available. GameIndex.yaml support disabled.")
+    from utils.file_hasher import get_file_hasher
+except ImportError:
+    from ..utils.file_hasher import get_file_hasher
+
+if not HAS_YAML:
+    logger.warning("PyYAML not available. GameIndex.yaml compilation disabled.")
 
 
 @dataclass
@@ -1778,50 +1779,46 @@ class GameIdentifier:
         """
         Initialize game identifier.
         
+        The GameIndex is not read here; it is compiled (once) and loaded on
+        the first serial/CRC lookup.
+        
         Args:
             gameindex_path: Optional path to GameIndex.yaml file
         """
         self.gameindex_path = gameindex_path
-        self.gameindex_db: Dict[str, Dict[str, Any]] = {}
-        
-        if gameindex_path and gameindex_path.exists():
-            self.load_gameindex(gameindex_path)
+        self._gameindex: Optional[GameIndexCache] = (
+            get_gameindex_cache(gameindex_path) if gameindex_path else None
+        )
+    
+    @property
+    def gameindex_db(self) -> Dict[str, Dict[str, Any]]:
+        """All GameIndex entries keyed by serial (read in full from the cache)."""
+        gameindex = self._get_gameindex()
+        return gameindex.entries() if gameindex else {}
     
     def load_gameindex(self, path: Path) -> bool:
         """
         Load PCSX2 GameIndex.yaml file.
         
+        The YAML is compiled into a cached SQLite index the first time and
+        whenever its content changes; later loads read the compiled form.
+        
         Args:
             path: Path to GameIndex.yaml
             
         Returns:
             True if loaded successfully
         """
-        if not HAS_YAML:
-            logger.warning("PyYAML not available. Cannot load GameIndex.yaml")
-            return False
-        
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            if not data:
-                logger.warning("GameIndex.yaml is empty or invalid")
-                return False
-            
-            # Parse GameIndex format
-            # Format: Serial: {name: "Game Title", region: "NTSC-U", ...}
-            self.gameindex_db = {}
-            for serial, info in data.items():
-                if isinstance(info, dict):
-                    self.gameindex_db[serial] = info
-            
-            logger.info(f"Loaded {len(self.gameindex_db)} games from GameIndex.yaml")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to load GameIndex.yaml: {e}", exc_info=True)
-            return False
+        self.gameindex_path = path
+        self._gameindex = get_gameindex_cache(path)
+        return self._gameindex.load()
+    
+    def _get_gameindex(self) -> Optional[GameIndexCache]:
+        """The loaded GameIndex, loading it on first use."""
+        gameindex = self._gameindex
+        if gameindex is None or not gameindex.load():
+            return None
+        return gameindex
     
     def detect_serial_from_path(self, path: Path) -> Optional[Tuple[str, str]]:
         """
@@ -1877,28 +1874,22 @@ class GameIdentifier:
         """
         Calculate CRC hash of a file.
         
+        Disc images are hashed at disk speed (memory-mapped, parallel
+        segments, native CRC when built) and the result is cached by path,
+        size and mtime, so re-identifying an unchanged ISO is instant.
+        
         Args:
             file_path: Path to file
-            algorithm: Hash algorithm ('crc32' or 'md5')
+            algorithm: Hash algorithm ('crc32', 'md5' or 'xxh3')
             
         Returns:
             CRC hash string
         """
         try:
+            digest = get_file_hasher().hash_file(Path(file_path), algorithm)
             if algorithm == 'crc32':
-                import zlib
-                with open(file_path, 'rb') as f:
-                    crc = 0
-                    while chunk := f.read(8192):
-                        crc = zlib.crc32(chunk, crc)
-                return f"{crc & 0xFFFFFFFF:08X}"
-            
-            elif algorithm == 'md5':
-                md5 = hashlib.md5()
-                with open(file_path, 'rb') as f:
-                    while chunk := f.read(8192):
-                        md5.update(chunk)
-                return md5.hexdigest()[:8].upper()
+                return digest
+            return digest[:8].upper()
             
         except Exception as e:
             logger.error(f"Failed to calculate CRC for {file_path}: {e}")
@@ -1930,12 +1921,14 @@ class GameIdentifier:
             )
         
         # Check GameIndex.yaml
-        if serial in self.gameindex_db:
-            game_data = self.gameindex_db[serial]
+        gameindex = self._get_gameindex()
+        found = gameindex.lookup_serial(serial) if gameindex else None
+        if found:
+            title, region = found
             return GameInfo(
                 serial=serial,
-                title=game_data.get('name', 'Unknown'),
-                region=game_data.get('region', 'Unknown'),
+                title=title,
+                region=region,
                 confidence=0.9,
                 source='gameindex'
             )
@@ -1954,24 +1947,19 @@ class GameIdentifier:
         """
         crc = crc.upper()
         
-        # Search GameIndex.yaml for CRC
-        if self.gameindex_db:
-            for serial, game_data in self.gameindex_db.items():
-                # Check if CRC is in the game data
-                if isinstance(game_data, dict):
-                    game_crcs = game_data.get('crc', [])
-                    if isinstance(game_crcs, str):
-                        game_crcs = [game_crcs]
-                    
-                    if crc in [c.upper() for c in game_crcs]:
-                        return GameInfo(
-                            serial=serial,
-                            crc=crc,
-                            title=game_data.get('name', 'Unknown'),
-                            region=game_data.get('region', 'Unknown'),
-                            confidence=0.95,
-                            source='gameindex_crc'
-                        )
+        # CRC -> serial index of GameIndex.yaml
+        gameindex = self._get_gameindex()
+        found = gameindex.lookup_crc(crc) if gameindex else None
+        if found:
+            serial, title, region = found
+            return GameInfo(
+                serial=serial,
+                crc=crc,
+                title=title,
+                region=region,
+                confidence=0.95,
+                source='gameindex_crc'
+            )
         
         return None
     
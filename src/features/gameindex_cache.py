@@ -0,0 +1,279 @@
+"""
+GameIndex Cache
+Compiles PCSX2's GameIndex.yaml once into SQLite and serves O(1) serial/CRC lookups
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import yaml
+    HAS_YAML = True
+    # The libyaml loader parses the multi-megabyte index several times faster
+    _YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except (ImportError, OSError, RuntimeError):
+    yaml = None  # type: ignore[assignment]
+    HAS_YAML = False
+    _YamlLoader = None
+
+# Bump when the table layout changes; older caches are recompiled.
+SCHEMA_VERSION = 1
+
+
+def default_cache_path(yaml_path: Path) -> Path:
+    """
+    Compiled-cache file for ``yaml_path`` inside the application cache.
+
+    Args:
+        yaml_path: GameIndex.yaml location
+
+    Returns:
+        Path of the SQLite file (one per YAML location)
+    """
+    try:
+        from config import get_data_dir as _gdd
+        cache_dir = _gdd() / 'cache' / 'gameindex'
+    except Exception:
+        cache_dir = Path.home() / '.ps2_texture_sorter' / 'cache' / 'gameindex'
+    digest = hashlib.sha1(str(Path(yaml_path).resolve()).encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"{digest}.db"
+
+
+def _file_sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _normalize_crcs(value: Any) -> list:
+    """CRC field (str, int or list of them) as upper-case 8-digit hex strings."""
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    crcs = []
+    for crc in value:
+        if isinstance(crc, int):
+            crcs.append(f"{crc & 0xFFFFFFFF:08X}")
+        elif isinstance(crc, str) and crc.strip():
+            crcs.append(crc.strip().upper())
+    return crcs
+
+
+class GameIndexCache:
+    """
+    Compiled, lazily loaded form of a GameIndex.yaml file.
+
+    The YAML is parsed once and written to SQLite. Later runs check the
+    YAML's size and mtime (and, if those changed, its SHA-256) against the
+    cache and only recompile when the content really changed. ``load()``
+    then fills two dictionaries, serial -> (name, region) and
+    crc -> serial, so lookups are O(1). Full entries stay on disk and are
+    read on demand.
+    """
+
+    def __init__(self, yaml_path: Path, db_path: Optional[Path] = None):
+        """
+        Args:
+            yaml_path: GameIndex.yaml location
+            db_path: Compiled cache file (default: in the application cache)
+        """
+        self.yaml_path = Path(yaml_path)
+        self.db_path = Path(db_path) if db_path else default_cache_path(self.yaml_path)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._serials: Dict[str, Tuple[str, str]] = {}
+        self._crcs: Dict[str, str] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._serials)
+
+    def load(self) -> bool:
+        """
+        Make the in-memory indexes current, compiling the YAML if needed.
+
+        Cheap when already loaded: one ``stat`` of the YAML.
+
+        Returns:
+            True if the index is available
+        """
+        with self._lock:
+            try:
+                st = os.stat(self.yaml_path)
+            except OSError:
+                if not self.loaded:
+                    logger.warning(f"GameIndex not found: {self.yaml_path}")
+                return self.loaded
+            signature = (st.st_size, st.st_mtime_ns)
+            if self.loaded and signature == self._signature:
+                return True
+            try:
+                if not self._is_current(signature):
+                    self._compile(signature)
+                self._read_indexes()
+                self._signature = signature
+                self.loaded = True
+            except Exception as e:
+                logger.error(f"Failed to load GameIndex.yaml: {e}", exc_info=True)
+            return self.loaded
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    def _is_current(self, signature: Tuple[int, int]) -> bool:
+        """Whether the compiled cache matches the YAML described by ``signature``."""
+        if not self.db_path.exists():
+            return False
+        try:
+            conn = self._connect()
+            try:
+                meta = dict(conn.execute('SELECT key, value FROM meta'))
+                if meta.get('schema') != str(SCHEMA_VERSION):
+                    return False
+                if (meta.get('size'), meta.get('mtime_ns')) == tuple(map(str, signature)):
+                    return True
+                # Touched but possibly unchanged (copied, re-extracted): compare content
+                if meta.get('sha256') != _file_sha256(self.yaml_path):
+                    return False
+                with conn:
+                    conn.executemany('UPDATE meta SET value = ? WHERE key = ?',
+                                     [(str(signature[0]), 'size'), (str(signature[1]), 'mtime_ns')])
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"GameIndex cache unreadable, recompiling: {e}")
+            return False
+
+    def _compile(self, signature: Tuple[int, int]) -> None:
+        """Parse the YAML and atomically replace the compiled cache."""
+        if not HAS_YAML:
+            raise RuntimeError("PyYAML not available. Cannot compile GameIndex.yaml")
+        sha256 = _file_sha256(self.yaml_path)
+        with open(self.yaml_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+        if not isinstance(data, dict) or not data:
+            raise ValueError("GameIndex.yaml is empty or invalid")
+
+        games, crcs = [], {}
+        for serial, info in data.items():
+            if not isinstance(info, dict):
+                continue
+            serial = str(serial)
+            games.append((serial, str(info.get('name', 'Unknown')),
+                          str(info.get('region', 'Unknown')),
+                          json.dumps(info, default=str)))
+            for crc in _normalize_crcs(info.get('crc')):
+                # The first game listing a CRC wins, as in file order
+                crcs.setdefault(crc, serial)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.db_path.with_name(self.db_path.name + f'.{os.getpid()}.tmp')
+        tmp_path.unlink(missing_ok=True)
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            with conn:
+                conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+                conn.execute('CREATE TABLE games (serial TEXT PRIMARY KEY, name TEXT, '
+                             'region TEXT, data TEXT)')
+                conn.execute('CREATE TABLE crcs (crc TEXT PRIMARY KEY, serial TEXT)')
+                conn.executemany('INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?)', games)
+                conn.executemany('INSERT INTO crcs VALUES (?, ?)', crcs.items())
+                conn.executemany('INSERT INTO meta VALUES (?, ?)', [
+                    ('schema', str(SCHEMA_VERSION)),
+                    ('size', str(signature[0])),
+                    ('mtime_ns', str(signature[1])),
+                    ('sha256', sha256),
+                    ('source', str(self.yaml_path)),
+                ])
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.db_path)
+        logger.info(f"Compiled {len(games)} games from GameIndex.yaml into {self.db_path.name}")
+
+    def _read_indexes(self) -> None:
+        conn = self._connect()
+        try:
+            self._serials = {
+                serial: (name, region)
+                for serial, name, region in conn.execute('SELECT serial, name, region FROM games')
+            }
+            self._crcs = dict(conn.execute('SELECT crc, serial FROM crcs'))
+        finally:
+            conn.close()
+        logger.info(f"Loaded {len(self._serials)} games from GameIndex cache")
+
+    def lookup_serial(self, serial: str) -> Optional[Tuple[str, str]]:
+        """
+        Args:
+            serial: Serial exactly as keyed in the YAML (e.g. SLUS-20946)
+
+        Returns:
+            (name, region) or None
+        """
+        return self._serials.get(serial)
+
+    def lookup_crc(self, crc: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Args:
+            crc: CRC hex string (any case)
+
+        Returns:
+            (serial, name, region) of the first game listing the CRC, or None
+        """
+        serial = self._crcs.get(crc.upper())
+        if serial is None:
+            return None
+        name, region = self._serials[serial]
+        return serial, name, region
+
+    def entry(self, serial: str) -> Optional[Dict[str, Any]]:
+        """Full YAML entry for ``serial``, read from the compiled cache."""
+        if serial not in self._serials:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT data FROM games WHERE serial = ?', (serial,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Every full YAML entry, keyed by serial (reads the whole cache)."""
+        if not self.loaded:
+            return {}
+        conn = self._connect()
+        try:
+            return {serial: json.loads(data)
+                    for serial, data in conn.execute('SELECT serial, data FROM games')}
+        finally:
+            conn.close()
+
+
+_SHARED: Dict[Path, GameIndexCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_gameindex_cache(yaml_path: Path) -> GameIndexCache:
+    """
+    Process-wide cache for ``yaml_path``, so every identifier shares one
+    set of loaded indexes.
+    """
+    key = Path(yaml_path).resolve()
+    with _SHARED_LOCK:
+        cache = _SHARED.get(key)
+        if cache is None:
+            cache = _SHARED[key] = GameIndexCache(key)
+        return cache
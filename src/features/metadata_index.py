@@ -0,0 +1,521 @@
+"""
+Metadata Index
+Columnar file metadata (size, mtime, resolution, category, format) held in
+NumPy arrays so search criteria evaluate as vectorized boolean masks
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except (ImportError, OSError, RuntimeError):
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+MetadataProvider = Callable[[Path], Dict[str, Any]]
+
+# Substring searches matching fewer rows than 1/SPARSE_MATCH_DIVISOR of the
+# index walk the joined name string; denser ones use a per-row ufunc.
+SPARSE_MATCH_DIVISOR = 16
+
+# mtimes read back from ISO strings (texture database) are rounded to
+# microseconds; differences below this are not treated as a change.
+MTIME_TOLERANCE = 1e-5
+
+
+def _iso_to_timestamp(value: Any) -> float:
+    """POSIX time of an ISO date string (naive = local time), NaN if invalid."""
+    if not value:
+        return math.nan
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except (ValueError, OverflowError, OSError):
+        return math.nan
+
+
+def needs_metadata(criteria) -> bool:
+    """Whether ``criteria`` uses fields that come from a metadata provider."""
+    return any([criteria.categories, criteria.min_width, criteria.max_width,
+                criteria.min_height, criteria.max_height])
+
+
+def needs_stat(criteria) -> bool:
+    """Whether ``criteria`` uses fields that come from ``stat()``."""
+    return (criteria.min_size is not None or criteria.max_size is not None
+            or bool(criteria.modified_after) or bool(criteria.modified_before))
+
+
+class MetadataIndex:
+    """
+    Columnar index of file metadata for fast filtering.
+
+    Rows are appended from a directory scan, a file list or the texture
+    database. Each attribute lives in its own NumPy column (categories and
+    formats as integer codes), so a FilterCriteria compiles to a handful of
+    array comparisons instead of a ``stat()`` and dict lookups per file.
+    Mask results for name searches are cached until the index changes.
+
+    Thread-safe: rows may be added while other threads query.
+    """
+
+    def __init__(self):
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for the metadata index")
+        self._lock = threading.RLock()
+        self.paths: List[Path] = []
+        self._row_of: Dict[Path, int] = {}
+        self._names: List[str] = []
+        self._size: List[int] = []
+        self._mtime: List[float] = []
+        self._width: List[int] = []
+        self._height: List[int] = []
+        self._category: List[int] = []
+        self._format: List[int] = []
+        self._has_meta: List[bool] = []
+        self._statted: List[bool] = []
+        self.categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self.formats: List[str] = []
+        self._format_codes: Dict[str, int] = {}
+        self._columns: Optional[Dict[str, Any]] = None
+        self._name_masks: Dict[Tuple[str, str], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: Path) -> bool:
+        return Path(path) in self._row_of
+
+    # ------------------------------------------------------------------
+    # Population
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _code(value: str, codes: Dict[str, int], values: List[str]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def _row(self, path: Path) -> int:
+        """Row of ``path``, appending an empty one if it is new."""
+        row = self._row_of.get(path)
+        if row is None:
+            row = self._row_of[path] = len(self.paths)
+            self.paths.append(path)
+            self._names.append(path.name)
+            self._size.append(-1)
+            self._mtime.append(math.nan)
+            self._width.append(0)
+            self._height.append(0)
+            self._category.append(-1)
+            self._format.append(self._code(path.suffix.lower(), self._format_codes, self.formats))
+            self._has_meta.append(False)
+            self._statted.append(False)
+        return row
+
+    def _set_stat(self, row: int, size: int, mtime: float) -> None:
+        self._size[row] = size
+        self._mtime[row] = mtime
+        self._statted[row] = True
+
+    def _set_metadata(self, row: int, metadata: Dict[str, Any]) -> None:
+        self._width[row] = int(metadata.get('width') or 0)
+        self._height[row] = int(metadata.get('height') or 0)
+        self._category[row] = self._code(str(metadata.get('category', '') or ''),
+                                         self._category_codes, self.categories)
+        self._has_meta[row] = True
+
+    def _restat(self, row: int) -> bool:
+        """
+        Stat ``row`` again, dropping its metadata if the file changed.
+
+        Returns:
+            True if the row's size or mtime differ from what was indexed
+        """
+        try:
+            st = os.stat(self.paths[row])
+            size, mtime = st.st_size, st.st_mtime
+        except OSError:
+            size, mtime = -1, math.nan
+        if self._statted[row]:
+            old_size, old_mtime = self._size[row], self._mtime[row]
+            same_mtime = ((math.isnan(old_mtime) and math.isnan(mtime)) or
+                          abs(old_mtime - mtime) <= MTIME_TOLERANCE)
+            if old_size == size and same_mtime:
+                return False
+            if self._has_meta[row] and (old_size >= 0 or not math.isnan(old_mtime)):
+                # Resolution/category were read from the old contents
+                self._width[row] = self._height[row] = 0
+                self._category[row] = -1
+                self._has_meta[row] = False
+        self._set_stat(row, size, mtime)
+        return True
+
+    def _changed(self) -> None:
+        self._columns = None
+        self._name_masks.clear()
+
+    def add(self, path: Path, size: Optional[int] = None, mtime: Optional[float] = None,
+            metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add or update one file.
+
+        Args:
+            path: File path
+            size: Size in bytes (None: unknown)
+            mtime: Modification time as POSIX seconds
+            metadata: Dict with optional 'width', 'height', 'category'
+        """
+        with self._lock:
+            row = self._row(Path(path))
+            if size is not None:
+                self._set_stat(row, int(size), math.nan if mtime is None else float(mtime))
+            if metadata is not None:
+                self._set_metadata(row, metadata)
+            self._changed()
+
+    def remove(self, paths: Iterable[Path]) -> None:
+        """Drop rows for files that were deleted or moved."""
+        with self._lock:
+            drop = {self._row_of[p] for p in map(Path, paths) if p in self._row_of}
+            if not drop:
+                return
+            keep = [i for i in range(len(self.paths)) if i not in drop]
+            for name in ('paths', '_names', '_size', '_mtime', '_width', '_height',
+                         '_category', '_format', '_has_meta', '_statted'):
+                column = getattr(self, name)
+                setattr(self, name, [column[i] for i in keep])
+            self._row_of = {path: i for i, path in enumerate(self.paths)}
+            self._changed()
+
+    def add_directory(self, root: Path, extensions: Optional[Set[str]] = None,
+                      recursive: bool = True) -> int:
+        """
+        Scan ``root`` with ``os.scandir`` and index every matching file.
+
+        Args:
+            root: Directory to scan
+            extensions: Lower-case suffixes to include (None: all files)
+            recursive: Descend into sub-directories
+
+        Returns:
+            Number of files indexed
+        """
+        added = 0
+        stack = [str(root)]
+        with self._lock:
+            while stack:
+                current = stack.pop()
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if recursive:
+                                        stack.append(entry.path)
+                                    continue
+                                if (extensions is not None and
+                                        os.path.splitext(entry.name)[1].lower() not in extensions):
+                                    continue
+                                if not entry.is_file():
+                                    continue
+                                st = entry.stat()
+                            except OSError:
+                                continue
+                            self._set_stat(self._row(Path(entry.path)), st.st_size, st.st_mtime)
+                            added += 1
+                except OSError as e:
+                    logger.warning(f"Cannot scan {current}: {e}")
+            self._changed()
+        return added
+
+    def add_texture_db(self, texture_db) -> int:
+        """
+        Index every texture recorded in a :class:`TextureDatabase`.
+
+        Size, resolution and category come from the database; the
+        ``date_modified`` column supplies the modification time.
+
+        Returns:
+            Number of rows read
+        """
+        rows = texture_db.conn.execute(
+            'SELECT file_path, file_size, width, height, category, date_modified FROM textures'
+        ).fetchall()
+        with self._lock:
+            for file_path, size, width, height, category, modified in rows:
+                row = self._row(Path(file_path))
+                self._set_stat(row, -1 if size is None else int(size), _iso_to_timestamp(modified))
+                self._set_metadata(row, {'width': width, 'height': height, 'category': category})
+            self._changed()
+        return len(rows)
+
+    def ensure(self, files: List[Path], stat: bool = False,
+               metadata_provider: Optional[MetadataProvider] = None):
+        """
+        Row numbers for ``files``, indexing any that are missing.
+
+        Args:
+            files: Files to look up (order preserved)
+            stat: Stat the rows (see below)
+            metadata_provider: Called for rows without metadata
+
+        When ``stat`` or ``metadata_provider`` is given every row is stat'ed
+        once per call, so a file changed since it was indexed gets its new
+        size and mtime and has its metadata fetched again.
+
+        Returns:
+            int64 array of row numbers
+        """
+        with self._lock:
+            rows = np.fromiter((self._row(p if isinstance(p, Path) else Path(p)) for p in files),
+                               dtype=np.int64, count=len(files))
+            changed = len(self.paths) != (0 if self._columns is None else self._columns['n'])
+            if stat or metadata_provider is not None:
+                for row in np.unique(rows).tolist():
+                    if self._restat(row):
+                        changed = True
+                    if metadata_provider is not None and not self._has_meta[row]:
+                        try:
+                            metadata = metadata_provider(self.paths[row])
+                        except Exception as e:
+                            # Like the per-file path: this row just has no metadata
+                            logger.debug(f"Metadata provider failed for {self.paths[row]}: {e}")
+                            continue
+                        if metadata:
+                            self._set_metadata(row, metadata)
+                            changed = True
+            if changed:
+                self._changed()
+            return rows
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def refresh(self, paths: Optional[Iterable[Path]] = None) -> int:
+        """
+        Stat indexed files again and invalidate the ones that changed.
+
+        Whole-index queries (``SearchFilter.search(None, ...)``) read the
+        stored columns without touching the disk; call this when files may
+        have been edited since they were indexed.
+
+        Args:
+            paths: Files to check (None: every indexed file)
+
+        Returns:
+            Number of rows whose size or mtime changed
+        """
+        with self._lock:
+            if paths is None:
+                rows = range(len(self.paths))
+            else:
+                rows = [self._row_of[p] for p in map(Path, paths) if p in self._row_of]
+            changed = sum(1 for row in rows if self._restat(row))
+            if changed:
+                self._changed()
+        return changed
+
+    def _freeze(self) -> Dict[str, Any]:
+        """Column arrays for the current rows (rebuilt after changes)."""
+        if self._columns is None:
+            names_lower = [name.lower() for name in self._names]
+            lengths = np.fromiter(map(len, names_lower), dtype=np.int64, count=len(names_lower))
+            offsets = np.zeros(len(names_lower) + 1, dtype=np.int64)
+            np.cumsum(lengths + 1, out=offsets[1:])
+            self._columns = {
+                'n': len(self.paths),
+                'names_lower': names_lower,
+                'joined': '\n'.join(names_lower),
+                'offsets': offsets,
+                'size': np.array(self._size, dtype=np.int64),
+                'mtime': np.array(self._mtime, dtype=np.float64),
+                'width': np.array(self._width, dtype=np.int64),
+                'height': np.array(self._height, dtype=np.int64),
+                'category': np.array(self._category, dtype=np.int32),
+                'format': np.array(self._format, dtype=np.int32),
+                'has_meta': np.array(self._has_meta, dtype=bool),
+            }
+        return self._columns
+
+    def _contains_mask(self, cols: Dict[str, Any], needle: str):
+        """Rows whose lower-cased name contains ``needle``."""
+        n = cols['n']
+        joined = cols['joined']
+        if '\n' in needle:
+            return np.zeros(n, dtype=bool)
+        if not needle:
+            return np.ones(n, dtype=bool)
+        if joined.count(needle) * SPARSE_MATCH_DIVISOR <= n:
+            # Few hits: C-speed find over one string, then map offsets to rows
+            hits = []
+            pos = joined.find(needle)
+            while pos >= 0:
+                hits.append(pos)
+                pos = joined.find(needle, pos + 1)
+            mask = np.zeros(n, dtype=bool)
+            if hits:
+                mask[np.searchsorted(cols['offsets'], hits, side='right') - 1] = True
+            return mask
+        names = cols.get('names_array')
+        if names is None:
+            names = cols['names_array'] = np.array(cols['names_lower'])
+        finder = np.strings.find if hasattr(np, 'strings') else np.char.find
+        return finder(names, needle) >= 0
+
+    def _name_mask(self, cols: Dict[str, Any], kind: str, value: str):
+        key = (kind, value)
+        mask = self._name_masks.get(key)
+        if mask is None:
+            if kind == 'name':
+                mask = self._contains_mask(cols, value.lower())
+            else:
+                pattern = re.compile(value, re.IGNORECASE)
+                mask = np.fromiter((pattern.search(name) is not None for name in self._names),
+                                   dtype=bool, count=cols['n'])
+            self._name_masks[key] = mask
+        return mask
+
+    def mask(self, criteria, combine_mode: str = "AND", rows=None,
+             favorites: Optional[Set[Path]] = None,
+             problematic: Optional[Set[Path]] = None):
+        """
+        Evaluate ``criteria`` as one boolean mask.
+
+        Semantics follow ``SearchFilter``: category and resolution criteria
+        only apply to rows that have metadata, a failed ``stat()`` fails the
+        size and date criteria, and no criteria at all matches everything.
+        One difference: a timezone-aware date is compared as a point in
+        time, where the per-file path fails the whole row (it cannot
+        compare an aware date with a naive mtime).
+
+        Args:
+            criteria: FilterCriteria to evaluate
+            combine_mode: "AND" or "OR"
+            rows: Row numbers to evaluate (None: every row)
+            favorites: Favorite paths for ``is_favorite``
+            problematic: Problematic paths for ``is_problematic``
+
+        Returns:
+            Boolean array, one entry per requested row
+        """
+        with self._lock:
+            cols = self._freeze()
+            if rows is None:
+                count = cols['n']
+
+                def take(column):
+                    return column
+            else:
+                count = len(rows)
+
+                def take(column):
+                    return column[rows]
+            # (mask, applies) per criterion; applies None = applies to every row
+            terms: List[Tuple[Any, Any]] = []
+
+            if criteria.name is not None:
+                terms.append((take(self._name_mask(cols, 'name', criteria.name)), None))
+
+            if criteria.name_regex is not None:
+                try:
+                    terms.append((take(self._name_mask(cols, 'regex', criteria.name_regex)), None))
+                except re.error as e:
+                    logger.warning(f"Invalid regex pattern '{criteria.name_regex}': {e}")
+                    terms.append((np.zeros(count, dtype=bool), None))
+
+            if criteria.min_size is not None or criteria.max_size is not None:
+                size = take(cols['size'])
+                known = size >= 0
+                if criteria.min_size is not None:
+                    terms.append((known & (size >= criteria.min_size), None))
+                if criteria.max_size is not None:
+                    terms.append((known & (size <= criteria.max_size), None))
+
+            if criteria.formats is not None:
+                codes = [self._format_codes[f.lower()] for f in criteria.formats
+                         if f.lower() in self._format_codes]
+                terms.append((np.isin(take(cols['format']), codes), None))
+
+            if needs_metadata(criteria):
+                has_meta = take(cols['has_meta'])
+                if criteria.categories is not None:
+                    codes = [self._category_codes[c] for c in criteria.categories
+                             if c in self._category_codes]
+                    terms.append((np.isin(take(cols['category']), codes), has_meta))
+                width = take(cols['width'])
+                height = take(cols['height'])
+                for bound, column, upper in ((criteria.min_width, width, False),
+                                             (criteria.max_width, width, True),
+                                             (criteria.min_height, height, False),
+                                             (criteria.max_height, height, True)):
+                    if bound is not None:
+                        terms.append(((column <= bound) if upper else (column >= bound), has_meta))
+
+            for flag, marked in ((criteria.is_favorite, favorites),
+                                 (criteria.is_problematic, problematic)):
+                if flag is not None:
+                    member = np.zeros(cols['n'], dtype=bool)
+                    marked_rows = [self._row_of[p] for p in (marked or ()) if p in self._row_of]
+                    member[marked_rows] = True
+                    terms.append((take(member) == flag, None))
+
+            for bound, after in ((criteria.modified_after, True),
+                                 (criteria.modified_before, False)):
+                if bound:
+                    limit = _iso_to_timestamp(bound)
+                    if math.isnan(limit):
+                        # As in the per-file path: an unparsable date is one
+                        # failed term and an invalid modified_after also
+                        # skips modified_before.
+                        terms.append((np.zeros(count, dtype=bool), None))
+                        break
+                    mtime = take(cols['mtime'])
+                    # NaN (unknown or failed stat) compares False both ways
+                    terms.append(((mtime >= limit) if after else (mtime <= limit), None))
+
+        if not terms:
+            return np.ones(count, dtype=bool)
+        if combine_mode.upper() == "OR":
+            result = np.zeros(count, dtype=bool)
+            unconditional = False
+            evaluated = np.zeros(count, dtype=bool)
+            for mask, applies in terms:
+                if applies is None:
+                    result |= mask
+                    unconditional = True
+                else:
+                    result |= mask & applies
+                    evaluated |= applies
+            if not unconditional:
+                # Rows where nothing applied had no criteria: match all
+                result |= ~evaluated
+            return result
+        result = np.ones(count, dtype=bool)
+        for mask, applies in terms:
+            result &= mask if applies is None else (mask | ~applies)
+        return result
+
+    def query(self, criteria, combine_mode: str = "AND",
+              favorites: Optional[Set[Path]] = None,
+              problematic: Optional[Set[Path]] = None) -> List[Path]:
+        """Every indexed path matching ``criteria``, in index order."""
+        mask = self.mask(criteria, combine_mode, None, favorites, problematic)
+        paths = self.paths
+        return [paths[i] for i in np.flatnonzero(mask).tolist()]
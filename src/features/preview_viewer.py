@@ -18,6 +18,14 @@ except (ImportError, OSError, RuntimeError):
 
 import os
 
+try:
+    from utils.cache_manager import load_image
+except ImportError:
+    try:
+        from ..utils.cache_manager import load_image
+    except ImportError:
+        load_image = None
+
 logger = logging.getLogger(__name__)
 
 # Try to import GUI libraries
@@ -324,18 +332,31 @@ class PreviewViewer:
                     logger.debug(f"Error closing original_image: {e}")
                 self.original_image = None
             
-            # Handle DDS files with special support
-            if file_path.suffix.lower() == '.dds':
+            # Decoded images are shared through the image cache, so stepping
+            # back and forth through a folder does not decode again
+            if load_image is not None:
                 try:
-                    self.original_image = Image.open(file_path)
-                    if self.original_image.mode not in ('RGB', 'RGBA'):
+                    self.original_image = load_image(file_path)
+                    if (file_path.suffix.lower() == '.dds'
+                            and self.original_image.mode not in ('RGB', 'RGBA')):
                         self.original_image = self.original_image.convert('RGBA')
-                except Exception as dds_error:
-                    logger.warning(f"DDS direct load failed, trying conversion: {dds_error}")
-                    img = Image.open(file_path)
-                    self.original_image = img.convert('RGBA')
-            else:
-                self.original_image = Image.open(file_path)
+                except Exception as cache_error:
+                    logger.debug(f"Cached load failed, opening directly: {cache_error}")
+                    self.original_image = None
+            
+            if self.original_image is None:
+                # Handle DDS files with special support
+                if file_path.suffix.lower() == '.dds':
+                    try:
+                        self.original_image = Image.open(file_path)
+                        if self.original_image.mode not in ('RGB', 'RGBA'):
+                            self.original_image = self.original_image.convert('RGBA')
+                    except Exception as dds_error:
+                        logger.warning(f"DDS direct load failed, trying conversion: {dds_error}")
+                        img = Image.open(file_path)
+                        self.original_image = img.convert('RGBA')
+                else:
+                    self.original_image = Image.open(file_path)
             
             self.zoom_level = 1.0
             
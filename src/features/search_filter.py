@@ -13,6 +13,8 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from threading import Lock
 
+from .metadata_index import HAS_NUMPY, MetadataIndex, needs_metadata, needs_stat
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +60,7 @@ class SearchFilter:
     - Save/load search presets
     - Quick filters (favorites, recent, problematic)
     - Combine multiple filters with AND/OR logic
+    - Vectorized evaluation over a columnar MetadataIndex (with NumPy)
     - Thread-safe operations
     """
     
@@ -73,14 +76,26 @@ class SearchFilter:
         self.recent_files: List[Path] = []
         self.favorites: Set[Path] = set()
         self.problematic: Set[Path] = set()
+        self.index: Optional[MetadataIndex] = None
         self._lock = Lock()
         
         logger.debug(f"SearchFilter initialized with presets_file={self.presets_file}")
         self._load_presets()
     
+    def set_index(self, index: Optional[MetadataIndex]) -> None:
+        """
+        Use a populated MetadataIndex for searches.
+
+        Files passed to ``search`` that are not in the index are added to it
+        on first use. Searches over a file list stat each file once to pick
+        up changes; ``search(None, ...)`` uses the stored values until
+        ``index.refresh()`` is called.
+        """
+        self.index = index
+
     def search(
         self,
-        files: List[Path],
+        files: Optional[List[Path]],
         criteria: FilterCriteria,
         combine_mode: str = "AND",
         metadata_provider: Optional[Callable[[Path], Dict[str, Any]]] = None
@@ -88,8 +103,12 @@ class SearchFilter:
         """
         Search and filter files based on criteria.
         
+        With NumPy available the criteria are evaluated as boolean masks
+        over a columnar index: each file is stat'ed (and its metadata
+        fetched) at most once, and only when a criterion needs it.
+        
         Args:
-            files: List of file paths to search
+            files: List of file paths to search (None: every file in the index)
             criteria: Filter criteria to apply
             combine_mode: How to combine filters ("AND" or "OR")
             metadata_provider: Optional function to get file metadata
@@ -98,12 +117,18 @@ class SearchFilter:
             List of file paths matching the criteria
         """
         try:
-            logger.debug(f"Searching {len(files)} files with combine_mode={combine_mode}")
-            results = []
-            
-            for file_path in files:
-                if self._matches_criteria(file_path, criteria, combine_mode, metadata_provider):
-                    results.append(file_path)
+            mask = self._criteria_mask(files, criteria, combine_mode, metadata_provider)
+            if mask is not None:
+                if files is None:
+                    files = self.index.paths
+                results = [files[i] for i in mask.nonzero()[0].tolist()]
+            else:
+                files = files or []
+                logger.debug(f"Searching {len(files)} files with combine_mode={combine_mode}")
+                results = [
+                    file_path for file_path in files
+                    if self._matches_criteria(file_path, criteria, combine_mode, metadata_provider)
+                ]
             
             logger.info(f"Search found {len(results)} matching files out of {len(files)}")
             return results
@@ -112,6 +137,33 @@ class SearchFilter:
             logger.error(f"Error during search: {e}", exc_info=True)
             return []
     
+    def _criteria_mask(
+        self,
+        files: Optional[List[Path]],
+        criteria: FilterCriteria,
+        combine_mode: str,
+        metadata_provider: Optional[Callable[[Path], Dict[str, Any]]],
+        index: Optional[MetadataIndex] = None
+    ):
+        """Boolean mask over ``files`` from the columnar index, or None without NumPy."""
+        if not HAS_NUMPY:
+            return None
+        if index is None:
+            index = self.index
+        if files is None:
+            if index is None:
+                raise ValueError("search(files=None) requires an index (see set_index)")
+            rows = None
+        else:
+            # Without a shared index a private one still stats each file once
+            index = index if index is not None else MetadataIndex()
+            provider = metadata_provider if needs_metadata(criteria) else None
+            rows = index.ensure(files, stat=needs_stat(criteria), metadata_provider=provider)
+        with self._lock:
+            favorites = set(self.favorites)
+            problematic = set(self.problematic)
+        return index.mask(criteria, combine_mode, rows, favorites, problematic)
+    
     def _matches_criteria(
         self,
         file_path: Path,
@@ -474,6 +526,22 @@ class SearchFilter:
             if not criteria_list:
                 return files
             
+            if HAS_NUMPY:
+                # Combine the per-criteria masks; results keep input order
+                index = self.index if self.index is not None else MetadataIndex()
+                combined = None
+                for criteria in criteria_list:
+                    mask = self._criteria_mask(files, criteria, "AND", metadata_provider, index)
+                    if combined is None:
+                        combined = mask
+                    elif mode.upper() == "OR":
+                        combined |= mask
+                    else:
+                        combined &= mask
+                if files is None:
+                    files = index.paths
+                return list(dict.fromkeys(files[i] for i in combined.nonzero()[0].tolist()))
+            
             results_list = [
                 self.search(files, criteria, "AND", metadata_provider)
                 for criteria in criteria_list
@@ -6,15 +6,174 @@ Author: Dead On The Inside / JosephsDeadish
 
 import json
 import csv
+import math
 import time
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from html import escape
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distinct categories / error types counted individually; further keys are
+# folded into OTHER_KEY so the counters stay a fixed size.
+MAX_TRACKED_KEYS = 512
+OTHER_KEY = '(other)'
+# Errors kept in memory for the summary; the event log holds all of them.
+RECENT_ERRORS = 100
+# Seconds covered by the rolling throughput window.
+THROUGHPUT_WINDOW = 60
+# Seconds between automatic counter snapshots in the event log.
+SNAPSHOT_INTERVAL = 30.0
+# Older session logs beyond this many are deleted.
+MAX_EVENT_LOGS = 20
+# Error rows shown in the HTML report (most recent).
+HTML_ERROR_ROWS = 500
+
+
+class LatencyDigest:
+    """
+    Merging t-digest for streaming percentile estimates.
+
+    Values are buffered and periodically merged into at most about
+    ``compression`` centroids, with small centroids near the tails so
+    p90/p99 stay accurate. Memory is constant regardless of how many
+    values are added.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self._centroids: List[List[float]] = []  # [mean, weight], sorted by mean
+        self._buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add ``value`` (with ``weight`` observations)."""
+        if weight <= 0:
+            return
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._merge()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        return (math.sin(min(k, self.compression / 4) * 2 * math.pi / self.compression) + 1) / 2
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted([(m, w) for m, w in self._centroids] + self._buffer)
+        self._buffer = []
+        total = self.count
+        merged: List[List[float]] = []
+        cumulative = 0.0
+        mean, weight = items[0]
+        limit = self._k_inverse(self._k(0.0) + 1) * total
+        for m, w in items[1:]:
+            if cumulative + weight + w <= limit:
+                weight += w
+                mean += (m - mean) * w / weight
+            else:
+                merged.append([mean, weight])
+                cumulative += weight
+                limit = self._k_inverse(self._k(cumulative / total) + 1) * total
+                mean, weight = m, w
+        merged.append([mean, weight])
+        self._centroids = merged
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile ``q`` (0-1); 0.0 when empty."""
+        self._merge()
+        centroids = self._centroids
+        if not centroids:
+            return 0.0
+        if len(centroids) == 1:
+            return centroids[0][0]
+        target = min(max(q, 0.0), 1.0) * self.count
+        # Interpolate between centroid centres; the ends run to min/max
+        previous_center, previous_mean = 0.0, self.min
+        cumulative = 0.0
+        for mean, weight in centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                frac = (target - previous_center) / span if span > 0 else 0.0
+                return previous_mean + frac * (mean - previous_mean)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+        span = self.count - previous_center
+        frac = (target - previous_center) / span if span > 0 else 1.0
+        return previous_mean + frac * (self.max - previous_mean)
+
+
+class RollingWindow:
+    """Files and bytes per second over the last ``seconds`` seconds, O(1) reads."""
+
+    def __init__(self, seconds: int = THROUGHPUT_WINDOW):
+        self.seconds = seconds
+        self._buckets: deque = deque()  # [second, files, bytes]
+        self.files = 0
+        self.bytes = 0
+
+    def _evict(self, now: float) -> None:
+        horizon = int(now) - self.seconds
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= horizon:
+            _, files, nbytes = buckets.popleft()
+            self.files -= files
+            self.bytes -= nbytes
+
+    def add(self, now: float, files: int, nbytes: int) -> None:
+        second = int(now)
+        self._evict(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            bucket = self._buckets[-1]
+            bucket[1] += files
+            bucket[2] += nbytes
+        else:
+            self._buckets.append([second, files, nbytes])
+        self.files += files
+        self.bytes += nbytes
+
+    def rates(self, now: float, started: float) -> Tuple[float, float]:
+        """(files/sec, bytes/sec) over the window (or since ``started`` if shorter)."""
+        self._evict(now)
+        span = min(float(self.seconds), now - started)
+        if span <= 0:
+            return 0.0, 0.0
+        return self.files / span, self.bytes / span
+
+
+def _default_log_dir() -> Path:
+    try:
+        from config import get_data_dir as _gdd
+        return _gdd() / 'statistics'
+    except Exception:
+        return Path.home() / '.ps2_texture_sorter' / 'statistics'
+
+
+def _prune_event_logs(log_dir: Path, keep: int = MAX_EVENT_LOGS) -> None:
+    """Delete all but the newest ``keep`` session logs in ``log_dir``."""
+    try:
+        logs = sorted(log_dir.glob('*.ndjson'), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for old in logs[keep:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
 
 class StatisticsTracker:
     """
@@ -27,14 +186,25 @@ class StatisticsTracker:
     - Error logging and recovery stats
     - Historical data persistence
     - Multi-format reporting (JSON, CSV, HTML)
+    
+    Memory stays constant however many files are recorded: throughput
+    uses a rolling per-second window, latency percentiles a t-digest, and
+    category/error counters are capped. Every event is appended to an
+    on-disk log (NDJSON) from which the exports stream per-file detail.
+    Progress reads (ETA, percentage, throughput) are O(1).
     """
     
-    def __init__(self, session_name: Optional[str] = None):
+    def __init__(self, session_name: Optional[str] = None,
+                 event_log_path: Optional[Path] = None,
+                 snapshot_interval: float = SNAPSHOT_INTERVAL):
         """
         Initialize statistics tracker.
         
         Args:
             session_name: Optional name for this processing session
+            event_log_path: Append-only event log (default: one file per
+                session in the application data folder)
+            snapshot_interval: Seconds between counter snapshots in the log
         """
         self.session_name = session_name or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.start_time = time.time()
@@ -51,13 +221,15 @@ class StatisticsTracker:
         self.category_counts: Dict[str, int] = defaultdict(int)
         self.category_sizes: Dict[str, int] = defaultdict(int)
         
-        # Error tracking
-        self.errors: List[Dict[str, Any]] = []
+        # Error tracking (recent errors only; all of them are in the event log)
+        self.errors: deque = deque(maxlen=RECENT_ERRORS)
         self.error_types: Dict[str, int] = defaultdict(int)
         
         # Performance tracking
         self.processing_times: deque = deque(maxlen=100)  # Last 100 processing times
-        self.throughput_history: deque = deque(maxlen=60)  # Last 60 seconds
+        self._processing_time_sum = 0.0
+        self.latency = LatencyDigest()
+        self.throughput_window = RollingWindow()
         
         # File size tracking
         self.total_bytes_processed = 0
@@ -67,8 +239,121 @@ class StatisticsTracker:
         self.history: List[Dict[str, Any]] = []
         self.checkpoints: List[Dict[str, Any]] = []
         
+        # Event log, opened on the first event
+        self.event_log_path = Path(event_log_path) if event_log_path else (
+            _default_log_dir() / f"{self.session_name}.ndjson")
+        self._prune_logs = event_log_path is None
+        self._log_file = None
+        self._log_failed = False
+        self._log_lock = threading.Lock()
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot = self.start_time
+        
         logger.info(f"Statistics tracker initialized for session: {self.session_name}")
     
+    # ------------------------------------------------------------------
+    # Event log
+    # ------------------------------------------------------------------
+    
+    def _write_event(self, event: Dict[str, Any]) -> None:
+        """Append one event to the log (buffered; see flush())."""
+        if self._log_failed:
+            return
+        with self._log_lock:
+            try:
+                if self._log_file is None:
+                    self.event_log_path.parent.mkdir(parents=True, exist_ok=True)
+                    if self._prune_logs:
+                        _prune_event_logs(self.event_log_path.parent, MAX_EVENT_LOGS - 1)
+                    self._log_file = open(self.event_log_path, 'a', encoding='utf-8',
+                                          buffering=64 * 1024)
+                self._log_file.write(json.dumps(event, ensure_ascii=False, default=str,
+                                                separators=(',', ':')) + '\n')
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Statistics event log disabled ({self.event_log_path}): {e}")
+                self._log_failed = True
+    
+    def flush(self) -> None:
+        """Write buffered events to disk."""
+        with self._log_lock:
+            if self._log_file is not None:
+                try:
+                    self._log_file.flush()
+                except OSError as e:
+                    logger.warning(f"Could not flush statistics event log: {e}")
+    
+    def close(self) -> None:
+        """Snapshot the counters and close the event log."""
+        if self._log_file is not None:
+            self._write_snapshot(time.time())
+        with self._log_lock:
+            if self._log_file is not None:
+                try:
+                    self._log_file.close()
+                except OSError:
+                    pass
+                self._log_file = None
+    
+    def iter_events(self, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream events back from the log.
+        
+        Args:
+            kind: Only events of this kind ('file', 'batch', 'skip',
+                'error', 'snapshot', 'checkpoint'); None for all
+        """
+        self.flush()
+        try:
+            f = open(self.event_log_path, 'r', encoding='utf-8')
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if kind is None or event.get('e') == kind:
+                    yield event
+    
+    def _write_snapshot(self, now: float) -> None:
+        self._last_snapshot = now
+        self._write_event({
+            'e': 'snapshot', 't': now,
+            'total': self.total_files, 'processed': self.processed_files,
+            'success': self.success_count, 'skipped': self.skipped_files,
+            'errors': self.error_count, 'bytes': self.total_bytes_processed,
+        })
+    
+    def _tick(self, now: float) -> None:
+        self.last_update_time = now
+        if now - self._last_snapshot >= self.snapshot_interval:
+            self._write_snapshot(now)
+    
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _bounded_key(counter: Dict[str, int], key: str) -> str:
+        """``key``, or OTHER_KEY once the counter holds MAX_TRACKED_KEYS keys."""
+        if key in counter or len(counter) < MAX_TRACKED_KEYS:
+            return key
+        return OTHER_KEY
+    
+    def _push_time(self, processing_time: float, weight: int = 1) -> None:
+        times = self.processing_times
+        if len(times) == times.maxlen:
+            self._processing_time_sum -= times[0]
+        times.append(processing_time)
+        self._processing_time_sum += processing_time
+        self.latency.add(processing_time, weight)
+    
+    def _add_error(self, entry: Dict[str, Any], key: str) -> None:
+        self.errors.append(entry)
+        self.error_types[self._bounded_key(self.error_types, key)] += 1
+        self._write_event({'e': 'error', **entry})
+    
     def set_total_files(self, count: int) -> None:
         """
         Set the total number of files to process.
@@ -97,27 +382,36 @@ class StatisticsTracker:
             success: Whether processing succeeded
             error: Error message if failed
         """
+        now = time.time()
         self.processed_files += 1
         
         if success:
             self.success_count += 1
-            self.category_counts[category] += 1
-            self.category_sizes[category] += file_size
+            key = self._bounded_key(self.category_counts, category)
+            self.category_counts[key] += 1
+            self.category_sizes[key] += file_size
             self.total_bytes_processed += file_size
+            self.throughput_window.add(now, 1, file_size)
         else:
             self.error_count += 1
-            if error:
-                self.errors.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'category': category,
-                    'error': error,
-                    'file_size': file_size
-                })
-                self.error_types[error] += 1
+            self.throughput_window.add(now, 1, 0)
+        
+        event = {'e': 'file', 't': now, 'c': category, 's': file_size,
+                 'd': processing_time, 'ok': success}
+        if error:
+            event['err'] = error
+        self._write_event(event)
+        if not success and error:
+            self._add_error({
+                'timestamp': datetime.fromtimestamp(now).isoformat(),
+                'category': category,
+                'error': error,
+                'file_size': file_size
+            }, error)
         
         # Update performance metrics
-        self.processing_times.append(processing_time)
-        self.last_update_time = time.time()
+        self._push_time(processing_time)
+        self._tick(now)
         
         # Update average file size
         if self.success_count > 0:
@@ -143,24 +437,30 @@ class StatisticsTracker:
         """
         if count <= 0:
             return
+        now = time.time()
         total_bytes = avg_file_size * count
         self.processed_files += count
         self.success_count += count
-        self.category_counts[category] += count
-        self.category_sizes[category] += total_bytes
+        key = self._bounded_key(self.category_counts, category)
+        self.category_counts[key] += count
+        self.category_sizes[key] += total_bytes
         self.total_bytes_processed += total_bytes
+        self.throughput_window.add(now, count, total_bytes)
         if count > 0:
             self.average_file_size = self.total_bytes_processed // self.success_count
         per_file = total_elapsed / count if total_elapsed > 0 and count > 0 else 0.0
         # Store a single representative timing entry rather than N duplicate values
         if per_file > 0:
-            self.processing_times.append(per_file)
-        self.last_update_time = time.time()
+            self._push_time(per_file, count)
+        self._write_event({'e': 'batch', 't': now, 'n': count, 'c': category,
+                           's': total_bytes, 'd': total_elapsed})
+        self._tick(now)
 
     def record_skipped(self) -> None:
         """Record a file that was skipped."""
         self.skipped_files += 1
         self.processed_files += 1
+        self._write_event({'e': 'skip', 't': time.time()})
     
     def record_error(self, error_type: str, details: str, context: Optional[Dict] = None) -> None:
         """
@@ -178,8 +478,7 @@ class StatisticsTracker:
             'details': details,
             'context': context or {}
         }
-        self.errors.append(error_entry)
-        self.error_types[error_type] += 1
+        self._add_error(error_entry, error_type)
         logger.error(f"Error recorded: {error_type} - {details}")
     
     def calculate_eta(self) -> Tuple[Optional[timedelta], float]:
@@ -198,7 +497,7 @@ class StatisticsTracker:
         
         # Calculate rate using moving average of recent processing times
         if len(self.processing_times) > 0:
-            avg_time_per_file = sum(self.processing_times) / len(self.processing_times)
+            avg_time_per_file = self._processing_time_sum / len(self.processing_times)
             rate = 1.0 / avg_time_per_file if avg_time_per_file > 0 else 0.0
         else:
             elapsed = time.time() - self.start_time
@@ -226,19 +525,38 @@ class StatisticsTracker:
         Calculate current throughput metrics.
         
         Returns:
-            Dictionary with files/sec and MB/sec
+            Dictionary with files/sec and MB/sec over the whole session and
+            over the rolling window ('recent_*')
         """
-        elapsed = time.time() - self.start_time
+        now = time.time()
+        elapsed = now - self.start_time
         
         if elapsed == 0:
-            return {'files_per_second': 0.0, 'mb_per_second': 0.0}
+            return {'files_per_second': 0.0, 'mb_per_second': 0.0,
+                    'recent_files_per_second': 0.0, 'recent_mb_per_second': 0.0}
         
         files_per_second = self.processed_files / elapsed
         mb_per_second = (self.total_bytes_processed / (1024 * 1024)) / elapsed
+        recent_files, recent_bytes = self.throughput_window.rates(now, self.start_time)
         
         return {
             'files_per_second': round(files_per_second, 2),
-            'mb_per_second': round(mb_per_second, 2)
+            'mb_per_second': round(mb_per_second, 2),
+            'recent_files_per_second': round(recent_files, 2),
+            'recent_mb_per_second': round(recent_bytes / (1024 * 1024), 2)
+        }
+    
+    def get_latency_percentiles(self) -> Dict[str, float]:
+        """
+        Processing-time percentiles over the whole session.
+        
+        Returns:
+            Dictionary with p50, p90 and p99 in seconds
+        """
+        return {
+            'p50': round(self.latency.quantile(0.50), 4),
+            'p90': round(self.latency.quantile(0.90), 4),
+            'p99': round(self.latency.quantile(0.99), 4),
         }
     
     def create_checkpoint(self, label: Optional[str] = None) -> None:
@@ -257,6 +575,7 @@ class StatisticsTracker:
             'elapsed': time.time() - self.start_time
         }
         self.checkpoints.append(checkpoint)
+        self._write_event({'e': 'checkpoint', **checkpoint})
         logger.info(f"Checkpoint created: {checkpoint['label']}")
     
     def get_summary(self) -> Dict[str, Any]:
@@ -269,6 +588,7 @@ class StatisticsTracker:
         elapsed = time.time() - self.start_time
         eta, rate = self.calculate_eta()
         throughput = self.get_throughput()
+        percentiles = self.get_latency_percentiles()
         
         return {
             'session': {
@@ -289,9 +609,14 @@ class StatisticsTracker:
             'performance': {
                 'files_per_second': throughput['files_per_second'],
                 'mb_per_second': throughput['mb_per_second'],
+                'recent_files_per_second': throughput['recent_files_per_second'],
+                'recent_mb_per_second': throughput['recent_mb_per_second'],
                 'avg_processing_time': round(
-                    sum(self.processing_times) / len(self.processing_times), 4
+                    self._processing_time_sum / len(self.processing_times), 4
                 ) if self.processing_times else 0.0,
+                'p50_processing_time': percentiles['p50'],
+                'p90_processing_time': percentiles['p90'],
+                'p99_processing_time': percentiles['p99'],
                 'eta_seconds': eta.total_seconds() if eta else None,
                 'eta_formatted': str(eta) if eta else 'N/A'
             },
@@ -317,10 +642,19 @@ class StatisticsTracker:
             'errors': {
                 'total': self.error_count,
                 'by_type': dict(self.error_types),
-                'recent': self.errors[-10:] if self.errors else []
+                'recent': list(self.errors)[-10:]
             }
         }
     
+    def _logged_errors(self) -> Iterator[Dict[str, Any]]:
+        """Every recorded error: from the event log, or the recent ones if it is unavailable."""
+        if self._log_failed or not self.event_log_path.exists():
+            yield from list(self.errors)
+            return
+        for event in self.iter_events('error'):
+            event.pop('e', None)
+            yield event
+    
     def export_json(self, output_path: Path) -> None:
         """
         Export statistics to JSON format.
@@ -331,10 +665,10 @@ class StatisticsTracker:
         try:
             summary = self.get_summary()
             summary['checkpoints'] = self.checkpoints
-            summary['all_errors'] = self.errors
+            summary['all_errors'] = list(self._logged_errors())
             
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+                json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
             
             logger.info(f"Statistics exported to JSON: {output_path}")
         except Exception as e:
@@ -392,6 +726,20 @@ class StatisticsTracker:
                     writer.writerow(['Type', 'Count'])
                     for error_type, count in summary['errors']['by_type'].items():
                         writer.writerow([error_type, count])
+                    writer.writerow([])
+                
+                # Per-file detail, streamed from the event log
+                writer.writerow(['Files'])
+                writer.writerow(['Time', 'Category', 'Size (bytes)', 'Seconds', 'Success', 'Error'])
+                for event in self.iter_events('file'):
+                    writer.writerow([
+                        datetime.fromtimestamp(event['t']).isoformat(),
+                        event.get('c', ''),
+                        event.get('s', 0),
+                        event.get('d', 0.0),
+                        event.get('ok', True),
+                        event.get('err', '')
+                    ])
             
             logger.info(f"Statistics exported to CSV: {output_path}")
         except Exception as e:
@@ -625,6 +973,31 @@ class StatisticsTracker:
                 html += """            </tbody>
         </table>
 """
+                # Most recent error details from the event log
+                recent = deque(self._logged_errors(), maxlen=HTML_ERROR_ROWS)
+                if recent:
+                    html += f"""
+        <h2>Recent Errors (last {len(recent)})</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Time</th>
+                    <th>Type</th>
+                    <th>Details</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+                    for entry in recent:
+                        html += f"""                <tr>
+                    <td>{escape(str(entry.get('timestamp', '')))}</td>
+                    <td>{escape(str(entry.get('type', entry.get('category', ''))))}</td>
+                    <td>{escape(str(entry.get('details', entry.get('error', ''))))}</td>
+                </tr>
+"""
+                    html += """            </tbody>
+        </table>
+"""
             
             html += """    </div>
 </body>
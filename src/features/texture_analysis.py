@@ -7,10 +7,10 @@ Author: Dead On The Inside / JosephsDeadish
 from __future__ import annotations
 
 import hashlib
+import io
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
-from collections import Counter
+from typing import Dict, Any, Iterable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +41,161 @@ except (ImportError, OSError, RuntimeError):
     logger.warning("OpenCV not available — advanced texture analysis disabled. "
                    "Install with: pip install opencv-python")
 
+try:
+    from utils.cache_manager import cached_array
+except ImportError:
+    try:
+        from ..utils.cache_manager import cached_array
+    except ImportError:
+        cached_array = None
+
+# File bytes are read (and hashed) in chunks of this size.
+READ_CHUNK_SIZE = 1 << 20
+
+# Sections returned by TextureAnalyzer.analyze, in result order.
+ANALYSIS_SECTIONS = ('basic', 'colors', 'alpha', 'quality', 'corruption', 'hashes', 'optimization')
+
+# Sections whose results another section is derived from.
+_SECTION_DEPENDENCIES = {'optimization': ('basic', 'colors', 'alpha', 'quality')}
+
+# Digests computed for the 'hashes' section.
+HASH_ALGORITHMS = ('md5', 'sha256')
+
+# PIL modes whose raw pixel array is inspected as-is for corruption.
+_NATIVE_ARRAY_MODES = ('L', 'LA', 'RGB', 'RGBA', 'I', 'I;16', 'F')
+
+# Derived arrays kept in the shared decoded-image cache between analyses.
+_SHARED_ARRAYS = ('rgb', 'alpha', 'gray', 'gray_f32', 'pixels')
+
+
+def _dct8_matrix():
+    """Orthonormal 8-point DCT-II basis (rows are frequencies)."""
+    n = np.arange(8)
+    basis = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / 16.0) * np.sqrt(2.0 / 8.0)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+class AnalysisContext:
+    """
+    One read and one decode of a texture, shared by every analysis section.
+
+    The file is read once, with the requested digests updated chunk by
+    chunk during that read, and decoded from memory. Derived arrays (RGB,
+    alpha, grayscale, float views) are built on first use and reused.
+    """
+
+    def __init__(self, path: Path, hash_algorithms: Iterable[str] = ()):
+        """
+        Read ``path`` into memory.
+
+        Args:
+            path: Image file
+            hash_algorithms: hashlib algorithm names to compute during the read
+        """
+        self.path = Path(path)
+        self.hashes: Dict[str, str] = {}
+        self._data = self._read(tuple(hash_algorithms))
+        self.file_size = len(self._data)
+        self._image = None
+        self._decoded = False
+        self._arrays: Dict[str, Any] = {}
+
+    def _read(self, algorithms: Tuple[str, ...]) -> bytes:
+        digests = [hashlib.new(name) for name in algorithms]
+        chunks = []
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                for digest in digests:
+                    digest.update(chunk)
+                chunks.append(chunk)
+        self.hashes = {name: digest.hexdigest() for name, digest in zip(algorithms, digests)}
+        return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+    @property
+    def image(self) -> Image.Image:
+        """The opened image; pixel data is decoded by :meth:`decoded`."""
+        if self._image is None:
+            self._image = Image.open(io.BytesIO(self._data))
+        return self._image
+
+    def decoded(self) -> Image.Image:
+        """The image with its pixel data loaded (decoded once)."""
+        img = self.image
+        if not self._decoded:
+            img.load()
+            self._decoded = True
+        return img
+
+    def _cached(self, name: str, build) -> Any:
+        value = self._arrays.get(name)
+        if value is None and name not in self._arrays:
+            if cached_array is not None and name in _SHARED_ARRAYS:
+                # Shared with later analyses of the same (unchanged) file
+                value = cached_array(self.path, f"analysis:{name}", build)
+            else:
+                value = build()
+            self._arrays[name] = value
+        return value
+
+    @property
+    def has_alpha(self) -> bool:
+        return self.image.mode in ('RGBA', 'LA', 'PA')
+
+    @property
+    def rgb_image(self) -> Image.Image:
+        """The image converted to RGB (the decoded image itself if already RGB)."""
+        def build():
+            img = self.decoded()
+            return img if img.mode == 'RGB' else img.convert('RGB')
+        return self._cached('rgb_image', build)
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """(H, W, 3) uint8 RGB pixels."""
+        return self._cached('rgb', lambda: np.asarray(self.rgb_image))
+
+    @property
+    def alpha(self) -> Optional[np.ndarray]:
+        """(H, W) uint8 alpha channel, or None for modes without alpha."""
+        def build():
+            if not self.has_alpha:
+                return None
+            return np.asarray(self.decoded().getchannel('A'))
+        return self._cached('alpha', build)
+
+    @property
+    def gray(self) -> np.ndarray:
+        """(H, W) uint8 luma."""
+        def build():
+            if HAS_CV2:
+                return cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+            return np.asarray(self.rgb_image.convert('L'))
+        return self._cached('gray', build)
+
+    @property
+    def gray_f32(self) -> np.ndarray:
+        """(H, W) float32 view of :attr:`gray`."""
+        return self._cached('gray_f32', lambda: self.gray.astype(np.float32))
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """Pixels in the file's own channel layout and bit depth, where NumPy can hold it."""
+        def build():
+            img = self.decoded()
+            if img.mode in _NATIVE_ARRAY_MODES:
+                return np.asarray(img)
+            return np.asarray(img.convert('RGBA' if self.has_alpha else 'RGB'))
+        return self._cached('pixels', build)
+
+    def close(self) -> None:
+        """Release the file bytes, image and derived arrays."""
+        if self._image is not None:
+            self._image.close()
+        self._image = None
+        self._arrays.clear()
+        self._data = b''
+
 
 class TextureAnalyzer:
     """
@@ -54,6 +209,9 @@ class TextureAnalyzer:
     - Hash calculation (MD5, SHA256)
     - Corruption detection
     - Format optimization suggestions
+    
+    Each file is read and decoded once per ``analyze`` call; see
+    :class:`AnalysisContext`.
     """
     
     def __init__(self, max_palette_colors: int = 10):
@@ -66,105 +224,107 @@ class TextureAnalyzer:
         self.max_palette_colors = max_palette_colors
         logger.debug(f"TextureAnalyzer initialized with max_palette_colors={max_palette_colors}")
     
-    def analyze(self, image_path: Path) -> Dict[str, Any]:
+    def analyze(self, image_path: Path, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Perform comprehensive texture analysis.
         
         Args:
             image_path: Path to image file
+            sections: Names from ``ANALYSIS_SECTIONS`` to compute (default:
+                all). Skipped sections cost nothing: e.g. hashes alone never
+                decode the image, and basic info reads only the header.
             
         Returns:
-            Dictionary containing all analysis results
+            Dictionary containing the requested analysis results
         """
+        wanted = ANALYSIS_SECTIONS if sections is None else tuple(sections)
+        unknown = set(wanted) - set(ANALYSIS_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown analysis sections: {sorted(unknown)}")
         if not HAS_PIL:
             logger.error("Pillow is required for texture analysis. Install: pip install Pillow")
             return {'error': 'Pillow not available', 'path': str(image_path)}
+        
+        needed = set(wanted)
+        for section in wanted:
+            needed.update(_SECTION_DEPENDENCIES.get(section, ()))
+        
+        ctx = None
         try:
             logger.debug(f"Analyzing texture: {image_path}")
-            
-            # Load image with PIL for general analysis
-            with Image.open(image_path) as img:
-                basic_info = self._get_basic_info(img, image_path)
-                color_info = self._analyze_colors(img)
-                alpha_info = self._analyze_alpha(img)
-                quality_info = self._analyze_quality(img)
-            
-            # Load with OpenCV for advanced analysis (optional)
-            cv_img = cv2.imread(str(image_path), cv2.IMREAD_UNCHANGED) if HAS_CV2 else None
-            corruption_info = self._detect_corruption(cv_img)
-            
-            # Calculate file hashes
-            hash_info = self._calculate_hashes(image_path)
-            
-            # Generate optimization suggestions
-            optimization = self._suggest_optimizations(
-                basic_info,
-                color_info,
-                alpha_info,
-                quality_info
+            ctx = AnalysisContext(
+                image_path, HASH_ALGORITHMS if 'hashes' in needed else ()
             )
             
-            result = {
-                'basic': basic_info,
-                'colors': color_info,
-                'alpha': alpha_info,
-                'quality': quality_info,
-                'corruption': corruption_info,
-                'hashes': hash_info,
-                'optimization': optimization
-            }
+            results: Dict[str, Any] = {}
+            if 'basic' in needed:
+                results['basic'] = self._get_basic_info(ctx)
+            if 'colors' in needed:
+                results['colors'] = self._analyze_colors(ctx)
+            if 'alpha' in needed:
+                results['alpha'] = self._analyze_alpha(ctx)
+            if 'quality' in needed:
+                results['quality'] = self._analyze_quality(ctx)
+            if 'corruption' in needed:
+                results['corruption'] = self._detect_corruption(ctx)
+            if 'hashes' in needed:
+                results['hashes'] = dict(ctx.hashes)
+            if 'optimization' in needed:
+                results['optimization'] = self._suggest_optimizations(
+                    results['basic'],
+                    results['colors'],
+                    results['alpha'],
+                    results['quality']
+                )
             
             logger.debug(f"Analysis complete for: {image_path}")
-            return result
+            return {section: results[section] for section in ANALYSIS_SECTIONS if section in wanted}
             
         except Exception as e:
             logger.error(f"Failed to analyze texture {image_path}: {e}")
             return self._get_error_result(str(e))
+        finally:
+            if ctx is not None:
+                ctx.close()
     
-    def _get_basic_info(self, img: Image.Image, path: Path) -> Dict[str, Any]:
-        """Extract basic image information."""
+    def _get_basic_info(self, ctx: AnalysisContext) -> Dict[str, Any]:
+        """Extract basic image information (header only, no pixel decode)."""
+        img = ctx.image
         return {
             'format': img.format or 'Unknown',
             'mode': img.mode,
             'width': img.width,
             'height': img.height,
             'size_pixels': img.width * img.height,
-            'file_size_bytes': path.stat().st_size,
-            'file_size_kb': round(path.stat().st_size / 1024, 2),
+            'file_size_bytes': ctx.file_size,
+            'file_size_kb': round(ctx.file_size / 1024, 2),
             'aspect_ratio': round(img.width / img.height, 3) if img.height > 0 else 0,
             'is_power_of_2': self._is_power_of_2(img.width) and self._is_power_of_2(img.height),
             'is_square': img.width == img.height
         }
     
-    def _analyze_colors(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_colors(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """
         Analyze color information including palette extraction.
         
         Returns detailed color analysis with dominant colors and percentages.
         """
         try:
-            # Convert to RGB if necessary
-            if img.mode in ('RGBA', 'LA', 'PA'):
-                rgb_img = img.convert('RGB')
-            elif img.mode == 'L':
-                rgb_img = img.convert('RGB')
-            else:
-                rgb_img = img
+            pixels = ctx.rgb.reshape(-1, 3)
+            total_pixels = pixels.shape[0]
             
-            # Get all pixels
-            pixels = list(rgb_img.getdata())
-            total_pixels = len(pixels)
-            
-            # Count color occurrences
-            color_counts = Counter(pixels)
-            unique_colors = len(color_counts)
-            
-            # Get top colors
-            top_colors = color_counts.most_common(self.max_palette_colors)
+            # Count colors as packed 24-bit keys; ties keep first-seen order
+            keys = ((pixels[:, 0].astype(np.uint32) << 16)
+                    | (pixels[:, 1].astype(np.uint32) << 8)
+                    | pixels[:, 2])
+            colors, first_seen, counts = np.unique(keys, return_index=True, return_counts=True)
+            unique_colors = int(colors.shape[0])
+            top = np.lexsort((first_seen, -counts))[:self.max_palette_colors]
             
             # Calculate dominant colors with percentages
             palette = []
-            for color, count in top_colors:
+            for key, count in zip(colors[top].tolist(), counts[top].tolist()):
+                color = ((key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF)
                 percentage = (count / total_pixels) * 100
                 palette.append({
                     'rgb': color,
@@ -174,40 +334,30 @@ class TextureAnalyzer:
                 })
             
             # Calculate color statistics
-            r_values = [p[0] for p in pixels]
-            g_values = [p[1] for p in pixels]
-            b_values = [p[2] for p in pixels]
+            statistics = {}
+            means = []
+            for channel, name in enumerate(('red', 'green', 'blue')):
+                values = pixels[:, channel]
+                mean = np.mean(values)
+                means.append(mean)
+                statistics[name] = {
+                    'mean': round(mean, 2),
+                    'std': round(np.std(values), 2),
+                    'min': int(values.min()),
+                    'max': int(values.max())
+                }
             
             return {
                 'unique_colors': unique_colors,
                 'palette': palette,
                 'dominant_color': {
-                    'rgb': top_colors[0][0],
+                    'rgb': palette[0]['rgb'],
                     'hex': palette[0]['hex'],
                     'percentage': palette[0]['percentage']
                 } if palette else None,
                 'color_diversity': round(unique_colors / total_pixels, 4),
-                'statistics': {
-                    'red': {
-                        'mean': round(np.mean(r_values), 2),
-                        'std': round(np.std(r_values), 2),
-                        'min': min(r_values),
-                        'max': max(r_values)
-                    },
-                    'green': {
-                        'mean': round(np.mean(g_values), 2),
-                        'std': round(np.std(g_values), 2),
-                        'min': min(g_values),
-                        'max': max(g_values)
-                    },
-                    'blue': {
-                        'mean': round(np.mean(b_values), 2),
-                        'std': round(np.std(b_values), 2),
-                        'min': min(b_values),
-                        'max': max(b_values)
-                    }
-                },
-                'brightness': round(np.mean([np.mean(r_values), np.mean(g_values), np.mean(b_values)]), 2),
+                'statistics': statistics,
+                'brightness': round(np.mean(means), 2),
                 'is_grayscale': self._is_grayscale(pixels)
             }
             
@@ -215,39 +365,30 @@ class TextureAnalyzer:
             logger.error(f"Color analysis failed: {e}")
             return {'error': str(e)}
     
-    def _analyze_alpha(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_alpha(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """
         Analyze alpha channel information.
         
         Returns alpha channel statistics and usage patterns.
         """
         try:
-            has_alpha = img.mode in ('RGBA', 'LA', 'PA')
+            alpha = ctx.alpha
             
-            if not has_alpha:
+            if alpha is None:
                 return {
                     'has_alpha': False,
                     'is_transparent': False,
                     'alpha_usage': 'none'
                 }
             
-            # Extract alpha channel
-            if img.mode == 'RGBA':
-                alpha = img.getchannel('A')
-            elif img.mode == 'LA':
-                alpha = img.getchannel('A')
-            else:
-                alpha = img.convert('RGBA').getchannel('A')
-            
-            alpha_data = list(alpha.getdata())
-            total_pixels = len(alpha_data)
+            total_pixels = alpha.size
             
             # Analyze alpha values
-            alpha_counter = Counter(alpha_data)
-            unique_alpha = len(alpha_counter)
+            histogram = np.bincount(alpha.ravel(), minlength=256)
+            unique_alpha = int(np.count_nonzero(histogram))
             
-            fully_opaque = alpha_counter.get(255, 0)
-            fully_transparent = alpha_counter.get(0, 0)
+            fully_opaque = int(histogram[255])
+            fully_transparent = int(histogram[0])
             partial_transparent = total_pixels - fully_opaque - fully_transparent
             
             # Determine alpha usage pattern
@@ -264,10 +405,10 @@ class TextureAnalyzer:
                 'alpha_usage': alpha_usage,
                 'statistics': {
                     'unique_values': unique_alpha,
-                    'mean': round(np.mean(alpha_data), 2),
-                    'std': round(np.std(alpha_data), 2),
-                    'min': min(alpha_data),
-                    'max': max(alpha_data)
+                    'mean': round(np.mean(alpha), 2),
+                    'std': round(np.std(alpha), 2),
+                    'min': int(alpha.min()),
+                    'max': int(alpha.max())
                 },
                 'distribution': {
                     'fully_opaque': fully_opaque,
@@ -283,7 +424,7 @@ class TextureAnalyzer:
             logger.error(f"Alpha analysis failed: {e}")
             return {'error': str(e)}
     
-    def _analyze_quality(self, img: Image.Image) -> Dict[str, Any]:
+    def _analyze_quality(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """
         Analyze compression quality and artifacts.
         
@@ -292,30 +433,22 @@ class TextureAnalyzer:
         try:
             if not HAS_NUMPY:
                 return {'error': 'numpy not available', 'quality_estimate': 'unknown'}
-            # Convert to numpy array for analysis
-            img_array = np.array(img.convert('RGB'))
+            gray = ctx.gray
+            gray_f = ctx.gray_f32
 
             if HAS_CV2:
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
                 laplacian = cv2.Laplacian(gray, cv2.CV_64F)
                 sharpness = laplacian.var()
-                dct = cv2.dct(np.float32(gray))
-                high_freq_energy = np.sum(np.abs(dct[int(dct.shape[0]/2):, int(dct.shape[1]/2):]))
-                total_energy = np.sum(np.abs(dct))
-                high_freq_ratio = high_freq_energy / total_energy if total_energy > 0 else 0
-                block_artifacts = self._detect_blocking_artifacts(gray)
                 noise_level = round(self._estimate_noise_level(gray), 2)
-                dynamic_range = int(gray.max()) - int(gray.min())
             else:
                 # Fallback: compute sharpness via pure numpy
-                gray_f = np.mean(img_array.astype(float), axis=2)
                 dy = np.diff(gray_f, axis=0)
                 dx = np.diff(gray_f, axis=1)
                 sharpness = float(np.var(dy) + np.var(dx))
-                high_freq_ratio = 0.0
-                block_artifacts = False
                 noise_level = 0.0
-                dynamic_range = int(gray_f.max()) - int(gray_f.min())
+            high_freq_ratio = self._high_frequency_ratio(gray_f)
+            block_artifacts = self._detect_blocking_artifacts(gray_f)
+            dynamic_range = int(gray.max()) - int(gray.min())
             
             # Estimate quality level
             if sharpness > 500:
@@ -338,13 +471,14 @@ class TextureAnalyzer:
             logger.error(f"Quality analysis failed: {e}")
             return {'error': str(e)}
     
-    def _detect_corruption(self, img: Optional[np.ndarray]) -> Dict[str, Any]:
+    def _detect_corruption(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """
         Detect image corruption or anomalies.
         
         Returns corruption detection results.
         """
         try:
+            img = ctx.pixels
             if img is None:
                 return {
                     'is_corrupted': True,
@@ -357,13 +491,14 @@ class TextureAnalyzer:
             if img.shape[0] == 0 or img.shape[1] == 0:
                 issues.append('Zero dimension detected')
             
-            # Check for NaN values
-            if np.isnan(img).any():
-                issues.append('NaN values detected')
-            
-            # Check for infinite values
-            if np.isinf(img).any():
-                issues.append('Infinite values detected')
+            if img.dtype.kind == 'f':
+                # Check for NaN values
+                if np.isnan(img).any():
+                    issues.append('NaN values detected')
+                
+                # Check for infinite values
+                if np.isinf(img).any():
+                    issues.append('Infinite values detected')
             
             # Check for unusual data ranges
             if img.dtype == np.uint8:
@@ -371,7 +506,7 @@ class TextureAnalyzer:
                     issues.append('Single color image (possibly corrupted)')
             
             # Check for stripe patterns (common corruption)
-            if self._detect_stripe_pattern(img):
+            if self._detect_stripe_pattern(ctx.gray):
                 issues.append('Stripe pattern detected (possible corruption)')
             
             return {
@@ -387,31 +522,6 @@ class TextureAnalyzer:
                 'reason': f'Analysis error: {str(e)}'
             }
     
-    def _calculate_hashes(self, path: Path) -> Dict[str, str]:
-        """
-        Calculate file hashes for integrity verification.
-        
-        Returns MD5 and SHA256 hashes.
-        """
-        try:
-            md5_hash = hashlib.md5()
-            sha256_hash = hashlib.sha256()
-            
-            with open(path, 'rb') as f:
-                # Read in chunks for memory efficiency
-                for chunk in iter(lambda: f.read(8192), b''):
-                    md5_hash.update(chunk)
-                    sha256_hash.update(chunk)
-            
-            return {
-                'md5': md5_hash.hexdigest(),
-                'sha256': sha256_hash.hexdigest()
-            }
-            
-        except Exception as e:
-            logger.error(f"Hash calculation failed: {e}")
-            return {'error': str(e)}
-    
     def _suggest_optimizations(
         self,
         basic: Dict,
@@ -530,50 +640,60 @@ class TextureAnalyzer:
         return n > 0 and (n & (n - 1)) == 0
     
     @staticmethod
-    def _is_grayscale(pixels: List[Tuple[int, int, int]]) -> bool:
-        """Check if image is effectively grayscale."""
+    def _is_grayscale(pixels: np.ndarray) -> bool:
+        """Check if an (N, 3) RGB pixel array is effectively grayscale."""
         # Sample first 1000 pixels for efficiency
         sample = pixels[:1000]
-        for r, g, b in sample:
-            if not (r == g == b):
-                return False
-        return True
+        return bool(np.all((sample[:, 0] == sample[:, 1]) & (sample[:, 1] == sample[:, 2])))
     
     @staticmethod
     def _detect_blocking_artifacts(gray: np.ndarray) -> bool:
-        """Detect 8x8 blocking artifacts typical in JPEG compression."""
+        """Detect 8x8 blocking artifacts typical in JPEG compression (float gray)."""
         try:
             # Look for discontinuities at 8-pixel boundaries
             h, w = gray.shape
             block_size = 8
             
-            # Check horizontal boundaries
-            h_diffs = []
-            for i in range(block_size, h, block_size):
-                if i < h - 1:
-                    diff = np.mean(np.abs(gray[i, :] - gray[i-1, :]))
-                    h_diffs.append(diff)
-            
-            # Check vertical boundaries
-            v_diffs = []
-            for j in range(block_size, w, block_size):
-                if j < w - 1:
-                    diff = np.mean(np.abs(gray[:, j] - gray[:, j-1]))
-                    v_diffs.append(diff)
-            
-            # If boundary differences are significantly higher, blocking exists
-            if h_diffs and v_diffs:
-                avg_h_diff = np.mean(h_diffs)
-                avg_v_diff = np.mean(v_diffs)
-                overall_diff = np.mean(np.abs(np.diff(gray.flatten())))
+            # Mean step across each interior row / column block boundary
+            rows = np.arange(block_size, h - 1, block_size)
+            cols = np.arange(block_size, w - 1, block_size)
+            if rows.size and cols.size:
+                avg_h_diff = np.mean(np.abs(gray[rows, :] - gray[rows - 1, :]), axis=1).mean()
+                avg_v_diff = np.mean(np.abs(gray[:, cols] - gray[:, cols - 1]), axis=0).mean()
+                overall_diff = np.mean(np.abs(np.diff(gray.ravel())))
                 
-                return (avg_h_diff > overall_diff * 1.5 or avg_v_diff > overall_diff * 1.5)
+                # If boundary differences are significantly higher, blocking exists
+                return bool(avg_h_diff > overall_diff * 1.5 or avg_v_diff > overall_diff * 1.5)
             
             return False
             
         except Exception:
             return False
     
+    @staticmethod
+    def _high_frequency_ratio(gray: np.ndarray, strip_blocks: int = 64) -> float:
+        """
+        Share of 8x8 block-DCT energy in the high-frequency quadrant.
+        
+        Blockwise like JPEG, so the cost is linear in the pixel count and
+        odd-sized images need no padding. Processed in strips of block rows
+        to bound memory.
+        """
+        h = gray.shape[0] - gray.shape[0] % 8
+        w = gray.shape[1] - gray.shape[1] % 8
+        if not h or not w:
+            return 0.0
+        basis = _dct8_matrix()
+        high = total = 0.0
+        step = strip_blocks * 8
+        for top in range(0, h, step):
+            strip = gray[top:min(top + step, h), :w]
+            blocks = strip.reshape(strip.shape[0] // 8, 8, w // 8, 8).transpose(0, 2, 1, 3)
+            coeffs = np.abs(basis @ blocks @ basis.T)
+            high += float(coeffs[..., 4:, 4:].sum(dtype=np.float64))
+            total += float(coeffs.sum(dtype=np.float64))
+        return high / total if total > 0 else 0.0
+    
     @staticmethod
     def _estimate_noise_level(gray: np.ndarray) -> float:
         """Estimate noise level in image."""
@@ -588,14 +708,9 @@ class TextureAnalyzer:
             return 0.0
     
     @staticmethod
-    def _detect_stripe_pattern(img: np.ndarray) -> bool:
-        """Detect stripe patterns that might indicate corruption."""
+    def _detect_stripe_pattern(gray: np.ndarray) -> bool:
+        """Detect stripe patterns that might indicate corruption (grayscale input)."""
         try:
-            if len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = img
-            
             # Check for repetitive patterns in rows
             row_variance = np.var(gray, axis=1)
             if np.std(row_variance) < 1.0:  # Very low variance variation
@@ -65,6 +65,15 @@ except (ImportError, OSError, RuntimeError):
     HAS_ARCHIVE_SUPPORT = False
     logger.debug("Archive handler not available.")
 
+try:
+    from utils.file_transfer import FileTransfer, MODE_AUTO, MODE_MOVE
+except ImportError:
+    try:
+        from ..utils.file_transfer import FileTransfer, MODE_AUTO, MODE_MOVE
+    except ImportError:
+        FileTransfer = None  # type: ignore[assignment,misc]
+        MODE_AUTO, MODE_MOVE = 'auto', 'move'
+
 
 class FileHandler:
     """Handles file operations for texture sorting"""
@@ -112,13 +121,24 @@ class FileHandler:
             # Config object provided
             self.create_backup = config.get('file_handling', 'create_backup', default=True)
             self.enable_archive = config.get('file_handling', 'enable_archive_support', default=True)
+            self.transfer_mode = config.get('file_handling', 'transfer_mode', default=MODE_AUTO)
         else:
             # Use legacy parameters or defaults
             self.create_backup = create_backup
             self.enable_archive = True
+            self.transfer_mode = MODE_AUTO
             
         self.operations_log = []
         
+        # Reflink / zero-copy / link placement of copied files
+        self.transfer = None
+        if FileTransfer is not None:
+            try:
+                self.transfer = FileTransfer(self.transfer_mode)
+            except ValueError as e:
+                logger.warning(f"{e}; using 'auto'")
+                self.transfer = FileTransfer(MODE_AUTO)
+        
         # Initialize archive handler if available and enabled
         self.archive_handler = None
         if HAS_ARCHIVE_SUPPORT and self.enable_archive:
@@ -708,9 +728,13 @@ class FileHandler:
                 backup_path = destination.with_suffix(destination.suffix + '.backup')
                 shutil.copy2(destination, backup_path)
             
-            # Copy file
-            shutil.copy2(source, destination)
-            self.operations_log.append(f"Copied {source} to {destination}")
+            # Copy file (clone/link/zero-copy per transfer_mode when available)
+            if self.transfer is not None:
+                method = self.transfer.transfer(source, destination, overwrite=True)
+                self.operations_log.append(f"Copied {source} to {destination} ({method})")
+            else:
+                shutil.copy2(source, destination)
+                self.operations_log.append(f"Copied {source} to {destination}")
             return True
             
         except Exception as e:
@@ -738,8 +762,11 @@ class FileHandler:
                 logger.debug(f"Destination {destination} already exists. Skipping.")
                 return False
             
-            # Move file
-            shutil.move(str(source), str(destination))
+            # Move file (rename, or copy + delete across devices)
+            if self.transfer is not None and Path(source).is_file():
+                self.transfer.transfer(source, destination, overwrite=True, mode=MODE_MOVE)
+            else:
+                shutil.move(str(source), str(destination))
             self.operations_log.append(f"Moved {source} to {destination}")
             return True
             
@@ -10,6 +10,7 @@ The ``texture_ops`` Rust extension (built with PyO3) accelerates:
 - Edge density measurement
 - Bitmap to SVG vector tracing (via vtracer)
 - Batch parallel processing of multiple images
+- Parallel file CRC-32 for game image identification
 
 When the native module is unavailable, the pure-Python fallbacks in this
 file are used instead.  They produce similar results but are slower.
@@ -100,6 +101,54 @@ def lanczos_upscale(
     return np.array(upscaled)
 
 
+# Older builds of the extension predate area_downscale
+NATIVE_AREA_DOWNSCALE = NATIVE_AVAILABLE and hasattr(_native, "area_downscale")
+
+
+def area_downscale(
+    image: np.ndarray,
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """Shrink an image by area averaging (like OpenCV ``INTER_AREA``).
+
+    When the Rust extension is available rows are processed in parallel
+    with the GIL released.  Otherwise Pillow's box filter is used (identical
+    for integer factors, a close approximation otherwise).
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Input image with shape ``(H, W)`` or ``(H, W, C)`` (C <= 4) and
+        dtype ``uint8``.
+    width : int
+        Target width, at most ``W``.
+    height : int
+        Target height, at most ``H``.
+
+    Returns
+    -------
+    np.ndarray
+        Downscaled image with shape ``(height, width[, C])`` and dtype
+        ``uint8``.
+    """
+    h, w = image.shape[:2]
+    channels = image.shape[2] if image.ndim == 3 else 1
+
+    if NATIVE_AREA_DOWNSCALE:
+        result_bytes = _native.area_downscale(
+            np.ascontiguousarray(image).tobytes(), w, h, channels, width, height
+        )
+        shape = (height, width, channels) if image.ndim == 3 else (height, width)
+        return np.frombuffer(result_bytes, dtype=np.uint8).reshape(shape)
+
+    # Pure-Python fallback using PIL
+    from PIL import Image as PILImage
+
+    pil_img = PILImage.fromarray(image)
+    return np.array(pil_img.resize((width, height), PILImage.BOX))
+
+
 # ---------------------------------------------------------------------------
 # Feature extraction
 # ---------------------------------------------------------------------------
@@ -423,3 +472,32 @@ def batch_bitmap_to_svg(
             logger.warning(f"Native batch_bitmap_to_svg failed: {e}, using sequential fallback")
 
     return [bitmap_to_svg(img, threshold, mode) for img in images]
+
+
+# ---------------------------------------------------------------------------
+# File hashing
+# ---------------------------------------------------------------------------
+
+
+def file_crc32(path: str, segment_size: int = 64 * 1024 * 1024) -> Optional[int]:
+    """Compute the zlib-compatible CRC-32 of a file natively.
+
+    Segments of ``segment_size`` bytes are hashed in parallel and combined,
+    with the GIL released throughout.
+
+    Parameters
+    ----------
+    path : str
+        File to hash.
+    segment_size : int, default 64 MiB
+        Bytes hashed per parallel task.
+
+    Returns
+    -------
+    Optional[int]
+        CRC-32 as an unsigned integer, or None when the native module (or
+        this function in an older build of it) is unavailable.
+    """
+    if NATIVE_AVAILABLE and hasattr(_native, "file_crc32"):
+        return _native.file_crc32(str(path), segment_size)
+    return None
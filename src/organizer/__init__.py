@@ -6,7 +6,8 @@ This package contains the organization/hierarchy system for sorting textures
 into various folder structures based on different organization styles.
 """
 
-from .organization_engine import OrganizationEngine, TextureInfo
+from .organization_engine import OrganizationEngine, OrganizationPlan, PlannedOperation, TextureInfo
+from .run_journal import RunJournal, journal_path_for, undo_run
 from .organization_styles import (
     SimsStyle,
     NeopetsStyle,
@@ -23,6 +24,11 @@ from .organization_styles import (
 __all__ = [
     'OrganizationEngine',
     'TextureInfo',
+    'OrganizationPlan',
+    'PlannedOperation',
+    'RunJournal',
+    'journal_path_for',
+    'undo_run',
     'SimsStyle',
     'NeopetsStyle',
     'FlatStyle',
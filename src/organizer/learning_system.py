@@ -93,6 +93,14 @@ class AILearningSystem:
         
         self._lock = RLock()
         
+        # Suggestion index: literal pattern part -> {folder: summed weight}.
+        # Rebuilt lazily whenever learned_mappings is replaced or changed
+        # outside add_learning(); add_learning() updates it in place.
+        self._part_index: Dict[str, Dict[str, float]] = {}
+        self._max_part_len = 0
+        self._indexed_list: Optional[List[LearningEntry]] = None
+        self._indexed_count = 0
+        
         logger.info(f"AI Learning System initialized: {self.config_dir}")
     
     def create_new_profile(self, game_name: str, game_serial: str = "", 
@@ -156,7 +164,11 @@ class AILearningSystem:
                 metadata=metadata or {}
             )
             
+            index_current = self._index_is_current()
             self.learned_mappings.append(entry)
+            if index_current:
+                self._index_entry(entry)
+                self._indexed_count += 1
             self.metadata.updated_at = datetime.utcnow().isoformat() + "Z"
             
             logger.debug(f"Added learning: {pattern} -> {user_choice} (accepted={accepted})")
@@ -188,6 +200,13 @@ class AILearningSystem:
         """
         Get folder suggestions based on learned patterns.
         
+        A pattern's similarity is the fraction of its literal parts found in
+        the filename (a full wildcard match has every part present, so it
+        scores 1.0). That is linear in the parts, so each part's weighted
+        contribution per folder is pre-aggregated in an index and a query
+        only looks up the filename's substrings: the cost depends on the
+        filename length, not on the number of learned entries.
+        
         Args:
             filename: Texture filename to classify
             top_n: Number of suggestions to return
@@ -198,28 +217,59 @@ class AILearningSystem:
         with self._lock:
             if not self.learned_mappings:
                 return []
-            
-            # Score each learned mapping
-            scores = []
-            for entry in self.learned_mappings:
-                if not entry.accepted:
-                    continue
-                
-                # Calculate similarity score
-                score = self._pattern_similarity(filename, entry.filename_pattern)
-                if score > 0:
-                    scores.append((entry.user_choice, score * entry.confidence))
+            if not self._index_is_current():
+                self._rebuild_index()
+            
+            index = self._part_index
+            text = filename.lower()
+            max_len = self._max_part_len
+            matched = set()
+            for start in range(len(text)):
+                for end in range(start + 1, min(len(text), start + max_len) + 1):
+                    part = text[start:end]
+                    if part in index:
+                        matched.add(part)
             
             # Aggregate scores by folder
             folder_scores: Dict[str, float] = {}
-            for folder, score in scores:
-                folder_scores[folder] = folder_scores.get(folder, 0) + score
+            for part in matched:
+                for folder, weight in index[part].items():
+                    folder_scores[folder] = folder_scores.get(folder, 0) + weight
             
             # Sort and return top N
             sorted_folders = sorted(folder_scores.items(), 
                                    key=lambda x: x[1], reverse=True)
             return sorted_folders[:top_n]
     
+    def _index_is_current(self) -> bool:
+        return (self._indexed_list is self.learned_mappings
+                and self._indexed_count == len(self.learned_mappings))
+    
+    def _rebuild_index(self) -> None:
+        """Index every accepted entry from scratch."""
+        self._part_index = {}
+        self._max_part_len = 0
+        for entry in self.learned_mappings:
+            self._index_entry(entry)
+        self._indexed_list = self.learned_mappings
+        self._indexed_count = len(self.learned_mappings)
+    
+    def _index_entry(self, entry: LearningEntry) -> None:
+        """Add one entry's weighted parts to the suggestion index."""
+        if not entry.accepted:
+            return
+        parts = [part for part in entry.filename_pattern.lower().split('*') if part]
+        if not parts:
+            return
+        # Each part contributes confidence / n_parts (repeated parts count twice)
+        weight = entry.confidence / len(parts)
+        for part in parts:
+            folders = self._part_index.get(part)
+            if folders is None:
+                folders = self._part_index[part] = {}
+                self._max_part_len = max(self._max_part_len, len(part))
+            folders[entry.user_choice] = folders.get(entry.user_choice, 0) + weight
+    
     def _pattern_similarity(self, filename: str, pattern: str) -> float:
         """
         Calculate similarity between filename and pattern.
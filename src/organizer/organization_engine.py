@@ -7,12 +7,26 @@ Main engine for organizing textures into hierarchical folder structures.
 
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Callable, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from abc import ABC, abstractmethod
 import re
 
+try:
+    from utils.file_transfer import FileTransfer, MODE_MOVE
+except ImportError:
+    try:
+        from ..utils.file_transfer import FileTransfer, MODE_MOVE
+    except ImportError:
+        FileTransfer = None
+        MODE_MOVE = 'move'
+
+from .run_journal import ACTION_COPY, ACTION_MOVE
+
 
 @dataclass
 class TextureInfo:
@@ -29,13 +43,113 @@ class TextureInfo:
     variant: Optional[str] = None  # For detecting variants like gender, skin tone
 
 
+# Gender, then colour/skin-tone words, in priority order, recognised as
+# _word / -word not followed by another letter; all folded into one regex
+# whose matching group gives the word's priority.
+_VARIANT_WORDS = ('Male', 'Female', 'Black', 'White', 'Brown', 'Tan', 'Red', 'Blue', 'Green', 'Yellow')
+_VARIANT_WORD_RE = re.compile(
+    r'[_-](?:' + '|'.join(f'({w.lower()})' for w in _VARIANT_WORDS) + r')(?![a-z])', re.IGNORECASE)
+_NUMERIC_VARIANT_RE = re.compile(r'[_-](\d{2,})(?=\.|$)')
+_INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"|?*'})
+
+
+@lru_cache(maxsize=1 << 16)
+def _detect_variant(filename: str) -> Optional[str]:
+    ranks = [m.lastindex for m in _VARIANT_WORD_RE.finditer(filename)]
+    if ranks:
+        return _VARIANT_WORDS[min(ranks) - 1]
+    
+    # Numeric variant detection
+    numeric_match = _NUMERIC_VARIANT_RE.search(filename)
+    if numeric_match:
+        return f"Variant_{numeric_match.group(1)}"
+    return None
+
+
+# Threads placing files when a plan is executed (file I/O, not CPU bound)
+IO_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+@dataclass
+class PlannedOperation:
+    """One file placement in an OrganizationPlan"""
+    texture: TextureInfo
+    target: Path
+
+    @property
+    def source(self) -> str:
+        return self.texture.file_path
+
+
+@dataclass
+class OrganizationPlan:
+    """
+    Every target path of an organize run, computed before touching disk.
+
+    Execute it with OrganizationEngine.execute_plan(), or inspect it (dry
+    run) with diff() / to_dict().
+    """
+    output_dir: Path
+    operations: List[PlannedOperation] = field(default_factory=list)
+    skipped: List[TextureInfo] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    @property
+    def directories(self) -> List[Path]:
+        """Distinct target directories, parents before children."""
+        return sorted({op.target.parent for op in self.operations},
+                      key=lambda p: (len(p.parts), str(p)))
+
+    def by_directory(self) -> Dict[Path, List[PlannedOperation]]:
+        """Operations grouped by target directory, in plan order."""
+        groups: Dict[Path, List[PlannedOperation]] = {}
+        for op in self.operations:
+            groups.setdefault(op.target.parent, []).append(op)
+        return groups
+
+    def conflicts(self) -> Dict[Path, List[str]]:
+        """Targets that more than one source maps to (the last one wins)."""
+        sources: Dict[Path, List[str]] = {}
+        for op in self.operations:
+            sources.setdefault(op.target, []).append(op.source)
+        return {target: srcs for target, srcs in sources.items() if len(srcs) > 1}
+
+    def diff(self) -> List[str]:
+        """
+        Dry-run listing: one line per change the plan would make.
+
+        ``+ dir/`` for a directory that does not exist yet, ``  source ->
+        target`` per file (``!`` when the target already exists).
+        """
+        lines = [f"+ {d}/" for d in self.directories if not d.exists()]
+        for op in self.operations:
+            marker = '!' if op.target.exists() else ' '
+            lines.append(f"{marker} {op.source} -> {op.target}")
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form of the plan."""
+        return {
+            'output_dir': str(self.output_dir),
+            'operations': [{'source': op.source, 'target': str(op.target),
+                            'category': op.texture.category} for op in self.operations],
+            'directories': [str(d) for d in self.directories],
+            'skipped': [t.file_path for t in self.skipped],
+            'errors': list(self.errors),
+        }
+
+
 class OrganizationEngine:
     """
     Base engine for organizing textures into folder hierarchies.
     Handles the actual file operations and delegates structure creation to style classes.
     """
     
-    def __init__(self, style_class, output_dir: str, dry_run: bool = False):
+    def __init__(self, style_class, output_dir: str, dry_run: bool = False,
+                 journal=None, transfer_mode: str = 'auto'):
         """
         Initialize the organization engine.
         
@@ -43,87 +157,168 @@ class OrganizationEngine:
             style_class: Organization style class to use
             output_dir: Base output directory for organized files
             dry_run: If True, only simulate operations without moving files
+            journal: Optional started RunJournal; every placement is recorded
+                in it and textures it already lists are skipped (resume)
+            transfer_mode: How files are placed ('auto', 'reflink',
+                'hardlink', 'symlink', 'copy', 'move'); see utils.file_transfer
         """
         self.style = style_class()
         self.output_dir = Path(output_dir)
         self.dry_run = dry_run
+        self.journal = journal
+        self.transfer = FileTransfer(transfer_mode) if FileTransfer is not None else None
+        # Undo restores moved files but deletes copies, so record which
+        self._journal_action = (ACTION_MOVE if self.transfer is not None and self.transfer.mode == MODE_MOVE
+                                else ACTION_COPY)
         self.operations_log = []
+        # Directories known to exist; mkdir is issued once per directory
+        # for the lifetime of the engine, however many plans it executes
+        self._created_dirs = set()
+        self._log_lock = threading.Lock()
+        
+    def plan(self, textures: List[TextureInfo]) -> OrganizationPlan:
+        """
+        Compute every target path without touching disk.
         
+        Textures the journal already lists (a resumed run) go to
+        ``plan.skipped``; textures the style cannot place go to ``plan.errors``.
+        
+        Args:
+            textures: List of TextureInfo objects to organize
+            
+        Returns:
+            OrganizationPlan
+        """
+        plan = OrganizationPlan(output_dir=self.output_dir)
+        for texture in textures:
+            if self.journal is not None and not self.dry_run and self.journal.is_done(texture.file_path):
+                plan.skipped.append(texture)
+                continue
+            try:
+                relative_path = self.style.get_target_path(texture)
+            except Exception as e:
+                plan.errors.append({'file': texture.filename, 'source': texture.file_path,
+                                    'error': str(e)})
+                continue
+            plan.operations.append(PlannedOperation(texture, self.output_dir / relative_path))
+        return plan
+    
+    def execute_plan(
+        self,
+        plan: OrganizationPlan,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Carry out a plan.
+        
+        All target directories are created first, each once. Files are then
+        placed by a thread pool, one task per target directory; files within
+        a directory are placed in plan order. In dry-run mode nothing on
+        disk is touched. Progress is reported from the calling thread.
+        
+        Args:
+            plan: Plan from plan()
+            progress_callback: Optional callback function(current, total, status_msg)
+            max_workers: I/O threads (default IO_WORKERS)
+            
+        Returns:
+            Same dictionary as organize_textures()
+        """
+        results = {
+            'success': not plan.errors,
+            'processed': 0,
+            'failed': len(plan.errors),
+            'skipped': len(plan.skipped),
+            'operations': [],
+            'errors': list(plan.errors)
+        }
+        total = len(plan.operations) + len(plan.skipped) + len(plan.errors)
+        done = len(plan.skipped) + len(plan.errors)
+        if progress_callback and done:
+            progress_callback(done, total, f"Already organized: {len(plan.skipped)} files")
+        if not plan.operations:
+            return results
+        
+        if not self.dry_run:
+            for directory in [self.output_dir] + plan.directories:
+                if directory not in self._created_dirs:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    self._created_dirs.add(directory)
+        
+        groups = list(plan.by_directory().values())
+        workers = max(1, min(max_workers or IO_WORKERS, len(groups)))
+        
+        def _place_group(group: List[PlannedOperation]) -> List[Tuple[PlannedOperation, Any]]:
+            placed = []
+            for op in group:
+                try:
+                    operation = self._perform_file_operation(op.source, op.target)
+                    if self.journal is not None and not self.dry_run:
+                        self.journal.record(op.source, op.target, op.texture.category,
+                                            action=self._journal_action)
+                    placed.append((op, operation))
+                except Exception as e:
+                    placed.append((op, e))
+            return placed
+        
+        def _collect(placed: List[Tuple[PlannedOperation, Any]]) -> None:
+            nonlocal done
+            for op, outcome in placed:
+                done += 1
+                if isinstance(outcome, Exception):
+                    results['failed'] += 1
+                    results['errors'].append({'file': op.texture.filename, 'source': op.source,
+                                              'error': str(outcome)})
+                    results['success'] = False
+                    status = f"Error: {op.texture.filename} - {outcome}"
+                else:
+                    results['operations'].append(outcome)
+                    results['processed'] += 1
+                    status = f"Organized: {op.texture.filename}"
+                if progress_callback:
+                    progress_callback(done, total, status)
+        
+        if workers == 1:
+            for group in groups:
+                _collect(_place_group(group))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Organize") as pool:
+                futures = [pool.submit(_place_group, group) for group in groups]
+                for future in as_completed(futures):
+                    _collect(future.result())
+        return results
+    
     def organize_textures(
         self, 
         textures: List[TextureInfo],
-        progress_callback: Optional[Callable[[int, int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Organize textures according to the selected style.
         
+        Plans the whole batch, then executes the plan (see plan() and
+        execute_plan()). Pass all textures in one call rather than one at
+        a time so directories are created once and placement runs in
+        parallel.
+        
         Args:
             textures: List of TextureInfo objects to organize
             progress_callback: Optional callback function(current, total, status_msg)
+            max_workers: I/O threads (default IO_WORKERS)
             
         Returns:
             Dict with results: {
                 'success': bool,
                 'processed': int,
                 'failed': int,
+                'skipped': int,
                 'operations': list,
                 'errors': list
             }
         """
-        results = {
-            'success': True,
-            'processed': 0,
-            'failed': 0,
-            'operations': [],
-            'errors': []
-        }
-        
-        # Create base output directory
-        if not self.dry_run:
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        total = len(textures)
-        
-        for idx, texture in enumerate(textures):
-            try:
-                # Get target path from style
-                relative_path = self.style.get_target_path(texture)
-                target_path = self.output_dir / relative_path
-                
-                # Create directory structure
-                if not self.dry_run:
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy/move file
-                operation = self._perform_file_operation(texture.file_path, target_path)
-                
-                results['operations'].append(operation)
-                results['processed'] += 1
-                
-                # Progress callback
-                if progress_callback:
-                    progress_callback(
-                        idx + 1,
-                        total,
-                        f"Organized: {texture.filename}"
-                    )
-                    
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append({
-                    'file': texture.filename,
-                    'error': str(e)
-                })
-                results['success'] = False
-                
-                if progress_callback:
-                    progress_callback(
-                        idx + 1,
-                        total,
-                        f"Error: {texture.filename} - {str(e)}"
-                    )
-        
-        return results
+        return self.execute_plan(self.plan(textures), progress_callback, max_workers)
     
     def _perform_file_operation(self, source: str, target: Path) -> Dict[str, str]:
         """
@@ -145,11 +340,16 @@ class OrganizationEngine:
         if self.dry_run:
             operation['status'] = 'simulated'
         else:
-            # Copy file (preserve original)
-            shutil.copy2(source, target)
+            # Copy file (preserve original); reflink/zero-copy where possible
+            if self.transfer is not None:
+                operation['method'] = self.transfer.transfer(Path(source), target, overwrite=True,
+                                                             make_parents=False)
+            else:
+                shutil.copy2(source, target)
             operation['status'] = 'success'
         
-        self.operations_log.append(operation)
+        with self._log_lock:
+            self.operations_log.append(operation)
         return operation
     
     def get_style_name(self) -> str:
@@ -222,40 +422,10 @@ class OrganizationStyle(ABC):
         Returns:
             Variant string or None
         """
-        # Gender detection
-        if re.search(r'[_-]male(?![a-z])', filename, re.IGNORECASE):
-            return 'Male'
-        if re.search(r'[_-]female(?![a-z])', filename, re.IGNORECASE):
-            return 'Female'
-        
-        # Color/skin tone detection
-        color_patterns = {
-            'Black': r'[_-]black(?![a-z])',
-            'White': r'[_-]white(?![a-z])',
-            'Brown': r'[_-]brown(?![a-z])',
-            'Tan': r'[_-]tan(?![a-z])',
-            'Red': r'[_-]red(?![a-z])',
-            'Blue': r'[_-]blue(?![a-z])',
-            'Green': r'[_-]green(?![a-z])',
-            'Yellow': r'[_-]yellow(?![a-z])',
-        }
-        
-        for color, pattern in color_patterns.items():
-            if re.search(pattern, filename, re.IGNORECASE):
-                return color
-        
-        # Numeric variant detection
-        numeric_match = re.search(r'[_-](\d{2,})(?=\.|$)', filename)
-        if numeric_match:
-            return f"Variant_{numeric_match.group(1)}"
-        
-        return None
+        return _detect_variant(filename)
     
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Remove invalid characters from filename"""
         # Remove or replace invalid Windows filename characters
-        invalid_chars = '<>:"|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        return filename
+        return filename.translate(_INVALID_FILENAME_CHARS)
@@ -5,10 +5,35 @@ Author: Dead On The Inside / JosephsDeadish
 Implementation of all 9 organization style presets for sorting textures.
 """
 
+import os
 import re as _re
+from functools import lru_cache
 from pathlib import Path
 from .organization_engine import OrganizationStyle, TextureInfo
 
+# Folder decisions remembered per process. Styles that only look for
+# keywords without digits key their cache on the name with every digit run
+# folded to '0', so tex_0001.png and tex_0002.png share one entry and large
+# dumps are planned almost entirely from the cache.
+STYLE_CACHE_SIZE = 1 << 16
+
+_TOKEN_SPLIT = _re.compile(r'[^a-z0-9]')
+_DIGIT_RUNS = _re.compile(r'[0-9]+')
+
+
+def _name_pattern(filename: str) -> str:
+    """Lower-cased *filename* with digit runs folded to '0'.
+
+    A keyword containing no digits occurs in the pattern exactly when it
+    occurs in the lower-cased name, and tokens keep or lack digits as before.
+    """
+    return _DIGIT_RUNS.sub('0', filename.lower())
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _tokens(text: str) -> frozenset:
+    return frozenset(_TOKEN_SPLIT.split(text))
+
 
 def _has_kw(text: str, keywords) -> bool:
     """Return True if *any* keyword appears as a whole token in *text*.
@@ -19,8 +44,39 @@ def _has_kw(text: str, keywords) -> bool:
     every texture with category ``'environment'`` was misclassified as
     ``Metal_Surfaces`` because ``'iron' in 'environment'`` is True in Python.
     """
-    tokens = set(_re.split(r'[^a-z0-9]', text))
-    return any(kw in tokens for kw in keywords)
+    return not _tokens(text).isdisjoint(keywords)
+
+
+class _SubstringRules:
+    """Ordered ``(keywords, value)`` rules, each folded into one compiled regex.
+
+    ``match()`` returns the value of the first rule with any keyword occurring
+    in the text, the same as a chain of ``any(k in text for k in keywords)``.
+    """
+
+    def __init__(self, rules):
+        self._rules = [(_re.compile('|'.join(_re.escape(k) for k in keywords)), value)
+                       for keywords, value in rules]
+
+    def match(self, text: str, default=None):
+        for pattern, value in self._rules:
+            if pattern.search(text):
+                return value
+        return default
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _folder(*parts: str) -> str:
+    return str(Path(*parts))
+
+
+def _join(folder: str, filename: str) -> str:
+    """``str(Path(folder, filename))`` for a *folder* returned by _folder()."""
+    if (folder and folder != '.' and filename and filename != '.'
+            and not folder.endswith(('/', os.sep)) and ':' not in folder
+            and '/' not in filename and os.sep not in filename and ':' not in filename):
+        return folder + os.sep + filename
+    return str(Path(folder, filename))
 
 
 class ByAppearanceStyle(OrganizationStyle):
@@ -41,60 +97,48 @@ class ByAppearanceStyle(OrganizationStyle):
             "Example: Skin_Tones/Tan/, Metal_Surfaces/Polished/, Fabric/Striped/"
         )
 
+    # Appearance groups in priority order: (whole-token keywords, folder).
+    # Tokens come from the filename and the category; 'iron' must not match
+    # 'environment', see _has_kw().
+    _APPEARANCES = [
+        (['skin', 'body', 'torso', 'arm', 'leg', 'face', 'head'], 'Skin_Tones'),
+        (['metal', 'steel', 'iron', 'chrome', 'gold', 'silver', 'armor'], 'Metal_Surfaces'),
+        (['stone', 'rock', 'concrete', 'brick', 'cobble', 'gravel'], 'Stone_Surfaces'),
+        (['wood', 'plank', 'timber', 'bark', 'log'], 'Wood_Surfaces'),
+        (['cloth', 'fabric', 'textile', 'shirt', 'pants', 'dress', 'outfit'], 'Fabric'),
+        (['grass', 'leaf', 'moss', 'dirt', 'mud', 'sand', 'nature'], 'Natural_Surfaces'),
+        (['glass', 'window', 'transparent', 'alpha', 'crystal'], 'Transparent'),
+        (['glow', 'light', 'neon', 'energy', 'fire', 'flame', 'electric'], 'Glowing_Energy'),
+    ]
+    # Every keyword folded into one lookup: token -> priority of its group
+    _APPEARANCE_RANK = {kw: rank for rank, (keywords, _) in reversed(list(enumerate(_APPEARANCES)))
+                        for kw in keywords}
+
+    # Skin tone from a substring of the filename; first match wins
+    _SKIN_TONES = _SubstringRules([
+        (['dark'], 'Dark'), (['black'], 'Dark'), (['brown'], 'Brown'), (['tan'], 'Tan'),
+        (['light'], 'Light'), (['pale'], 'Light'), (['white'], 'Light'),
+    ])
+    _POLISHED = _SubstringRules([(['polish', 'shiny', 'clean'], 'Polished')])
+
     def get_target_path(self, texture: TextureInfo) -> str:
-        name = texture.filename.lower()
-        cat = texture.category.lower()
-
-        # Skin/body tones
-        if _has_kw(name, ['skin', 'body', 'torso', 'arm', 'leg', 'face', 'head']) or \
-                _has_kw(cat, ['skin', 'body', 'torso', 'arm', 'leg', 'face', 'head']):
-            tone = 'Neutral'
-            for t in [('dark', 'Dark'), ('black', 'Dark'), ('brown', 'Brown'),
-                       ('tan', 'Tan'), ('light', 'Light'), ('pale', 'Light'), ('white', 'Light')]:
-                if t[0] in name:
-                    tone = t[1]
-                    break
-            return str(Path('Skin_Tones', tone, texture.filename))
-
-        # Metal surfaces — use _has_kw to avoid 'iron' matching 'environment'
-        if _has_kw(name, ['metal', 'steel', 'iron', 'chrome', 'gold', 'silver', 'armor']) or \
-                _has_kw(cat, ['metal', 'steel', 'iron', 'chrome', 'gold', 'silver', 'armor']):
-            sub = 'Polished' if any(k in name for k in ['polish', 'shiny', 'clean']) else 'Rough'
-            return str(Path('Metal_Surfaces', sub, texture.filename))
-
-        # Stone / rock / concrete
-        if _has_kw(name, ['stone', 'rock', 'concrete', 'brick', 'cobble', 'gravel']) or \
-                _has_kw(cat, ['stone', 'rock', 'concrete', 'brick', 'cobble', 'gravel']):
-            return str(Path('Stone_Surfaces', texture.filename))
-
-        # Wood
-        if _has_kw(name, ['wood', 'plank', 'timber', 'bark', 'log']) or \
-                _has_kw(cat, ['wood', 'plank', 'timber', 'bark', 'log']):
-            return str(Path('Wood_Surfaces', texture.filename))
-
-        # Fabric / cloth
-        if _has_kw(name, ['cloth', 'fabric', 'textile', 'shirt', 'pants', 'dress', 'outfit']) or \
-                _has_kw(cat, ['cloth', 'fabric', 'textile', 'shirt', 'pants', 'dress', 'outfit']):
-            return str(Path('Fabric', texture.filename))
-
-        # Nature / organic
-        if _has_kw(name, ['grass', 'leaf', 'moss', 'dirt', 'mud', 'sand', 'nature']) or \
-                _has_kw(cat, ['grass', 'leaf', 'moss', 'dirt', 'mud', 'sand', 'nature']):
-            return str(Path('Natural_Surfaces', texture.filename))
-
-        # Transparent / alpha / glass
-        if _has_kw(name, ['glass', 'window', 'transparent', 'alpha', 'crystal']) or \
-                _has_kw(cat, ['glass', 'window', 'transparent', 'alpha', 'crystal']):
-            return str(Path('Transparent', texture.filename))
-
-        # Glow / energy
-        if _has_kw(name, ['glow', 'light', 'neon', 'energy', 'fire', 'flame', 'electric']) or \
-                _has_kw(cat, ['glow', 'light', 'neon', 'energy', 'fire', 'flame', 'electric']):
-            return str(Path('Glowing_Energy', texture.filename))
+        return _join(_appearance_folder(_name_pattern(texture.filename), texture.category),
+                     texture.filename)
+
 
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _appearance_folder(name: str, category: str) -> str:
+    rank = ByAppearanceStyle._APPEARANCE_RANK
+    hits = [rank[t] for t in _tokens(name) | _tokens(category.lower()) if t in rank]
+    if not hits:
         # Fall back to category
-        top = texture.category.replace('/', '_') or 'Other'
-        return str(Path(top, texture.filename))
+        return _folder(category.replace('/', '_') or 'Other')
+    group = ByAppearanceStyle._APPEARANCES[min(hits)][1]
+    if group == 'Skin_Tones':
+        return _folder(group, ByAppearanceStyle._SKIN_TONES.match(name, 'Neutral'))
+    if group == 'Metal_Surfaces':
+        return _folder(group, ByAppearanceStyle._POLISHED.match(name, 'Rough'))
+    return _folder(group)
 
 
 class ByTypeStyle(OrganizationStyle):
@@ -115,20 +159,12 @@ class ByTypeStyle(OrganizationStyle):
                 "Example: Characters/warrior/warrior_red.dds")
     
     def get_target_path(self, texture: TextureInfo) -> str:
-        parts = []
-        
-        # Main category
-        parts.append(texture.category)
-        
         # Detect type (base name without variant)
         base_name = texture.filename.rsplit('_', 1)[0] if '_' in texture.filename else texture.filename
         base_name = base_name.split('.')[0]  # Remove extension
-        parts.append(base_name)
         
-        # LODs in same folder with file
-        parts.append(texture.filename)
-        
-        return str(Path(*parts))
+        # Category / base type, LODs in same folder with file
+        return _join(_folder(texture.category, base_name), texture.filename)
 
 
 class FlatStyle(OrganizationStyle):
@@ -148,7 +184,7 @@ class FlatStyle(OrganizationStyle):
     
     def get_target_path(self, texture: TextureInfo) -> str:
         # Just category and filename - no subdirectories
-        return str(Path(texture.category) / texture.filename)
+        return _join(_folder(texture.category), texture.filename)
 
 
 class ByLocationStyle(OrganizationStyle):
@@ -187,20 +223,18 @@ class ByLocationStyle(OrganizationStyle):
         (['sci', 'futur', 'space', 'station', 'lab', 'tech', 'cyber'], ('Indoor', 'SciFi')),
     ]
 
-    def get_target_path(self, texture: TextureInfo) -> str:
-        name_lower = texture.filename.lower()
-        cat_lower = texture.category.lower()
-        combined = name_lower + ' ' + cat_lower
+    _ZONE_RULES = _SubstringRules(_ZONES)
 
-        zone = 'Outdoor'
-        area = 'General'
+    def get_target_path(self, texture: TextureInfo) -> str:
+        return _join(_location_folder(_name_pattern(texture.filename), texture.category),
+                     texture.filename)
 
-        for keywords, (z, a) in self._ZONES:
-            if any(kw in combined for kw in keywords):
-                zone, area = z, a
-                break
 
-        return str(Path(zone, area, texture.category or 'Misc', texture.filename))
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _location_folder(name: str, category: str) -> str:
+    zone, area = ByLocationStyle._ZONE_RULES.match(name + ' ' + category.lower(),
+                                                   ('Outdoor', 'General'))
+    return _folder(zone, area, category or 'Misc')
 
 
 class ByResolutionStyle(OrganizationStyle):
@@ -230,30 +264,32 @@ class ByResolutionStyle(OrganizationStyle):
         if m >= 512:    return '512'
         return 'Low'
 
+    _NAME_TIERS = _SubstringRules([
+        (['4k', '4096'], '4K+'),
+        (['2k', '2048'], '2K'),
+        (['1k', '1024'], '1K'),
+        (['512'], '512'),
+        (['hd', 'high'], '2K'),
+        (['low', 'lod'], 'Low'),
+    ])
+
     @staticmethod
     def _res_tier_from_name(name: str) -> str:
         """Infer resolution tier from filename keywords."""
-        n = name.lower()
-        if '4k' in n or '4096' in n: return '4K+'
-        if '2k' in n or '2048' in n: return '2K'
-        if '1k' in n or '1024' in n: return '1K'
-        if '512' in n:               return '512'
-        if 'hd' in n or 'high' in n: return '2K'
-        if 'low' in n or 'lod' in n: return 'Low'
-        return '1K'  # 1K is the most common texture resolution in game assets
+        # 1K is the most common texture resolution in game assets
+        return ByResolutionStyle._NAME_TIERS.match(name.lower(), '1K')
 
     def get_target_path(self, texture: TextureInfo) -> str:
         res_tier = (self._res_tier_from_dims(texture.dimensions)
                     if texture.dimensions else
                     self._res_tier_from_name(texture.filename))
         fmt = (texture.format.upper() if texture.format else
-               Path(texture.filename).suffix.lstrip('.').upper() or 'Unknown')
-        lod = f"LOD{texture.lod_level}" if texture.lod_level is not None else None
-        parts = [texture.category or 'Misc', res_tier, fmt]
-        if lod:
-            parts.append(lod)
-        parts.append(texture.filename)
-        return str(Path(*parts))
+               os.path.splitext(texture.filename)[1].lstrip('.').upper() or 'Unknown')
+        if texture.lod_level is not None:
+            folder = _folder(texture.category or 'Misc', res_tier, fmt, f"LOD{texture.lod_level}")
+        else:
+            folder = _folder(texture.category or 'Misc', res_tier, fmt)
+        return _join(folder, texture.filename)
 
 
 class BySystemStyle(OrganizationStyle):
@@ -288,17 +324,20 @@ class BySystemStyle(OrganizationStyle):
         (['animal', 'creature', 'monster', 'beast', 'wildlife'],                             'Creatures'),
     ]
 
+    _SYSTEM_RULES = _SubstringRules(_SYSTEMS)
+
     def get_target_path(self, texture: TextureInfo) -> str:
-        combined = (texture.category + ' ' + texture.filename).lower()
-        system = 'Props'   # default
-        for keywords, sys_folder in self._SYSTEMS:
-            if any(kw in combined for kw in keywords):
-                system = sys_folder
-                break
-        # Sub-category: first part of the AI-classified category (e.g. "Characters/Skin" → "Skin")
-        parts_cat = texture.category.split('/')
-        sub = parts_cat[1] if len(parts_cat) > 1 else (parts_cat[0] if parts_cat else 'General')
-        return str(Path(system, sub, texture.filename))
+        return _join(_system_folder(_name_pattern(texture.filename), texture.category),
+                     texture.filename)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _system_folder(name: str, category: str) -> str:
+    system = BySystemStyle._SYSTEM_RULES.match(category.lower() + ' ' + name, 'Props')
+    # Sub-category: first part of the AI-classified category (e.g. "Characters/Skin" → "Skin")
+    parts_cat = category.split('/')
+    sub = parts_cat[1] if len(parts_cat) > 1 else (parts_cat[0] if parts_cat else 'General')
+    return _folder(system, sub)
 
 
 class MinimalistStyle(OrganizationStyle):
@@ -318,7 +357,7 @@ class MinimalistStyle(OrganizationStyle):
     
     def get_target_path(self, texture: TextureInfo) -> str:
         # Most minimal - just category folder
-        return str(Path(texture.category) / texture.filename)
+        return _join(_folder(texture.category), texture.filename)
 
 
 class MaximumDetailStyle(OrganizationStyle):
@@ -336,41 +375,25 @@ class MaximumDetailStyle(OrganizationStyle):
                 "Sorts by category, gender, age, style, item type, color, format, resolution, and LOD. "
                 "Example: Characters/Male/Adult/Casual/Shirt/Blue/HighRes/LOD0/shirt_blue_lod0.dds")
     
+    _AGES = _SubstringRules([(['child', 'kid'], 'Child'), (['teen'], 'Teen')])
+    _CLOTHING_STYLES = _SubstringRules(
+        [([style.lower()], style) for style in ['Casual', 'Formal', 'Sports', 'Military', 'Fantasy']])
+    _ITEMS = _SubstringRules(
+        [([item.lower()], item) for item in ['Shirt', 'Pants', 'Shoes', 'Hat', 'Jacket', 'Dress']])
+
     def get_target_path(self, texture: TextureInfo) -> str:
-        parts = []
-        
-        # Category
-        parts.append(texture.category)
+        parts = [texture.category]
         
         # Gender if detected
-        gender = self.detect_variant(texture.filename)
-        if gender in ['Male', 'Female']:
-            parts.append(gender)
-        
-        # Age group (if detectable)
-        filename_lower = texture.filename.lower()
-        if 'child' in filename_lower or 'kid' in filename_lower:
-            parts.append('Child')
-        elif 'teen' in filename_lower:
-            parts.append('Teen')
-        else:
-            parts.append('Adult')
-        
-        # Style/Type (detect common descriptors)
-        for style in ['Casual', 'Formal', 'Sports', 'Military', 'Fantasy']:
-            if style.lower() in filename_lower:
-                parts.append(style)
-                break
+        variant = self.detect_variant(texture.filename)
+        if variant in ('Male', 'Female'):
+            parts.append(variant)
         
-        # Specific item type (try to extract from filename)
-        for item in ['Shirt', 'Pants', 'Shoes', 'Hat', 'Jacket', 'Dress']:
-            if item.lower() in filename_lower:
-                parts.append(item)
-                break
+        # Age group (if detectable), style/type and specific item type
+        parts.extend(_detail_descriptors(_name_pattern(texture.filename)))
         
         # Color variant
-        variant = self.detect_variant(texture.filename)
-        if variant and variant not in ['Male', 'Female']:
+        if variant and variant not in ('Male', 'Female'):
             parts.append(variant)
         
         # Format
@@ -392,10 +415,18 @@ class MaximumDetailStyle(OrganizationStyle):
         if texture.lod_level is not None:
             parts.append(f"LOD{texture.lod_level}")
         
-        # Filename
-        parts.append(texture.filename)
-        
-        return str(Path(*parts))
+        return _join(_folder(*parts), texture.filename)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _detail_descriptors(name: str) -> tuple:
+    """Age group, then style and item type when the filename names them."""
+    found = [MaximumDetailStyle._AGES.match(name, 'Adult')]
+    for rules in (MaximumDetailStyle._CLOTHING_STYLES, MaximumDetailStyle._ITEMS):
+        value = rules.match(name)
+        if value:
+            found.append(value)
+    return tuple(found)
 
 
 class CustomStyle(OrganizationStyle):
@@ -463,40 +494,42 @@ class CustomStyle(OrganizationStyle):
 #   • Keeps a resolution sub-tier so CI/CD pipelines can distinguish LOD layers
 #     common in console ports (e.g. 16px icon sprites vs. 256px character maps)
 
+_CONSOLE_MAP_TYPES = _SubstringRules([
+    (('_nrm', '_norm', '_n.', '_n_', 'normal'), 'Normal'),
+    (('_spc', '_spec', '_s.', '_s_', 'specular', 'gloss'), 'Specular'),
+    (('_emi', '_emis', '_e.', '_e_', 'emissive', 'glow'), 'Emissive'),
+    (('_alp', '_a.', '_a_', 'alpha', '_msk', 'mask'), 'Alpha'),
+])
+
+_CONSOLE_CONTENT = _SubstringRules([
+    (('chr', 'char', 'npc', 'player', 'ply', 'face', 'head',
+      'body', 'skin', 'hair', 'hand', 'arm', 'leg'), 'Characters'),
+    (('wpn', 'weap', 'gun', 'sword', 'blade', 'knife',
+      'rifle', 'bow', 'item', 'itm'), 'Items'),
+    (('ui', 'hud', 'font', 'icon', 'btn', 'menu', 'cursor',
+      'button', 'iface', 'interface'), 'UI'),
+    (('fx', 'eff', 'smoke', 'fire', 'spark', 'glow',
+      'particle', 'decal', 'blood', 'hit'), 'Effects'),
+    (('sky', 'cloud', 'sun', 'moon', 'star', 'bg', 'background'), 'Sky'),
+])
+
+
 def _console_map_type(name: str) -> str:
     """Derive map-type folder from filename suffixes / keywords."""
-    n = name.lower()
-    if any(s in n for s in ('_nrm', '_norm', '_n.', '_n_', 'normal')):
-        return 'Normal'
-    if any(s in n for s in ('_spc', '_spec', '_s.', '_s_', 'specular', 'gloss')):
-        return 'Specular'
-    if any(s in n for s in ('_emi', '_emis', '_e.', '_e_', 'emissive', 'glow')):
-        return 'Emissive'
-    if any(s in n for s in ('_alp', '_a.', '_a_', 'alpha', '_msk', 'mask')):
-        return 'Alpha'
     # Default → diffuse
-    return 'Diffuse'
+    return _CONSOLE_MAP_TYPES.match(name.lower(), 'Diffuse')
 
 
 def _console_content_cat(name: str) -> str:
     """Map filename keywords → broad content category."""
-    n = name.lower()
-    if any(k in n for k in ('chr', 'char', 'npc', 'player', 'ply', 'face', 'head',
-                              'body', 'skin', 'hair', 'hand', 'arm', 'leg')):
-        return 'Characters'
-    if any(k in n for k in ('wpn', 'weap', 'gun', 'sword', 'blade', 'knife',
-                              'rifle', 'bow', 'item', 'itm')):
-        return 'Items'
-    if any(k in n for k in ('ui', 'hud', 'font', 'icon', 'btn', 'menu', 'cursor',
-                              'button', 'iface', 'interface')):
-        return 'UI'
-    if any(k in n for k in ('fx', 'eff', 'smoke', 'fire', 'spark', 'glow',
-                              'particle', 'decal', 'blood', 'hit')):
-        return 'Effects'
-    if any(k in n for k in ('sky', 'cloud', 'sun', 'moon', 'star', 'bg', 'background')):
-        return 'Sky'
     # Default → Environments
-    return 'Environments'
+    return _CONSOLE_CONTENT.match(name.lower(), 'Environments')
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _console_folder(name: str) -> tuple:
+    """(content category, map type) for a name pattern."""
+    return _console_content_cat(name), _console_map_type(name)
 
 
 def _console_res_tier(dims, max_typical: int) -> str:
@@ -541,10 +574,9 @@ class PS2Style(OrganizationStyle):
         )
 
     def get_target_path(self, texture: TextureInfo) -> str:
-        cat  = _console_content_cat(texture.filename)
-        mtype = _console_map_type(texture.filename)
+        cat, mtype = _console_folder(_name_pattern(texture.filename))
         tier  = _console_res_tier(texture.dimensions, 256)
-        return str(Path(cat, mtype, tier, texture.filename))
+        return _join(_folder(cat, mtype, tier), texture.filename)
 
 
 class PSPStyle(OrganizationStyle):
@@ -568,9 +600,8 @@ class PSPStyle(OrganizationStyle):
         )
 
     def get_target_path(self, texture: TextureInfo) -> str:
-        cat   = _console_content_cat(texture.filename)
-        mtype = _console_map_type(texture.filename)
-        return str(Path(cat, mtype, texture.filename))
+        cat, mtype = _console_folder(_name_pattern(texture.filename))
+        return _join(_folder(cat, mtype), texture.filename)
 
 
 class GameCubeStyle(OrganizationStyle):
@@ -593,10 +624,9 @@ class GameCubeStyle(OrganizationStyle):
         )
 
     def get_target_path(self, texture: TextureInfo) -> str:
-        cat   = _console_content_cat(texture.filename)
-        mtype = _console_map_type(texture.filename)
+        cat, mtype = _console_folder(_name_pattern(texture.filename))
         tier  = _console_res_tier(texture.dimensions, 1024)
-        return str(Path(cat, mtype, tier, texture.filename))
+        return _join(_folder(cat, mtype, tier), texture.filename)
 
 
 class N64Style(OrganizationStyle):
@@ -620,8 +650,8 @@ class N64Style(OrganizationStyle):
         )
 
     def get_target_path(self, texture: TextureInfo) -> str:
-        cat = _console_content_cat(texture.filename)
-        return str(Path(cat, texture.filename))
+        cat, _ = _console_folder(_name_pattern(texture.filename))
+        return _join(_folder(cat), texture.filename)
 
 
 # ── Game Texture Content style ─────────────────────────────────────────────
@@ -639,122 +669,118 @@ class N64Style(OrganizationStyle):
 # versus "Characters → Eyes_Isolated → Diffuse" — handling the "floating
 # eyeball" phenomenon common in PS2/N64/GCN UV sheets.
 
-def _game_map_type(name: str) -> str:
-    """Detect map type (Diffuse, Normal, Specular, Emissive, Alpha, AO, Shadow)."""
-    n = name.lower()
-    if any(s in n for s in ('_nrm', '_norm', '_n.', '_n_', 'normal', 'bump', '_bmp')):
-        return 'Normal'
-    if any(s in n for s in ('_spc', '_spec', '_s.', '_s_', 'specular', 'gloss', '_g.')):
-        return 'Specular'
-    if any(s in n for s in ('_emi', '_emis', '_e.', '_e_', 'emissive', 'glow', '_glow')):
-        return 'Emissive'
-    if any(s in n for s in ('_alp', '_a.', '_a_', 'alpha', '_msk', '_mask', 'opacity')):
-        return 'Alpha'
-    if any(s in n for s in ('_ao', '_occ', 'ambient', 'occlusion', 'shadow', '_shd')):
-        return 'AO_Shadow'
-    if any(s in n for s in ('_rgh', '_rough', 'roughness', '_mtl', '_metallic', 'pbr')):
-        return 'PBR'
-    return 'Diffuse'
-
+_GAME_MAP_TYPES = _SubstringRules([
+    (('_nrm', '_norm', '_n.', '_n_', 'normal', 'bump', '_bmp'), 'Normal'),
+    (('_spc', '_spec', '_s.', '_s_', 'specular', 'gloss', '_g.'), 'Specular'),
+    (('_emi', '_emis', '_e.', '_e_', 'emissive', 'glow', '_glow'), 'Emissive'),
+    (('_alp', '_a.', '_a_', 'alpha', '_msk', '_mask', 'opacity'), 'Alpha'),
+    (('_ao', '_occ', 'ambient', 'occlusion', 'shadow', '_shd'), 'AO_Shadow'),
+    (('_rgh', '_rough', 'roughness', '_mtl', '_metallic', 'pbr'), 'PBR'),
+])
 
-def _game_body_part(name: str) -> str | None:
-    """Detect isolated body-part UV sheets — the 'floating eyeball' problem.
-
-    In game UV atlases (especially PS2, N64, GameCube) the 3-D model's surface
-    is cut along seams and unfolded flat, so individual body parts become
-    separate image patches.  Eyes, mouths, and hands are almost always stored
-    as completely separate texture files rather than packed into the full-body
-    sheet.  This produces the 'floating eyeball' appearance — a close-up of
-    an eyeball or just the iris/pupil sitting in an otherwise empty image.
-
-    Returns a sub-folder name if the filename clearly refers to a single
-    isolated body part, or *None* if it looks like a full-body UV sheet.
-    """
-    n = name.lower()
+_GAME_BODY_PARTS = _SubstringRules([
     # Eyes are the most common isolated part in PS2/N64/GCN UV atlases
-    if any(s in n for s in ('eye', '_eye', 'iris', 'pupil', 'eyeball', 'sclera')):
-        return 'Eyes_Isolated'
-    if any(s in n for s in ('mouth', 'teeth', 'lip', 'gum', 'tongue')):
-        return 'Mouth_Isolated'
-    if any(s in n for s in ('ear', 'ear_', '_ear')):
-        return 'Ears_Isolated'
-    if any(s in n for s in ('hand', 'palm', 'finger', 'fist', 'knuckle')):
-        return 'Hands'
-    if any(s in n for s in ('foot', 'feet', 'toe', 'heel', 'shoe', 'boot', 'sole')):
-        return 'Feet'
-    if any(s in n for s in ('hair', 'strand', 'braid', 'ponytail', 'fringe')):
-        return 'Hair'
-    return None
-
-
-def _game_content_role(name: str) -> str:
-    """Map a filename to its broad game-content role folder."""
-    n = name.lower()
-
+    (('eye', '_eye', 'iris', 'pupil', 'eyeball', 'sclera'), 'Eyes_Isolated'),
+    (('mouth', 'teeth', 'lip', 'gum', 'tongue'), 'Mouth_Isolated'),
+    (('ear', 'ear_', '_ear'), 'Ears_Isolated'),
+    (('hand', 'palm', 'finger', 'fist', 'knuckle'), 'Hands'),
+    (('foot', 'feet', 'toe', 'heel', 'shoe', 'boot', 'sole'), 'Feet'),
+    (('hair', 'strand', 'braid', 'ponytail', 'fringe'), 'Hair'),
+])
+
+_GAME_CONTENT_ROLES = _SubstringRules([
     # ── Characters & creatures ──────────────────────────────────────────────
     # UV atlas sheets (full body or torso) — detected by 'chr', 'ply', 'npc', etc.
-    if any(s in n for s in ('chr_', '_chr', 'char_', 'ply_', 'npc_', 'hero_',
-                              'enemy_', 'mob_', 'boss_', 'player', 'avatar')):
-        return 'Characters/UV_Body'
+    (('chr_', '_chr', 'char_', 'ply_', 'npc_', 'hero_',
+      'enemy_', 'mob_', 'boss_', 'player', 'avatar'), 'Characters/UV_Body'),
     # Individual named body sections
-    if any(s in n for s in ('head_', '_head', 'face_', '_face', 'torso', 'body_',
-                              '_body', 'chest', 'neck', 'shoulder', 'arm_', 'leg_',
-                              'thigh', 'calf', 'wrist', 'ankle')):
-        return 'Characters/UV_Body'
+    (('head_', '_head', 'face_', '_face', 'torso', 'body_',
+      '_body', 'chest', 'neck', 'shoulder', 'arm_', 'leg_',
+      'thigh', 'calf', 'wrist', 'ankle'), 'Characters/UV_Body'),
 
     # ── Weapons & equipment ─────────────────────────────────────────────────
-    if any(s in n for s in ('wpn_', '_wpn', 'weap', 'sword', 'gun_', '_gun',
-                              'rifle', 'pistol', 'knife', 'bow_', '_bow',
-                              'shield', 'axe', 'hammer', 'staff', 'blade')):
-        return 'Weapons'
+    (('wpn_', '_wpn', 'weap', 'sword', 'gun_', '_gun',
+      'rifle', 'pistol', 'knife', 'bow_', '_bow',
+      'shield', 'axe', 'hammer', 'staff', 'blade'), 'Weapons'),
 
     # ── Clothing & accessories ──────────────────────────────────────────────
-    if any(s in n for s in ('shirt', 'pants', 'dress', 'coat', 'jacket', 'armor',
-                              'helmet', 'glove', 'belt', 'outfit', 'cloth', 'robe',
-                              'cape', 'hood', 'cloak')):
-        return 'Clothing_Accessories'
+    (('shirt', 'pants', 'dress', 'coat', 'jacket', 'armor',
+      'helmet', 'glove', 'belt', 'outfit', 'cloth', 'robe',
+      'cape', 'hood', 'cloak'), 'Clothing_Accessories'),
 
     # ── Environment / architecture ──────────────────────────────────────────
-    if any(s in n for s in ('wall', 'floor', 'ceil', 'roof', 'ground', 'terrain',
-                              'tile_', '_tile', 'brick', 'stone', 'wood_', '_wood',
-                              'pillar', 'arch', 'door', 'window', 'fence', 'road',
-                              'stair', 'ramp', 'cliff', 'cave', 'rock', 'dirt',
-                              'grass', 'sand', 'snow', 'mud', 'path', 'street')):
-        return 'Environment'
+    (('wall', 'floor', 'ceil', 'roof', 'ground', 'terrain',
+      'tile_', '_tile', 'brick', 'stone', 'wood_', '_wood',
+      'pillar', 'arch', 'door', 'window', 'fence', 'road',
+      'stair', 'ramp', 'cliff', 'cave', 'rock', 'dirt',
+      'grass', 'sand', 'snow', 'mud', 'path', 'street'), 'Environment'),
 
     # ── Props / objects ─────────────────────────────────────────────────────
-    if any(s in n for s in ('prop_', '_prop', 'obj_', '_obj', 'item_', '_item',
-                              'box', 'crate', 'barrel', 'chest', 'bag', 'cask',
-                              'table', 'chair', 'bed', 'shelf', 'lamp', 'pot',
-                              'vase', 'book', 'sign', 'fence', 'plant', 'bush')):
-        return 'Props'
+    (('prop_', '_prop', 'obj_', '_obj', 'item_', '_item',
+      'box', 'crate', 'barrel', 'chest', 'bag', 'cask',
+      'table', 'chair', 'bed', 'shelf', 'lamp', 'pot',
+      'vase', 'book', 'sign', 'fence', 'plant', 'bush'), 'Props'),
 
     # ── Vehicles ────────────────────────────────────────────────────────────
-    if any(s in n for s in ('car_', '_car', 'veh_', '_veh', 'tank', 'plane',
-                              'boat', 'ship', 'bike', 'truck', 'bus', 'train')):
-        return 'Vehicles'
+    (('car_', '_car', 'veh_', '_veh', 'tank', 'plane',
+      'boat', 'ship', 'bike', 'truck', 'bus', 'train'), 'Vehicles'),
 
     # ── Sky / background ────────────────────────────────────────────────────
-    if any(s in n for s in ('sky', 'cloud', 'sun', 'moon', 'star', 'bg_', '_bg',
-                              'background', 'skybox', 'horizon')):
-        return 'Sky_Background'
+    (('sky', 'cloud', 'sun', 'moon', 'star', 'bg_', '_bg',
+      'background', 'skybox', 'horizon'), 'Sky_Background'),
 
     # ── UI / HUD ────────────────────────────────────────────────────────────
-    if any(s in n for s in ('ui_', '_ui', 'hud', 'icon_', '_icon', 'btn_', '_btn',
-                              'menu', 'cursor', 'font', 'button', 'panel', 'frame')):
-        return 'UI_HUD'
+    (('ui_', '_ui', 'hud', 'icon_', '_icon', 'btn_', '_btn',
+      'menu', 'cursor', 'font', 'button', 'panel', 'frame'), 'UI_HUD'),
 
     # ── Effects / particles ─────────────────────────────────────────────────
-    if any(s in n for s in ('fx_', '_fx', 'eff_', '_eff', 'smoke', 'fire', 'spark',
-                              'blood', 'decal', 'splash', 'glow', 'particle')):
-        return 'Effects'
+    (('fx_', '_fx', 'eff_', '_eff', 'smoke', 'fire', 'spark',
+      'blood', 'decal', 'splash', 'glow', 'particle'), 'Effects'),
 
     # ── Animals / wildlife ──────────────────────────────────────────────────
-    if any(s in n for s in ('animal', 'creature', 'monster', 'beast', 'bird',
-                              'fish', 'insect', 'wolf', 'bear', 'deer', 'dog', 'cat')):
-        return 'Creatures'
+    (('animal', 'creature', 'monster', 'beast', 'bird',
+      'fish', 'insect', 'wolf', 'bear', 'deer', 'dog', 'cat'), 'Creatures'),
+])
+
+
+def _game_map_type(name: str) -> str:
+    """Detect map type (Diffuse, Normal, Specular, Emissive, Alpha, AO, Shadow)."""
+    return _GAME_MAP_TYPES.match(name.lower(), 'Diffuse')
+
+
+def _game_body_part(name: str) -> str | None:
+    """Detect isolated body-part UV sheets — the 'floating eyeball' problem.
+
+    In game UV atlases (especially PS2, N64, GameCube) the 3-D model's surface
+    is cut along seams and unfolded flat, so individual body parts become
+    separate image patches.  Eyes, mouths, and hands are almost always stored
+    as completely separate texture files rather than packed into the full-body
+    sheet.  This produces the 'floating eyeball' appearance — a close-up of
+    an eyeball or just the iris/pupil sitting in an otherwise empty image.
+
+    Returns a sub-folder name if the filename clearly refers to a single
+    isolated body part, or *None* if it looks like a full-body UV sheet.
+    """
+    return _GAME_BODY_PARTS.match(name.lower())
+
+
+def _game_content_role(name: str) -> str:
+    """Map a filename to its broad game-content role folder."""
+    return _GAME_CONTENT_ROLES.match(name.lower(), 'Misc')
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _game_content_folder(name: str) -> str:
+    """ContentRole / BodyPart (if isolated) / MapType for a name pattern."""
+    role  = _game_content_role(name)
+    mtype = _game_map_type(name)
 
-    return 'Misc'
+    # Check for isolated body parts within the Characters role
+    if role.startswith('Characters'):
+        part = _game_body_part(name)
+        if part:
+            return _folder(role, part, mtype)
+    return _folder(role, mtype)
 
 
 class GameTextureContentStyle(OrganizationStyle):
@@ -796,18 +822,7 @@ class GameTextureContentStyle(OrganizationStyle):
         )
 
     def get_target_path(self, texture: TextureInfo) -> str:
-        name  = texture.filename.lower()
-        role  = _game_content_role(name)
-        mtype = _game_map_type(name)
-
-        # Check for isolated body parts within the Characters role
-        if role.startswith('Characters'):
-            part = _game_body_part(name)
-            if part:
-                return str(Path(role, part, mtype, texture.filename))
-            return str(Path(role, mtype, texture.filename))
-
-        return str(Path(role, mtype, texture.filename))
+        return _join(_game_content_folder(_name_pattern(texture.filename)), texture.filename)
 
 
 # Dictionary of all available organization styles
@@ -0,0 +1,407 @@
+"""
+Run Journal - Resumable, undoable organize runs
+Append-only NDJSON record of every file an organize run has finished with,
+synced to disk in batches so an interrupted run can resume where it stopped
+and a whole run can be undone by replaying the journal backwards.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    from utils.file_hasher import hash_file
+except ImportError:
+    try:
+        from ..utils.file_hasher import hash_file
+    except ImportError:
+        hash_file = None
+
+logger = logging.getLogger(__name__)
+
+# fsync after this many entries or this many seconds, whichever comes first
+SYNC_EVERY = 256
+SYNC_INTERVAL = 1.0
+
+# Actions: what happened to the source file
+ACTION_COPY = 'copy'
+ACTION_MOVE = 'move'
+ACTION_SKIP = 'skip'   # decided (e.g. classified) but nothing written
+
+
+def _default_journal_dir() -> Path:
+    try:
+        from config import get_data_dir as _gdd
+        return _gdd() / 'journals'
+    except Exception:
+        return Path.home() / '.ps2_texture_sorter' / 'journals'
+
+
+def journal_path_for(output_dir: Path, journal_dir: Optional[Path] = None) -> Path:
+    """
+    Default journal file for runs that write into ``output_dir``.
+
+    Journals live in the application data folder (not in the output tree),
+    one per output directory.
+    """
+    resolved = str(Path(output_dir).resolve())
+    digest = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:12]
+    name = Path(resolved).name or 'root'
+    return Path(journal_dir or _default_journal_dir()) / f"{name}-{digest}.ndjson"
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class RunJournal:
+    """
+    Journal of completed (source, destination, category, content hash) entries.
+
+    Entries are appended as NDJSON and fsynced every ``sync_every`` entries
+    or ``sync_interval`` seconds, so a crash loses at most one batch. On
+    resume the journal is loaded into a dictionary keyed by source path:
+    checking whether a file is already done is one lookup and one ``stat``.
+    """
+
+    def __init__(self, path: Path, sync_every: int = SYNC_EVERY,
+                 sync_interval: float = SYNC_INTERVAL,
+                 hash_algorithm: Optional[str] = 'crc32'):
+        """
+        Args:
+            path: Journal file
+            sync_every: Entries between fsyncs
+            sync_interval: Maximum seconds between fsyncs
+            hash_algorithm: Content hash recorded per destination
+                (see utils.file_hasher.hash_file), or None to skip hashing
+        """
+        self.path = Path(path)
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self.hash_algorithm = hash_algorithm if hash_file is not None else None
+        self.run_info: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._done: Dict[str, Dict[str, Any]] = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def for_output(cls, output_dir: Path, **kwargs) -> 'RunJournal':
+        """Journal at the default location for ``output_dir``."""
+        return cls(journal_path_for(output_dir), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def start(self, resume: bool = False, **run_info) -> int:
+        """
+        Open the journal for a run.
+
+        Args:
+            resume: Keep the existing journal and skip its entries; otherwise
+                the previous journal is replaced
+            **run_info: Stored in the run header (source, output, style, ...)
+
+        Returns:
+            Number of completed entries loaded for resuming
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        loaded = 0
+        if resume and self.path.exists():
+            loaded = self._load()
+        else:
+            self._done.clear()
+        self.run_info = dict(run_info)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._append({
+            'type': 'run',
+            'started': datetime.now().isoformat(),
+            'resumed': bool(resume and loaded),
+            **self.run_info,
+        })
+        self.sync()
+        return loaded
+
+    def _load(self) -> int:
+        self._done.clear()
+        for entry in self.iter_entries():
+            self._done[entry['src']] = entry
+        return len(self._done)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str) + '\n')
+        self._unsynced += 1
+
+    def record(self, source: Path, destination: Optional[Path], category: str = '',
+               action: str = ACTION_COPY, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Record a finished file.
+
+        Args:
+            source: Source file (as it was before the operation)
+            destination: Where it was written, or None for ACTION_SKIP
+            category: Category it was organized under
+            action: ACTION_COPY, ACTION_MOVE or ACTION_SKIP
+            content_hash: Hash of the written file (computed if None and
+                hashing is enabled)
+
+        Returns:
+            The journal entry
+        """
+        source = str(source)
+        entry: Dict[str, Any] = {'type': 'file', 'src': source, 'action': action,
+                                 'cat': category}
+        if destination is not None:
+            destination = Path(destination)
+            entry['dst'] = str(destination)
+            signature = _stat_signature(destination)
+            if signature is not None:
+                entry['size'], entry['dst_mtime_ns'] = signature
+                if content_hash is None and self.hash_algorithm:
+                    try:
+                        content_hash = hash_file(destination, self.hash_algorithm)
+                    except OSError as e:
+                        logger.debug(f"Could not hash {destination}: {e}")
+        if content_hash:
+            entry['hash'] = f"{self.hash_algorithm}:{content_hash}" if self.hash_algorithm else content_hash
+        if action != ACTION_MOVE:
+            # Copied/skipped sources stay put; remember them to spot changes on resume
+            signature = _stat_signature(Path(source))
+            if signature is not None:
+                entry['src_size'], entry['src_mtime_ns'] = signature
+
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("Journal is not open; call start() first")
+            self._append(entry)
+            self._done[source] = entry
+            if (self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval):
+                self._sync_locked()
+        return entry
+
+    def _sync_locked(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        try:
+            os.fsync(self._file.fileno())
+        except OSError:
+            pass
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Flush and fsync pending entries."""
+        with self._lock:
+            self._sync_locked()
+
+    def complete(self, **summary) -> None:
+        """Mark the run as finished and close the journal."""
+        with self._lock:
+            if self._file is not None:
+                self._append({'type': 'end', 'finished': datetime.now().isoformat(), **summary})
+        self.close()
+
+    def close(self) -> None:
+        """Sync and close the journal (safe to call more than once)."""
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'RunJournal':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def is_done(self, source: Path) -> bool:
+        """
+        True if ``source`` was completed by this run (or the run it resumes).
+
+        Copied sources must also be unchanged since they were journaled, so
+        a file edited between runs is processed again.
+        """
+        entry = self._done.get(str(source))
+        if entry is None:
+            return False
+        if 'src_size' not in entry:
+            return True
+        return _stat_signature(Path(source)) == (entry['src_size'], entry['src_mtime_ns'])
+
+    def get(self, source: Path) -> Optional[Dict[str, Any]]:
+        """Journal entry for ``source``, if any."""
+        return self._done.get(str(source))
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """File entries in the journal, in write order (torn last line skipped)."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('type') == 'file':
+                    yield record
+
+    def is_complete(self) -> bool:
+        """True if the last run in the journal finished (was not interrupted)."""
+        last_type = None
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        last_type = json.loads(line).get('type')
+                    except json.JSONDecodeError:
+                        continue
+        return last_type == 'end'
+
+    # ------------------------------------------------------------------
+    # Undo
+    # ------------------------------------------------------------------
+
+    def undo(self, verify_hash: bool = False,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Undo every journaled operation, newest first.
+
+        Copies are deleted and moves are moved back. A destination whose size
+        or mtime no longer matches the journal (or, with ``verify_hash``, whose
+        content hash differs) was changed after the run and is left alone.
+        Directories emptied by the undo are removed. The journal is renamed
+        to ``*.undone`` afterwards.
+
+        Args:
+            verify_hash: Re-hash each destination before touching it
+            progress_callback: Called as (done, total)
+
+        Returns:
+            Dict with 'removed', 'restored', 'missing', 'changed' and 'errors'
+        """
+        self.close()
+        entries = [e for e in self.iter_entries() if e.get('dst') and e.get('action') != ACTION_SKIP]
+        # A file journaled twice (resumed run) is undone once, from its last entry
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            latest[entry['dst']] = entry
+        ordered = [e for e in reversed(entries) if latest.get(e['dst']) is e]
+
+        stats: Dict[str, Any] = {'removed': 0, 'restored': 0, 'missing': 0, 'changed': 0, 'errors': []}
+        parents = set()
+        total = len(ordered)
+        for done, entry in enumerate(ordered, 1):
+            destination = Path(entry['dst'])
+            try:
+                signature = _stat_signature(destination)
+                if signature is None:
+                    stats['missing'] += 1
+                elif ('size' in entry
+                      and signature != (entry['size'], entry['dst_mtime_ns'])) or (
+                        verify_hash and not self._hash_matches(destination, entry)):
+                    stats['changed'] += 1
+                elif entry.get('action') == ACTION_MOVE:
+                    source = Path(entry['src'])
+                    if source.exists():
+                        stats['changed'] += 1
+                    else:
+                        source.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(destination, source)
+                        stats['restored'] += 1
+                        parents.add(destination.parent)
+                else:
+                    os.unlink(destination)
+                    stats['removed'] += 1
+                    parents.add(destination.parent)
+            except OSError as e:
+                stats['errors'].append({'file': str(destination), 'error': str(e)})
+            if progress_callback:
+                progress_callback(done, total)
+
+        output_root = self.run_info.get('output') or self._header_value('output')
+        self._remove_empty_dirs(parents, Path(output_root) if output_root else None)
+        try:
+            os.replace(self.path, self.path.with_name(self.path.name + '.undone'))
+        except OSError as e:
+            logger.warning(f"Could not retire journal {self.path}: {e}")
+        self._done.clear()
+        logger.info(f"Undid run from {self.path}: {stats['removed']} removed, "
+                    f"{stats['restored']} restored, {stats['changed']} changed, "
+                    f"{stats['missing']} missing")
+        return stats
+
+    def _hash_matches(self, destination: Path, entry: Dict[str, Any]) -> bool:
+        recorded = entry.get('hash')
+        if not recorded or hash_file is None:
+            return True
+        algorithm, _, digest = recorded.partition(':')
+        try:
+            return hash_file(destination, algorithm) == digest
+        except (OSError, ValueError, RuntimeError):
+            return False
+
+    def _header_value(self, key: str) -> Optional[Any]:
+        if not self.path.exists():
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('type') == 'run' and key in record:
+                    return record[key]
+        return None
+
+    @staticmethod
+    def _remove_empty_dirs(directories, stop_at: Optional[Path]) -> None:
+        """Remove now-empty directories, walking up to (not including) ``stop_at``."""
+        stop = stop_at.resolve() if stop_at else None
+        for directory in sorted(directories, key=lambda p: len(p.parts), reverse=True):
+            current = directory
+            while stop is None or (current.resolve() != stop and stop in current.resolve().parents):
+                try:
+                    current.rmdir()
+                except OSError:
+                    break
+                if stop is None:
+                    break
+                current = current.parent
+
+
+def undo_run(output_dir: Path, journal_path: Optional[Path] = None,
+             verify_hash: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Undo the last journaled run into ``output_dir``.
+
+    Returns:
+        Undo statistics, or None if there is no journal for that directory
+    """
+    journal = RunJournal(journal_path or journal_path_for(output_dir))
+    if not journal.path.exists():
+        return None
+    journal.run_info = {'output': str(output_dir)}
+    return journal.undo(verify_hash=verify_hash)
@@ -7,9 +7,12 @@ Author: Dead On The Inside / JosephsDeadish
 from .similarity_search import SimilaritySearch
 from .embedding_store import EmbeddingStore
 from .duplicate_detector import DuplicateDetector
+from .content_index import ContentIndex, index_path_for_folder
 
 __all__ = [
     'SimilaritySearch',
     'EmbeddingStore',
-    'DuplicateDetector'
+    'DuplicateDetector',
+    'ContentIndex',
+    'index_path_for_folder'
 ]
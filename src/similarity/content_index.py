@@ -0,0 +1,299 @@
+"""
+Content Index
+Persistent per-folder image embedding index for text-to-image search
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except (ImportError, OSError, RuntimeError):
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+# Images are decoded at reduced resolution before encoding; CLIP-style
+# encoders centre-crop to 224 px, so twice that keeps the crop sharp.
+ENCODE_DECODE_SIZE = 448
+
+
+def index_path_for_folder(cache_dir: Path, folder: Path) -> Path:
+    """
+    Database file used to index ``folder``.
+
+    Indexes live in the application cache rather than next to the textures,
+    so read-only and shared folders can be indexed too.
+
+    Args:
+        cache_dir: Directory holding all content indexes
+        folder: Folder being indexed
+
+    Returns:
+        Path of the SQLite file for this folder
+    """
+    digest = hashlib.sha1(str(Path(folder).resolve()).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / f"{digest}.db"
+
+
+def _load_for_encoding(path: Path):
+    """Decode ``path`` as RGB at reduced size, or return None."""
+    try:
+        from utils.image_processing import load_reduced_image
+    except ImportError:
+        from ..utils.image_processing import load_reduced_image
+    try:
+        img = load_reduced_image(path, (ENCODE_DECODE_SIZE, ENCODE_DECODE_SIZE))
+        return img if img.mode == 'RGB' else img.convert('RGB')
+    except Exception as e:
+        logger.debug(f"Could not decode {path} for content index: {e}")
+        return None
+
+
+class ContentIndex:
+    """
+    Persistent embedding index for the images of one folder.
+
+    Features:
+    - One normalized embedding per image, stored as float32 in SQLite
+    - Incremental updates: only new or changed files (size/mtime) are encoded
+    - In-memory matrix for millisecond top-k queries
+    - Thread-safe, so a background build can run while queries are served
+
+    The encoder is any object providing ``batch_encode_images(images)``
+    returning an (N, D) array and ``encode_text(text)`` returning (1, D),
+    e.g. :class:`vision_models.clip_model.CLIPModel`.
+    """
+
+    def __init__(self, db_path: Path, model_name: str = ''):
+        """
+        Open (or create) a content index.
+
+        Args:
+            db_path: SQLite file for this folder's index
+            model_name: Encoder identifier; an index built with a different
+                encoder is discarded, since embeddings are not comparable
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for the content index")
+        self.db_path = Path(db_path)
+        self.model_name = model_name
+        self._lock = threading.RLock()
+        self._matrix = None
+        self._paths: List[str] = []
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS embeddings (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                dim INTEGER NOT NULL,
+                embedding BLOB NOT NULL
+            )
+        ''')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+        if row is not None and row[0] != model_name:
+            logger.info(f"Content index {self.db_path.name} built with {row[0]!r}; rebuilding")
+            self.conn.execute('DELETE FROM embeddings')
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('model', ?)",
+                          (model_name,))
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+
+    def stale_files(self, files: Iterable[Path]) -> Tuple[List[Path], List[str]]:
+        """
+        Compare ``files`` against the index.
+
+        Args:
+            files: Current image files of the folder
+
+        Returns:
+            Tuple of (files that need encoding, indexed paths no longer present)
+        """
+        with self._lock:
+            known: Dict[str, Tuple[int, int]] = {
+                path: (size, mtime)
+                for path, size, mtime in self.conn.execute(
+                    'SELECT path, size, mtime_ns FROM embeddings'
+                )
+            }
+        to_encode: List[Path] = []
+        for path in files:
+            key = str(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if known.pop(key, None) != (st.st_size, st.st_mtime_ns):
+                to_encode.append(path)
+        return to_encode, list(known)
+
+    def add(self, paths: List[Path], embeddings: Any) -> None:
+        """
+        Store embeddings for ``paths`` (rows of ``embeddings``, same order).
+
+        Files are stat'ed here so their size/mtime are recorded with the
+        embedding; a file rewritten later is picked up by ``stale_files``.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        rows = []
+        for path, vector in zip(paths, embeddings):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            norm = float(np.linalg.norm(vector))
+            if norm > 0:
+                vector = vector / norm
+            rows.append((str(path), st.st_size, st.st_mtime_ns, vector.shape[0],
+                         vector.astype(np.float32).tobytes()))
+        with self._lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (path, size, mtime_ns, dim, embedding) '
+                'VALUES (?, ?, ?, ?, ?)', rows
+            )
+            self.conn.commit()
+            self._matrix = None
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Drop entries for files that were deleted or renamed."""
+        with self._lock:
+            self.conn.executemany('DELETE FROM embeddings WHERE path = ?',
+                                  [(str(p),) for p in paths])
+            self.conn.commit()
+            self._matrix = None
+
+    def update(
+        self,
+        files: List[Path],
+        encoder: Any,
+        batch_size: int = 32,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> int:
+        """
+        Bring the index up to date with ``files``.
+
+        Only new or modified files are decoded and encoded; entries for
+        files that disappeared are removed.
+
+        Args:
+            files: Current image files of the folder
+            encoder: Image/text encoder (see class docstring)
+            batch_size: Images per encoder forward pass
+            progress_callback: Called with (done, total) after each batch
+            cancel_event: Set to stop early; finished batches are kept
+
+        Returns:
+            Number of files encoded
+        """
+        to_encode, removed = self.stale_files(files)
+        if removed:
+            self.remove(removed)
+        total = len(to_encode)
+        if total:
+            logger.info(f"Content index: encoding {total} of {len(files)} images")
+        done = encoded = 0
+        for start in range(0, total, batch_size):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            chunk = to_encode[start:start + batch_size]
+            paths, images = [], []
+            for path in chunk:
+                img = _load_for_encoding(path)
+                if img is not None:
+                    paths.append(path)
+                    images.append(img)
+            if images:
+                try:
+                    self.add(paths, encoder.batch_encode_images(images, batch_size=len(images)))
+                    encoded += len(paths)
+                except Exception as e:
+                    logger.warning(f"Content index: batch encode failed: {e}")
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, total)
+        return encoded
+
+    def _load_matrix(self):
+        """Build (or reuse) the in-memory (N, D) embedding matrix."""
+        if self._matrix is not None:
+            return self._matrix
+        rows = self.conn.execute('SELECT path, dim, embedding FROM embeddings').fetchall()
+        self._paths = [row[0] for row in rows]
+        if rows:
+            dim = rows[0][1]
+            self._matrix = np.frombuffer(
+                b''.join(row[2] for row in rows), dtype=np.float32
+            ).reshape(len(rows), dim)
+        else:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+        return self._matrix
+
+    def preload(self) -> None:
+        """Build the in-memory matrix now, e.g. on the thread that updated it."""
+        with self._lock:
+            self._load_matrix()
+
+    def search(self, query: Any, k: int = 50) -> List[Tuple[Path, float]]:
+        """
+        Top-k cosine search against a query embedding.
+
+        Args:
+            query: Query embedding, shape (D,) or (1, D)
+            k: Maximum number of results
+
+        Returns:
+            List of (path, score), best first
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+        with self._lock:
+            matrix = self._load_matrix()
+            paths = self._paths
+        if matrix.shape[0] == 0 or matrix.shape[1] != query.shape[0]:
+            return []
+        scores = matrix @ query
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(Path(paths[i]), float(scores[i])) for i in top]
+
+    def search_text(self, text: str, encoder: Any, k: int = 50) -> List[Tuple[Path, float]]:
+        """Encode ``text`` once and return the top-k matching images."""
+        return self.search(encoder.encode_text(text), k)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+                self._matrix = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
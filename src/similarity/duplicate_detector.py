@@ -19,6 +19,13 @@ except (ImportError, OSError, RuntimeError):
     logger.error("numpy not available - limited functionality")
     logger.error("Install with: pip install numpy")
 
+try:
+    from utils.cache_manager import cached_array
+except ImportError:
+    try:
+        from ..utils.cache_manager import cached_array
+    except ImportError:
+        cached_array = None
 
 
 class DuplicateDetector:
@@ -116,9 +123,7 @@ class DuplicateDetector:
 
         # Filter to true color swaps via histogram comparison
         try:
-            from PIL import Image as PILImage
-            ref_img = PILImage.open(texture_path).convert("RGB")
-            ref_hist = self._color_histogram(ref_img)
+            ref_hist = self._file_histogram(texture_path)
         except Exception:
             logger.debug("Could not load reference image for histogram analysis")
             return variants
@@ -130,8 +135,7 @@ class DuplicateDetector:
                 if v_path is None:
                     color_swaps.append(variant)
                     continue
-                v_img = PILImage.open(v_path).convert("RGB")
-                v_hist = self._color_histogram(v_img)
+                v_hist = self._file_histogram(Path(v_path))
                 hist_diff = self._histogram_distance(ref_hist, v_hist)
                 # A large histogram distance means very different colours
                 # but the structural similarity is already high (>threshold)
@@ -144,6 +148,16 @@ class DuplicateDetector:
         logger.info(f"Found {len(color_swaps)} color swaps (from {len(variants)} variants) for {texture_path.name}")
         return color_swaps
 
+    def _file_histogram(self, path: Path) -> np.ndarray:
+        """Colour histogram of an image file, shared through the image cache."""
+        def build():
+            from PIL import Image as PILImage
+            with PILImage.open(path) as img:
+                return self._color_histogram(img.convert("RGB"))
+        if cached_array is not None:
+            return cached_array(path, "color_hist:32", build)
+        return build()
+
     @staticmethod
     def _color_histogram(image, bins: int = 32) -> np.ndarray:
         """Compute a normalized per-channel colour histogram."""
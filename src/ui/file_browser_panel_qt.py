@@ -6,20 +6,29 @@ Author: Dead On The Inside / JosephsDeadish
 
 
 from __future__ import annotations
+import atexit
 import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 import json
 
 try:
     from PyQt6.QtWidgets import (
         QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-        QLineEdit, QComboBox, QListWidget, QListWidgetItem,
+        QLineEdit, QComboBox, QListView,
         QFileDialog, QMessageBox, QGroupBox, QCheckBox,
         QScrollArea, QFrame, QGridLayout, QSplitter, QMainWindow,
         QMenu, QApplication
     )
-    from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QThread
+    from PyQt6.QtCore import (
+        Qt, pyqtSignal, QSize, QTimer, QThread, QAbstractListModel, QModelIndex
+    )
     from PyQt6.QtGui import QPixmap, QIcon, QImage, QAction
     PYQT_AVAILABLE = True
 except (ImportError, OSError, RuntimeError):
@@ -36,6 +45,9 @@ except (ImportError, OSError, RuntimeError):
     class QThread(QObject):  # type: ignore[no-redef]
         """Fallback stub when PyQt6 is not installed."""
         pass
+    class QAbstractListModel(QObject):  # type: ignore[no-redef]
+        """Fallback stub when PyQt6 is not installed."""
+        pass
     class QPixmap:  # type: ignore[no-redef]
         """Fallback stub when PyQt6 is not installed."""
         pass
@@ -65,6 +77,47 @@ try:
 except Exception:
     _SEARCH_FILTER = None  # type: ignore[assignment]
 
+try:
+    from utils.thumbnail_cache import ThumbnailCache, thumbnail_key, generate_thumbnail
+    THUMB_CACHE_AVAILABLE = True
+except Exception:
+    ThumbnailCache = None  # type: ignore[assignment,misc]
+    THUMB_CACHE_AVAILABLE = False
+
+# One disk cache per database file, shared by every browser instance
+# (including pop-out windows).
+_DISK_CACHES: Dict[str, 'ThumbnailCache'] = {}
+_DISK_CACHES_LOCK = threading.Lock()
+
+
+def _close_disk_caches() -> None:
+    """Flush, prune and close the shared caches at interpreter exit."""
+    with _DISK_CACHES_LOCK:
+        for cache in _DISK_CACHES.values():
+            try:
+                cache.close()
+            except Exception as e:
+                logger.debug(f"Closing thumbnail cache failed: {e}")
+        _DISK_CACHES.clear()
+
+
+def _get_disk_cache(db_path: Path) -> Optional['ThumbnailCache']:
+    """Return the shared ThumbnailCache for *db_path*, or None if unavailable."""
+    if not THUMB_CACHE_AVAILABLE:
+        return None
+    with _DISK_CACHES_LOCK:
+        cache = _DISK_CACHES.get(str(db_path))
+        if cache is None:
+            try:
+                cache = ThumbnailCache(db_path)
+            except Exception as e:
+                logger.warning(f"Thumbnail disk cache unavailable: {e}")
+                return None
+            if not _DISK_CACHES:
+                atexit.register(_close_disk_caches)
+            _DISK_CACHES[str(db_path)] = cache
+        return cache
+
 
 class _ScaledPreviewLabel(QWidget):
     """A simple image-preview widget that scales its pixmap to fill the
@@ -126,51 +179,467 @@ class _ScaledPreviewLabel(QWidget):
 
 
 class ThumbnailGenerator(QThread):
-    """Background thread for generating thumbnails"""
+    """Background thumbnail producer backed by the persistent disk cache.
+
+    Cached thumbnails are looked up in batches and emitted straight away;
+    misses are decoded at reduced resolution (JPEG draft, DDS mips) on a
+    small thread pool and written back to the cache. ``prioritize()`` moves
+    the rows currently on screen to the front of the queue.
+
+    With ``keep_alive=True`` the thread stays idle when the queue runs dry
+    and picks up new work passed to ``request()``, so a list view can ask
+    for exactly the rows it paints.
+    """
     thumbnail_ready = pyqtSignal(str, QImage)  # filepath, qimage (QPixmap must be created in main thread)
 
-    def __init__(self, files: List[Path], size: int = 128):
+    LOOKUP_BATCH = 64
+
+    def __init__(self, files: List[Path], size: int = 128,
+                 cache: Optional['ThumbnailCache'] = None,
+                 max_workers: Optional[int] = None,
+                 keep_alive: bool = False):
         super().__init__()
         self.files = files
         self.size = size
+        self.cache = cache
+        if max_workers is None:
+            import os
+            max_workers = max(2, min(8, (os.cpu_count() or 2) - 1))
+        self.max_workers = max_workers
+        self.keep_alive = keep_alive
         self._stopped = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # Insertion-ordered set of files still to produce
+        self._pending: Dict[Path, None] = dict.fromkeys(files)
+        self._priority: List[Path] = []
+        self._slots = threading.Semaphore(max_workers * 2)
 
     def stop(self):
         """Stop thumbnail generation"""
         self._stopped = True
+        self._wakeup.set()
+
+    def request(self, files: List[Path]):
+        """Queue *files* for generation (keep-alive mode)."""
+        with self._lock:
+            for path in files:
+                self._pending[path] = None
+        self._wakeup.set()
+
+    def retain(self, files: List[Path]) -> List[Path]:
+        """Drop every queued file not in *files*.
+
+        Returns:
+            The files that were dropped, so the caller can request them
+            again if they scroll back into view.
+        """
+        keep = set(files)
+        with self._lock:
+            dropped = [path for path in self._pending if path not in keep]
+            for path in dropped:
+                del self._pending[path]
+            self._priority = [f for f in self._priority if f in keep]
+        return dropped
+
+    def prioritize(self, files: List[Path]):
+        """Generate *files* (e.g. the visible rows) before anything else."""
+        with self._lock:
+            self._priority = [f for f in files if f in self._pending]
+
+    def _next_batch(self) -> List[Path]:
+        """Take the next batch of pending files, priority files first."""
+        with self._lock:
+            batch: List[Path] = []
+            while self._priority and len(batch) < self.LOOKUP_BATCH:
+                path = self._priority.pop(0)
+                if self._pending.pop(path, 0) is None:
+                    batch.append(path)
+            for path in list(islice(self._pending, self.LOOKUP_BATCH - len(batch))):
+                del self._pending[path]
+                batch.append(path)
+            return batch
+
+    @staticmethod
+    def _to_qimage(thumb) -> QImage:
+        """Convert a (width, height, mode, bytes) thumbnail into a QImage."""
+        width, height, mode, raw = thumb
+        if mode == 'RGBA':
+            fmt, bpp = QImage.Format.Format_RGBA8888, 4
+        else:
+            fmt, bpp = QImage.Format.Format_RGB888, 3
+        # QImage.copy() ensures the underlying buffer outlives the local bytes
+        return QImage(raw, width, height, width * bpp, fmt).copy()
+
+    def _emit(self, filepath: Path, thumb) -> None:
+        if thumb is not None and not self._stopped:
+            self.thumbnail_ready.emit(str(filepath), self._to_qimage(thumb))
+
+    def _produce(self, filepath: Path, key: Optional[str]) -> None:
+        """Worker-pool job: decode one thumbnail and store it in the cache."""
+        try:
+            if self._stopped:
+                return
+            thumb = generate_thumbnail(filepath, self.size)
+            if thumb is not None and self.cache is not None and key is not None:
+                try:
+                    self.cache.put(key, thumb)
+                except Exception as e:
+                    logger.debug(f"Thumbnail cache write failed: {e}")
+            self._emit(filepath, thumb)
+        finally:
+            self._slots.release()
+
+    def _flush_cache(self) -> None:
+        if self.cache is not None:
+            try:
+                self.cache.flush()
+            except Exception:
+                pass
 
     def run(self):
         """Generate thumbnails (produce QImage — caller converts to QPixmap in main thread)."""
-        for filepath in self.files:
-            if self._stopped:
-                break
+        if not PIL_AVAILABLE or not THUMB_CACHE_AVAILABLE:
+            return
 
-            try:
-                if not PIL_AVAILABLE:
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="Thumbnail") as pool:
+            idle = True
+            while not self._stopped:
+                self._wakeup.clear()
+                batch = self._next_batch()
+                if not batch:
+                    if not self.keep_alive:
+                        break
+                    if not idle:
+                        self._flush_cache()
+                        idle = True
+                    self._wakeup.wait(0.5)
                     continue
+                idle = False
 
-                # Load and resize image
-                img = Image.open(filepath)
-                img.thumbnail((self.size, self.size), Image.Resampling.LANCZOS)
-
-                # Convert to QImage (safe to create in any thread; QPixmap is GUI-only)
-                if img.mode == 'RGBA':
-                    data = img.tobytes("raw", "RGBA")
-                    qimage = QImage(data, img.size[0], img.size[1], QImage.Format.Format_RGBA8888)
-                elif img.mode == 'RGB':
-                    data = img.tobytes("raw", "RGB")
-                    qimage = QImage(data, img.size[0], img.size[1], QImage.Format.Format_RGB888)
-                else:
-                    img = img.convert('RGB')
-                    data = img.tobytes("raw", "RGB")
-                    qimage = QImage(data, img.size[0], img.size[1], QImage.Format.Format_RGB888)
+                keys = {path: thumbnail_key(path, self.size) for path in batch}
+                hits = {}
+                if self.cache is not None:
+                    try:
+                        hits = self.cache.get_many(k for k in keys.values() if k)
+                    except Exception as e:
+                        logger.debug(f"Thumbnail cache lookup failed: {e}")
+
+                for filepath in batch:
+                    if self._stopped:
+                        break
+                    key = keys[filepath]
+                    if key in hits:
+                        self._emit(filepath, hits[key])
+                        continue
+                    # Bound the number of queued decodes so prioritize()
+                    # still takes effect while a large folder is loading.
+                    self._slots.acquire()
+                    pool.submit(self._produce, filepath, key)
+
+        self._flush_cache()
+
+
+def _scan_folder(folder: Path, extensions: Set[str],
+                 cancelled: Callable[[], bool] = lambda: False) -> List[Path]:
+    """List files in *folder* whose extension (any case) is in *extensions*.
+
+    One ``os.scandir`` pass replaces globbing once per extension and case.
+    Results are sorted case-insensitively by name.
+    """
+    found: List[Path] = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if cancelled():
+                return []
+            if os.path.splitext(entry.name)[1].lower() not in extensions:
+                continue
+            try:
+                if entry.is_file():
+                    found.append(Path(entry.path))
+            except OSError:
+                continue
+    found.sort(key=lambda p: p.name.lower())
+    return found
+
+
+@dataclass(frozen=True)
+class _FilterSpec:
+    """Everything that decides which files the list shows."""
+    search_text: str = ''
+    type_filter: str = 'All Files'
+    show_archives: bool = True
+    favorites_only: bool = False
+
+    def narrows(self, other: '_FilterSpec') -> bool:
+        """True if this spec can only keep a subset of *other*'s results."""
+        return (
+            self.type_filter == other.type_filter
+            and self.show_archives == other.show_archives
+            and self.favorites_only == other.favorites_only
+            and other.search_text in self.search_text
+        )
 
-                # QImage.copy() ensures the underlying buffer outlives the local `data` bytes
-                self.thumbnail_ready.emit(str(filepath), qimage.copy())
 
-            except Exception as e:
-                logger.debug(f"Failed to generate thumbnail for {filepath}: {e}")
+def _filter_paths(files: List[Path], spec: _FilterSpec,
+                  image_exts: Set[str], archive_exts: Set[str],
+                  cancelled: Callable[[], bool] = lambda: False,
+                  chunk_size: int = 4096) -> Optional[List[Path]]:
+    """Apply *spec* to *files* in chunks.
+
+    Returns:
+        Matching files in input order, or None if cancelled part way.
+    """
+    text = spec.search_text.lower()
+    result: List[Path] = []
+    for start in range(0, len(files), chunk_size):
+        if cancelled():
+            return None
+        chunk = files[start:start + chunk_size]
+        for filepath in chunk:
+            ext = filepath.suffix.lower()
+            if spec.type_filter == "Images Only" and ext in archive_exts:
+                continue
+            if spec.type_filter == "Archives Only" and ext in image_exts:
+                continue
+            if not spec.show_archives and ext in archive_exts:
+                continue
+            if text and text not in filepath.name.lower():
                 continue
+            result.append(filepath)
+    if spec.favorites_only and _SEARCH_FILTER is not None:
+        try:
+            result = _SEARCH_FILTER.quick_filter_favorites(result)
+        except Exception:
+            pass
+    return result
+
+
+class _FileListWorker(QThread):
+    """Scan a folder and/or filter a file list off the GUI thread.
+
+    Every run carries a generation number; the panel ignores results from
+    superseded runs, and ``requestInterruption()`` makes them exit early.
+    """
+    scanned = pyqtSignal(int, list)    # generation, all files in folder
+    filtered = pyqtSignal(int, list)   # generation, files to display
+    failed = pyqtSignal(int, str)      # generation, error message
+
+    def __init__(self, generation: int, spec: _FilterSpec,
+                 image_exts: Set[str], archive_exts: Set[str],
+                 files: Optional[List[Path]] = None,
+                 folder: Optional[Path] = None):
+        super().__init__()
+        self.generation = generation
+        self.spec = spec
+        self.image_exts = image_exts
+        self.archive_exts = archive_exts
+        self.files = files
+        self.folder = folder
+
+    def run(self):
+        cancelled = self.isInterruptionRequested
+        try:
+            files = self.files
+            if self.folder is not None:
+                files = _scan_folder(self.folder, self.image_exts | self.archive_exts, cancelled)
+                if cancelled():
+                    return
+                self.scanned.emit(self.generation, files)
+            result = _filter_paths(files or [], self.spec, self.image_exts,
+                                   self.archive_exts, cancelled)
+            if result is not None and not cancelled():
+                self.filtered.emit(self.generation, result)
+        except Exception as e:
+            logger.error(f"File list worker failed: {e}", exc_info=True)
+            self.failed.emit(self.generation, str(e))
+
+
+# One content-search encoder per process: loading CLIP takes seconds, so it
+# is loaded on first use and shared by every browser instance.
+_CONTENT_ENCODER = None
+_CONTENT_ENCODER_NAME = ''
+_CONTENT_ENCODER_LOCK = threading.Lock()
+
+
+def _content_search_unavailable_reason() -> Optional[str]:
+    """Cheap availability check that does not import torch on the GUI thread."""
+    import importlib.util
+    if importlib.util.find_spec('torch') is None:
+        return "PyTorch is not installed"
+    if (importlib.util.find_spec('open_clip') is None
+            and importlib.util.find_spec('transformers') is None):
+        return "Neither open-clip-torch nor transformers is installed"
+    return None
+
+
+def _get_content_encoder():
+    """Return the shared (encoder, model_name), loading CLIP on first use."""
+    global _CONTENT_ENCODER, _CONTENT_ENCODER_NAME
+    with _CONTENT_ENCODER_LOCK:
+        if _CONTENT_ENCODER is None:
+            from vision_models.clip_model import CLIPModel, CLIP_AVAILABLE, OPEN_CLIP_AVAILABLE
+            if not CLIP_AVAILABLE:
+                raise ImportError("Neither open-clip-torch nor transformers is installed")
+            if OPEN_CLIP_AVAILABLE:
+                name = 'ViT-B-32,openai'
+                _CONTENT_ENCODER = CLIPModel(name, use_open_clip=True)
+            else:
+                name = 'openai/clip-vit-base-patch32'
+                _CONTENT_ENCODER = CLIPModel(name)
+            _CONTENT_ENCODER_NAME = name
+        return _CONTENT_ENCODER, _CONTENT_ENCODER_NAME
+
+
+class _ContentIndexWorker(QThread):
+    """Load the content encoder and bring a folder's embedding index up to date."""
+    progress = pyqtSignal(int, int)        # done, total
+    ready = pyqtSignal(object, object)     # ContentIndex, encoder
+    unavailable = pyqtSignal(str)          # missing AI libraries
+    failed = pyqtSignal(str)
+
+    def __init__(self, folder: Path, files: List[Path], cache_dir: Path):
+        super().__init__()
+        self.folder = folder
+        self.files = files
+        self.cache_dir = cache_dir
+        self._cancel = threading.Event()
+
+    def stop(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            encoder, name = _get_content_encoder()
+        except ImportError as e:
+            self.unavailable.emit(str(e))
+            return
+        except Exception as e:
+            logger.error(f"Could not load content encoder: {e}", exc_info=True)
+            self.failed.emit(str(e))
+            return
+        try:
+            from similarity.content_index import ContentIndex, index_path_for_folder
+            index = ContentIndex(index_path_for_folder(self.cache_dir, self.folder), name)
+            index.update(self.files, encoder,
+                         progress_callback=self.progress.emit, cancel_event=self._cancel)
+            if self._cancel.is_set():
+                index.close()
+                return
+            index.preload()
+            self.ready.emit(index, encoder)
+        except Exception as e:
+            logger.error(f"Content indexing failed: {e}", exc_info=True)
+            self.failed.emit(str(e))
+
+
+class FileListModel(QAbstractListModel):
+    """Virtual list model over a plain list of paths.
+
+    Nothing is created per row: names and icons are produced in ``data()``
+    only for the indexes the view actually paints. A thumbnail miss on a
+    painted image row is reported through ``thumbnails_needed`` (coalesced
+    per event-loop pass), and decoded icons live in a bounded LRU so memory
+    stays flat regardless of folder size.
+    """
+    thumbnails_needed = pyqtSignal(list)  # List[Path]
+
+    def __init__(self, image_exts: Set[str], archive_exts: Set[str],
+                 max_icons: int = 2000, parent=None):
+        super().__init__(parent)
+        self.image_exts = image_exts
+        self.archive_exts = archive_exts
+        self.max_icons = max_icons
+        self.file_icon = None
+        self.archive_icon = None
+        self._files: List[Path] = []
+        self._icons: 'OrderedDict[str, QIcon]' = OrderedDict()
+        # path -> row for thumbnails requested but not yet delivered
+        self._requested: Dict[str, int] = {}
+        self._wanted: List[Path] = []
+
+    # ── Qt model interface ───────────────────────────────────────────────────
+
+    def rowCount(self, parent=None) -> int:  # type: ignore[override]
+        return 0 if parent is not None and parent.isValid() else len(self._files)
+
+    def data(self, index, role=None):  # type: ignore[override]
+        if role is None:
+            role = Qt.ItemDataRole.DisplayRole
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row >= len(self._files):
+            return None
+        filepath = self._files[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return filepath.name
+        if role == Qt.ItemDataRole.UserRole:
+            return str(filepath)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(row, filepath)
+        return None
+
+    # ── Files and thumbnails ─────────────────────────────────────────────────
+
+    def files(self) -> List[Path]:
+        return self._files
+
+    def set_files(self, files: List[Path]) -> None:
+        """Replace the listed files (icons already decoded are kept)."""
+        self.beginResetModel()
+        self._files = files
+        self._requested.clear()
+        self._wanted.clear()
+        self.endResetModel()
+
+    def path_at(self, row: int) -> Path:
+        return self._files[row]
+
+    def has_thumbnail(self, filepath: str) -> bool:
+        return filepath in self._icons
+
+    def clear_thumbnails(self) -> None:
+        self._icons.clear()
+        self._requested.clear()
+
+    def forget_requests(self, files: List[Path]) -> None:
+        """Allow *files* to be requested again (their queued work was dropped)."""
+        for filepath in files:
+            self._requested.pop(str(filepath), None)
+
+    def set_thumbnail(self, filepath: str, icon: 'QIcon') -> None:
+        """Store a decoded icon and repaint its row if it is still listed."""
+        self._icons[filepath] = icon
+        self._icons.move_to_end(filepath)
+        while len(self._icons) > self.max_icons:
+            self._icons.popitem(last=False)
+        row = self._requested.pop(filepath, None)
+        if row is not None and row < len(self._files) and str(self._files[row]) == filepath:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _icon_for(self, row: int, filepath: Path):
+        ext = filepath.suffix.lower()
+        if ext in self.archive_exts:
+            return self.archive_icon
+        key = str(filepath)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            return icon
+        if ext in self.image_exts and key not in self._requested:
+            self._requested[key] = row
+            if not self._wanted:
+                QTimer.singleShot(0, self._flush_wanted)
+            self._wanted.append(filepath)
+        return self.file_icon
+
+    def _flush_wanted(self) -> None:
+        wanted, self._wanted = self._wanted, []
+        if wanted:
+            self.thumbnails_needed.emit(wanted)
 
 
 class FileBrowserPanelQt(QWidget):
@@ -207,8 +676,22 @@ class FileBrowserPanelQt(QWidget):
         self.tooltip_manager = tooltip_manager
         self.current_folder: Optional[Path] = None
         self.current_files: List[Path] = []
-        self.thumbnail_cache: dict = {}
         self.thumbnail_generator: Optional[ThumbnailGenerator] = None
+        # Scan/filter runs happen on _FileListWorker threads; only results
+        # from the newest generation are applied.
+        self._list_generation = 0
+        self._list_workers: List[_FileListWorker] = []
+        self._list_spec: Optional[_FilterSpec] = None
+        # Content search: per-folder embedding index built in the background
+        self._content_index = None
+        self._content_index_folder: Optional[Path] = None
+        self._content_encoder = None
+        self._content_worker: Optional[_ContentIndexWorker] = None
+        # Stopped workers are kept until their thread ends (a QThread must
+        # not be garbage-collected while it runs)
+        self._retired_content_workers: List[_ContentIndexWorker] = []
+        self._pending_content_query: Optional[str] = None
+        self._last_filter: Optional[tuple] = None  # (_FilterSpec, result)
         # Track floating pop-out windows so they aren't garbage collected
         self._popout_windows: list = []
         
@@ -224,6 +707,8 @@ class FileBrowserPanelQt(QWidget):
                 self.config_dir = Path.home() / '.ps2_texture_sorter'
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.recent_folders_path = self.config_dir / 'recent_folders.json'
+        # Persistent thumbnails survive folder switches and restarts
+        self.thumbnail_disk_cache = _get_disk_cache(self.config_dir / 'cache' / 'thumbnails.db')
         self.recent_folders: List[str] = []
         self.load_recent_folders()
         
@@ -237,6 +722,13 @@ class FileBrowserPanelQt(QWidget):
         self._pending_preview: Optional[Path] = None
         self._preview_timer.timeout.connect(self._load_pending_preview)
 
+        # Debounce timer for visible-rows-first thumbnail prioritisation while
+        # the user scrolls.
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(60)
+        self._visible_timer.timeout.connect(self._prioritize_visible_thumbnails)
+
         self.setup_ui()
     
     def _set_tooltip(self, widget, widget_id_or_text: str):
@@ -392,17 +884,32 @@ class FileBrowserPanelQt(QWidget):
         self.file_count_label.setStyleSheet("font-weight: bold; color: #666;")
         list_layout.addWidget(self.file_count_label)
         
-        # File list with thumbnails
-        self.file_list = QListWidget()
+        # File list with thumbnails — a virtual view: rows, names and icons
+        # are only materialised for the indexes on screen.
+        self.file_model = FileListModel(self.IMAGE_EXTENSIONS, self.ARCHIVE_EXTENSIONS, parent=self)
+        self.file_model.file_icon = self.style().standardIcon(self.style().StandardPixmap.SP_FileIcon)
+        self.file_model.archive_icon = self.style().standardIcon(
+            self.style().StandardPixmap.SP_FileDialogContentsView
+        )
+        self.file_model.thumbnails_needed.connect(self._request_thumbnails)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
         self.file_list.setIconSize(QSize(96, 96))
-        self.file_list.setViewMode(QListWidget.ViewMode.IconMode)
-        self.file_list.setResizeMode(QListWidget.ResizeMode.Adjust)
+        self.file_list.setViewMode(QListView.ViewMode.IconMode)
+        self.file_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.file_list.setMovement(QListView.Movement.Static)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.file_list.setBatchSize(1000)
         self.file_list.setSpacing(10)
         self.file_list.setWordWrap(True)
-        self.file_list.itemClicked.connect(self.on_file_clicked)
-        self.file_list.itemDoubleClicked.connect(self.on_file_double_clicked)
+        self.file_list.clicked.connect(self.on_file_clicked)
+        self.file_list.doubleClicked.connect(self.on_file_double_clicked)
         self.file_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.file_list.customContextMenuRequested.connect(self._show_file_context_menu)
+        self.file_list.verticalScrollBar().valueChanged.connect(
+            lambda _value: self._visible_timer.start()
+        )
         list_layout.addWidget(self.file_list)
         
         splitter.addWidget(list_container)
@@ -468,6 +975,12 @@ class FileBrowserPanelQt(QWidget):
             QMessageBox.warning(self, "Error", f"Folder does not exist:\n{folder}")
             return
         
+        if folder != self.current_folder:
+            # In-memory icons only cover the folder on screen; the disk
+            # cache keeps everything else.
+            self.file_model.clear_thumbnails()
+            if self.thumbnail_generator is not None:
+                self.thumbnail_generator.retain([])
         self.current_folder = folder
         self.refresh_btn.setEnabled(True)
         self.status_label.setText(f"Loading folder: {folder.name}...")
@@ -480,72 +993,87 @@ class FileBrowserPanelQt(QWidget):
             self.save_recent_folders()
             self.update_recent_combo()
         
-        # Scan for files
-        try:
-            all_files = []
-            for ext in self.IMAGE_EXTENSIONS:
-                all_files.extend(folder.glob(f"*{ext}"))
-                all_files.extend(folder.glob(f"*{ext.upper()}"))
-            
-            if self.show_archives_cb.isChecked():
-                for ext in self.ARCHIVE_EXTENSIONS:
-                    all_files.extend(folder.glob(f"*{ext}"))
-                    all_files.extend(folder.glob(f"*{ext.upper()}"))
-            
-            self.current_files = sorted(all_files, key=lambda p: p.name.lower())
-            self.filter_files()
-            
-            self.status_label.setText(f"Loaded {len(self.current_files)} files from {folder.name}")
-            self.folder_changed.emit(folder)
-            
-        except Exception as e:
-            logger.error(f"Error loading folder: {e}", exc_info=True)
-            QMessageBox.warning(self, "Error", f"Failed to load folder:\n{e}")
-            self.status_label.setText("Error loading folder")
-    
-    def filter_files(self):
-        """Filter files based on search and type, using SearchFilter when available."""
-        if not self.current_files:
-            return
+        # Scan and filter off the GUI thread; _on_folder_scanned and
+        # _on_files_filtered pick up the results.
+        self._start_list_worker(folder=folder)
+
+    def _current_filter_spec(self) -> _FilterSpec:
+        return _FilterSpec(
+            search_text=self.search_box.text().lower(),
+            type_filter=self.type_combo.currentText(),
+            show_archives=self.show_archives_cb.isChecked(),
+            favorites_only=hasattr(self, 'favorites_btn') and self.favorites_btn.isChecked(),
+        )
 
-        search_text = self.search_box.text().lower()
-        type_filter = self.type_combo.currentText()
-        show_archives = self.show_archives_cb.isChecked()
+    def _start_list_worker(self, folder: Optional[Path] = None,
+                           files: Optional[List[Path]] = None) -> None:
+        """Cancel any running scan/filter and start a new one."""
+        for worker in self._list_workers:
+            worker.requestInterruption()
+        self._list_generation += 1
+        self._list_spec = self._current_filter_spec()
+        worker = _FileListWorker(
+            self._list_generation, self._list_spec,
+            self.IMAGE_EXTENSIONS, self.ARCHIVE_EXTENSIONS,
+            files=files, folder=folder,
+        )
+        worker.scanned.connect(self._on_folder_scanned)
+        worker.filtered.connect(self._on_files_filtered)
+        worker.failed.connect(self._on_list_worker_failed)
+        worker.finished.connect(lambda w=worker: self._list_workers.remove(w)
+                                if w in self._list_workers else None)
+        self._list_workers.append(worker)
+        worker.start()
+
+    def _on_folder_scanned(self, generation: int, files: list):
+        if generation != self._list_generation:
+            return
+        self.current_files = files
+        self._last_filter = None
+        if self.current_folder is not None:
+            self.status_label.setText(
+                f"Loaded {len(files)} files from {self.current_folder.name}"
+            )
+            self.folder_changed.emit(self.current_folder)
+            # Once content search has been used, keep the folder's index
+            # fresh; only new or modified images are re-encoded.
+            if self._content_encoder is not None:
+                self._start_content_indexing(
+                    [p for p in files if p.suffix.lower() in self.IMAGE_EXTENSIONS]
+                )
 
-        # Apply type / archive pre-filter first (fast, no SearchFilter needed)
-        candidates = []
-        for filepath in self.current_files:
-            if type_filter == "Images Only" and filepath.suffix.lower() in self.ARCHIVE_EXTENSIONS:
-                continue
-            if type_filter == "Archives Only" and filepath.suffix.lower() in self.IMAGE_EXTENSIONS:
-                continue
-            if not show_archives and filepath.suffix.lower() in self.ARCHIVE_EXTENSIONS:
-                continue
-            candidates.append(filepath)
+    def _on_files_filtered(self, generation: int, files: list):
+        if generation != self._list_generation:
+            return
+        self._last_filter = (self._list_spec, files)
+        self.display_files(files)
 
-        # Use SearchFilter for text search when available; fall back to plain substring
-        if search_text:
-            if _SEARCH_FILTER is not None:
-                try:
-                    criteria = FilterCriteria(name=search_text)
-                    filtered = _SEARCH_FILTER.search(candidates, criteria)
-                except Exception:
-                    # Fallback to simple substring match on any error
-                    filtered = [p for p in candidates if search_text in p.name.lower()]
-            else:
-                filtered = [p for p in candidates if search_text in p.name.lower()]
-        else:
-            filtered = candidates
+    def _on_list_worker_failed(self, generation: int, message: str):
+        if generation != self._list_generation:
+            return
+        QMessageBox.warning(self, "Error", f"Failed to load folder:\n{message}")
+        self.status_label.setText("Error loading folder")
+    
+    def filter_files(self):
+        """Filter files based on search and type on a worker thread.
 
-        # Apply favorites filter when the button is active
-        if hasattr(self, 'favorites_btn') and self.favorites_btn.isChecked():
-            if _SEARCH_FILTER is not None:
-                try:
-                    filtered = _SEARCH_FILTER.quick_filter_favorites(filtered)
-                except Exception:
-                    pass
+        When the new criteria can only narrow the previous result (e.g. the
+        user typed another character), the previous result is filtered
+        instead of the whole folder.
+        """
+        if not self.current_files:
+            return
 
-        self.display_files(filtered)
+        spec = self._current_filter_spec()
+        source = self.current_files
+        if self._last_filter is not None:
+            last_spec, last_result = self._last_filter
+            if spec == last_spec:
+                self.display_files(last_result)
+                return
+            if spec.narrows(last_spec) and not spec.favorites_only:
+                source = last_result
+        self._start_list_worker(files=source)
 
     def _on_favorites_toggled(self, checked: bool):
         """Handle Favorites filter toggle — re-run the filter with/without favorites."""
@@ -581,13 +1109,17 @@ class FileBrowserPanelQt(QWidget):
             logger.warning(f"Pop-out window failed: {e}")
 
     def _search_by_content(self):
-        """Search displayed images by visual content description using CLIP."""
+        """Search the folder's images by visual content description using CLIP.
+
+        Image embeddings come from a persistent per-folder index that is built
+        (or incrementally refreshed) on a worker thread; a query is one text
+        encode plus a top-k lookup.
+        """
         query = self.content_search_box.text().strip()
         if not query:
             self.content_search_status.setText("Enter a description first.")
             return
 
-        # Only search image files currently shown
         image_files = [
             p for p in self.current_files
             if p.suffix.lower() in self.IMAGE_EXTENSIONS
@@ -596,144 +1128,173 @@ class FileBrowserPanelQt(QWidget):
             self.content_search_status.setText("No images loaded. Browse a folder first.")
             return
 
-        # Try CLIP-based content search
-        try:
-            import torch
-            try:
-                import open_clip
-                _clip_backend = "open_clip"
-            except ImportError:
-                open_clip = None
-                _clip_backend = None
-
-            try:
-                from transformers import CLIPProcessor, CLIPModel
-                _hf_available = True
-            except ImportError:
-                _hf_available = False
-
-            if not _clip_backend and not _hf_available:
-                raise ImportError("Neither open-clip-torch nor transformers is installed")
-
-            def _process_events():
-                try:
-                    from PyQt6.QtWidgets import QApplication as _QApp
-                    _QApp.processEvents()
-                except Exception:
-                    pass
+        missing = _content_search_unavailable_reason()
+        if missing:
+            self._show_content_search_unavailable(missing)
+            return
 
-            self.content_search_status.setText("⏳ Loading CLIP model…")
-            _process_events()
+        self._pending_content_query = query
+        worker = self._content_worker
+        if (self._content_index is not None
+                and self._content_index_folder == self.current_folder
+                and (worker is None or not worker.isRunning())):
+            self._run_content_query()
+        else:
+            self._start_content_indexing(image_files)
 
-            from PIL import Image as _PILImage
+    def _show_content_search_unavailable(self, details: str):
+        self.content_search_status.setText("⚠️ CLIP not installed")
+        QMessageBox.information(
+            self,
+            "Content Search Unavailable",
+            f"Image content search requires AI libraries.\n\n"
+            f"Install with:\n  pip install open-clip-torch torch\n"
+            f"or:\n  pip install transformers torch\n\n"
+            f"Technical details: {details}"
+        )
 
-            if _clip_backend == "open_clip":
-                model, _, preprocess = open_clip.create_model_and_transforms(
-                    'ViT-B-32', pretrained='openai'
-                )
-                tokenizer = open_clip.get_tokenizer('ViT-B-32')
-                model.eval()
-
-                text_tokens = tokenizer([query])
-                with torch.no_grad():
-                    text_features = model.encode_text(text_tokens)
-                    text_features /= text_features.norm(dim=-1, keepdim=True)
-
-                scores: list = []
-                self.content_search_status.setText("⏳ Scoring images…")
-                _process_events()
-                for fp in image_files:
-                    try:
-                        img = preprocess(_PILImage.open(fp).convert("RGB")).unsqueeze(0)
-                        with torch.no_grad():
-                            img_feat = model.encode_image(img)
-                            img_feat /= img_feat.norm(dim=-1, keepdim=True)
-                        score = (img_feat @ text_features.T).item()
-                        scores.append((score, fp))
-                    except Exception:
-                        pass
-            else:
-                processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
-                model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-                model.eval()
-
-                scores = []
-                self.content_search_status.setText("⏳ Scoring images…")
-                _process_events()
-                for fp in image_files:
-                    try:
-                        img = _PILImage.open(fp).convert("RGB")
-                        inputs = processor(text=[query], images=img, return_tensors="pt", padding=True)
-                        with torch.no_grad():
-                            outputs = model(**inputs)
-                        score = outputs.logits_per_image.item()
-                        scores.append((score, fp))
-                    except Exception:
-                        pass
-
-            if not scores:
-                self.content_search_status.setText("No images could be scored.")
+    def _start_content_indexing(self, image_files: List[Path]):
+        """Build or refresh the current folder's content index in the background."""
+        worker = self._content_worker
+        if worker is not None and worker.isRunning():
+            if worker.folder == self.current_folder:
                 return
+            worker.stop()
+            worker.finished.connect(
+                lambda w=worker: self._retired_content_workers.remove(w)
+                if w in self._retired_content_workers else None)
+            self._retired_content_workers = [
+                w for w in self._retired_content_workers if w.isRunning()] + [worker]
+        worker = _ContentIndexWorker(
+            self.current_folder, image_files, self.config_dir / 'cache' / 'content_index'
+        )
+        worker.progress.connect(self._on_content_index_progress)
+        worker.ready.connect(self._on_content_index_ready)
+        worker.unavailable.connect(self._on_content_index_unavailable)
+        worker.failed.connect(self._on_content_index_failed)
+        self._content_worker = worker
+        self.content_search_status.setText("⏳ Loading CLIP model…")
+        worker.start()
+
+    def _on_content_index_progress(self, done: int, total: int):
+        self.content_search_status.setText(f"⏳ Indexing images… {done}/{total}")
+
+    def _on_content_index_ready(self, index, encoder):
+        worker = self.sender()
+        folder = getattr(worker, 'folder', None)
+        if folder != self.current_folder:
+            index.close()
+            return
+        if self._content_index is not None and self._content_index is not index:
+            self._content_index.close()
+        self._content_index = index
+        self._content_index_folder = folder
+        self._content_encoder = encoder
+        if self._pending_content_query:
+            self._run_content_query()
+        else:
+            self.content_search_status.setText(f"Content index ready ({len(index)} images)")
 
-            _MAX_RESULTS = 50
-            scores.sort(reverse=True)
-            top_files = [fp for _, fp in scores[:_MAX_RESULTS]]
-            self.display_files(top_files)
-            self.content_search_status.setText(
-                f"✅ Showing {len(top_files)} best matches for \"{query}\""
-            )
+    def _on_content_index_unavailable(self, details: str):
+        self._pending_content_query = None
+        self._show_content_search_unavailable(details)
 
-        except ImportError as _ie:
-            self.content_search_status.setText("⚠️ CLIP not installed")
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.information(
-                self,
-                "Content Search Unavailable",
-                f"Image content search requires AI libraries.\n\n"
-                f"Install with:\n  pip install open-clip-torch torch\n"
-                f"or:\n  pip install transformers torch\n\n"
-                f"Technical details: {_ie}"
-            )
+    def _on_content_index_failed(self, message: str):
+        self._pending_content_query = None
+        self.content_search_status.setText(f"❌ Error: {message}")
+
+    def _run_content_query(self):
+        """Answer the pending query from the ready content index."""
+        query, self._pending_content_query = self._pending_content_query, None
+        if not query or self._content_index is None:
+            return
+        _MAX_RESULTS = 50
+        try:
+            results = self._content_index.search_text(query, self._content_encoder, k=_MAX_RESULTS)
         except Exception as _e:
             logger.error(f"Content search failed: {_e}", exc_info=True)
             self.content_search_status.setText(f"❌ Error: {_e}")
+            return
+        if not results:
+            self.content_search_status.setText("No images could be scored.")
+            return
+        top_files = [fp for fp, _ in results]
+        self.display_files(top_files)
+        self.content_search_status.setText(
+            f"✅ Showing {len(top_files)} best matches for \"{query}\""
+        )
 
     def display_files(self, files: List[Path]):
         """Display files in the list"""
-        self.file_list.clear()
-        self.thumbnail_cache.clear()
-        
-        # Stop any running thumbnail generator
-        if self.thumbnail_generator and self.thumbnail_generator.isRunning():
-            self.thumbnail_generator.stop()
-            self.thumbnail_generator.wait()
-        
+        self.file_model.set_files(files)
         self.file_count_label.setText(f"📄 {len(files)} files")
-        
-        if not files:
+        # Drop queued thumbnails for rows that are no longer listed; the
+        # view re-requests whatever it paints next.
+        self._visible_timer.start()
+
+    def _ensure_thumbnail_generator(self) -> Optional[ThumbnailGenerator]:
+        """Start the long-lived thumbnail generator on first use."""
+        if not PIL_AVAILABLE:
+            return None
+        generator = self.thumbnail_generator
+        if generator is None or not generator.isRunning():
+            generator = ThumbnailGenerator(
+                [], size=96, cache=self.thumbnail_disk_cache, keep_alive=True
+            )
+            generator.thumbnail_ready.connect(self.on_thumbnail_ready)
+            self.thumbnail_generator = generator
+            generator.start()
+        return generator
+
+    def _request_thumbnails(self, files: list):
+        """Queue thumbnails the view asked for while painting."""
+        generator = self._ensure_thumbnail_generator()
+        if generator is None:
             return
-        
-        # Add items to list
-        for filepath in files:
-            item = QListWidgetItem()
-            item.setText(filepath.name)
-            item.setData(Qt.ItemDataRole.UserRole, str(filepath))
-            
-            # Set icon based on file type
-            if filepath.suffix.lower() in self.ARCHIVE_EXTENSIONS:
-                item.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_FileDialogContentsView))
+        generator.request(files)
+    
+    def _visible_rows(self) -> range:
+        """Rows of the file list currently inside the viewport."""
+        count = self.file_model.rowCount()
+        if count == 0:
+            return range(0)
+        height = self.file_list.viewport().height()
+        model = self.file_model
+
+        def rect(row):
+            return self.file_list.visualRect(model.index(row))
+
+        # Icon-mode rows are laid out top-to-bottom, so bisect on y.
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rect(mid).bottom() < 0:
+                lo = mid + 1
             else:
-                # Initial icon — replaced by async thumbnail when ready
-                item.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_FileIcon))
-            
-            self.file_list.addItem(item)
-        
-        # Generate thumbnails in background
-        image_files = [f for f in files if f.suffix.lower() in self.IMAGE_EXTENSIONS]
-        if image_files and PIL_AVAILABLE:
-            self.thumbnail_generator = ThumbnailGenerator(image_files, size=96)
-            self.thumbnail_generator.thumbnail_ready.connect(self.on_thumbnail_ready)
-            self.thumbnail_generator.start()
+                hi = mid
+        first = lo
+        lo, hi = first, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rect(mid).top() <= height:
+                lo = mid + 1
+            else:
+                hi = mid
+        return range(first, lo)
+    
+    def _prioritize_visible_thumbnails(self):
+        """Keep only on-screen rows queued in the thumbnail generator."""
+        generator = self.thumbnail_generator
+        if generator is None:
+            return
+        try:
+            visible = [self.file_model.path_at(row) for row in self._visible_rows()]
+        except Exception as e:
+            logger.debug(f"Could not compute visible rows: {e}")
+            return
+        dropped = generator.retain(visible)
+        self.file_model.forget_requests(dropped)
+        generator.prioritize(visible)
     
     def on_thumbnail_ready(self, filepath: str, qimage: QImage):
         """Handle thumbnail generated — convert QImage → QPixmap in the main (GUI) thread."""
@@ -742,18 +1303,11 @@ class FileBrowserPanelQt(QWidget):
         except Exception as _e:
             logger.debug(f"QImage→QPixmap conversion failed: {_e}")
             return
-        self.thumbnail_cache[filepath] = pixmap
-
-        # Find item and update icon
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == filepath:
-                item.setIcon(QIcon(pixmap))
-                break
+        self.file_model.set_thumbnail(filepath, QIcon(pixmap))
     
-    def on_file_clicked(self, item: QListWidgetItem):
+    def on_file_clicked(self, index: QModelIndex):
         """Handle file clicked — debounce preview to avoid blocking the UI."""
-        filepath = Path(item.data(Qt.ItemDataRole.UserRole))
+        filepath = Path(index.data(Qt.ItemDataRole.UserRole))
         # Schedule preview with debounce so rapid clicks don't pile up
         self._pending_preview = filepath
         self._preview_timer.start()
@@ -765,9 +1319,9 @@ class FileBrowserPanelQt(QWidget):
             self.show_preview(self._pending_preview)
             self._pending_preview = None
     
-    def on_file_double_clicked(self, item: QListWidgetItem):
+    def on_file_double_clicked(self, index: QModelIndex):
         """Handle file double-clicked — open with default OS application."""
-        filepath = Path(item.data(Qt.ItemDataRole.UserRole))
+        filepath = Path(index.data(Qt.ItemDataRole.UserRole))
         import subprocess
         import platform
         import os
@@ -784,14 +1338,14 @@ class FileBrowserPanelQt(QWidget):
 
     def _show_file_context_menu(self, pos) -> None:
         """Show right-click context menu for the file list."""
-        item = self.file_list.itemAt(pos)
-        if item is None:
+        index = self.file_list.indexAt(pos)
+        if not index.isValid():
             return
-        filepath = Path(item.data(Qt.ItemDataRole.UserRole))
+        filepath = Path(index.data(Qt.ItemDataRole.UserRole))
         menu = QMenu(self)
 
         open_action = QAction("🔗 Open", self)
-        open_action.triggered.connect(lambda: self.on_file_double_clicked(item))
+        open_action.triggered.connect(lambda: self.on_file_double_clicked(index))
         menu.addAction(open_action)
 
         reveal_action = QAction("📂 Reveal in Explorer", self)
@@ -886,6 +1440,18 @@ class FileBrowserPanelQt(QWidget):
         if self.thumbnail_generator is not None and self.thumbnail_generator.isRunning():
             self.thumbnail_generator.stop()
             self.thumbnail_generator.wait(500)  # 500 ms grace period
+        for worker in self._list_workers:
+            worker.requestInterruption()
+            worker.wait(500)
+        for worker in [self._content_worker] + self._retired_content_workers:
+            if worker is not None and worker.isRunning():
+                worker.stop()
+                worker.wait(500)
+        if self.thumbnail_disk_cache is not None:
+            try:
+                self.thumbnail_disk_cache.flush()
+            except Exception:
+                pass
         super().closeEvent(event)
 
     def refresh_view(self):
@@ -5,6 +5,7 @@ Batch-converts images between formats with quality, resize, and colour-space opt
 from __future__ import annotations
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -46,6 +47,11 @@ try:
 except (ImportError, OSError):
     _PIL = False
 
+try:
+    from utils.image_processing import iter_batch_process_images
+except ImportError:
+    iter_batch_process_images = None
+
 # ── SVG rasterisation via Qt ───────────────────────────────────────────────────
 # Qt ships an SVG renderer in PyQt6.QtSvg (no extra package needed).
 # We rasterise the SVG at a user-specified DPI and return a PIL Image.
@@ -207,166 +213,189 @@ def _make_square(img: "Image.Image") -> "Image.Image":
 
 
 # ─── Worker thread ────────────────────────────────────────────────────────────
+def _convert_one(fp: Path, out_path: Path, s: dict) -> bool:
+    """Convert one image to ``out_path``; raises on failure."""
+    pil_fmt = s["pil_fmt"]
+    colour = s["colour"]
+
+    # ── Load image (SVG rasterised via Qt/cairosvg) ──────────
+    if fp.suffix.lower() == ".svg":
+        try:
+            img = _rasterise_svg(fp, dpi=s.get("svg_dpi", 96))
+        except Exception as svg_exc:
+            raise RuntimeError(
+                f"SVG rasterisation failed for '{fp.name}': {svg_exc}"
+            )
+    else:
+        img = Image.open(fp)
+        img.load()  # force decode (catches lazy errors)
+
+    # ── Colour conversion ─────────────────────────────────────
+    if colour != "keep":
+        if colour == "RGBA" and pil_fmt in ("JPEG", "BMP"):
+            # JPEG/BMP cannot store alpha — flatten to RGB
+            bg = Image.new("RGB", img.size, (255, 255, 255))
+            if img.mode in ("RGBA", "LA", "PA"):
+                bg.paste(img, mask=img.split()[-1])
+            else:
+                bg.paste(img.convert("RGB"))
+            img = bg
+        else:
+            target_mode = colour
+            if target_mode == "RGB" and pil_fmt in ("PNG", "TIFF", "WEBP", "TGA"):
+                pass  # allow
+            img = img.convert(target_mode)
+    elif pil_fmt == "JPEG" and img.mode in ("RGBA", "LA", "P", "1"):
+        # Auto-flatten alpha for JPEG even when "keep"
+        bg = Image.new("RGB", img.size, (255, 255, 255))
+        if img.mode in ("RGBA", "LA"):
+            bg.paste(img, mask=img.split()[-1])
+        else:
+            bg.paste(img.convert("RGB"))
+        img = bg
+    elif pil_fmt == "ICO":
+        img = img.convert("RGBA")
+    elif pil_fmt == "ICNS":
+        # ICNS requires a square RGBA image — pad shorter side if needed
+        img = _make_square(img.convert("RGBA"))
+    elif pil_fmt == "GIF":
+        # GIF supports only palette / P mode (256 colours)
+        if img.mode not in ("P", "L"):
+            img = img.convert("RGB").quantize(colors=256)
+
+    # ── Resize ────────────────────────────────────────────────
+    img = _resize_image(img, s["resize_mode"], s)
+
+    # ── Watermark ─────────────────────────────────────────────
+    if s.get("watermark_enabled") and s.get("watermark_text"):
+        img = _apply_watermark(img, s)
+
+    # ── ICO size cap ──────────────────────────────────────────
+    if pil_fmt == "ICO":
+        img.thumbnail((256, 256), Image.Resampling.LANCZOS)
+    elif pil_fmt == "ICNS":
+        # Recommended ICNS sizes: 16, 32, 64, 128, 256, 512, 1024
+        img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+
+    # ── Save kwargs ───────────────────────────────────────────
+    save_kw: dict = {}
+    if pil_fmt == "JPEG":
+        save_kw = {"quality": s["jpeg_quality"], "optimize": True}
+        if s["strip_metadata"]:
+            save_kw["exif"] = b""
+    elif pil_fmt == "PNG":
+        save_kw = {"compress_level": s["png_compress"], "optimize": True}
+    elif pil_fmt == "WEBP":
+        save_kw = {"quality": s["webp_quality"], "lossless": s["webp_lossless"]}
+    elif pil_fmt == "TIFF":
+        save_kw = {"compression": "tiff_lzw"}
+    elif pil_fmt == "AVIF":
+        save_kw = {"quality": s["webp_quality"]}
+    elif pil_fmt == "JPEG2000":
+        save_kw = {"quality_mode": "lossless"}
+
+    # ── Early AVIF check — skip inference if plugin absent ───────
+    if pil_fmt == "AVIF" and not _AVIF_AVAILABLE:
+        raise RuntimeError(_AVIF_UNAVAILABLE_MSG)
+
+    try:
+        img.save(out_path, format=pil_fmt, **save_kw)
+    except Exception as save_exc:
+        # Provide a friendlier message for the very common "no AVIF encoder" error
+        exc_str = str(save_exc)
+        if pil_fmt == "AVIF" and (
+            "encoder avif not available" in exc_str.lower()
+            or "libaom" in exc_str.lower()
+            or "avif" in exc_str.lower()
+        ):
+            raise RuntimeError(_AVIF_UNAVAILABLE_MSG) from save_exc
+        raise
+    return True
+
+
 class _ConvertWorker(QThread):
-    """Runs the conversion in a background thread."""
+    """
+    Runs the conversion in a background thread.
+
+    Images are converted on iter_batch_process_images()'s bounded worker
+    pool and reported as each one finishes; ``memory_manager`` (the app's
+    MemoryManager, optional) holds back new images under memory pressure.
+    """
     progress   = pyqtSignal(int, int, str)   # done, total, filename
     log_msg    = pyqtSignal(str)
     finished   = pyqtSignal(bool, str, int)  # success, message, count
 
-    def __init__(self, files: List[Path], settings: dict, parent=None):
+    def __init__(self, files: List[Path], settings: dict, parent=None, memory_manager=None):
         super().__init__(parent)
         self._files    = files
         self._settings = settings
-        self._cancel   = False
+        self._memory_manager = memory_manager
+        self._cancel   = threading.Event()
 
     def cancel(self):
-        self._cancel = True
+        self._cancel.set()
 
     def run(self):
         if not _PIL:
             self.finished.emit(False, "Pillow not installed — cannot convert images", 0)
             return
+        if iter_batch_process_images is None:
+            self.finished.emit(False, "Image processing module unavailable — cannot convert images", 0)
+            return
         s         = self._settings
         out_dir   = Path(s["out_dir"])
         out_dir.mkdir(parents=True, exist_ok=True)
         out_ext   = s["out_ext"]
-        pil_fmt   = s["pil_fmt"]
-        colour    = s["colour"]
-        resize_md = s["resize_mode"]
-        jpeg_q    = s["jpeg_quality"]
-        png_cmp   = s["png_compress"]
-        webp_q    = s["webp_quality"]
-        webp_ll   = s["webp_lossless"]
-        strip_xmp = s["strip_metadata"]
         skip_existing = s.get("skip_existing", False)
         name_tpl  = s["name_template"]  # e.g. "{stem}{ext}"
         suffix    = s.get("name_suffix", "")
-        svg_dpi   = s.get("svg_dpi", 96)
         total     = len(self._files)
         done      = 0
         errors    = 0
         skipped   = 0
 
+        # Build output paths first so existing outputs are skipped early
+        targets = {}
+        claimed = set()
         for fp in self._files:
-            if self._cancel:
-                break
-            try:
-                # Build output path first so we can skip early if needed
-                stem = fp.stem + suffix
-                out_name = (name_tpl
-                            .replace("{stem}", stem)
-                            .replace("{ext}", out_ext)
-                            .replace("{name}", fp.name))
-                out_path = out_dir / out_name
-                # Guard: never overwrite the source file
-                if out_path.resolve() == fp.resolve():
-                    out_path = out_dir / (fp.stem + "_converted" + out_ext)
-
-                if skip_existing and out_path.exists():
-                    skipped += 1
-                    self.log_msg.emit(f"⏭️ Skipped (exists): {out_path.name}")
-                    self.progress.emit(done + errors + skipped, total, fp.name)
-                    continue
-
-                # ── Load image (SVG rasterised via Qt/cairosvg) ──────────
-                if fp.suffix.lower() == ".svg":
-                    try:
-                        img = _rasterise_svg(fp, dpi=svg_dpi)
-                    except Exception as svg_exc:
-                        raise RuntimeError(
-                            f"SVG rasterisation failed for '{fp.name}': {svg_exc}"
-                        )
-                else:
-                    img = Image.open(fp)
-                    img.load()  # force decode (catches lazy errors)
-
-                # ── Colour conversion ─────────────────────────────────────
-                if colour != "keep":
-                    if colour == "RGBA" and pil_fmt in ("JPEG", "BMP"):
-                        # JPEG/BMP cannot store alpha — flatten to RGB
-                        bg = Image.new("RGB", img.size, (255, 255, 255))
-                        if img.mode in ("RGBA", "LA", "PA"):
-                            bg.paste(img, mask=img.split()[-1])
-                        else:
-                            bg.paste(img.convert("RGB"))
-                        img = bg
-                    else:
-                        target_mode = colour
-                        if target_mode == "RGB" and pil_fmt in ("PNG", "TIFF", "WEBP", "TGA"):
-                            pass  # allow
-                        img = img.convert(target_mode)
-                elif pil_fmt == "JPEG" and img.mode in ("RGBA", "LA", "P", "1"):
-                    # Auto-flatten alpha for JPEG even when "keep"
-                    bg = Image.new("RGB", img.size, (255, 255, 255))
-                    if img.mode in ("RGBA", "LA"):
-                        bg.paste(img, mask=img.split()[-1])
-                    else:
-                        bg.paste(img.convert("RGB"))
-                    img = bg
-                elif pil_fmt == "ICO":
-                    img = img.convert("RGBA")
-                elif pil_fmt == "ICNS":
-                    # ICNS requires a square RGBA image — pad shorter side if needed
-                    img = _make_square(img.convert("RGBA"))
-                elif pil_fmt == "GIF":
-                    # GIF supports only palette / P mode (256 colours)
-                    if img.mode not in ("P", "L"):
-                        img = img.convert("RGB").quantize(colors=256)
-
-                # ── Resize ────────────────────────────────────────────────
-                img = _resize_image(img, resize_md, s)
-
-                # ── Watermark ─────────────────────────────────────────────
-                if s.get("watermark_enabled") and s.get("watermark_text"):
-                    img = _apply_watermark(img, s)
-
-                # ── ICO size cap ──────────────────────────────────────────
-                if pil_fmt == "ICO":
-                    img.thumbnail((256, 256), Image.Resampling.LANCZOS)
-                elif pil_fmt == "ICNS":
-                    # Recommended ICNS sizes: 16, 32, 64, 128, 256, 512, 1024
-                    img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-
-                # ── Save kwargs ───────────────────────────────────────────
-                save_kw: dict = {}
-                if pil_fmt == "JPEG":
-                    save_kw = {"quality": jpeg_q, "optimize": True}
-                    if strip_xmp:
-                        save_kw["exif"] = b""
-                elif pil_fmt == "PNG":
-                    save_kw = {"compress_level": png_cmp, "optimize": True}
-                elif pil_fmt == "WEBP":
-                    save_kw = {"quality": webp_q, "lossless": webp_ll}
-                elif pil_fmt == "TIFF":
-                    save_kw = {"compression": "tiff_lzw"}
-                elif pil_fmt == "AVIF":
-                    save_kw = {"quality": webp_q}
-                elif pil_fmt == "JPEG2000":
-                    save_kw = {"quality_mode": "lossless"}
-
-                # ── Early AVIF check — skip inference if plugin absent ───────
-                if pil_fmt == "AVIF" and not _AVIF_AVAILABLE:
-                    raise RuntimeError(_AVIF_UNAVAILABLE_MSG)
-
-                try:
-                    img.save(out_path, format=pil_fmt, **save_kw)
-                except Exception as save_exc:
-                    # Provide a friendlier message for the very common "no AVIF encoder" error
-                    exc_str = str(save_exc)
-                    if pil_fmt == "AVIF" and (
-                        "encoder avif not available" in exc_str.lower()
-                        or "libaom" in exc_str.lower()
-                        or "avif" in exc_str.lower()
-                    ):
-                        raise RuntimeError(_AVIF_UNAVAILABLE_MSG) from save_exc
-                    raise
+            stem = fp.stem + suffix
+            out_name = (name_tpl
+                        .replace("{stem}", stem)
+                        .replace("{ext}", out_ext)
+                        .replace("{name}", fp.name))
+            out_path = out_dir / out_name
+            # Guard: never overwrite the source file
+            if out_path.resolve() == fp.resolve():
+                out_path = out_dir / (fp.stem + "_converted" + out_ext)
+            # Sources sharing an output name (a.png, a.jpg → a.webp) would be
+            # written concurrently; later ones get a numbered name instead
+            base, n = out_path, 1
+            while os.path.normcase(str(out_path)) in claimed:
+                out_path = base.with_name(f"{base.stem}_{n}{base.suffix}")
+                n += 1
+            if out_path != base:
+                self.log_msg.emit(f"↪️ {fp.name}: {base.name} is taken, writing {out_path.name}")
+            claimed.add(os.path.normcase(str(out_path)))
+
+            if skip_existing and out_path.exists():
+                skipped += 1
+                self.log_msg.emit(f"⏭️ Skipped (exists): {out_path.name}")
+                self.progress.emit(done + errors + skipped, total, fp.name)
+                continue
+            targets[fp] = out_path
+
+        results = iter_batch_process_images(
+            out_dir, out_dir, _convert_one, image_files=list(targets),
+            cancel_event=self._cancel, memory_manager=self._memory_manager,
+            output_for=targets.__getitem__, s=s)
+        for fp, result in results:
+            if result['success']:
                 done += 1
-                self.log_msg.emit(f"✅ {fp.name}  →  {out_path.name}")
-            except Exception as exc:
+                self.log_msg.emit(f"✅ {fp.name}  →  {result['output'].name}")
+            else:
                 errors += 1
-                self.log_msg.emit(f"❌ {fp.name}: {exc}")
-                logger.warning(f"Format convert: {fp}: {exc}")
-
+                self.log_msg.emit(f"❌ {fp.name}: {result['error']}")
+                logger.warning(f"Format convert: {fp}: {result['error']}")
             self.progress.emit(done + errors + skipped, total, fp.name)
 
         ok  = errors == 0
@@ -1026,7 +1055,9 @@ if _PYQT:
             self._cancel_btn.setEnabled(True)
             self._status_lbl.setText("Converting…")
 
-            self._worker = _ConvertWorker(self._files, settings, parent=self)
+            self._worker = _ConvertWorker(
+                self._files, settings, parent=self,
+                memory_manager=getattr(self.window(), 'memory_manager', None))
             self._worker.progress.connect(self._on_progress)
             self._worker.log_msg.connect(self._log.append)
             self._worker.finished.connect(self._on_finished)
@@ -7,6 +7,8 @@ Author: Dead On The Inside / JosephsDeadish
 
 from __future__ import annotations
 import logging
+import os
+import tempfile
 import time
 import threading
 import shutil
@@ -154,12 +156,25 @@ except Exception as e:
     logger.warning(f"PIL could not be loaded: {e}")
 
 try:
-    from utils.archive_handler import ArchiveHandler
+    from utils.archive_handler import (
+        ArchiveFormat, ArchiveHandler, TEXTURE_EXTENSIONS as ARCHIVE_TEXTURE_EXTENSIONS,
+    )
     ARCHIVE_AVAILABLE = True
 except (ImportError, OSError, RuntimeError):
     ARCHIVE_AVAILABLE = False
     logger.warning("Archive handler not available")
 
+try:
+    from utils.file_transfer import transfer_file
+except (ImportError, OSError, RuntimeError):
+    transfer_file = None
+    logger.warning("File transfer helpers not available")
+
+# Files the style engine places per plan. Each chunk is planned, placed and
+# journaled as soon as it fills, so an interrupted run can be resumed and a
+# cancel never waits on more than one chunk.
+ENGINE_CHUNK_SIZE = 512
+
 # Human-readable descriptions for every organisation style key.
 # Defined once here and referenced by both _create_mode_selection_section
 # and _on_style_changed so they never drift out of sync.
@@ -270,68 +285,95 @@ class OrganizerWorker(QThread):
 
         self.log.emit(f"Processing {total_files} files in automatic mode...")
 
+        # Journal every move so an interrupted run can be resumed or undone
+        journal = None
+        if not self.settings.get('dry_run', False):
+            try:
+                from organizer.run_journal import RunJournal
+                journal = RunJournal.for_output(target_dir)
+                resumed = journal.start(resume=self.settings.get('resume', False),
+                                        source=str(source_dir), output=str(target_dir),
+                                        style=self.settings.get('style_key'))
+                if resumed:
+                    self.log.emit(f"↻ Resuming: {resumed} files already organized")
+            except Exception as _je:
+                self.log.emit(f"⚠️ Run journal unavailable: {_je}")
+                journal = None
+
         # Optionally use OrganizationEngine for folder structure
         org_engine = None
         style_key = self.settings.get('style_key')
         if style_key:
             try:
-                from organizer import ORGANIZATION_STYLES, OrganizationEngine
+                from organizer import ORGANIZATION_STYLES, OrganizationEngine, TextureInfo
                 style_cls = ORGANIZATION_STYLES.get(style_key)
                 if style_cls:
                     org_engine = OrganizationEngine(
                         style_class=style_cls,
                         output_dir=str(target_dir),
+                        dry_run=self.settings.get('dry_run', False),
+                        journal=journal,
                     )
                     self.log.emit(f"🗂️ Using style: {org_engine.get_style_name()}")
             except Exception as _e:
                 self.log.emit(f"⚠️ Could not load style '{style_key}': {_e}")
 
+        # Files the style engine places are collected and organized in
+        # chunks of ENGINE_CHUNK_SIZE (one plan per chunk)
+        engine_batch = []
         moved_count = 0
-        for idx, file_path in enumerate(files):
-            if self._is_cancelled:
-                break
+        try:
+            for idx, file_path in enumerate(files):
+                if self._is_cancelled:
+                    break
 
-            # Classify with AI
-            suggested_folder, confidence = self._classify_texture(file_path)
+                if journal is not None and journal.is_done(file_path):
+                    self.progress.emit(idx + 1, total_files, file_path.name, 1.0)
+                    continue
 
-            # Auto-accept if confidence above threshold
-            threshold = self.settings.get('confidence_threshold', 0.8)
-            if confidence >= threshold:
-                if org_engine:
-                    try:
-                        from organizer.organization_engine import TextureInfo as _TI
-                        ti = _TI(
+                # Classify with AI
+                suggested_folder, confidence = self._classify_texture(file_path)
+
+                # Auto-accept if confidence above threshold
+                threshold = self.settings.get('confidence_threshold', 0.8)
+                if confidence >= threshold:
+                    if org_engine:
+                        engine_batch.append(TextureInfo(
                             file_path=str(file_path),
                             filename=file_path.name,
                             category=suggested_folder,
                             confidence=confidence,
-                        )
-                        result = org_engine.organize_textures([ti])
-                        if result and result.get('success'):
-                            moved_count += 1
-                            self._files_processed += 1
-                            self.progress.emit(idx + 1, total_files, file_path.name, confidence)
-                            continue
-                    except Exception as _oe:
-                        self.log.emit(f"⚠ Style engine failed for {file_path.name}: {_oe}")
-
-                # Default: move to target_dir / suggested_folder
-                target_path = target_dir / suggested_folder / file_path.name
-                dry_run = self.settings.get('dry_run', False)
-                if dry_run:
-                    self.log.emit(f"[DRY RUN] Would move: {file_path.name} → {suggested_folder}/")
-                    moved_count += 1
-                    self._files_processed += 1
-                else:
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
-                    try:
-                        file_path.rename(target_path)
+                        ))
+                        if len(engine_batch) >= ENGINE_CHUNK_SIZE:
+                            moved_count += self._organize_batch(
+                                org_engine, engine_batch, target_dir, journal, idx + 1, total_files)
+                            engine_batch = []
+                    elif self._move_to_folder(file_path, target_dir, suggested_folder, journal):
                         moved_count += 1
-                        self._files_processed += 1
-                    except Exception as e:
-                        self.log.emit(f"⚠ Failed to move {file_path.name}: {e}")
 
-            self.progress.emit(idx + 1, total_files, file_path.name, confidence)
+                self.progress.emit(idx + 1, total_files, file_path.name, confidence)
+
+            # The last partial chunk is placed even after a cancel so the
+            # classification work is not lost
+            if engine_batch:
+                moved_count += self._organize_batch(org_engine, engine_batch, target_dir, journal,
+                                                    idx + 1, total_files)
+
+            # Archive input: stream texture members straight to their final folders
+            if self.settings.get('archive_input') and ARCHIVE_AVAILABLE and not self._is_cancelled:
+                archive_moved, total_files = self._organize_archives(
+                    source_dir, target_dir, org_engine, total_files, journal)
+                moved_count += archive_moved
+        except BaseException:
+            if journal is not None:
+                journal.close()  # keep what was placed; the run can be resumed
+            raise
+
+        if journal is not None:
+            if self._is_cancelled:
+                journal.close()  # no end marker: the run can be resumed
+            else:
+                journal.complete(moved=moved_count, total=total_files)
 
         elapsed = time.time() - self._start_time
         stats = {
@@ -345,6 +387,180 @@ class OrganizerWorker(QThread):
         action_word = "Would move" if dry_run else "Moved"
         self.finished.emit(True, f"{action_word} {moved_count}/{total_files} files", stats)
     
+    def _move_to_folder(self, file_path: Path, target_dir: Path, folder: str, journal) -> bool:
+        """Default placement: move ``file_path`` to target_dir / folder."""
+        target_path = target_dir / folder / file_path.name
+        if self.settings.get('dry_run', False):
+            self.log.emit(f"[DRY RUN] Would move: {file_path.name} → {folder}/")
+            self._files_processed += 1
+            return True
+        try:
+            if transfer_file is not None:
+                # Rename, or copy + delete when target is on another drive
+                transfer_file(file_path, target_path, mode='move', overwrite=True)
+            else:
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.rename(target_path)
+        except Exception as e:
+            self.log.emit(f"⚠ Failed to move {file_path.name}: {e}")
+            return False
+        self._files_processed += 1
+        if journal is not None:
+            journal.record(file_path, target_path, folder, action='move')
+        return True
+
+    def _organize_batch(self, org_engine, textures: list, target_dir: Path, journal,
+                        position: int = 0, total: int = 0) -> int:
+        """
+        Place the style engine's batch with a single plan.
+
+        Files the engine could not place fall back to a plain folder move.
+        Each placed file is reported through ``progress`` at ``position`` of
+        ``total`` (skipped when ``total`` is 0).
+
+        Returns:
+            Number of files placed
+        """
+        plan = org_engine.plan(textures)
+        self.log.emit(f"Placing {len(plan)} files into {len(plan.directories)} folders...")
+        if org_engine.dry_run:
+            for line in plan.diff():
+                self.log.emit(f"[DRY RUN] {line}")
+        progress_callback = None
+        if total:
+            def progress_callback(done: int, count: int, status: str) -> None:
+                self.progress.emit(position, total, status, 1.0)
+        result = org_engine.execute_plan(plan, progress_callback)
+        placed = result['processed']
+        self._files_processed += placed
+        by_source = {t.file_path: t for t in textures}
+        for error in result['errors']:
+            self.log.emit(f"⚠ Style engine failed for {error['file']}: {error['error']}")
+            texture = by_source.get(error.get('source'))
+            if texture is not None and self._move_to_folder(
+                    Path(texture.file_path), target_dir, texture.category, journal):
+                placed += 1
+        return placed
+
+    def _organize_archives(self, source_dir: Path, target_dir: Path, org_engine,
+                           done: int, journal=None) -> Tuple[int, int]:
+        """
+        Organize the textures inside archives found in ``source_dir``.
+
+        Members are decompressed in the background and written once, to
+        their destination folder; the archive is never extracted to a temp
+        directory first. Each placed member is journaled as a copy from
+        ``archive/member`` so a resumed run skips it and undo removes it.
+
+        Returns:
+            (members placed, running file total for progress)
+        """
+        handler = ArchiveHandler()
+        pattern = source_dir.rglob if self.settings.get('recursive', True) else source_dir.glob
+        archives = sorted(p for p in pattern('*') if handler.is_archive(p))
+        threshold = self.settings.get('confidence_threshold', 0.8)
+        total = done
+        for archive in archives:
+            # ZIP has a central directory, so counting its textures is free
+            if handler.get_archive_format(archive) is ArchiveFormat.ZIP:
+                total += sum(1 for name in handler.list_archive_contents(archive)
+                             if Path(name).suffix.lower() in ARCHIVE_TEXTURE_EXTENSIONS)
+
+        moved = 0
+        for archive in archives:
+            if self._is_cancelled:
+                break
+            self.log.emit(f"📦 Streaming textures from {archive.name}...")
+            members = handler.iter_members(archive)
+            try:
+                for member in members:
+                    if self._is_cancelled:
+                        break
+                    with member:
+                        done += 1
+                        total = max(total, done)
+                        source = archive / member.name
+                        if journal is not None and journal.is_done(source):
+                            self.progress.emit(done, total, member.filename, 1.0)
+                            continue
+                        suggested_folder, confidence = self._classify_member(member)
+                        if confidence >= threshold and self._place_member(
+                                member, target_dir, suggested_folder, confidence, org_engine,
+                                journal, source):
+                            moved += 1
+                            self._files_processed += 1
+                        self.progress.emit(done, total, member.filename, confidence)
+            except Exception as e:
+                self.log.emit(f"⚠ Failed to read archive {archive.name}: {e}")
+            finally:
+                members.close()
+        return moved, total
+
+    def _classify_member(self, member) -> Tuple[str, float]:
+        """Classify an archive member; vision models get a temporary file."""
+        if not self.clip_model and not self.dinov2_model:
+            return self._heuristic_classification(Path(member.filename))
+        fd, tmp_name = tempfile.mkstemp(suffix=Path(member.filename).suffix)
+        os.close(fd)
+        try:
+            tmp_path = member.save(Path(tmp_name))
+            folder, confidence = self._classify_texture(tmp_path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return folder, confidence
+
+    def _place_member(self, member, target_dir: Path, suggested_folder: str,
+                      confidence: float, org_engine, journal=None,
+                      source: Optional[Path] = None) -> bool:
+        """Write an archive member to its organized location."""
+        if org_engine:
+            from organizer.organization_engine import TextureInfo as _TI
+            ti = _TI(
+                file_path=member.name,
+                filename=member.filename,
+                category=suggested_folder,
+                confidence=confidence,
+                file_size=member.size,
+            )
+            target_path = org_engine.output_dir / org_engine.style.get_target_path(ti)
+        else:
+            target_path = target_dir / suggested_folder / member.filename
+        if self.settings.get('dry_run', False):
+            self.log.emit(f"[DRY RUN] Would extract: {member.name} → {target_path.parent.name}/")
+            return True
+        try:
+            self._save_member(member, target_path)
+        except Exception as e:
+            self.log.emit(f"⚠ Failed to extract {member.name}: {e}")
+            return False
+        if journal is not None:
+            journal.record(source or Path(member.name), target_path, suggested_folder,
+                           action='copy')
+        return True
+
+    @staticmethod
+    def _save_member(member, target_path: Path) -> None:
+        """
+        Write an archive member with the same overwrite policy as loose files.
+
+        The content is written to a temporary file beside the target and
+        then moved onto it with ``transfer_file(..., overwrite=True)``, so an
+        existing file is only replaced once the new one is complete.
+        """
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, staging_name = tempfile.mkstemp(prefix=f'.{target_path.name}.', suffix='.tmp',
+                                            dir=target_path.parent)
+        os.close(fd)
+        staging = Path(staging_name)
+        try:
+            member.save(staging)
+            if transfer_file is not None:
+                transfer_file(staging, target_path, mode='move', overwrite=True)
+            else:
+                os.replace(staging, target_path)
+        finally:
+            staging.unlink(missing_ok=True)
+
     def _run_suggested(self):
         """Suggested mode: AI suggests, user confirms (handled by UI)."""
         source_dir = Path(self.settings['source_dir'])
@@ -1248,6 +1464,13 @@ class OrganizerPanelQt(QWidget):
             "When checked, files are classified and planned but NOT actually moved or copied. "
             "Use this to preview what the organizer would do before committing.")
         org_settings_layout.addWidget(self.dry_run_cb)
+
+        self.resume_cb = QCheckBox("↻ Resume interrupted run")
+        self.resume_cb.setChecked(False)
+        self._set_tooltip(self.resume_cb,
+            "Skip files the previous run into this target folder already organized "
+            "(read from its run journal) instead of starting over.")
+        org_settings_layout.addWidget(self.resume_cb)
         
         org_settings_layout.addStretch()
         
@@ -1749,6 +1972,8 @@ class OrganizerPanelQt(QWidget):
             'create_backup': backup,
             'style_key': getattr(self.style_combo, 'currentData', lambda: None)(),
             'dry_run': hasattr(self, 'dry_run_cb') and self.dry_run_cb.isChecked(),
+            'resume': hasattr(self, 'resume_cb') and self.resume_cb.isChecked(),
+            'archive_input': ARCHIVE_AVAILABLE and self.archive_input_cb.isChecked(),
         }
         
         # Disable UI
@@ -79,6 +79,14 @@ except (ImportError, OSError, RuntimeError):
     ProfileResult = None  # type: ignore[assignment]
     PROFILER_AVAILABLE = False
 
+# Shared decoded-image cache (hit rate / evictions)
+try:
+    from utils.cache_manager import get_cache_manager
+    CACHE_STATS_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    get_cache_manager = None  # type: ignore[assignment]
+    CACHE_STATS_AVAILABLE = False
+
 # Try to import tooltip system
 try:
     from features.tutorial_system import WidgetTooltip
@@ -122,6 +130,9 @@ class PerformanceMetrics:
         self.queue_processing = 0
         self.queue_completed = 0
         self.queue_failed = 0
+        
+        # Image cache statistics (from the shared CacheManager)
+        self.cache_stats: Dict = {}
     
     def update(self):
         """Update all metrics."""
@@ -157,6 +168,13 @@ class PerformanceMetrics:
             self.processing_speed.append(speed)
         
         self.last_update = now
+        
+        # Image cache hit rate and evictions
+        if CACHE_STATS_AVAILABLE:
+            try:
+                self.cache_stats = get_cache_manager().get_stats()
+            except Exception as e:
+                logger.debug(f"Could not read cache stats: {e}")
     
     def record_file_processed(self, file_size_bytes: int):
         """Record that a file was processed."""
@@ -203,7 +221,12 @@ class PerformanceMetrics:
             "queue_processing": self.queue_processing,
             "queue_completed": self.queue_completed,
             "queue_failed": self.queue_failed,
-            "estimated_completion": self.get_estimated_completion()
+            "estimated_completion": self.get_estimated_completion(),
+            "cache_size_mb": self.cache_stats.get('size_mb', 0.0),
+            "cache_max_mb": self.cache_stats.get('max_size_mb', 0.0),
+            "cache_hit_rate": self.cache_stats.get('hit_rate', 0.0),
+            "cache_evictions": self.cache_stats.get('evictions', 0),
+            "cache_disk_mb": self.cache_stats.get('disk_size_mb', 0.0),
         }
 
 
@@ -303,6 +326,14 @@ class PerformanceDashboard(QFrame):
         self.available_label.setFont(normal_font)
         resources_layout.addWidget(self.available_label)
         
+        self.cache_label = QLabel("Image Cache: 0 / 0 MB")
+        self.cache_label.setFont(normal_font)
+        resources_layout.addWidget(self.cache_label)
+        
+        self.cache_hits_label = QLabel("Cache Hit Rate: 0% (0 evictions)")
+        self.cache_hits_label.setFont(normal_font)
+        resources_layout.addWidget(self.cache_hits_label)
+        
         resources_layout.addStretch()
         content_layout.addWidget(resources_frame, 0, 1)
         
@@ -460,6 +491,16 @@ class PerformanceDashboard(QFrame):
             f"CPU: {summary['current_cpu_percent']:.1f}% (Peak: {summary['peak_cpu_percent']:.1f}%)"
         )
         
+        self.cache_label.setText(
+            f"Image Cache: {summary['cache_size_mb']:.0f} / {summary['cache_max_mb']:.0f} MB"
+            + (f" (+{summary['cache_disk_mb']:.0f} MB on disk)" if summary['cache_disk_mb'] else "")
+        )
+        
+        self.cache_hits_label.setText(
+            f"Cache Hit Rate: {summary['cache_hit_rate'] * 100:.0f}% "
+            f"({summary['cache_evictions']} evictions)"
+        )
+        
         self.queue_pending_label.setText(
             f"⏳ Pending: {summary['queue_pending']}"
         )
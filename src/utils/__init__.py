@@ -10,6 +10,9 @@ from .archive_handler import ArchiveHandler, ArchiveFormat
 from .metadata_handler import MetadataHandler
 from .gpu_detector import GPUDetector, GPUDevice, GPUVendor
 from .system_detection import SystemDetector, SystemCapabilities, PerformanceModeManager
+from .thumbnail_cache import ThumbnailCache
+from .file_hasher import FileHasher
+from .file_transfer import FileTransfer, transfer_file, TRANSFER_MODES
 from . import image_processing
 
 __all__ = [
@@ -28,5 +31,10 @@ __all__ = [
     'SystemDetector',
     'SystemCapabilities',
     'PerformanceModeManager',
+    'ThumbnailCache',
+    'FileHasher',
+    'FileTransfer',
+    'transfer_file',
+    'TRANSFER_MODES',
     'image_processing',
 ]
@@ -4,12 +4,17 @@ Handles extraction and compression of various archive formats (ZIP, 7Z, RAR, TAR
 Author: Dead On The Inside / JosephsDeadish
 """
 
+import io
+import os
 import zipfile
 import tempfile
 import shutil
 import logging
-from pathlib import Path
-from typing import Optional, List, Set, Callable
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Optional, List, Set, Tuple, Callable, Container, Iterable, Iterator, BinaryIO
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -37,6 +42,165 @@ except (ImportError, OSError, RuntimeError):
     logger.debug("tarfile not available. TAR support disabled.")
 
 
+# Texture members yielded by ArchiveHandler.iter_members() by default
+TEXTURE_EXTENSIONS = frozenset({
+    '.dds', '.png', '.jpg', '.jpeg', '.tga', '.bmp', '.tiff', '.tif', '.webp',
+    '.gif', '.avif', '.qoi', '.apng', '.jfif', '.ico', '.icns',
+})
+
+# Members up to this size are handed out as in-memory buffers; larger ones
+# are spooled to an anonymous temp file so memory stays bounded.
+MEMORY_MEMBER_LIMIT = 32 * 1024 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveMember:
+    """
+    One file streamed out of an archive.
+
+    The content is either held in memory (``data``) or in a spooled temp
+    file; ``open()``, ``read()`` and ``save()`` work the same for both.
+    Call ``close()`` (or use the member as a context manager) to release
+    a spooled file early.
+    """
+
+    __slots__ = ('name', 'size', 'crc', 'data', '_spool')
+
+    def __init__(self, name: str, size: int, crc: Optional[int] = None,
+                 data: Optional[bytes] = None, spool: Optional[BinaryIO] = None):
+        self.name = name
+        self.size = size
+        self.crc = crc
+        self.data = data
+        self._spool = spool
+
+    @property
+    def filename(self) -> str:
+        """Base name of the member."""
+        return PurePosixPath(self.name).name
+
+    @property
+    def in_memory(self) -> bool:
+        return self.data is not None
+
+    @property
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """``(size, crc)`` for ``iter_members(skip_signatures=...)``, if the CRC is known."""
+        return None if self.crc is None else (self.size, self.crc)
+
+    def open(self) -> BinaryIO:
+        """Readable binary stream positioned at the start of the content."""
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        self._spool.seek(0)
+        return self._spool
+
+    def read(self) -> bytes:
+        """Whole content as bytes."""
+        if self.data is not None:
+            return self.data
+        return self.open().read()
+
+    def save(self, dest: Path) -> Path:
+        """
+        Write the content to ``dest``, creating parent directories.
+
+        Returns:
+            ``dest``
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, 'wb') as out:
+            if self.data is not None:
+                out.write(self.data)
+            else:
+                shutil.copyfileobj(self.open(), out, COPY_CHUNK_SIZE)
+        return dest
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ArchiveMember({self.name!r}, size={self.size})"
+
+
+def _buffer_stream(stream: BinaryIO, size: int, memory_limit: int):
+    """Read ``stream`` into bytes, or into a temp file when ``size`` is large."""
+    if size <= memory_limit:
+        return stream.read(), None
+    spool = tempfile.TemporaryFile(prefix="ps2_member_")
+    shutil.copyfileobj(stream, spool, COPY_CHUNK_SIZE)
+    return None, spool
+
+
+def _wants(name: str, extensions: Optional[Set[str]]) -> bool:
+    return extensions is None or PurePosixPath(name).suffix.lower() in extensions
+
+
+class _ZipReaders:
+    """One ZipFile handle per worker thread; a single handle is not safe to share."""
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = archive_path
+        self._local = threading.local()
+        self._handles: List[zipfile.ZipFile] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> zipfile.ZipFile:
+        zf = getattr(self._local, 'zf', None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self.archive_path, 'r')
+            with self._lock:
+                self._handles.append(zf)
+        return zf
+
+    def close(self) -> None:
+        with self._lock:
+            for zf in self._handles:
+                zf.close()
+            self._handles.clear()
+
+
+def _existing_matches_crc(dest: Path, size: int, crc: int) -> bool:
+    """Whether ``dest`` already holds content with this size and CRC-32."""
+    try:
+        if dest.stat().st_size != size:
+            return False
+    except OSError:
+        return False
+    try:
+        from utils.file_hasher import crc32_file
+    except ImportError:
+        from .file_hasher import crc32_file
+    try:
+        # Reading back is far cheaper than inflating and rewriting the member
+        return (crc32_file(dest) & 0xFFFFFFFF) == (crc & 0xFFFFFFFF)
+    except OSError:
+        return False
+
+
+def _member_dest(extract_to: Path, name: str) -> Path:
+    """Where ``ZipFile.extract`` writes member ``name`` (same sanitizing)."""
+    name = name.replace('\\', '/')
+    parts = [p for p in PurePosixPath(name.lstrip('/')).parts if p not in ('', '.', '..')]
+    if parts and parts[0].endswith(':'):
+        parts = parts[1:]  # drive letter
+    return extract_to.joinpath(*parts)
+
+
+def _default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
 class ArchiveFormat(Enum):
     """Supported archive formats"""
     ZIP = "zip"
@@ -165,14 +329,20 @@ class ArchiveHandler:
     
     def extract_archive(self, archive_path: Path, 
                        extract_to: Optional[Path] = None,
-                       progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Optional[Path]:
+                       progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                       max_workers: Optional[int] = None) -> Optional[Path]:
         """
         Extract archive to a directory.
         
+        ZIP members are decompressed on several threads, and members already
+        present at the destination with the same size and CRC-32 are skipped,
+        so re-extracting a pack only writes what changed.
+        
         Args:
             archive_path: Path to archive file
             extract_to: Target directory (creates temp dir if None)
             progress_callback: Optional callback(current, total, filename)
+            max_workers: Threads for ZIP decompression (default: min(4, CPUs))
             
         Returns:
             Path to extraction directory or None on failure
@@ -195,14 +365,10 @@ class ArchiveHandler:
             logger.info(f"Extracting {archive_path.name} ({format_type.value}) to {extract_to}")
             
             if format_type == ArchiveFormat.ZIP:
-                with zipfile.ZipFile(archive_path, 'r') as zf:
-                    members = zf.namelist()
-                    total = len(members)
-                    for i, member in enumerate(members):
-                        if progress_callback:
-                            progress_callback(i + 1, total, member)
-                        zf.extract(member, extract_to)
-                    logger.info(f"Extracted {total} files from ZIP")
+                extracted, skipped = self._extract_zip_parallel(
+                    archive_path, extract_to, progress_callback, max_workers)
+                logger.info(f"Extracted {extracted} files from ZIP"
+                            + (f" ({skipped} already up to date)" if skipped else ""))
             
             elif format_type == ArchiveFormat.SEVEN_ZIP:
                 if not HAS_7Z:
@@ -255,6 +421,179 @@ class ArchiveHandler:
             logger.error(f"Error extracting archive: {e}")
             return None
     
+    def _extract_zip_parallel(self, archive_path: Path, extract_to: Path,
+                              progress_callback: Optional[Callable[[int, int, str], None]],
+                              max_workers: Optional[int]):
+        """Extract a ZIP on a thread pool; returns (extracted, skipped)."""
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            infos = zf.infolist()
+        total = len(infos)
+        readers = _ZipReaders(archive_path)
+
+        # ZipFile.extract creates missing parents without exist_ok, so
+        # threads sharing a folder would race; create every folder up front.
+        for directory in {_member_dest(extract_to, info.filename)
+                          if info.is_dir() else _member_dest(extract_to, info.filename).parent
+                          for info in infos}:
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def _extract(info: zipfile.ZipInfo) -> bool:
+            if not info.is_dir():
+                dest = _member_dest(extract_to, info.filename)
+                if _existing_matches_crc(dest, info.file_size, info.CRC):
+                    return False
+            # ZipFile.extract sanitizes absolute and '..' member names
+            readers.get().extract(info, extract_to)
+            return True
+
+        extracted = skipped = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or _default_workers(),
+                                    thread_name_prefix="Unzip") as pool:
+                for i, (info, wrote) in enumerate(zip(infos, pool.map(_extract, infos))):
+                    if wrote:
+                        extracted += 1
+                    else:
+                        skipped += 1
+                    if progress_callback:
+                        progress_callback(i + 1, total, info.filename)
+        finally:
+            readers.close()
+        return extracted, skipped
+
+    def iter_members(self, archive_path: Path,
+                     extensions: Optional[Iterable[str]] = TEXTURE_EXTENSIONS,
+                     skip_signatures: Optional[Container[Tuple[int, int]]] = None,
+                     max_workers: Optional[int] = None,
+                     memory_limit: int = MEMORY_MEMBER_LIMIT) -> Iterator[ArchiveMember]:
+        """
+        Stream members out of an archive without extracting it to disk.
+        
+        Members are yielded in archive order while later ones are still
+        being decompressed. ZIP members are decompressed on a thread pool
+        (zlib releases the GIL) with a bounded read-ahead window; TAR and
+        RAR are streamed sequentially. Small members arrive as in-memory
+        buffers, large ones as spooled temp files (see ``memory_limit``).
+        
+        Args:
+            archive_path: Path to archive file
+            extensions: Lower-case suffixes to yield (None: every file)
+            skip_signatures: ``(size, CRC-32)`` pairs already processed
+                (see ``ArchiveMember.signature``); matching ZIP/RAR members
+                are skipped without being decompressed
+            max_workers: Decompression threads for ZIP (default: min(4, CPUs))
+            memory_limit: Largest member kept in memory
+            
+        Yields:
+            ArchiveMember for each matching file
+        """
+        archive_path = Path(archive_path)
+        if extensions is not None:
+            extensions = {ext.lower() for ext in extensions}
+        format_type = self.get_archive_format(archive_path)
+
+        if format_type == ArchiveFormat.ZIP:
+            yield from self._iter_zip_members(archive_path, extensions, skip_signatures,
+                                              max_workers or _default_workers(), memory_limit)
+
+        elif format_type in [ArchiveFormat.TAR, ArchiveFormat.TAR_GZ,
+                             ArchiveFormat.TAR_BZ2, ArchiveFormat.TAR_XZ]:
+            if not HAS_TAR:
+                logger.error("TAR support not available")
+                return
+            # Stream mode: one sequential pass, no seeking back through the file
+            with tarfile.open(archive_path, 'r|*') as tf:
+                for info in tf:
+                    if not info.isfile() or not _wants(info.name, extensions):
+                        continue
+                    stream = tf.extractfile(info)
+                    data, spool = _buffer_stream(stream, info.size, memory_limit)
+                    yield ArchiveMember(info.name, info.size, None, data, spool)
+
+        elif format_type == ArchiveFormat.RAR:
+            if not HAS_RAR:
+                logger.error("RAR support not available (install rarfile)")
+                return
+            with rarfile.RarFile(archive_path, 'r') as rf:
+                for info in rf.infolist():
+                    if info.is_dir() or not _wants(info.filename, extensions):
+                        continue
+                    if (skip_signatures is not None
+                            and (info.file_size, info.CRC) in skip_signatures):
+                        continue
+                    with rf.open(info) as stream:
+                        data, spool = _buffer_stream(stream, info.file_size, memory_limit)
+                    yield ArchiveMember(info.filename, info.file_size, info.CRC, data, spool)
+
+        elif format_type == ArchiveFormat.SEVEN_ZIP:
+            if not HAS_7Z:
+                logger.error("7z support not available (install py7zr)")
+                return
+            # py7zr decodes solid blocks as a whole, so extract once and stream
+            # the files back from a private temp dir
+            temp_dir = Path(tempfile.mkdtemp(prefix="ps2_archive_"))
+            try:
+                with py7zr.SevenZipFile(archive_path, 'r') as archive:
+                    names = [n for n in archive.getnames() if _wants(n, extensions)]
+                    archive.extract(path=temp_dir, targets=names)
+                for name in names:
+                    path = temp_dir / name
+                    if not path.is_file():
+                        continue
+                    size = path.stat().st_size
+                    with open(path, 'rb') as stream:
+                        data, spool = _buffer_stream(stream, size, memory_limit)
+                    path.unlink()
+                    yield ArchiveMember(name, size, None, data, spool)
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        else:
+            logger.error(f"Unsupported archive format: {format_type}")
+
+    def _iter_zip_members(self, archive_path: Path, extensions: Optional[Set[str]],
+                          skip_signatures: Optional[Container[Tuple[int, int]]],
+                          max_workers: int,
+                          memory_limit: int) -> Iterator[ArchiveMember]:
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            infos = [info for info in zf.infolist()
+                     if not info.is_dir() and _wants(info.filename, extensions)
+                     and (skip_signatures is None
+                          or (info.file_size, info.CRC) not in skip_signatures)]
+        readers = _ZipReaders(archive_path)
+
+        def _read(info: zipfile.ZipInfo) -> ArchiveMember:
+            with readers.get().open(info) as stream:
+                data, spool = _buffer_stream(stream, info.file_size, memory_limit)
+            return ArchiveMember(info.filename, info.file_size, info.CRC, data, spool)
+
+        # Keep a few members in flight ahead of the consumer, in archive order
+        window = max_workers * 2
+        pending = deque()
+        remaining = iter(infos)
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Unzip")
+        try:
+            for info in remaining:
+                pending.append(pool.submit(_read, info))
+                if len(pending) >= window:
+                    break
+            while pending:
+                member = pending.popleft().result()
+                nxt = next(remaining, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_read, nxt))
+                yield member
+        finally:
+            # Abandoned early: drop queued reads and release spooled files
+            for future in pending:
+                if not future.cancel():
+                    try:
+                        future.result().close()
+                    except Exception:
+                        pass
+            pool.shutdown(wait=True)
+            readers.close()
+
     def create_archive(self, source_path: Path, archive_path: Path,
                       format_type: Optional[ArchiveFormat] = None,
                       progress_callback: Optional[Callable[[int, int, str], None]] = None) -> bool:
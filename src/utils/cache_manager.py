@@ -1,143 +1,618 @@
 """
-Cache Manager - LRU cache for texture metadata and thumbnails
+Cache Manager - Shared LRU cache for decoded images and derived arrays
+Sized from real buffer sizes (ndarray.nbytes, PIL image buffers), sharded
+locks so worker threads rarely contend, and an optional second tier that
+spills evicted arrays to disk compressed.
 Author: Dead On The Inside / JosephsDeadish
 """
 
+import atexit
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
 import time
+import zlib
 from collections import OrderedDict
-from typing import Any, Optional
 from pathlib import Path
-import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except (ImportError, OSError, RuntimeError):
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except (ImportError, OSError, RuntimeError):
+    Image = None  # type: ignore[assignment]
+    HAS_PIL = False
+
+# Independent LRU shards; a key's shard is chosen by hash, so threads working
+# on different images rarely wait on the same lock.
+DEFAULT_SHARDS = 16
+# zlib level for spilled arrays: level 1 keeps spilling cheaper than re-decoding.
+SPILL_COMPRESS_LEVEL = 1
+# Entries smaller than this are not worth a disk round trip.
+SPILL_MIN_BYTES = 64 * 1024
+# PIL modes that round-trip through a NumPy array unchanged.
+_SPILLABLE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'I', 'F', 'I;16')
+# Spill folders of earlier sessions older than this are removed on start-up.
+STALE_SPILL_SECONDS = 24 * 3600
+
+
+def _pil_buffer_size(img) -> int:
+    """Bytes held by a PIL image's pixel buffer."""
+    width, height = img.size
+    mode = img.mode
+    # PIL stores 1/L/P at one byte per pixel, I;16 variants at two and
+    # everything else (including RGB and LA) at four.
+    if mode in ('1', 'L', 'P'):
+        per_pixel = 1
+    elif mode.startswith('I;16'):
+        per_pixel = 2
+    else:
+        per_pixel = 4
+    return width * height * per_pixel
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Approximate memory held by ``obj`` in bytes.
+
+    NumPy arrays report ``nbytes``, PIL images their pixel buffer, Qt images
+    ``sizeInBytes``; tuples, lists and dicts are summed over their items.
+
+    Args:
+        obj: Value to size
+
+    Returns:
+        Size in bytes
+    """
+    if HAS_NUMPY and isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if HAS_PIL and isinstance(obj, Image.Image):
+        return _pil_buffer_size(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, memoryview):
+        return obj.nbytes
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(estimate_size(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj.values())
+    size_in_bytes = getattr(obj, 'sizeInBytes', None)  # QImage
+    if callable(size_in_bytes):
+        try:
+            return int(size_in_bytes())
+        except Exception:
+            pass
+    try:
+        return sys.getsizeof(obj)
+    except Exception:
+        return 1024  # Default 1KB if can't determine
+
+
+class _Shard:
+    """One LRU segment of the memory tier."""
+
+    __slots__ = ('lock', 'entries', 'size', 'hits', 'misses', 'evictions')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class _DiskTier:
+    """
+    Second cache tier: evicted arrays written to disk, zlib-compressed.
+
+    The tier belongs to one session: its folder is created on start-up and
+    removed by :meth:`close`. It is itself LRU-bounded by compressed size.
+    """
+
+    def __init__(self, base_dir: Path, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index: 'OrderedDict[str, Tuple[Path, int]]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.spills = 0
+        self.evictions = 0
+        base_dir = Path(base_dir)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_stale(base_dir)
+        self.dir = Path(tempfile.mkdtemp(prefix='session-', dir=base_dir))
+
+    @staticmethod
+    def _remove_stale(base_dir: Path) -> None:
+        cutoff = time.time() - STALE_SPILL_SECONDS
+        for old in base_dir.glob('session-*'):
+            try:
+                if old.stat().st_mtime < cutoff:
+                    shutil.rmtree(old, ignore_errors=True)
+            except OSError:
+                pass
+
+    @staticmethod
+    def can_spill(value: Any) -> bool:
+        if not HAS_NUMPY:
+            return False
+        if isinstance(value, np.ndarray):
+            return value.dtype != object
+        return HAS_PIL and isinstance(value, Image.Image) and value.mode in _SPILLABLE_MODES
+
+    def put(self, key: str, value: Any) -> None:
+        """Compress ``value`` to disk (errors are logged, not raised)."""
+        mode = None
+        if HAS_PIL and isinstance(value, Image.Image):
+            mode = value.mode
+            value = np.asarray(value)
+        array = np.ascontiguousarray(value)
+        header = json.dumps({'dtype': array.dtype.str, 'shape': array.shape, 'mode': mode})
+        payload = zlib.compress(array.data, SPILL_COMPRESS_LEVEL)
+        path = self.dir / (hashlib.sha1(key.encode('utf-8')).hexdigest() + '.z')
+        try:
+            with open(path, 'wb') as f:
+                f.write(header.encode('utf-8') + b'\n')
+                f.write(payload)
+        except OSError as e:
+            logger.debug(f"Cache spill failed for {key}: {e}")
+            return
+        size = len(header) + 1 + len(payload)
+        stale: List[Path] = []
+        with self.lock:
+            old = self.index.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self.index[key] = (path, size)
+            self.size += size
+            self.spills += 1
+            while self.size > self.max_bytes and len(self.index) > 1:
+                _, (old_path, old_size) = self.index.popitem(last=False)
+                self.size -= old_size
+                self.evictions += 1
+                stale.append(old_path)
+        for old_path in stale:
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+
+    def take(self, key: str) -> Optional[Any]:
+        """Load and remove ``key`` from disk (it moves back to memory)."""
+        with self.lock:
+            entry = self.index.pop(key, None)
+            if entry is None:
+                return None
+            self.size -= entry[1]
+            self.hits += 1
+        path = entry[0]
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                data = zlib.decompress(f.read())
+        except (OSError, ValueError, zlib.error) as e:
+            logger.debug(f"Spilled cache entry unreadable ({key}): {e}")
+            return None
+        finally:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        array = np.frombuffer(data, dtype=np.dtype(header['dtype'])).reshape(header['shape'])
+        mode = header.get('mode')
+        if mode:
+            img = Image.fromarray(array)
+            return img if img.mode == mode else img.convert(mode)
+        return array
+
+    def discard(self, key: str) -> None:
+        with self.lock:
+            entry = self.index.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+        if entry is not None:
+            try:
+                entry[0].unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self.lock:
+            paths = [path for path, _ in self.index.values()]
+            self.index.clear()
+            self.size = 0
+        for path in paths:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        self.clear()
+        shutil.rmtree(self.dir, ignore_errors=True)
 
 
 class CacheManager:
     """
-    Thread-safe LRU cache manager for texture data
-    Implements Least Recently Used eviction policy
+    Thread-safe LRU cache for decoded images and derived arrays.
+
+    Entries are spread over ``shards`` independent LRU segments, each with
+    its own lock. The byte budget is global: when it is exceeded, least
+    recently used entries are evicted from the inserting shard first and
+    then from the others, so eviction order is approximately LRU overall.
+
+    With ``spill_dir`` set, evicted arrays and images are compressed to
+    disk (bounded by ``disk_max_mb``) and transparently reloaded on the
+    next ``get``. Everything else is simply dropped.
     """
-    
-    def __init__(self, max_size_mb: int = 500):
+
+    def __init__(self, max_size_mb: int = 500, shards: int = DEFAULT_SHARDS,
+                 spill_dir: Optional[Path] = None, disk_max_mb: int = 1024):
         """
         Initialize cache manager
-        
+
         Args:
-            max_size_mb: Maximum cache size in megabytes
+            max_size_mb: Maximum memory tier size in megabytes
+            shards: Number of independently locked LRU segments
+            spill_dir: Folder for the compressed disk tier (None: no disk tier)
+            disk_max_mb: Maximum compressed size of the disk tier in megabytes
         """
-        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._max_size_bytes = max_size_mb * 1024 * 1024
+        self._size_lock = threading.Lock()
         self.current_size = 0
-        self.cache = OrderedDict()
-        self.lock = threading.Lock()
-        self.hits = 0
-        self.misses = 0
-        
+        self._disk: Optional[_DiskTier] = None
+        if spill_dir is not None:
+            try:
+                self._disk = _DiskTier(Path(spill_dir), disk_max_mb * 1024 * 1024)
+            except OSError as e:
+                logger.warning(f"Cache disk tier unavailable ({spill_dir}): {e}")
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self._max_size_bytes
+
+    @max_size_bytes.setter
+    def max_size_bytes(self, value: int) -> None:
+        """Resize the memory tier, evicting immediately when it shrinks."""
+        self._max_size_bytes = int(value)
+        self._enforce_budget(0)
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _add_size(self, delta: int) -> None:
+        with self._size_lock:
+            self.current_size += delta
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get item from cache
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None if not found
         """
-        with self.lock:
-            if key in self.cache:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
                 # Move to end (most recently used)
-                self.cache.move_to_end(key)
-                self.hits += 1
-                return self.cache[key]['data']
-            else:
-                self.misses += 1
-                return None
-    
+                shard.entries.move_to_end(key)
+                shard.hits += 1
+                return entry[0]
+            shard.misses += 1
+        if self._disk is not None:
+            value = self._disk.take(key)
+            if value is not None:
+                self.put(key, value)
+                return value
+        return None
+
     def put(self, key: str, value: Any, size_bytes: int = 0):
         """
         Put item in cache
-        
+
         Args:
             key: Cache key
             value: Value to cache
             size_bytes: Size of the value in bytes (0 for auto-estimate)
         """
-        with self.lock:
+        # Estimate size if not provided
+        if size_bytes == 0:
+            size_bytes = self._estimate_size(value)
+        if size_bytes > self._max_size_bytes:
+            # Larger than the whole memory tier: straight to disk, if anywhere
+            self.remove(key)
+            if self._disk is not None and _DiskTier.can_spill(value):
+                self._disk.put(key, value)
+            return
+
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        with shard.lock:
             # If key exists, remove old entry first
-            if key in self.cache:
-                old_size = self.cache[key]['size']
-                self.current_size -= old_size
-                del self.cache[key]
-            
-            # Estimate size if not provided
-            if size_bytes == 0:
-                size_bytes = self._estimate_size(value)
-            
-            # Evict items if necessary
-            while (self.current_size + size_bytes > self.max_size_bytes 
-                   and len(self.cache) > 0):
-                self._evict_lru()
-            
-            # Add new item
-            self.cache[key] = {
-                'data': value,
-                'size': size_bytes,
-                'timestamp': time.time()
-            }
-            self.current_size += size_bytes
-    
+            old = shard.entries.pop(key, None)
+            delta = size_bytes - (old[1] if old is not None else 0)
+            shard.entries[key] = (value, size_bytes)
+            shard.size += delta
+        self._add_size(delta)
+        if self._disk is not None and old is None:
+            self._disk.discard(key)
+        self._enforce_budget(index, keep=key)
+
+    def get_or_create(self, key: str, factory: Callable[[], Any], size_bytes: int = 0) -> Any:
+        """
+        Cached value for ``key``, building and caching it on a miss.
+
+        Two threads missing the same key at once may both build it; the
+        later ``put`` wins. That is cheaper than holding a lock across a
+        decode.
+
+        Args:
+            key: Cache key
+            factory: Builds the value on a miss
+            size_bytes: Size of the value in bytes (0 for auto-estimate)
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.put(key, value, size_bytes)
+        return value
+
+    def _enforce_budget(self, start: int, keep: Optional[str] = None) -> None:
+        """Evict LRU entries, starting at shard ``start``, until within budget.
+
+        ``keep`` (the entry just inserted) is never evicted.
+        """
+        if self.current_size <= self._max_size_bytes:
+            return
+        spilled: List[Tuple[str, Any]] = []
+        count = len(self._shards)
+        for step in range(count):
+            shard = self._shards[(start + step) % count]
+            freed = 0
+            with shard.lock:
+                while shard.entries and self.current_size - freed > self._max_size_bytes:
+                    if next(iter(shard.entries)) == keep:
+                        break
+                    key, (value, size) = shard.entries.popitem(last=False)
+                    shard.size -= size
+                    freed += size
+                    shard.evictions += 1
+                    if (self._disk is not None and size >= SPILL_MIN_BYTES
+                            and _DiskTier.can_spill(value)):
+                        spilled.append((key, value))
+            if freed:
+                self._add_size(-freed)
+            if self.current_size <= self._max_size_bytes:
+                break
+        # Compress outside the shard locks
+        for key, value in spilled:
+            self._disk.put(key, value)
+
     def _evict_lru(self):
-        """Evict least recently used item"""
-        if self.cache:
-            key, value = self.cache.popitem(last=False)
-            self.current_size -= value['size']
-    
+        """Evict least recently used item from the largest shard"""
+        shard = max(self._shards, key=lambda s: s.size)
+        with shard.lock:
+            if not shard.entries:
+                return
+            key, (value, size) = shard.entries.popitem(last=False)
+            shard.size -= size
+            shard.evictions += 1
+        self._add_size(-size)
+
     def _estimate_size(self, obj: Any) -> int:
         """Estimate object size in bytes"""
-        import sys
-        try:
-            return sys.getsizeof(obj)
-        except Exception:
-            return 1024  # Default 1KB if can't determine
-    
+        return estimate_size(obj)
+
     def clear(self):
-        """Clear entire cache"""
-        with self.lock:
-            self.cache.clear()
-            self.current_size = 0
-    
+        """Clear entire cache (both tiers)"""
+        for shard in self._shards:
+            with shard.lock:
+                freed = shard.size
+                shard.entries.clear()
+                shard.size = 0
+            self._add_size(-freed)
+        if self._disk is not None:
+            self._disk.clear()
+
     def remove(self, key: str) -> bool:
         """
         Remove specific key from cache
-        
+
         Args:
             key: Cache key to remove
-            
+
         Returns:
             True if removed, False if not found
         """
-        with self.lock:
-            if key in self.cache:
-                size = self.cache[key]['size']
-                self.current_size -= size
-                del self.cache[key]
-                return True
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+            if entry is not None:
+                shard.size -= entry[1]
+        if self._disk is not None:
+            self._disk.discard(key)
+        if entry is None:
             return False
-    
+        self._add_size(-entry[1])
+        return True
+
+    def close(self) -> None:
+        """Clear the cache and delete the disk tier's folder."""
+        self.clear()
+        if self._disk is not None:
+            self._disk.close()
+
     def get_stats(self) -> dict:
         """
         Get cache statistics
-        
+
         Returns:
             Dictionary with cache stats
         """
-        with self.lock:
-            total_requests = self.hits + self.misses
-            hit_rate = self.hits / total_requests if total_requests > 0 else 0
-            
-            return {
-                'size_mb': self.current_size / (1024 * 1024),
-                'max_size_mb': self.max_size_bytes / (1024 * 1024),
-                'items': len(self.cache),
-                'hits': self.hits,
-                'misses': self.misses,
-                'hit_rate': hit_rate,
-                'usage_percent': (self.current_size / self.max_size_bytes) * 100
-            }
+        hits = self.hits
+        misses = self.misses
+        disk_hits = self._disk.hits if self._disk is not None else 0
+        total_requests = hits + misses
+        hit_rate = (hits + disk_hits) / total_requests if total_requests > 0 else 0
+
+        return {
+            'size_mb': self.current_size / (1024 * 1024),
+            'max_size_mb': self._max_size_bytes / (1024 * 1024),
+            'items': sum(len(shard.entries) for shard in self._shards),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hit_rate,
+            'evictions': self.evictions,
+            'usage_percent': (self.current_size / self._max_size_bytes) * 100
+                             if self._max_size_bytes else 0.0,
+            'disk_enabled': self._disk is not None,
+            'disk_items': len(self._disk.index) if self._disk is not None else 0,
+            'disk_size_mb': self._disk.size / (1024 * 1024) if self._disk is not None else 0.0,
+            'disk_hits': disk_hits,
+            'disk_spills': self._disk.spills if self._disk is not None else 0,
+            'disk_evictions': self._disk.evictions if self._disk is not None else 0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Shared decoded-image cache
+# ---------------------------------------------------------------------------
+
+_SHARED_CACHE: Optional[CacheManager] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_cache_manager(max_size_mb: Optional[int] = None) -> CacheManager:
+    """
+    Process-wide decoded-image cache, with its disk tier in the
+    application cache folder.
+
+    Args:
+        max_size_mb: Memory budget; resizes the cache if it already exists
+    """
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            try:
+                from config import get_data_dir as _gdd
+                spill_dir = _gdd() / 'cache' / 'decoded'
+            except Exception:
+                spill_dir = Path.home() / '.ps2_texture_sorter' / 'cache' / 'decoded'
+            _SHARED_CACHE = CacheManager(max_size_mb=max_size_mb or 512, spill_dir=spill_dir)
+            # Remove this session's spill folder on exit
+            atexit.register(_SHARED_CACHE.close)
+        elif max_size_mb is not None:
+            _SHARED_CACHE.max_size_bytes = max_size_mb * 1024 * 1024
+        return _SHARED_CACHE
+
+
+def image_key(path: Path, variant: str = '') -> Optional[str]:
+    """
+    Cache key for a decoded form of ``path``.
+
+    The file's size and mtime are part of the key, so an edited file is
+    never served from a stale entry.
+
+    Args:
+        path: Image file
+        variant: What was derived from it (e.g. 'RGB', 'gray', 'thumb:256')
+
+    Returns:
+        Key string, or None if the file cannot be stat'ed
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{variant}"
+
+
+def load_image(path: Path, mode: Optional[str] = None,
+               cache: Optional[CacheManager] = None):
+    """
+    Decode ``path`` (optionally converted to ``mode``) through the shared cache.
+
+    Returns a copy, so callers may modify or close it freely.
+
+    Args:
+        path: Image file
+        mode: PIL mode to convert to (None: the file's own mode)
+        cache: Cache to use (default: :func:`get_cache_manager`)
+
+    Returns:
+        Decoded PIL image
+    """
+    if not HAS_PIL:
+        raise RuntimeError("PIL not available. Cannot load images")
+
+    def decode():
+        with Image.open(path) as img:
+            img.load()
+            if mode and img.mode != mode:
+                return img.convert(mode)
+            return img.copy()
+
+    key = image_key(path, f"image:{mode or ''}")
+    if key is None:
+        return decode()
+    cache = cache or get_cache_manager()
+    return cache.get_or_create(key, decode).copy()
+
+
+def cached_array(path: Path, variant: str, build: Callable[[], Any],
+                 cache: Optional[CacheManager] = None) -> Any:
+    """
+    Array derived from ``path``, built once and shared through the cache.
+
+    Arrays are marked read-only since every caller sees the same object.
+
+    Args:
+        path: Source image file
+        variant: Name of the derived array (e.g. 'gray', 'analysis:256')
+        build: Computes the array on a miss
+        cache: Cache to use (default: :func:`get_cache_manager`)
+    """
+    key = image_key(path, variant)
+    if key is None:
+        return build()
+
+    def build_frozen():
+        value = build()
+        if HAS_NUMPY and isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        return value
+
+    return (cache or get_cache_manager()).get_or_create(key, build_frozen)
@@ -0,0 +1,360 @@
+"""
+File Hasher - Fast whole-file checksums with a persistent result cache
+CRC-32 of multi-gigabyte disc images at disk speed: memory-mapped reads,
+parallel segments combined with crc32_combine, the native Rust path when it
+is built, and results remembered by (path, size, mtime) across runs.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from native_ops import file_crc32 as _native_file_crc32
+except (ImportError, OSError):
+    _native_file_crc32 = None
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except (ImportError, OSError, RuntimeError):
+    xxhash = None  # type: ignore[assignment]
+    HAS_XXHASH = False
+
+# Files at least this large are split into segments hashed on several threads.
+PARALLEL_MIN_SIZE = 128 * 1024 * 1024
+SEGMENT_SIZE = 64 * 1024 * 1024
+# Preallocated buffer for the readinto() path (files that cannot be mapped).
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+ALGORITHMS = ('crc32', 'md5', 'xxh3')
+
+
+# ---------------------------------------------------------------------------
+# CRC-32 combination (zlib's crc32_combine, GF(2) matrix method)
+# ---------------------------------------------------------------------------
+
+def _gf2_times(matrix: List[int], vector: int) -> int:
+    total = 0
+    i = 0
+    while vector:
+        if vector & 1:
+            total ^= matrix[i]
+        vector >>= 1
+        i += 1
+    return total
+
+
+def _gf2_square(matrix: List[int]) -> List[int]:
+    return [_gf2_times(matrix, row) for row in matrix]
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """
+    CRC-32 of A+B from the CRC of A, the CRC of B and the length of B.
+
+    Args:
+        crc1: CRC-32 of the first block
+        crc2: CRC-32 of the second block
+        len2: Length of the second block in bytes
+
+    Returns:
+        CRC-32 of the concatenation
+    """
+    if len2 <= 0:
+        return crc1
+    odd = [0xEDB88320] + [1 << n for n in range(31)]  # operator for one zero bit
+    even = _gf2_square(odd)   # two zero bits
+    odd = _gf2_square(even)   # four zero bits
+    # Apply len2 zero bytes to crc1, squaring the operator each step
+    while True:
+        even = _gf2_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_square(even)
+        if len2 & 1:
+            crc1 = _gf2_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+
+# ---------------------------------------------------------------------------
+# Hashing primitives
+# ---------------------------------------------------------------------------
+
+def _crc32_readinto(f, length: int) -> int:
+    """CRC-32 of the next ``length`` bytes of ``f`` via one reused buffer."""
+    buffer = bytearray(min(READ_BUFFER_SIZE, max(length, 1)))
+    view = memoryview(buffer)
+    crc = 0
+    remaining = length
+    while remaining > 0:
+        n = f.readinto(view[:min(remaining, len(buffer))])
+        if not n:
+            break
+        crc = zlib.crc32(view[:n], crc)
+        remaining -= n
+    view.release()
+    return crc
+
+
+def _crc32_segment(path: Path, start: int, length: int) -> Tuple[int, int]:
+    """(CRC-32, length) of one byte range; run on worker threads."""
+    with open(path, 'rb', buffering=0) as f:
+        f.seek(start)
+        return _crc32_readinto(f, length), length
+
+
+def crc32_file(path: Path, max_workers: Optional[int] = None) -> int:
+    """
+    CRC-32 (zlib-compatible) of a whole file.
+
+    Uses the native extension when built. Otherwise the file is memory
+    mapped and hashed in one ``zlib.crc32`` call (which releases the GIL),
+    or, for large files, split into segments hashed on a thread pool and
+    combined with :func:`crc32_combine`.
+
+    Args:
+        path: File to hash
+        max_workers: Threads for large files (default: min(4, CPU count))
+
+    Returns:
+        Unsigned 32-bit CRC
+    """
+    if _native_file_crc32 is not None:
+        crc = _native_file_crc32(str(path), SEGMENT_SIZE)
+        if crc is not None:
+            return crc
+
+    size = os.path.getsize(path)
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+
+    if size >= PARALLEL_MIN_SIZE and max_workers > 1:
+        ranges = [(start, min(SEGMENT_SIZE, size - start))
+                  for start in range(0, size, SEGMENT_SIZE)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="CRC") as pool:
+            parts = list(pool.map(lambda r: _crc32_segment(path, *r), ranges))
+        crc = parts[0][0]
+        for part_crc, length in parts[1:]:
+            crc = crc32_combine(crc, part_crc, length)
+        return crc
+
+    with open(path, 'rb', buffering=0) as f:
+        if size == 0:
+            return 0
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return zlib.crc32(mapped)
+        except (OSError, ValueError):
+            # Not mappable (special files, some network shares)
+            f.seek(0)
+            return _crc32_readinto(f, size)
+
+
+def _digest_file(path: Path, new_hash: Callable) -> str:
+    """Hex digest of ``path`` using a hashlib-style constructor."""
+    digest = new_hash()
+    with open(path, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                    return digest.hexdigest()
+            except (OSError, ValueError):
+                f.seek(0)
+        buffer = bytearray(READ_BUFFER_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(view)
+            if not n:
+                break
+            digest.update(view[:n])
+        view.release()
+    return digest.hexdigest()
+
+
+def hash_file(path: Path, algorithm: str = 'crc32') -> str:
+    """
+    Hash a file without caching.
+
+    Args:
+        path: File to hash
+        algorithm: 'crc32', 'md5' or 'xxh3' (xxh3 needs the xxhash package)
+
+    Returns:
+        Hex digest; CRC-32 as 8 upper-case hex digits
+    """
+    if algorithm == 'crc32':
+        return f"{crc32_file(path) & 0xFFFFFFFF:08X}"
+    if algorithm == 'md5':
+        return _digest_file(path, hashlib.md5)
+    if algorithm == 'xxh3':
+        if not HAS_XXHASH:
+            raise RuntimeError("xxh3 requires the xxhash package: pip install xxhash")
+        return _digest_file(path, xxhash.xxh3_64)
+    raise ValueError(f"Unknown hash algorithm: {algorithm}")
+
+
+# ---------------------------------------------------------------------------
+# Cached service
+# ---------------------------------------------------------------------------
+
+class FileHasher:
+    """
+    Whole-file hashing service with a persistent result cache.
+
+    Digests are stored in SQLite keyed by path and algorithm together with
+    the file's size and mtime, so re-hashing an unchanged disc image is a
+    single ``stat``. A changed file is hashed again automatically.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite file for cached digests (None: memory only)
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple[str, str], Tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.conn: Optional[sqlite3.Connection] = None
+        if self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self.conn.execute('PRAGMA journal_mode=WAL')
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS file_hashes (
+                        path TEXT NOT NULL,
+                        algorithm TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        digest TEXT NOT NULL,
+                        PRIMARY KEY (path, algorithm)
+                    )
+                ''')
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"File hash cache unavailable ({self.db_path}): {e}")
+                self.conn = None
+
+    def _cached(self, key: Tuple[str, str], signature: Tuple[int, int]) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self.conn is not None:
+                row = self.conn.execute(
+                    'SELECT size, mtime_ns, digest FROM file_hashes WHERE path = ? AND algorithm = ?',
+                    key
+                ).fetchone()
+                if row is not None:
+                    entry = self._memory[key] = tuple(row)
+        if entry is not None and entry[:2] == signature:
+            return entry[2]
+        return None
+
+    def _store(self, key: Tuple[str, str], signature: Tuple[int, int], digest: str) -> None:
+        with self._lock:
+            self._memory[key] = (*signature, digest)
+            if self.conn is not None:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)',
+                    (*key, *signature, digest)
+                )
+                self.conn.commit()
+
+    def hash_file(self, path: Path, algorithm: str = 'crc32') -> str:
+        """
+        Digest of ``path``, from the cache when the file is unchanged.
+
+        Args:
+            path: File to hash
+            algorithm: See :func:`hash_file`
+
+        Returns:
+            Hex digest
+        """
+        path = Path(path)
+        st = os.stat(path)
+        signature = (st.st_size, st.st_mtime_ns)
+        key = (str(path.resolve()), algorithm)
+        digest = self._cached(key, signature)
+        if digest is not None:
+            self.hits += 1
+            return digest
+        self.misses += 1
+        digest = hash_file(path, algorithm)
+        self._store(key, signature, digest)
+        return digest
+
+    def hash_files(
+        self,
+        paths: Iterable[Path],
+        algorithm: str = 'crc32',
+        max_workers: int = 2
+    ) -> Dict[str, str]:
+        """
+        Hash many files, a few at a time.
+
+        Each large file is already split across threads, so a small number
+        of concurrent files keeps the disk busy without thrashing it.
+
+        Returns:
+            Dictionary of str(path) -> digest (files that fail are omitted)
+        """
+        paths = [Path(p) for p in paths]
+
+        def _one(path: Path) -> Optional[str]:
+            try:
+                return self.hash_file(path, algorithm)
+            except Exception as e:
+                logger.error(f"Failed to hash {path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                thread_name_prefix="FileHash") as pool:
+            digests = list(pool.map(_one, paths))
+        return {str(p): d for p, d in zip(paths, digests) if d is not None}
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+_DEFAULT_HASHER: Optional[FileHasher] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_file_hasher() -> FileHasher:
+    """Process-wide hasher whose cache lives in the application cache folder."""
+    global _DEFAULT_HASHER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_HASHER is None:
+            try:
+                from config import get_data_dir as _gdd
+                db_path = _gdd() / 'cache' / 'file_hashes.db'
+            except Exception:
+                db_path = Path.home() / '.ps2_texture_sorter' / 'cache' / 'file_hashes.db'
+            _DEFAULT_HASHER = FileHasher(db_path)
+        return _DEFAULT_HASHER
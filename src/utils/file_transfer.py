@@ -0,0 +1,310 @@
+"""
+File Transfer - Put a file at its organized location with the least I/O
+Copy-on-write clones (FICLONE reflinks on Btrfs/XFS), hardlinks, in-kernel
+copy_file_range/sendfile copies, renames with a cross-device fallback and
+symlink farms, with the best working method remembered per pair of devices.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Transfer modes. 'auto' produces an independent copy of the file by the
+# cheapest means that works for the source/destination pair; 'hardlink'
+# and 'symlink' share the source's data instead of duplicating it.
+MODE_AUTO = 'auto'
+MODE_REFLINK = 'reflink'
+MODE_HARDLINK = 'hardlink'
+MODE_SYMLINK = 'symlink'
+MODE_COPY = 'copy'
+MODE_MOVE = 'move'
+TRANSFER_MODES = (MODE_AUTO, MODE_REFLINK, MODE_HARDLINK, MODE_SYMLINK, MODE_COPY, MODE_MOVE)
+
+# Methods actually used (what transfer() returns).
+METHOD_REFLINK = 'reflink'
+METHOD_HARDLINK = 'hardlink'
+METHOD_SYMLINK = 'symlink'
+METHOD_COPY_FILE_RANGE = 'copy_file_range'
+METHOD_SENDFILE = 'sendfile'
+METHOD_COPY = 'copy'
+METHOD_RENAME = 'rename'
+
+# Copy methods tried in order by 'auto' (and by 'move' across devices).
+_COPY_METHODS = (METHOD_REFLINK, METHOD_COPY_FILE_RANGE, METHOD_SENDFILE, METHOD_COPY)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Chunk handed to the kernel per copy_file_range/sendfile call.
+KERNEL_COPY_CHUNK = 1 << 30
+
+# errno values meaning "this method does not work here", as opposed to a
+# real I/O error; on these the next method is tried and the failed one is
+# not tried again for the same pair of devices.
+_UNSUPPORTED_ERRNOS = frozenset(
+    e for e in (getattr(errno, name, None) for name in (
+        'EOPNOTSUPP', 'ENOTSUP', 'ENOTTY', 'EXDEV', 'EINVAL', 'ENOSYS', 'EBADF', 'EPERM'))
+    if e is not None)
+
+
+class TransferUnsupported(OSError):
+    """The requested method cannot be used for this source/destination."""
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    if fcntl is None:
+        raise TransferUnsupported(errno.ENOTSUP, "reflinks need fcntl (Linux)")
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _copy_file_range(source: Path, destination: Path) -> None:
+    if not hasattr(os, 'copy_file_range'):
+        raise TransferUnsupported(errno.ENOSYS, "os.copy_file_range is unavailable")
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            sent = os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, KERNEL_COPY_CHUNK))
+            if sent == 0:
+                break
+            remaining -= sent
+
+
+def _sendfile(source: Path, destination: Path) -> None:
+    if not hasattr(os, 'sendfile') or os.name != 'posix':
+        raise TransferUnsupported(errno.ENOSYS, "os.sendfile is unavailable")
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        offset = 0
+        size = os.fstat(src.fileno()).st_size
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, min(size - offset, KERNEL_COPY_CHUNK))
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _plain_copy(source: Path, destination: Path) -> None:
+    shutil.copyfile(source, destination)
+
+
+_COPIERS = {
+    METHOD_REFLINK: _reflink,
+    METHOD_COPY_FILE_RANGE: _copy_file_range,
+    METHOD_SENDFILE: _sendfile,
+    METHOD_COPY: _plain_copy,
+}
+
+
+class FileTransfer:
+    """
+    Places files at a destination by a configurable method.
+
+    For each (source device, destination device) pair the copy methods
+    that turned out not to work are remembered, so after the first file
+    every later one goes straight to the best working method.
+    """
+
+    def __init__(self, mode: str = MODE_AUTO):
+        """
+        Args:
+            mode: One of TRANSFER_MODES
+        """
+        if mode not in TRANSFER_MODES:
+            raise ValueError(f"Unknown transfer mode {mode!r}; expected one of {TRANSFER_MODES}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._unsupported: Dict[Tuple[int, int], set] = {}
+        self.stats: Dict[str, int] = {}
+
+    def transfer(self, source: Path, destination: Path, overwrite: bool = False,
+                 mode: Optional[str] = None, make_parents: bool = True) -> str:
+        """
+        Put ``source`` at ``destination``.
+
+        Copies keep the source's timestamps and permission bits, like
+        shutil.copy2. An existing destination is only replaced once the new
+        file is complete: it is written next to it and renamed over it.
+
+        Args:
+            source: Existing file
+            destination: Target path
+            overwrite: Replace an existing destination
+            mode: Override the instance's mode for this file
+            make_parents: Create missing parent directories (callers that
+                create their directories up front pass False)
+
+        Returns:
+            The method used (METHOD_*)
+
+        Raises:
+            FileExistsError: Destination exists and ``overwrite`` is False
+            shutil.SameFileError: Overwriting a file with itself (a move,
+                or a link that already points at the source, is a no-op)
+            TransferUnsupported: A forced method (reflink/hardlink/symlink)
+                is not possible for this pair
+            OSError: The transfer failed
+        """
+        mode = mode or self.mode
+        source = Path(source)
+        destination = Path(destination)
+        replace = False
+        if os.path.lexists(destination):
+            if not overwrite:
+                raise FileExistsError(errno.EEXIST, "Destination exists", str(destination))
+            if self._same_file(source, destination):
+                # Already in place: nothing to do, and never delete it
+                if mode == MODE_MOVE:
+                    return METHOD_RENAME
+                if mode == MODE_HARDLINK and not destination.is_symlink():
+                    return METHOD_HARDLINK
+                if mode == MODE_SYMLINK and destination.is_symlink():
+                    return METHOD_SYMLINK
+                raise shutil.SameFileError(f"{source} and {destination} are the same file")
+            if destination.is_dir() and not destination.is_symlink():
+                raise IsADirectoryError(errno.EISDIR, "Destination is a directory", str(destination))
+            replace = True
+        if make_parents:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+
+        if not replace:
+            method = self._place(mode, source, destination)
+        else:
+            # Build the new file beside the old one, then swap it in
+            staging = destination.with_name(f".{destination.name}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                method = self._place(mode, source, staging)
+                os.replace(staging, destination)
+            except BaseException:
+                try:
+                    os.unlink(staging)
+                except OSError:
+                    pass
+                raise
+
+        with self._lock:
+            self.stats[method] = self.stats.get(method, 0) + 1
+        return method
+
+    @staticmethod
+    def _same_file(source: Path, destination: Path) -> bool:
+        try:
+            return os.path.samefile(source, destination)
+        except OSError:
+            return False
+
+    def _place(self, mode: str, source: Path, destination: Path) -> str:
+        """Put ``source`` at a ``destination`` that does not exist yet."""
+        if mode == MODE_MOVE:
+            method = self._move(source, destination)
+        elif mode == MODE_HARDLINK:
+            try:
+                os.link(source, destination)
+            except OSError as e:
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    raise TransferUnsupported(e.errno, f"Cannot hardlink {source}: {e.strerror}") from e
+                raise
+            method = METHOD_HARDLINK
+        elif mode == MODE_SYMLINK:
+            os.symlink(os.path.abspath(source), destination)
+            method = METHOD_SYMLINK
+        elif mode == MODE_REFLINK:
+            self._run_copier(METHOD_REFLINK, source, destination)
+            shutil.copystat(source, destination)
+            method = METHOD_REFLINK
+        elif mode == MODE_COPY:
+            shutil.copy2(source, destination)
+            method = METHOD_COPY
+        else:
+            method = self._copy(source, destination)
+        return method
+
+    def _device_pair(self, source: Path, destination: Path) -> Tuple[int, int]:
+        try:
+            return os.stat(source).st_dev, os.stat(destination.parent).st_dev
+        except OSError:
+            return (-1, -1)
+
+    def _copy(self, source: Path, destination: Path) -> str:
+        """Independent copy by the cheapest method that works for this pair."""
+        pair = self._device_pair(source, destination)
+        with self._lock:
+            skip = set(self._unsupported.get(pair, ()))
+        if pair[0] != pair[1]:
+            skip.add(METHOD_REFLINK)  # clones never cross filesystems
+        for method in _COPY_METHODS:
+            if method in skip:
+                continue
+            try:
+                self._run_copier(method, source, destination)
+            except TransferUnsupported:
+                with self._lock:
+                    self._unsupported.setdefault(pair, set()).add(method)
+                logger.debug(f"{method} unsupported for devices {pair}; trying the next method")
+                continue
+            shutil.copystat(source, destination)
+            return method
+        raise OSError(errno.EIO, f"No copy method succeeded for {source}")
+
+    @staticmethod
+    def _run_copier(method: str, source: Path, destination: Path) -> None:
+        """Run one copy method, removing a partial destination on failure."""
+        try:
+            _COPIERS[method](source, destination)
+        except BaseException as e:
+            try:
+                os.unlink(destination)
+            except OSError:
+                pass
+            if (isinstance(e, OSError) and not isinstance(e, TransferUnsupported)
+                    and e.errno in _UNSUPPORTED_ERRNOS and method != METHOD_COPY):
+                raise TransferUnsupported(e.errno, f"{method}: {e.strerror}") from e
+            raise
+
+    def _move(self, source: Path, destination: Path) -> str:
+        """Rename; across devices copy then delete the source."""
+        try:
+            os.replace(source, destination)
+            return METHOD_RENAME
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        method = self._copy(source, destination)
+        os.unlink(source)
+        return method
+
+
+_default_transfer = FileTransfer()
+
+
+def transfer_file(source: Path, destination: Path, mode: str = MODE_AUTO,
+                  overwrite: bool = False) -> str:
+    """
+    Put ``source`` at ``destination`` using a shared FileTransfer.
+
+    Args:
+        source: Existing file
+        destination: Target path
+        mode: One of TRANSFER_MODES
+        overwrite: Replace an existing destination
+
+    Returns:
+        The method used (METHOD_*)
+    """
+    if mode not in TRANSFER_MODES:
+        raise ValueError(f"Unknown transfer mode {mode!r}; expected one of {TRANSFER_MODES}")
+    return _default_transfer.transfer(source, destination, overwrite=overwrite, mode=mode)
@@ -9,8 +9,12 @@ from __future__ import annotations
 
 import io
 import logging
+import math
+import os
+import struct
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Tuple, Union, BinaryIO
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union, BinaryIO
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +48,12 @@ except (ImportError, OSError, RuntimeError):
     logger.warning("OpenCV not available — advanced image ops disabled. "
                    "Install with: pip install opencv-python")
 
+try:
+    from native_ops import NATIVE_AREA_DOWNSCALE, area_downscale as _native_area_downscale
+except (ImportError, OSError):
+    NATIVE_AREA_DOWNSCALE = False
+    _native_area_downscale = None
+
 # Module-level thumbnail quality (1-100).  Updated at runtime by apply_performance_settings().
 THUMBNAIL_QUALITY: int = 85
 
@@ -58,9 +68,34 @@ SUPPORTED_FORMATS = {
 PS2_MAX_DIMENSION = 1024
 PS2_COMMON_SIZES = [16, 32, 64, 128, 256, 512, 1024]
 
+# Batch pipeline: result ordering, and how far the pool may run ahead of the
+# consumer (in-flight plus finished-but-not-yet-yielded images per worker)
+BATCH_ORDER_COMPLETED = 'completed'
+BATCH_ORDER_INPUT = 'input'
+BATCH_ORDERS = (BATCH_ORDER_COMPLETED, BATCH_ORDER_INPUT)
+BATCH_WINDOW_PER_WORKER = 2
+BATCH_MAX_WORKERS = 8
+# Seconds between checks for cancellation and memory pressure while waiting
+BATCH_POLL_SECONDS = 0.05
+
 # Safe resampling constant — resolved at import time if PIL is available
 _LANCZOS = Image.Resampling.LANCZOS if HAS_PIL else None
 
+# Area-averaging backend used when shrinking: OpenCV INTER_AREA (SIMD),
+# the native extension's multithreaded resize, or Pillow's box filter.
+# All of them release the GIL, so batches scale across worker threads.
+if HAS_CV2 and HAS_NUMPY:
+    RESIZE_BACKEND = 'opencv'
+elif NATIVE_AREA_DOWNSCALE and HAS_NUMPY:
+    RESIZE_BACKEND = 'native'
+else:
+    RESIZE_BACKEND = 'pillow'
+
+# Modes the array backends handle; RGBA/LA are premultiplied (RGBa/La) first
+# so fully transparent pixels do not bleed their colour into the edges
+_ARRAY_RESIZE_MODES = ('L', 'RGB', 'RGBa')
+_PREMULTIPLIED = {'RGBA': 'RGBa', 'LA': 'La'}
+
 
 def validate_image(image_path: Path) -> Tuple[bool, Optional[str]]:
     """
@@ -130,6 +165,223 @@ def get_image_info(image_path: Path) -> Optional[dict]:
         return None
 
 
+def _fit_size(width: int, height: int, box: Tuple[int, int]) -> Tuple[int, int]:
+    """Size of a ``width`` x ``height`` image scaled down to fit inside ``box``."""
+    scale = min(box[0] / width, box[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _cover_size(width: int, height: int, size: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Smallest aspect-preserving scale of a ``width`` x ``height`` image that
+    still covers ``size`` on both axes (never larger than the image).
+
+    Passed to :func:`prepare_reduced_decode` when the target does not keep
+    the aspect ratio, so the reduced decode is large enough on both axes.
+    """
+    scale = min(max(size[0] / width, size[1] / height), 1.0)
+    return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+
+def _downscale(img: Image.Image, size: Tuple[int, int], resample=None) -> Image.Image:
+    """
+    Resize ``img`` to exactly ``size``.
+
+    Shrinking uses area averaging through RESIZE_BACKEND unless ``resample``
+    is given; enlarging uses ``resample`` or LANCZOS. Palette and bilevel
+    images are converted first so they are averaged rather than sampled
+    (the result is RGB/RGBA or L; see :func:`_resize_keep_mode`).
+
+    Returns:
+        New image (``img`` itself if it already has the requested size)
+    """
+    size = (int(size[0]), int(size[1]))
+    if img.size == size:
+        return img
+    if resample is not None or size[0] > img.width or size[1] > img.height:
+        return img.resize(size, resample if resample is not None else _LANCZOS)
+
+    if img.mode == 'P':
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    elif img.mode == '1':
+        img = img.convert('L')
+    mode = img.mode
+    work = img.convert(_PREMULTIPLIED[mode]) if mode in _PREMULTIPLIED else img
+
+    if RESIZE_BACKEND != 'pillow' and work.mode in _ARRAY_RESIZE_MODES:
+        pixels = np.asarray(work)
+        if RESIZE_BACKEND == 'opencv':
+            pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+        else:
+            pixels = _native_area_downscale(pixels, size[0], size[1])
+        result = Image.frombytes(work.mode, size, np.ascontiguousarray(pixels).tobytes())
+    else:
+        result = work.resize(size, Image.Resampling.BOX, reducing_gap=2.0)
+
+    return result.convert(mode) if result.mode != mode else result
+
+
+def _resize_keep_mode(img: Image.Image, size: Tuple[int, int], resample=None) -> Image.Image:
+    """
+    :func:`_downscale` for images that are written back out in their own mode.
+
+    Palette images are averaged and then mapped back onto the source
+    palette, bilevel images are averaged and thresholded; both stay indexed
+    as PS2 textures must. Palettes with a transparent entry are sampled
+    nearest-neighbour so that entry survives.
+    """
+    mode = img.mode
+    if mode == 'P' and 'transparency' in img.info:
+        return img if img.size == tuple(size) else img.resize(size, Image.Resampling.NEAREST)
+    result = _downscale(img, size, resample)
+    if result.mode == mode:
+        return result
+    if mode == 'P':
+        return result.convert('RGB').quantize(palette=img, dither=Image.Dither.NONE)
+    if mode == '1':
+        return result.convert('1', dither=Image.Dither.NONE)
+    return result
+
+
+def _select_dds_mip(img: Image.Image, box: Tuple[int, int]) -> bool:
+    """
+    Point a block-compressed DDS image at the smallest mip level that still
+    covers ``box`` once fitted, so only that level is decoded.
+
+    Returns:
+        True if a smaller mip level was selected
+    """
+    if len(img.tile) != 1 or img.tile[0][0] != 'bcn' or img.fp is None:
+        return False
+    tile = img.tile[0]
+    pos = img.fp.tell()
+    try:
+        img.fp.seek(0)
+        header = img.fp.read(32)
+    finally:
+        img.fp.seek(pos)
+    if len(header) < 32:
+        return False
+    mipmaps = struct.unpack('<I', header[28:32])[0]
+    if mipmaps <= 1:
+        return False
+
+    # BC1 and BC4 use 8-byte 4x4 blocks, every other BCn format 16 bytes.
+    block_bytes = 8 if tile[3][0] in (1, 4) else 16
+    width, height = img.size
+    need_w, need_h = _fit_size(width, height, box)
+    offset = tile[2]
+    level = 0
+    while level + 1 < mipmaps:
+        next_w, next_h = max(1, width // 2), max(1, height // 2)
+        if next_w < need_w or next_h < need_h:
+            break
+        offset += max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * block_bytes
+        width, height = next_w, next_h
+        level += 1
+    if level == 0:
+        return False
+
+    extents = (0, 0, width, height)
+    if hasattr(tile, '_replace'):
+        new_tile = tile._replace(extents=extents, offset=offset)
+    else:
+        new_tile = (tile[0], extents, offset, tile[3])
+    img._size = (width, height)
+    img.tile = [new_tile]
+    # The DDS plugin ignores tile offsets and decodes from the current
+    # file position, so move there explicitly.
+    img.fp.seek(offset)
+    return True
+
+
+def open_image_for_size(
+    image_path: Union[Path, str, BinaryIO],
+    size: Tuple[int, int]
+) -> Image.Image:
+    """
+    Open an image and arrange for the cheapest decode that still yields at
+    least ``size`` pixels after fitting.
+
+    - JPEG: DCT-domain scaling via ``Image.draft``
+    - DDS: decodes the smallest embedded mip level that is large enough
+    - Other formats: decoded normally; call ``thumbnail()`` / ``reduce()``
+      afterwards, which box-reduces before resampling
+
+    The returned image is lazy (not yet loaded) and owns the file handle,
+    so use it as a context manager.
+
+    Args:
+        image_path: Path or binary stream of the source image
+        size: Target (width, height) box
+
+    Returns:
+        Opened PIL Image
+    """
+    img = Image.open(image_path)
+    prepare_reduced_decode(img, size)
+    return img
+
+
+def prepare_reduced_decode(img: Image.Image, size: Tuple[int, int]) -> bool:
+    """
+    Configure an opened, not yet loaded image for the cheapest decode that
+    still covers ``size`` (JPEG draft or DDS mip, see :func:`open_image_for_size`).
+
+    Read ``img.size`` first if the full dimensions are needed; it reflects
+    the reduced decode afterwards.
+
+    Args:
+        img: Image returned by ``Image.open``
+        size: Target (width, height) box
+
+    Returns:
+        True if a reduced decode was arranged
+    """
+    try:
+        if img.format == 'JPEG':
+            full = img.size
+            img.draft(img.mode if img.mode in ('RGB', 'L') else 'RGB',
+                      _fit_size(img.width, img.height, size))
+            return img.size != full
+        if img.format == 'DDS':
+            return _select_dds_mip(img, size)
+    except Exception as e:
+        logger.debug(f"Reduced decode unavailable for {getattr(img, 'filename', img)}: {e}")
+    return False
+
+
+def load_reduced_image(
+    image_path: Union[Path, str, BinaryIO],
+    size: Tuple[int, int],
+    resample=None
+) -> Image.Image:
+    """
+    Decode an image at reduced resolution, fitted inside ``size``.
+
+    JPEG and mipmapped DDS files skip most of the full-resolution decode
+    (see :func:`open_image_for_size`); the remainder is area-averaged down
+    to size. The result is detached from the source file.
+
+    Args:
+        image_path: Path or binary stream of the source image
+        size: Target (width, height) box
+        resample: Final resampling filter (default: area averaging)
+
+    Returns:
+        Loaded PIL Image no larger than ``size``
+    """
+    with Image.open(image_path) as img:
+        target = _fit_size(img.width, img.height, size)
+        prepare_reduced_decode(img, size)
+        if resample is not None:
+            img.thumbnail(size, resample, reducing_gap=2.0)
+            return img.copy()
+        img.load()
+        result = _downscale(img, target)
+        return img.copy() if result is img else result
+
+
 def create_thumbnail(
     image_path: Path,
     size: Tuple[int, int] = (256, 256),
@@ -139,6 +391,9 @@ def create_thumbnail(
     """
     Create thumbnail from image with efficient memory usage.
     
+    Decodes the cheapest sufficient source (JPEG draft scaling, the
+    smallest large-enough DDS mip level) and area-averages it down.
+    
     Args:
         image_path: Path to source image
         size: Target thumbnail size (width, height)
@@ -152,17 +407,19 @@ def create_thumbnail(
         quality = THUMBNAIL_QUALITY
     try:
         with Image.open(image_path) as img:
+            if maintain_aspect:
+                target = _fit_size(img.width, img.height, size)
+                prepare_reduced_decode(img, size)
+            else:
+                target = tuple(size)
+                prepare_reduced_decode(img, _cover_size(img.width, img.height, size))
+            
             # Convert to RGB if necessary (for JPEG compatibility)
             if img.mode not in ('RGB', 'RGBA'):
                 img = img.convert('RGB')
             
-            # Create thumbnail
-            if maintain_aspect:
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-            else:
-                img = img.resize(size, Image.Resampling.LANCZOS)
-            
-            return img.copy()
+            thumb = _downscale(img, target)
+            return img.copy() if thumb is img else thumb
             
     except Exception as e:
         logger.error(f"Failed to create thumbnail for {image_path}: {e}")
@@ -205,6 +462,49 @@ def save_thumbnail(
         return False
 
 
+def create_thumbnails(
+    image_paths: Iterable[Path],
+    size: Tuple[int, int] = (256, 256),
+    maintain_aspect: bool = True,
+    max_workers: Optional[int] = None,
+    order: str = BATCH_ORDER_INPUT,
+    window: Optional[int] = None,
+    cancel_event=None,
+    memory_manager=None
+) -> Iterator[Tuple[Path, Optional[Image.Image]]]:
+    """
+    Create thumbnails for many images, yielding each as soon as it is ready.
+    
+    One worker pool serves the whole batch; decoding and area resampling
+    release the GIL, so throughput scales with workers until disk reads
+    dominate. Window, ordering, cancellation and memory backpressure work
+    as in iter_batch_process_images().
+    
+    Args:
+        image_paths: Source images
+        size: Target thumbnail size (width, height)
+        maintain_aspect: Maintain aspect ratio
+        max_workers: Worker threads (None: one per CPU, up to BATCH_MAX_WORKERS)
+        order: BATCH_ORDER_INPUT (default) or BATCH_ORDER_COMPLETED
+        window: Images in flight or buffered (None: BATCH_WINDOW_PER_WORKER per worker)
+        cancel_event: threading.Event-like object; set it to stop
+        memory_manager: MemoryManager used for backpressure (optional)
+        
+    Yields:
+        (image path, PIL Image or None if it could not be decoded)
+    """
+    if order not in BATCH_ORDERS:
+        raise ValueError(f"Unknown batch order {order!r}; expected one of {BATCH_ORDERS}")
+    if not HAS_PIL:
+        return
+    
+    def task(path: Path) -> Optional[Image.Image]:
+        return create_thumbnail(path, size, maintain_aspect)
+    
+    yield from _iter_pool(task, (Path(p) for p in image_paths), max_workers, order,
+                          window, cancel_event, memory_manager)
+
+
 def convert_image_format(
     source_path: Path,
     target_path: Path,
@@ -275,22 +575,24 @@ def resize_image(
         image_path: Source image path
         output_path: Output path
         target_size: Target (width, height)
-        maintain_aspect: Maintain aspect ratio
-        resample_method: Resampling algorithm
+        maintain_aspect: Maintain aspect ratio (and never enlarge)
+        resample_method: Resampling algorithm (default: area averaging
+            when shrinking, LANCZOS when enlarging)
         
     Returns:
         True if successful, False otherwise
     """
     if not HAS_PIL:
         return None
-    if resample_method is None:
-        resample_method = _LANCZOS
     try:
         with Image.open(image_path) as img:
             if maintain_aspect:
-                img.thumbnail(target_size, resample_method)
+                target = _fit_size(img.width, img.height, target_size)
+                prepare_reduced_decode(img, target_size)
             else:
-                img = img.resize(target_size, resample_method)
+                target = tuple(target_size)
+                prepare_reduced_decode(img, _cover_size(img.width, img.height, target_size))
+            img = _resize_keep_mode(img, target, resample_method)
             
             output_path.parent.mkdir(parents=True, exist_ok=True)
             img.save(output_path)
@@ -338,9 +640,10 @@ def normalize_for_ps2(
                 target_width = min(width, max_dimension)
                 target_height = min(height, max_dimension)
             
-            # Resize if needed
+            # Resize if needed, decoding no more than the target needs
             if (target_width, target_height) != (width, height):
-                img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+                prepare_reduced_decode(img, _cover_size(width, height, (target_width, target_height)))
+                img = _resize_keep_mode(img, (target_width, target_height))
                 logger.info(f"Normalized from {width}x{height} to {target_width}x{target_height}")
             
             output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -496,8 +799,11 @@ def load_image_stream(
     """
     Load image from memory stream efficiently.
     
+    File objects are decoded from directly; pass an open file rather than
+    reading it into bytes first.
+    
     Args:
-        stream: Binary stream or bytes
+        stream: Binary stream or bytes-like object
         format: Optional format hint
         
     Returns:
@@ -506,7 +812,7 @@ def load_image_stream(
     if not HAS_PIL:
         return None
     try:
-        if isinstance(stream, bytes):
+        if isinstance(stream, (bytes, bytearray, memoryview)):
             stream = io.BytesIO(stream)
         
         img = Image.open(stream)
@@ -538,19 +844,47 @@ def image_to_bytes(
     """
     if not HAS_PIL:
         return None
+    buffer = io.BytesIO()
+    if not write_image(image, buffer, format, quality):
+        return None
+    return buffer.getvalue()
+
+
+def write_image(
+    image: Image.Image,
+    stream: BinaryIO,
+    format: str = 'PNG',
+    quality: int = 95
+) -> bool:
+    """
+    Encode PIL Image straight into a writable binary stream.
+    
+    Avoids the intermediate bytes object of image_to_bytes() when the
+    destination is already a file, socket or buffer.
+    
+    Args:
+        image: PIL Image object
+        stream: Writable binary stream
+        format: Output format
+        quality: Compression quality
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    if not HAS_PIL:
+        return False
     try:
-        buffer = io.BytesIO()
-        save_kwargs = {'format': format}
+        save_kwargs = {'format': 'JPEG' if format.upper() == 'JPG' else format}
         
         if format.upper() in ('JPEG', 'JPG'):
             save_kwargs['quality'] = quality
         
-        image.save(buffer, **save_kwargs)
-        return buffer.getvalue()
+        image.save(stream, **save_kwargs)
+        return True
         
     except Exception as e:
         logger.error(f"Failed to convert image to bytes: {e}")
-        return None
+        return False
 
 
 def compare_images(
@@ -616,19 +950,235 @@ def compare_images(
         return None
 
 
+def iter_image_files(input_dir: Path, exclude: Optional[Path] = None) -> Iterator[Path]:
+    """
+    Yield supported image files below a directory as they are found.
+    
+    Extensions are matched case-insensitively; each directory's entries
+    are yielded in name order.
+    
+    Args:
+        input_dir: Directory to walk
+        exclude: Sub-directory not to descend into (e.g. a batch's output
+            folder inside ``input_dir``, whose files appear during the walk)
+    """
+    excluded = os.path.realpath(exclude) if exclude is not None else None
+    pending = [str(input_dir)]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                listing = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {current}: {e}")
+            continue
+        subdirs = []
+        for entry in listing:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if excluded is None or os.path.realpath(entry.path) != excluded:
+                        subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMATS and entry.is_file():
+                    yield Path(entry.path)
+            except OSError:
+                continue
+        pending.extend(reversed(subdirs))
+
+
+_BATCH_OPERATIONS = {
+    'resize': resize_image,
+    'convert': convert_image_format,
+    'optimize': optimize_image,
+    'normalize': normalize_for_ps2,
+}
+
+
+def _run_batch_operation(
+    operation: Union[str, Callable[..., bool]],
+    img_path: Path,
+    input_dir: Path,
+    output_dir: Path,
+    kwargs: Dict[str, Any],
+    output_for: Optional[Callable[[Path], Path]] = None
+) -> Dict[str, Any]:
+    """Run one batch operation on one image; never raises."""
+    if output_for is not None:
+        out_path = Path(output_for(img_path))
+    else:
+        try:
+            out_path = output_dir / img_path.relative_to(input_dir)
+        except ValueError:
+            out_path = output_dir / img_path.name
+    func = operation if callable(operation) else _BATCH_OPERATIONS[operation]
+    try:
+        success = bool(func(img_path, out_path, **kwargs))
+        return {'success': success, 'output': out_path,
+                'error': None if success else 'Operation failed'}
+    except Exception as e:
+        return {'success': False, 'output': out_path, 'error': str(e)}
+
+
+def iter_batch_process_images(
+    input_dir: Path,
+    output_dir: Path,
+    operation: Union[str, Callable[..., bool]],
+    max_workers: Optional[int] = None,
+    order: str = BATCH_ORDER_COMPLETED,
+    window: Optional[int] = None,
+    cancel_event=None,
+    memory_manager=None,
+    image_files: Optional[Iterable[Path]] = None,
+    output_for: Optional[Callable[[Path], Path]] = None,
+    **kwargs
+) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """
+    Batch process images, yielding each result as soon as it is available.
+    
+    Images are processed on a bounded thread pool (Pillow releases the GIL
+    while decoding, resampling and encoding). At most ``window`` images are
+    in flight or waiting to be yielded, so a slow consumer (e.g. a panel
+    adding thumbnails to a list) holds back the workers instead of letting
+    results pile up. While ``memory_manager.is_memory_critical()`` reports
+    pressure no new images are started until running ones finish; if none
+    are running, one cleanup is forced and work continues one image at a time.
+    
+    Closing the generator or setting ``cancel_event`` stops it: queued images
+    are dropped and the images already being processed are finished so no
+    partial output files are left behind.
+    
+    Args:
+        input_dir: Input directory
+        output_dir: Output directory (input sub-folders are mirrored)
+        operation: Operation to perform ('resize', 'convert', 'optimize', 'normalize'),
+            or a callable ``(source, output, **kwargs) -> bool`` that may raise
+        max_workers: Worker threads (None: one per CPU, up to BATCH_MAX_WORKERS)
+        order: BATCH_ORDER_COMPLETED yields in completion order;
+            BATCH_ORDER_INPUT yields in input order
+        window: Images in flight or buffered (None: BATCH_WINDOW_PER_WORKER per worker)
+        cancel_event: threading.Event-like object; set it to stop
+        memory_manager: MemoryManager used for backpressure (optional)
+        image_files: Images to process (None: all supported files below input_dir)
+        output_for: Maps an image to its output path (None: mirror input_dir
+            under output_dir)
+        **kwargs: Operation-specific arguments
+        
+    Yields:
+        (image path, {'success': bool, 'output': Path, 'error': str or None})
+        
+    Raises:
+        ValueError: Unknown operation or order
+    """
+    if not callable(operation) and operation not in _BATCH_OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation}")
+    if order not in BATCH_ORDERS:
+        raise ValueError(f"Unknown batch order {order!r}; expected one of {BATCH_ORDERS}")
+    if not HAS_PIL:
+        return
+    
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    if image_files is not None:
+        files = image_files
+    else:
+        # The walk is lazy: never descend into the output folder, and list
+        # up front when outputs are written beside the inputs
+        files = iter_image_files(input_dir, exclude=output_dir)
+        if os.path.realpath(output_dir) == os.path.realpath(input_dir):
+            files = list(files)
+    
+    def task(img_path: Path) -> Dict[str, Any]:
+        return _run_batch_operation(operation, img_path, input_dir, output_dir, kwargs,
+                                    output_for)
+    
+    yield from _iter_pool(task, (Path(f) for f in files), max_workers, order,
+                          window, cancel_event, memory_manager)
+
+
+def _iter_pool(
+    task,
+    items: Iterable[Any],
+    max_workers: Optional[int],
+    order: str,
+    window: Optional[int],
+    cancel_event,
+    memory_manager
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Run ``task(item)`` on a bounded thread pool, yielding (item, result).
+    
+    See iter_batch_process_images() for the window, ordering, cancellation
+    and memory backpressure semantics.
+    """
+    workers = max(1, max_workers or min(BATCH_MAX_WORKERS, os.cpu_count() or 1))
+    window = max(1, window or workers * BATCH_WINDOW_PER_WORKER)
+    items = iter(items)
+    
+    # Futures not yet yielded, in submission order
+    pending: Dict[Any, Any] = {}
+    exhausted = False
+    relieved = True  # a cleanup may be forced at the next pressure episode
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ImageBatch')
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("Batch processing cancelled")
+                return
+            
+            # Top up the window unless memory is under pressure
+            while not exhausted and len(pending) < window:
+                if memory_manager is not None and memory_manager.is_memory_critical():
+                    if pending:
+                        break
+                    if relieved:
+                        memory_manager.force_cleanup()
+                        relieved = False
+                else:
+                    relieved = True
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(task, item)] = item
+            
+            if not pending:
+                return
+            
+            if order == BATCH_ORDER_INPUT:
+                head = next(iter(pending))
+                if not wait([head], timeout=BATCH_POLL_SECONDS).done:
+                    continue
+                while pending:
+                    head = next(iter(pending))
+                    if not head.done():
+                        break
+                    yield pending.pop(head), head.result()
+            else:
+                done, _ = wait(pending, timeout=BATCH_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def batch_process_images(
     input_dir: Path,
     output_dir: Path,
     operation: str,
+    max_workers: Optional[int] = None,
     **kwargs
 ) -> dict:
     """
     Batch process images in directory.
     
+    Collects the results of iter_batch_process_images(); use that directly
+    to show progress while a large batch runs.
+    
     Args:
         input_dir: Input directory
         output_dir: Output directory
         operation: Operation to perform ('resize', 'convert', 'optimize', 'normalize')
+        max_workers: Worker threads (None: one per CPU, up to BATCH_MAX_WORKERS)
         **kwargs: Operation-specific arguments
         
     Returns:
@@ -641,46 +1191,20 @@ def batch_process_images(
         'errors': []
     }
     
+    if operation not in _BATCH_OPERATIONS:
+        logger.error(f"Unknown operation: {operation}")
+        results['errors'].append(f"Unknown operation: {operation}")
+        return results
+    
     try:
-        # Get all image files
-        image_files = []
-        for ext in SUPPORTED_FORMATS:
-            image_files.extend(input_dir.glob(f"**/*{ext}"))
-        
-        results['total'] = len(image_files)
-        
-        for img_path in image_files:
-            if not HAS_PIL:
-                return None
-            try:
-                # Create relative output path
-                rel_path = img_path.relative_to(input_dir)
-                out_path = output_dir / rel_path
-                
-                # Perform operation
-                success = False
-                if operation == 'resize':
-                    success = resize_image(img_path, out_path, **kwargs)
-                elif operation == 'convert':
-                    success = convert_image_format(img_path, out_path, **kwargs)
-                elif operation == 'optimize':
-                    success = optimize_image(img_path, out_path, **kwargs)
-                elif operation == 'normalize':
-                    success = normalize_for_ps2(img_path, out_path, **kwargs)
-                else:
-                    logger.error(f"Unknown operation: {operation}")
-                    results['errors'].append(f"{img_path}: Unknown operation")
-                    continue
-                
-                if success:
-                    results['success'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].append(f"{img_path}: Operation failed")
-                    
-            except Exception as e:
+        for img_path, result in iter_batch_process_images(
+                input_dir, output_dir, operation, max_workers=max_workers, **kwargs):
+            results['total'] += 1
+            if result['success']:
+                results['success'] += 1
+            else:
                 results['failed'] += 1
-                results['errors'].append(f"{img_path}: {str(e)}")
+                results['errors'].append(f"{img_path}: {result['error']}")
         
         logger.info(f"Batch processing complete: {results['success']}/{results['total']} successful")
         return results
@@ -308,15 +308,25 @@ class JobScheduler:
     """
     Smart job scheduler with CPU-aware batch processing.
     Prevents UI freezing by managing concurrent operations.
+    
+    With ``use_processes=True`` jobs run on a warm process pool instead of
+    threads, which lets pure-Python / Pillow-bound work scale past the GIL.
+    Job functions must then be module-level (picklable); NumPy arrays and
+    PIL images are passed to the workers through shared memory.
     """
     
-    def __init__(self, max_workers: Optional[int] = None, name: str = "JobScheduler"):
+    def __init__(self, max_workers: Optional[int] = None, name: str = "JobScheduler",
+                 use_processes: bool = False,
+                 preload: Optional[Dict[str, Callable[[], Any]]] = None):
         """
         Initialize job scheduler.
         
         Args:
             max_workers: Maximum concurrent workers (auto-detects if None)
             name: Scheduler name for logging
+            use_processes: Run jobs in worker processes instead of threads
+            preload: Resources preloaded into every worker process
+                (only used with ``use_processes``)
         """
         self.name = name
         
@@ -329,7 +339,17 @@ class JobScheduler:
             logger.info(f"{name}: Detected {cpu_count} CPU cores, using {max_workers} workers")
         
         self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.use_processes = use_processes
+        if use_processes:
+            try:
+                from ..core.process_pool import ProcessPoolBackend
+            except (ImportError, ValueError):
+                from core.process_pool import ProcessPoolBackend
+            self.executor = ProcessPoolBackend(max_workers=max_workers,
+                                               preload=preload, name=name)
+            self.executor.start()
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
         self._active_jobs = 0
         self._lock = threading.Lock()
     
@@ -433,27 +453,31 @@ class JobScheduler:
         
         logger.info(f"{self.name}: Processing {len(items)} items in {len(batches)} batches")
         
-        # Process batches
+        # Progress is the running total of the sizes of the batches that
+        # have finished (successfully or not), in whatever order the pool
+        # completes them.  It is reported here rather than inside the job
+        # so ``func`` can run in a worker process.
         total_items = len(items)
-        processed_items = 0
-        all_results = []
-        
-        def process_batch_with_progress(batch):
-            nonlocal processed_items
-            results = func(batch)
-            processed_items += len(batch)
+        futures = {self.submit_job(func, batch): index for index, batch in enumerate(batches)}
+        batch_results = [None] * len(batches)
+        done_items = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                batch_results[index] = future.result()
+            except Exception as e:
+                logger.error(f"{self.name}: Batch job failed: {e}")
+            done_items += len(batches[index])
             if progress_callback:
-                progress_callback(processed_items, total_items)
-            return results
+                progress_callback(done_items, total_items)
         
-        # Submit all batches
-        batch_results = self.submit_batch(process_batch_with_progress, batches)
-        
-        # Flatten results
+        # Flatten results in input order
+        all_results = []
         for batch_result in batch_results:
             if batch_result:
                 all_results.extend(batch_result)
         
+        logger.info(f"{self.name}: Batch complete ({total_items} items)")
         return all_results
     
     def get_active_jobs(self) -> int:
@@ -0,0 +1,198 @@
+"""
+Startup Timeline - Where application start-up time goes
+Records named checkpoints and the cost of each measured import, and
+preloads heavy optional modules on a background thread once the window
+is up so the first tool that needs them does not stall the UI.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional ML / imaging stacks imported in the background after the main
+# window is shown, in this order (cheap, widely shared modules first).
+BACKGROUND_IMPORTS = (
+    'numpy',
+    'cv2',
+    'onnxruntime',
+    'torch',
+    'torchvision',
+    'transformers',
+    'open_clip',
+    'timm',
+    'rembg',
+)
+
+
+class StartupTimeline:
+    """
+    Monotonic record of start-up checkpoints and import costs.
+
+    Times are seconds since the timeline was created (normally at the top
+    of ``main.py``), so the report reads as a timeline of the launch.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.marks: List[Dict] = []
+        self.imports: List[Dict] = []
+
+    def elapsed(self) -> float:
+        """Seconds since the timeline started."""
+        return time.perf_counter() - self.origin
+
+    def mark(self, label: str) -> float:
+        """
+        Record a checkpoint.
+
+        Args:
+            label: What has just finished (e.g. 'window shown')
+
+        Returns:
+            Seconds since start
+        """
+        at = self.elapsed()
+        with self._lock:
+            self.marks.append({'label': label, 'at': at,
+                               'thread': threading.current_thread().name})
+        logger.debug(f"[startup] {at * 1000:8.1f} ms  {label}")
+        return at
+
+    @contextmanager
+    def measure(self, label: str) -> Iterator[None]:
+        """Time the enclosed block as an import of ``label``."""
+        start = time.perf_counter()
+        before = len(sys.modules)
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self._record_import(label, start, time.perf_counter() - start,
+                                len(sys.modules) - before, ok)
+
+    def _record_import(self, module: str, start: float, seconds: float,
+                       new_modules: int, ok: bool) -> None:
+        with self._lock:
+            self.imports.append({
+                'module': module,
+                'start': start - self.origin,
+                'seconds': seconds,
+                'new_modules': new_modules,
+                'ok': ok,
+                'thread': threading.current_thread().name,
+            })
+
+    def import_module(self, name: str):
+        """
+        Import ``name`` and record how long it took.
+
+        Returns:
+            The module, or None if it is not installed or failed to load
+            (including modules that call sys.exit while importing)
+        """
+        already = name in sys.modules
+        start = time.perf_counter()
+        before = len(sys.modules)
+        try:
+            module = importlib.import_module(name)
+            ok = True
+        except (Exception, SystemExit) as e:
+            logger.debug(f"[startup] import {name} failed: {e}")
+            module = None
+            ok = False
+        if not already:
+            self._record_import(name, start, time.perf_counter() - start,
+                                len(sys.modules) - before, ok)
+        return module
+
+    def slowest_imports(self, count: int = 10) -> List[Dict]:
+        """The ``count`` most expensive recorded imports."""
+        with self._lock:
+            return sorted(self.imports, key=lambda e: e['seconds'], reverse=True)[:count]
+
+    def report(self) -> Dict:
+        """Checkpoints and imports as a JSON-serialisable dictionary."""
+        with self._lock:
+            return {'marks': list(self.marks), 'imports': list(self.imports)}
+
+    def format_report(self, top: int = 10) -> str:
+        """Human-readable timeline (checkpoints, then the slowest imports)."""
+        lines = ['Startup timeline:']
+        with self._lock:
+            marks = list(self.marks)
+        for mark in marks:
+            lines.append(f"  {mark['at'] * 1000:8.1f} ms  {mark['label']}")
+        slowest = self.slowest_imports(top)
+        if slowest:
+            lines.append('Slowest imports and panel builds:')
+            for entry in slowest:
+                status = '' if entry['ok'] else '  (failed)'
+                lines.append(f"  {entry['seconds'] * 1000:8.1f} ms  {entry['module']}"
+                             f"  [{entry['thread']}, +{entry['new_modules']} modules]{status}")
+        return '\n'.join(lines)
+
+
+class BackgroundImporter(threading.Thread):
+    """
+    Daemon thread that imports heavy optional modules after start-up.
+
+    Python's per-module import locks make this safe: if the UI thread
+    needs a module that is still being imported here it simply waits for
+    that import to finish instead of starting a second one.
+    """
+
+    def __init__(self, timeline: StartupTimeline,
+                 modules: Iterable[str] = BACKGROUND_IMPORTS,
+                 before: Optional[Callable[[], None]] = None,
+                 on_done: Optional[Callable[[Dict[str, bool]], None]] = None):
+        """
+        Args:
+            timeline: Where import costs are recorded
+            modules: Module names, imported in order
+            before: Called first on the thread (e.g. a compatibility shim)
+            on_done: Called on the thread with {module: imported} at the end
+        """
+        super().__init__(name='BackgroundImports', daemon=True)
+        self.timeline = timeline
+        self.modules = tuple(modules)
+        self.before = before
+        self.on_done = on_done
+        self.results: Dict[str, bool] = {}
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop after the import currently in progress."""
+        self._cancelled.set()
+
+    def run(self) -> None:
+        if self.before is not None:
+            try:
+                self.before()
+            except Exception as e:
+                logger.debug(f"Background import preparation failed: {e}")
+        for name in self.modules:
+            if self._cancelled.is_set():
+                break
+            self.results[name] = self.timeline.import_module(name) is not None
+        self.timeline.mark('background imports finished')
+        if self.on_done is not None:
+            try:
+                self.on_done(dict(self.results))
+            except Exception as e:
+                logger.debug(f"Background import callback failed: {e}")
+
+
+# Process-wide timeline; created when this module is first imported, which
+# main.py does right after handling the early CLI flags.
+startup_timeline = StartupTimeline()
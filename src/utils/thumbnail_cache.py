@@ -0,0 +1,288 @@
+"""
+Thumbnail Cache - Persistent on-disk thumbnail store
+Keeps generated thumbnails in a single SQLite file keyed by the source
+file's path, size and modification time, so reopening a folder does not
+decode any image that has not changed since the last visit.
+Author: Dead On The Inside / JosephsDeadish
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .image_processing import HAS_PIL, load_reduced_image
+
+logger = logging.getLogger(__name__)
+
+# A decoded thumbnail: (width, height, mode, raw pixel bytes)
+ThumbnailData = Tuple[int, int, str, bytes]
+
+
+def thumbnail_key(path: Path, size: int) -> Optional[str]:
+    """
+    Build the content key for a thumbnail.
+
+    The key changes whenever the file is rewritten (size or mtime), so stale
+    thumbnails are never served.
+
+    Args:
+        path: Source image path
+        size: Thumbnail edge length in pixels
+
+    Returns:
+        Key string, or None if the file cannot be stat'ed
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}|{st.st_size}|{st.st_mtime_ns}|{size}"
+
+
+def generate_thumbnail(path: Path, size: int) -> Optional[ThumbnailData]:
+    """
+    Decode ``path`` at reduced resolution and fit it inside ``size`` px.
+
+    JPEG files are scaled during decode and mipmapped DDS files decode only
+    the smallest sufficient mip level.
+
+    Args:
+        path: Source image path
+        size: Thumbnail edge length in pixels
+
+    Returns:
+        ThumbnailData tuple, or None if the image could not be decoded
+    """
+    if not HAS_PIL:
+        return None
+    try:
+        img = load_reduced_image(path, (size, size))
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() or img.mode == 'P' else 'RGB')
+        return img.width, img.height, img.mode, img.tobytes()
+    except Exception as e:
+        logger.debug(f"Failed to generate thumbnail for {path}: {e}")
+        return None
+
+
+class ThumbnailCache:
+    """
+    Thread-safe persistent thumbnail cache backed by one SQLite file.
+
+    Pixels are stored as zlib-compressed raw bytes, which decode far faster
+    than re-encoding formats while staying compact. Writes are buffered and
+    committed in batches.
+    """
+
+    COMMIT_EVERY = 64
+
+    def __init__(self, db_path: Path, max_entries: int = 200_000):
+        """
+        Initialize the thumbnail cache.
+
+        Args:
+            db_path: SQLite file to store thumbnails in
+            max_entries: Entries kept after ``prune()``, which runs when the
+                cache is opened and when it is closed
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                key TEXT PRIMARY KEY,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                mode TEXT NOT NULL,
+                data BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_thumbnails_last_used
+            ON thumbnails(last_used)
+        ''')
+        self.conn.commit()
+        self.prune()
+
+    def get(self, key: str) -> Optional[ThumbnailData]:
+        """
+        Look up one thumbnail.
+
+        Args:
+            key: Key from :func:`thumbnail_key`
+
+        Returns:
+            ThumbnailData or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, ThumbnailData]:
+        """
+        Look up many thumbnails with one query per chunk of keys.
+
+        Hits are marked as recently used (committed with the next batch of
+        writes) so ``prune()`` evicts the least recently viewed entries.
+
+        Args:
+            keys: Keys from :func:`thumbnail_key`
+
+        Returns:
+            Dictionary of key -> ThumbnailData for every hit
+        """
+        keys = list(keys)
+        found: Dict[str, ThumbnailData] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT key, width, height, mode, data FROM thumbnails '
+                    f'WHERE key IN ({marks})', chunk
+                ).fetchall()
+                for key, width, height, mode, data in rows:
+                    try:
+                        found[key] = (width, height, mode, zlib.decompress(data))
+                    except zlib.error:
+                        continue
+            if found:
+                now = time.time()
+                self.conn.executemany('UPDATE thumbnails SET last_used = ? WHERE key = ?',
+                                      [(now, key) for key in found])
+                self._pending_writes += 1
+                if self._pending_writes >= self.COMMIT_EVERY:
+                    self.conn.commit()
+                    self._pending_writes = 0
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, thumb: ThumbnailData) -> None:
+        """
+        Store a thumbnail.
+
+        Args:
+            key: Key from :func:`thumbnail_key`
+            thumb: ThumbnailData to store
+        """
+        width, height, mode, raw = thumb
+        blob = zlib.compress(raw, 1)
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO thumbnails '
+                '(key, width, height, mode, data, last_used) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, width, height, mode, blob, time.time())
+            )
+            self._pending_writes += 1
+            if self._pending_writes >= self.COMMIT_EVERY:
+                self.conn.commit()
+                self._pending_writes = 0
+
+    def flush(self) -> None:
+        """Commit buffered writes."""
+        with self._lock:
+            if self._pending_writes:
+                self.conn.commit()
+                self._pending_writes = 0
+
+    def touch(self, keys: Iterable[str]) -> None:
+        """Mark entries as recently used so ``prune()`` keeps them."""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                'UPDATE thumbnails SET last_used = ? WHERE key = ?',
+                [(now, key) for key in keys]
+            )
+            self.conn.commit()
+
+    def prune(self, max_entries: Optional[int] = None) -> int:
+        """
+        Drop the least recently used entries beyond ``max_entries``.
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_entries if max_entries is None else max_entries
+        with self._lock:
+            self.conn.commit()
+            count = self.conn.execute('SELECT COUNT(*) FROM thumbnails').fetchone()[0]
+            excess = count - limit
+            if excess <= 0:
+                return 0
+            self.conn.execute(
+                'DELETE FROM thumbnails WHERE key IN ('
+                'SELECT key FROM thumbnails ORDER BY last_used LIMIT ?)', (excess,)
+            )
+            self.conn.commit()
+        logger.info(f"Thumbnail cache pruned {excess} entries")
+        return excess
+
+    def get_or_create(self, path: Path, size: int) -> Optional[ThumbnailData]:
+        """
+        Return the cached thumbnail for ``path``, generating it on a miss.
+
+        Args:
+            path: Source image path
+            size: Thumbnail edge length in pixels
+
+        Returns:
+            ThumbnailData or None if the image cannot be decoded
+        """
+        key = thumbnail_key(path, size)
+        if key is None:
+            return None
+        thumb = self.get(key)
+        if thumb is None:
+            thumb = generate_thumbnail(path, size)
+            if thumb is not None:
+                self.put(key, thumb)
+        return thumb
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Get cache statistics."""
+        with self._lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM thumbnails').fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached thumbnail."""
+        with self._lock:
+            self.conn.execute('DELETE FROM thumbnails')
+            self.conn.commit()
+            self._pending_writes = 0
+
+    def close(self) -> None:
+        """Flush, prune to ``max_entries`` and close the database."""
+        if self.conn is not None:
+            self.prune()
+        with self._lock:
+            if self.conn is not None:
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
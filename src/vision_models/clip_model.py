@@ -313,13 +313,30 @@ class CLIPModel:
         embeddings = []
         
         for i in range(0, len(images), batch_size):
-            batch = images[i:i + batch_size]
+            batch = []
+            for img in images[i:i + batch_size]:
+                if isinstance(img, Path):
+                    img = Image.open(img).convert('RGB')
+                elif isinstance(img, np.ndarray):
+                    img = Image.fromarray(img)
+                batch.append(img)
             
-            # Process batch
-            batch_embeddings = [self.encode_image(img) for img in batch]
-            embeddings.extend(batch_embeddings)
+            # One forward pass per batch
+            with torch.no_grad():
+                if self.use_open_clip:
+                    image_input = torch.stack(
+                        [self.processor(im) for im in batch]
+                    ).to(self.device)
+                    batch_embeddings = self.model.encode_image(image_input)
+                else:
+                    inputs = self.processor(images=batch, return_tensors="pt").to(self.device)
+                    batch_embeddings = self.model.get_image_features(**inputs)
+                batch_embeddings = F.normalize(batch_embeddings, p=2, dim=-1)
+            embeddings.append(batch_embeddings.cpu().numpy())
         
-        return np.array(embeddings)
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(embeddings, axis=0)
     
     @staticmethod
     def _softmax(x: np.ndarray, temperature: float = 1.0) -> np.ndarray:
@@ -10390,6 +10390,1908 @@ def test_lineart_panel_comparison_mode_selector():
     print("  ✅ Source: _on_comparison_mode_changed() uses _COMPARISON_MODE_MAP")
 
 
+def test_threading_manager_process_backend_shared_memory():
+    """CPU-bound task types can run on a warm process pool.
+
+    Large NumPy arrays must reach the worker through shared memory (no
+    pickling of the pixel data), array results must come back intact, and
+    the submit / status / callback API must be unchanged.
+    """
+    print("\ntest_threading_manager_process_backend_shared_memory ...")
+    import sys as _sys
+    import threading as _threading
+    _sys.path.insert(0, 'src')
+    try:
+        import numpy as np
+        from core.process_pool import (
+            ProcessPoolBackend, SharedArrayRef, share_array, attach_array,
+            _export, _release,
+        )
+        from core.threading_manager import (
+            ThreadingManager, ExecutionBackend, TaskStatus,
+        )
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    image = np.arange(256 * 256 * 4, dtype=np.uint8).reshape(256, 256, 4)
+
+    # Round trip through a shared segment is zero-copy on the reader side.
+    ref, shm = share_array(image)
+    try:
+        view, reader = attach_array(ref)
+        assert np.array_equal(view, image)
+        del view
+        reader.close()
+    finally:
+        shm.close()
+        shm.unlink()
+    print("  ✅ share_array / attach_array round trip")
+
+    # Large arrays are exported as handles, small ones stay inline.
+    segments = []
+    assert isinstance(_export(image, segments), SharedArrayRef)
+    assert _export(np.zeros(4), segments).shape == (4,)
+    _release(segments, unlink=True)
+    print("  ✅ Only large arrays travel through shared memory")
+
+    with ProcessPoolBackend(max_workers=2) as backend:
+        assert backend.run(np.sum, image) == image.sum()
+        flipped = backend.run(np.flipud, image)
+        assert np.array_equal(flipped, np.flipud(image))
+    print("  ✅ ProcessPoolBackend runs tasks and returns shared arrays")
+
+    manager = ThreadingManager(
+        thread_count=2,
+        task_backends={"alpha_stats": ExecutionBackend.PROCESS},
+    )
+    assert manager.get_task_backend("alpha_stats") is ExecutionBackend.PROCESS
+    assert manager.get_task_backend("thumbnail") is ExecutionBackend.THREAD
+    manager.start()
+    try:
+        done = _threading.Event()
+        results = []
+
+        def _on_done(value):
+            results.append(value)
+            done.set()
+
+        task_id = manager.submit_task(
+            np.mean, args=(image,), callback=_on_done, task_type="alpha_stats"
+        )
+        assert done.wait(60), "process-backed task did not complete"
+        assert manager.get_task_status(task_id) is TaskStatus.COMPLETED
+        assert abs(results[0] - image.mean()) < 1e-9
+        assert manager.get_statistics()["process_backend_running"]
+    finally:
+        manager.shutdown()
+    assert not manager.get_statistics()["process_backend_running"]
+    print("  ✅ ThreadingManager routes task types to the process backend")
+
+    import warnings
+    from PIL import Image
+    from core.process_pool import _collect_result
+    for mode in ('L', 'LA', 'RGB', 'RGBA', 'I', 'F'):
+        original = Image.linear_gradient('L').resize((300, 200)).convert(mode)
+        segments = []
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            restored = _collect_result(_export(original, segments))
+        assert restored.mode == mode and restored.tobytes() == original.tobytes()
+    print("  ✅ PIL images round-trip through shared memory without deprecated fromarray(mode=)")
+
+    from utils.performance import JobScheduler
+    import time as _time
+
+    def _uneven(batch):
+        if batch[0] == 0:
+            _time.sleep(0.2)  # the first batch finishes last
+        if batch[0] == 10:
+            raise ValueError("bad batch")
+        return [x * 2 for x in batch]
+
+    progress = []
+    scheduler = JobScheduler(max_workers=3)
+    try:
+        out = scheduler.submit_batch_with_batching(
+            _uneven, list(range(25)), progress_callback=lambda d, t: progress.append((d, t)),
+            items_per_batch=10)
+    finally:
+        scheduler.shutdown()
+    assert out == [x * 2 for x in list(range(10)) + list(range(20, 25))]
+    assert sorted(d for d, _ in progress) == [d for d, _ in progress]
+    assert progress[-1] == (25, 25) and len(progress) == 3
+    print("  ✅ Batched progress sums finished batch sizes, out of order and with failures")
+
+
+def test_job_graph_pipelines_stages_and_shares_intermediates():
+    """JobGraph runs per-file DAGs, shares intermediates and times stages."""
+    print("\ntest_job_graph_pipelines_stages_and_shares_intermediates ...")
+    import sys as _sys
+    import threading as _threading
+    _sys.path.insert(0, 'src')
+    try:
+        from features.batch_operations import JobGraph, BatchQueue, OperationStatus
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    decode_calls = []
+    lock = _threading.Lock()
+
+    def decode(item, inputs):
+        with lock:
+            decode_calls.append(item)
+        return f"px:{item}"
+
+    def alpha_fix(item, inputs):
+        if item == 'bad.png':
+            raise ValueError("corrupt alpha")
+        return inputs['decode'] + "+alpha"
+
+    graph = JobGraph()
+    graph.add_stage('decode', decode)
+    graph.add_stage('alpha_fix', alpha_fix, depends_on=['decode'])
+    graph.add_stage('upscale', lambda i, d: d['alpha_fix'] + "+up", depends_on=['alpha_fix'])
+    graph.add_stage('thumbnail', lambda i, d: d['decode'] + "+thumb", depends_on=['decode'])
+    graph.add_stage('encode', lambda i, d: d['upscale'] + "+enc", depends_on=['upscale'])
+
+    assert graph.roots() == ['decode']
+    assert sorted(graph.sinks()) == ['encode', 'thumbnail']
+    try:
+        graph.add_stage('orphan', decode, depends_on=['missing'])
+        raise AssertionError("unknown dependency must be rejected")
+    except ValueError:
+        pass
+
+    files = [f"tex_{i}.png" for i in range(20)] + ['bad.png']
+    progress = []
+    result = graph.run(files, max_workers=4, max_in_flight=3,
+                       progress_callback=lambda d, t: progress.append((d, t)))
+
+    # Shared intermediate: decode runs once per file even with two consumers.
+    assert sorted(decode_calls) == sorted(files)
+    assert result.outputs['tex_3.png'] == {
+        'encode': 'px:tex_3.png+alpha+up+enc',
+        'thumbnail': 'px:tex_3.png+thumb',
+    }
+    # Failure stops only the failed branch for that file.
+    assert result.errors['bad.png'] == {'alpha_fix': 'corrupt alpha'}
+    assert result.outputs['bad.png'] == {'thumbnail': 'px:bad.png+thumb'}
+    assert result.completed == 20 and result.failed == 1
+    assert not result.cancelled
+    assert progress[-1] == (21, 21)
+    assert result.timings['decode'].count == 21
+    assert result.timings['encode'].count == 20
+    assert result.timings['alpha_fix'].failures == 1
+    assert {t['stage'] for t in result.timing_report()} == set(graph.stages)
+    print("  ✅ DAG stages pipelined with shared intermediates and timings")
+
+    cancel = _threading.Event()
+    cancel.set()
+    cancelled = graph.run(files, cancel_event=cancel)
+    assert cancelled.cancelled and not cancelled.outputs
+    print("  ✅ Cancel event stops scheduling")
+
+    queue = BatchQueue()
+    op_id = queue.add_job_graph("textures", graph, files[:5], max_workers=2)
+    queue.start()
+    try:
+        for _ in range(100):
+            status = queue.get_operation_status(op_id)
+            if status['status'] == OperationStatus.COMPLETED.value:
+                break
+            __import__('time').sleep(0.05)
+        assert status['status'] == OperationStatus.COMPLETED.value
+        assert status['progress'] == 100.0
+        assert queue.operations[op_id].result.completed == 5
+    finally:
+        queue.stop()
+    print("  ✅ BatchQueue.add_job_graph queues a graph run")
+
+
+def test_thumbnail_disk_cache_and_reduced_decode():
+    """Thumbnails persist on disk keyed by (path, size, mtime) and decode cheaply.
+
+    JPEGs must use draft-mode decoding and mipmapped DDS files must decode
+    only the smallest mip level that still covers the thumbnail; the file
+    browser's ThumbnailGenerator must serve a second visit from the cache.
+    """
+    print("\ntest_thumbnail_disk_cache_and_reduced_decode ...")
+    import sys as _sys
+    import os as _os
+    import struct
+    import tempfile
+    from pathlib import Path
+    _sys.path.insert(0, 'src')
+    try:
+        from PIL import Image
+        from utils.image_processing import open_image_for_size, load_reduced_image
+        from utils.thumbnail_cache import ThumbnailCache, thumbnail_key
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # BC1 DDS with four solid-colour mip levels: red, green, blue, white.
+        dds_path = tmp / 'mips.dds'
+        colors = [0xF800, 0x07E0, 0x001F, 0xFFFF]
+        header = bytearray(128)
+        header[0:4] = b'DDS '
+        struct.pack_into('<7I', header, 4, 124, 0x1 | 0x2 | 0x4 | 0x1000 | 0x20000,
+                         256, 256, 0, 0, len(colors))
+        struct.pack_into('<4I', header, 76, 32, 0x4, struct.unpack('<I', b'DXT1')[0], 0)
+        body = bytearray()
+        dim = 256
+        for c in colors:
+            body += struct.pack('<HHI', c, 0, 0) * (max(1, (dim + 3) // 4) ** 2)
+            dim //= 2
+        dds_path.write_bytes(bytes(header) + bytes(body))
+
+        with open_image_for_size(dds_path, (64, 64)) as img:
+            img.load()
+            assert img.size == (64, 64), img.size
+            assert img.getpixel((0, 0))[:3] == (0, 0, 255), "should decode mip level 2"
+        with open_image_for_size(dds_path, (100, 100)) as img:
+            img.load()
+            assert img.size == (128, 128)
+            assert img.getpixel((0, 0))[:3] == (0, 255, 0), "should decode mip level 1"
+        print("  ✅ DDS decodes the smallest sufficient mip level")
+
+        jpg_path = tmp / 'big.jpg'
+        Image.new('RGB', (2048, 1024), 'red').save(jpg_path)
+        with open_image_for_size(jpg_path, (96, 96)) as img:
+            assert img.size[0] < 2048, "JPEG draft mode not applied"
+        assert load_reduced_image(jpg_path, (96, 96)).size == (96, 48)
+        print("  ✅ JPEG draft decode and reduced load")
+
+        png_path = tmp / 'alpha.png'
+        Image.new('RGBA', (300, 150), (1, 2, 3, 128)).save(png_path)
+
+        cache = ThumbnailCache(tmp / 'cache' / 'thumbs.db')
+        try:
+            first = cache.get_or_create(png_path, 96)
+            assert first[:3] == (96, 48, 'RGBA')
+            assert cache.get(thumbnail_key(png_path, 96)) == first
+            # Rewriting the file changes the key, so stale thumbnails are never served.
+            old_key = thumbnail_key(png_path, 96)
+            Image.new('RGB', (50, 50), 'blue').save(png_path)
+            _os.utime(png_path, ns=(1, 1))
+            assert thumbnail_key(png_path, 96) != old_key
+            assert cache.get_or_create(png_path, 96)[:3] == (50, 50, 'RGB')
+            print("  ✅ ThumbnailCache keyed by size + mtime")
+        finally:
+            cache.close()
+
+        lru = ThumbnailCache(tmp / 'cache' / 'lru.db', max_entries=2)
+        for i, key in enumerate(('a', 'b', 'c')):
+            lru.put(key, (1, 1, 'L', b'x'))
+            lru.conn.execute('UPDATE thumbnails SET last_used = ? WHERE key = ?', (i, key))
+        assert lru.get_many(['a'])  # a hit makes 'a' the most recently used
+        lru.close()  # prunes to max_entries
+        lru = ThumbnailCache(tmp / 'cache' / 'lru.db', max_entries=1)  # prunes on open
+        try:
+            assert [k for (k,) in lru.conn.execute('SELECT key FROM thumbnails')] == ['a']
+        finally:
+            lru.close()
+        print("  ✅ Hits refresh LRU order; open and close prune to max_entries")
+
+        try:
+            from ui.file_browser_panel_qt import ThumbnailGenerator
+            from PyQt6.QtWidgets import QApplication
+        except ImportError as exc:
+            print(f"  ⚠️  Generator check skipped (import failed: {exc})")
+            return
+        app = QApplication.instance() or QApplication([])
+
+        files = [jpg_path, png_path, dds_path]
+        cache = ThumbnailCache(tmp / 'cache' / 'thumbs.db')
+        try:
+            for visit in range(2):
+                got = []
+                gen = ThumbnailGenerator(files, size=96, cache=cache, max_workers=2)
+                gen.thumbnail_ready.connect(lambda path, img: got.append((path, img.width())))
+                gen.prioritize([dds_path])
+                gen.run()  # synchronous: exercises the batch + pool logic
+                # Pool threads emit through queued connections.
+                app.processEvents()
+                assert sorted(p for p, _ in got) == sorted(str(f) for f in files), got
+            stats = cache.get_statistics()
+            assert stats['entries'] >= 3
+            assert stats['hits'] >= 3, "second visit must be served from the disk cache"
+            print("  ✅ ThumbnailGenerator serves repeat visits from the disk cache")
+        finally:
+            cache.close()
+
+
+def test_file_browser_virtual_model_and_worker_filter():
+    """The file browser lists files through a virtual model: thumbnails are
+    requested only for rows whose icon is queried, and scanning/filtering are
+    plain functions run on a worker thread."""
+    print("\ntest_file_browser_virtual_model_and_worker_filter ...")
+    import sys
+    import tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from ui.file_browser_panel_qt import (
+            FileListModel, ThumbnailGenerator, _FilterSpec, _filter_paths, _scan_folder,
+        )
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtWidgets import QApplication
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    app = QApplication.instance() or QApplication([])
+
+    images = {'.png', '.dds'}
+    archives = {'.zip'}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        for name in ('b.PNG', 'a.dds', 'C.Zip', 'notes.txt'):
+            (tmp / name).write_bytes(b'')
+        (tmp / 'folder.png').mkdir()
+        scanned = _scan_folder(tmp, images | archives)
+        assert [p.name for p in scanned] == ['a.dds', 'b.PNG', 'C.Zip'], scanned
+    print("  ✅ Single scandir pass, case-insensitive extensions, no directories")
+
+    files = [Path(f'/textures/tex_{i:05d}.png') for i in range(10_000)]
+    files.append(Path('/textures/pack.zip'))
+    spec = _FilterSpec(search_text='tex_001')
+    narrower = _FilterSpec(search_text='tex_0012')
+    assert narrower.narrows(spec) and not spec.narrows(narrower)
+    assert not _FilterSpec(search_text='tex_0012', type_filter='Archives Only').narrows(spec)
+    first = _filter_paths(files, spec, images, archives)
+    assert len(first) == 100
+    assert _filter_paths(first, narrower, images, archives) == _filter_paths(files, narrower, images, archives)
+    assert _filter_paths(files, _FilterSpec(type_filter='Archives Only'), images, archives) == [files[-1]]
+    assert _filter_paths(files, spec, images, archives, cancelled=lambda: True) is None
+    print("  ✅ Incremental filter narrows the previous result and honours cancellation")
+
+    model = FileListModel(images, archives, max_icons=2)
+    requested = []
+    model.thumbnails_needed.connect(requested.extend)
+    model.set_files(files)
+    assert model.rowCount() == len(files)
+    index = model.index(3)
+    assert model.data(index) == 'tex_00003.png'
+    assert model.data(index, Qt.ItemDataRole.UserRole) == str(files[3])
+    for row in (3, 4, 3):
+        model.data(model.index(row), Qt.ItemDataRole.DecorationRole)
+    app.processEvents()
+    assert requested == [files[3], files[4]], requested
+    print("  ✅ Thumbnails requested only for the rows the view painted")
+
+    changed = []
+    model.dataChanged.connect(lambda top, _bottom, _roles: changed.append(top.row()))
+    for row in (3, 4, 5):
+        model.set_thumbnail(str(files[row]), object())
+    assert changed == [3, 4]
+    assert not model.has_thumbnail(str(files[3])), "icon cache must stay bounded"
+    print("  ✅ Delivered icons repaint their row; icon cache is an LRU")
+
+    gen = ThumbnailGenerator([], keep_alive=True)
+    gen.request(files[:5])
+    dropped = gen.retain(files[1:2])
+    assert dropped == [files[0]] + files[2:5]
+    assert gen._next_batch() == [files[1]]
+    print("  ✅ Generator drops queued work for rows that scrolled away")
+
+
+def test_content_index_incremental_topk():
+    """Content search uses a persistent per-folder embedding index: only new
+    or changed images are encoded and a query is one top-k lookup."""
+    print("\ntest_content_index_incremental_topk ...")
+    import os as _os
+    import sys
+    import tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        import numpy as np
+        from PIL import Image
+        from similarity.content_index import ContentIndex, index_path_for_folder
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    class ColourEncoder:
+        """Embeds an image as its mean colour; text names a colour."""
+        colours = {'red': (1, 0, 0), 'green': (0, 1, 0), 'blue': (0, 0, 1)}
+
+        def __init__(self):
+            self.encoded = 0
+
+        def batch_encode_images(self, images, batch_size=32):
+            self.encoded += len(images)
+            return np.array([np.asarray(img, dtype=np.float32).mean(axis=(0, 1))
+                             for img in images])
+
+        def encode_text(self, text):
+            return np.array([self.colours[text]], dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        folder = tmp / 'textures'
+        folder.mkdir()
+        files = []
+        for name, colour in (('r', 'red'), ('g', 'green'), ('b', 'blue'), ('r2', (200, 40, 0))):
+            path = folder / f'{name}.png'
+            Image.new('RGB', (64, 64), colour).save(path)
+            files.append(path)
+        db_path = index_path_for_folder(tmp / 'index', folder)
+        assert db_path == index_path_for_folder(tmp / 'index', folder / '.')
+
+        encoder = ColourEncoder()
+        with ContentIndex(db_path, 'colour') as index:
+            assert index.update(files, encoder, batch_size=3) == 4
+            top = index.search_text('red', encoder, k=2)
+            assert [p.name for p, _ in top] == ['r.png', 'r2.png'], top
+            assert top[0][1] >= top[1][1]
+        print("  ✅ Built index answers top-k text queries")
+
+        encoder = ColourEncoder()
+        with ContentIndex(db_path, 'colour') as index:
+            assert index.update(files, encoder) == 0 and encoder.encoded == 0
+            Image.new('RGB', (64, 64), 'green').save(files[0])
+            _os.utime(files[0], ns=(1, 1))
+            files[2].unlink()
+            assert index.update(files, encoder) == 1 and len(index) == 3
+            greens = {p.name for p, _ in index.search_text('green', encoder, k=2)}
+            assert greens == {'g.png', 'r.png'}, greens
+        print("  ✅ Reopened index re-encodes only changed files and drops deleted ones")
+
+        with ContentIndex(db_path, 'other-model') as index:
+            assert len(index) == 0, "embeddings from another encoder must be discarded"
+        print("  ✅ Index is rebuilt when the encoder changes")
+
+
+def test_classifier_keyword_automaton_matches_scalar_scoring():
+    """Filename classification runs on a compiled Aho-Corasick automaton;
+    the bulk vectorized path must agree exactly with the per-file path."""
+    print("\ntest_classifier_keyword_automaton_matches_scalar_scoring ...")
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from classifier.classifier_engine import TextureClassifier
+        from classifier.keyword_matcher import AhoCorasick
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+    found = sorted((start, automaton.patterns[pid]) for start, pid in automaton.find_all('ushers'))
+    assert found == [(1, 'she'), (2, 'he'), (2, 'hers')], found
+    print("  ✅ Automaton reports overlapping hits with positions")
+
+    clf = TextureClassifier()
+    category, confidence = clf._classify_by_filename(Path('tex_skin_diffuse.png'))
+    assert 'skin' in clf.categories[category]['keywords'] and confidence == 1.0
+    assert clf._classify_by_filename(Path('zzqx.png')) == ('unclassified', 0.3)
+
+    names = []
+    for prefix in ('', 'tex_', 'T_', 'mat_'):
+        for body in ('char_head_skin', 'grass-dirt', 'SKY box', 'metal_plate', 'ui_button',
+                     'eye', 'wpn_sword', 'tree bark', 'zzqx', 'water', 'rock01'):
+            for suffix in ('', '_d', '_2k', '_lod0', '_1024x1024', '_01'):
+                names.append(f"{prefix}{body}{suffix}.png")
+    scalar = [clf._classify_by_filename(Path(n)) for n in names]
+    assert clf.classify_filenames(names) == scalar
+    print(f"  ✅ classify_filenames() == _classify_by_filename() for {len(names)} names")
+
+    profiled = TextureClassifier(game_profile={'prefix_mappings': {'wpn': 'weapons', 'ch_': 'character'}})
+    assert profiled._classify_by_filename(Path('wpn_rock.png')) == ('weapons', 1.0)
+    assert profiled.classify_filenames(names) == [profiled._classify_by_filename(Path(n)) for n in names]
+    profiled.set_game_profile({})
+    assert profiled._classify_by_filename(Path('wpn_rock.png')) == clf._classify_by_filename(Path('wpn_rock.png'))
+    print("  ✅ Game-profile keywords take priority and recompile on profile change")
+
+
+def test_classifier_reduced_decode_and_pooled_batch():
+    """Image heuristics run on a reduced decode; batch_classify pools and keeps order"""
+    print("\ntest_classifier_reduced_decode_and_pooled_batch ...")
+    import sys, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from PIL import Image
+        from classifier.classifier_engine import TextureClassifier
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sky = tmp / "aaa.png"
+        Image.new('RGB', (2048, 2048), (40, 60, 200)).save(sky)
+        grass = tmp / "bbb.jpg"
+        Image.new('RGB', (1024, 512), (50, 180, 40)).save(grass, quality=90)
+
+        clf = TextureClassifier()
+        img, width, height = clf._load_analysis_image(grass)
+        assert (width, height) == (1024, 512)
+        assert max(img.size) <= clf.ANALYSIS_SIZE and img.mode == 'RGB'
+        assert clf._classify_by_image(sky)[0] == "sky"
+        assert clf._classify_by_image(grass)[0] == "grass"
+        print("  ✅ Large textures classified from a reduced decode")
+
+        files = [sky, grass, tmp / "missing.png"] * 4
+        pooled = TextureClassifier().batch_classify(files, max_workers=4)
+        serial = TextureClassifier().batch_classify(files, max_workers=1)
+        assert list(pooled) == list(serial) == list(dict.fromkeys(str(f) for f in files))
+        assert pooled == serial
+        print("  ✅ Pooled batch_classify matches sequential results")
+
+        progress = []
+        names = [tmp / "hero_face.png", tmp / "stone_wall.dds", tmp / "hero_face.png"]
+        clf = TextureClassifier()
+        fast = clf.batch_classify(names, use_image_analysis=False,
+                                  progress_callback=lambda d, t: progress.append((d, t)))
+        assert fast == {str(n): clf.classify_texture(n, use_image_analysis=False) for n in names}
+        assert progress[-1] == (3, 3)
+        print("  ✅ Filename-only batch uses the keyword matcher")
+
+
+def test_texture_analyzer_single_decode_context():
+    """TextureAnalyzer reads/decodes once, fuses hashing and skips unrequested sections"""
+    print("\ntest_texture_analyzer_single_decode_context ...")
+    import sys, hashlib, tempfile
+    from collections import Counter
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        import numpy as np
+        from PIL import Image
+        from features import texture_analysis
+        from features.texture_analysis import TextureAnalyzer, ANALYSIS_SECTIONS
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    rng = np.random.default_rng(7)
+    pixels = (rng.integers(0, 5, (37, 53, 4)) * 60).astype(np.uint8)
+    pixels[:5, :, 3] = 0
+    pixels[5:, :, 3] = 255
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "odd_size.png"
+        Image.fromarray(pixels, 'RGBA').save(path)
+        data = path.read_bytes()
+
+        analyzer = TextureAnalyzer(max_palette_colors=5)
+        result = analyzer.analyze(path)
+        assert tuple(result) == ANALYSIS_SECTIONS
+        assert result['hashes'] == {'md5': hashlib.md5(data).hexdigest(),
+                                    'sha256': hashlib.sha256(data).hexdigest()}
+        assert result['basic']['file_size_bytes'] == len(data)
+        expected = Counter(map(tuple, pixels[..., :3].reshape(-1, 3).tolist())).most_common(5)
+        assert [(p['rgb'], p['count']) for p in result['colors']['palette']] == expected
+        assert result['alpha']['alpha_usage'] == 'binary'
+        assert result['alpha']['distribution']['fully_transparent'] == 5 * 53
+        assert 0.0 < result['quality']['high_frequency_ratio'] < 1.0
+        print("  ✅ Full analysis matches reference palette, alpha and hashes")
+
+        decodes = []
+        original = texture_analysis.AnalysisContext.decoded
+        texture_analysis.AnalysisContext.decoded = lambda self: decodes.append(1) or original(self)
+        try:
+            only = analyzer.analyze(path, sections=['hashes', 'basic'])
+            assert list(only) == ['basic', 'hashes'] and not decodes
+            # Derived arrays of the first analysis are in the shared image cache
+            from utils.cache_manager import get_cache_manager
+            get_cache_manager().clear()
+            analyzer.analyze(path, sections=['optimization'])
+            assert decodes
+        finally:
+            texture_analysis.AnalysisContext.decoded = original
+        try:
+            analyzer.analyze(path, sections=['nope'])
+            assert False, "unknown section accepted"
+        except ValueError:
+            pass
+        print("  ✅ Unrequested sections are skipped without decoding")
+
+
+def test_gameindex_compiled_cache_and_invalidation():
+    """GameIndex.yaml is compiled once to SQLite and recompiled only on content change"""
+    print("\ntest_gameindex_compiled_cache_and_invalidation ...")
+    import sys, os, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from features.gameindex_cache import GameIndexCache, HAS_YAML
+        from features.game_identifier import GameIdentifier
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    if not HAS_YAML:
+        print("  ⚠️  Skipped (PyYAML not installed)")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        yaml_path = tmp / "GameIndex.yaml"
+        db_path = tmp / "gameindex.db"
+        yaml_path.write_text(
+            'SLUS-29999:\n  name: "Psychonauts"\n  region: "NTSC-U"\n  crc: ["0aba1234", "BEEF0001"]\n'
+            'SLES-50000:\n  name: "Later Dup"\n  region: "PAL-E"\n  crc: "BEEF0001"\n'
+            'broken: 3\n', encoding='utf-8')
+
+        identifier = GameIdentifier()
+        identifier._gameindex = GameIndexCache(yaml_path, db_path)
+        info = identifier.lookup_by_crc('0ABA1234')
+        assert info and info.serial == 'SLUS-29999' and info.source == 'gameindex_crc'
+        assert identifier.lookup_by_crc('beef0001').serial == 'SLUS-29999'
+        assert identifier.lookup_by_serial('SLES_50000').title == 'Later Dup'
+        assert identifier.lookup_by_crc('00000000') is None
+        assert set(identifier.gameindex_db) == {'SLUS-29999', 'SLES-50000'}
+        print("  ✅ Serial and CRC lookups served from the compiled index")
+
+        st = yaml_path.stat()
+        os.utime(yaml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        fresh = GameIndexCache(yaml_path, db_path)
+        def _no_compile(signature):
+            raise AssertionError("recompiled unchanged YAML")
+        fresh._compile = _no_compile
+        assert fresh.load() and len(fresh) == 2
+        assert fresh.lookup_crc('BEEF0001')[0] == 'SLUS-29999'
+        print("  ✅ Touched but unchanged YAML reuses the compiled cache")
+
+        yaml_path.write_text('SCUS-97328:\n  name: "Ratchet"\n  region: "NTSC-U"\n  crc: "11112222"\n',
+                             encoding='utf-8')
+        assert identifier.lookup_by_crc('11112222').serial == 'SCUS-97328'
+        assert identifier.lookup_by_serial('SLUS-29999') is None
+        print("  ✅ Changed YAML content recompiles the index")
+
+
+def test_file_hasher_parallel_crc_and_cache():
+    """Segmented CRC-32 matches zlib and digests are cached by (path, size, mtime)"""
+    print("\ntest_file_hasher_parallel_crc_and_cache ...")
+    import sys, os, zlib, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from utils import file_hasher
+        from utils.file_hasher import FileHasher, crc32_combine, crc32_file
+        from features.game_identifier import GameIdentifier
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    for a, b in [(b'', b'x'), (b'abc', b''), (os.urandom(999), os.urandom(70001))]:
+        assert crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == zlib.crc32(a + b)
+    print("  ✅ crc32_combine matches zlib on concatenations")
+
+    saved = (file_hasher.PARALLEL_MIN_SIZE, file_hasher.SEGMENT_SIZE,
+             file_hasher._native_file_crc32, file_hasher._DEFAULT_HASHER)
+    with tempfile.TemporaryDirectory() as tmp:
+        iso = Path(tmp) / "GAME.ISO"
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        iso.write_bytes(data)
+        try:
+            file_hasher._native_file_crc32 = None
+            assert crc32_file(iso) == zlib.crc32(data)
+            file_hasher.PARALLEL_MIN_SIZE = 1
+            file_hasher.SEGMENT_SIZE = 1024 * 1024 + 3
+            assert crc32_file(iso, max_workers=3) == zlib.crc32(data)
+            print("  ✅ Mapped and segmented CRC-32 match zlib")
+
+            hasher = FileHasher(Path(tmp) / "hashes.db")
+            first = hasher.hash_file(iso)
+            assert first == f"{zlib.crc32(data):08X}"
+            again = FileHasher(Path(tmp) / "hashes.db")
+            assert again.hash_file(iso) == first and again.hits == 1 and again.misses == 0
+            iso.write_bytes(data[:-1])
+            assert again.hash_file(iso) == f"{zlib.crc32(data[:-1]):08X}" and again.misses == 1
+            again.close()
+            hasher.close()
+            print("  ✅ Digests cached across instances and refreshed on change")
+
+            file_hasher._DEFAULT_HASHER = FileHasher()
+            assert GameIdentifier().calculate_file_crc(iso) == f"{zlib.crc32(data[:-1]):08X}"
+            assert GameIdentifier().calculate_file_crc(Path(tmp) / "missing.iso") == ""
+            print("  ✅ GameIdentifier.calculate_file_crc uses the hashing service")
+        finally:
+            (file_hasher.PARALLEL_MIN_SIZE, file_hasher.SEGMENT_SIZE,
+             file_hasher._native_file_crc32, file_hasher._DEFAULT_HASHER) = saved
+
+
+def test_backup_store_incremental_dedup():
+    """Content-addressed backups: dedup, incremental reuse, restore and GC"""
+    print("\ntest_backup_store_incremental_dedup ...")
+    import sys, os, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from features.backup_store import BackupStore
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / 'src'
+        (src / 'sub').mkdir(parents=True)
+        payload = os.urandom(50_000)
+        (src / 'a.bin').write_bytes(payload)
+        (src / 'sub' / 'copy.bin').write_bytes(payload)
+        (src / 'b.txt').write_text('texture ' * 1000)
+        store = BackupStore(tmp / 'store')
+
+        first = store.create_snapshot('one', src)
+        assert first['file_count'] == 3 and first['reused'] == 0
+        objects = [p for shard in store.objects_dir.iterdir() for p in shard.iterdir()]
+        assert len(objects) == 2, "duplicate files must be stored once"
+        print("  ✅ Duplicate content stored once")
+
+        (src / 'b.txt').write_text('changed ' * 1000)
+        second = store.create_snapshot('two', src)
+        assert second['reused'] == 2
+        assert second['stored_bytes'] < 10_000
+        print("  ✅ Unchanged files reused without re-reading")
+
+        dest = tmp / 'dest'
+        store.restore_snapshot('one', dest)
+        (dest / 'extra.tmp').write_text('x')
+        (dest / 'a.bin').unlink()
+        assert store.restore_snapshot('one', dest) == 1
+        assert not (dest / 'extra.tmp').exists()
+        assert (dest / 'a.bin').read_bytes() == payload
+        assert (dest / 'b.txt').read_text() == 'texture ' * 1000
+        assert store.verify_snapshot('one', first['checksum'])
+        print("  ✅ Restore rewrites only missing files and drops extras")
+
+        assert store.delete_snapshot('one') == 1
+        assert store.verify_snapshot('two', second['checksum'])
+        store.restore_snapshot('two', tmp / 'dest2')
+        assert (tmp / 'dest2' / 'sub' / 'copy.bin').read_bytes() == payload
+        print("  ✅ Deleting a backup keeps objects other backups use")
+
+
+def test_archive_streaming_members_and_crc_skip():
+    """ArchiveHandler streams filtered members and skips up-to-date extractions"""
+    print("\ntest_archive_streaming_members_and_crc_skip ...")
+    import sys, os, tempfile, zipfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from utils.archive_handler import ArchiveHandler
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pack = tmp / 'pack.zip'
+        payloads = {f'tex/t{i}.png': os.urandom(3000) * 4 for i in range(20)}
+        with zipfile.ZipFile(pack, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, data in payloads.items():
+                zf.writestr(name, data)
+            zf.writestr('tex/readme.txt', 'not a texture')
+        handler = ArchiveHandler()
+
+        members = list(handler.iter_members(pack, max_workers=3))
+        assert [m.name for m in members] == list(payloads), "archive order, textures only"
+        assert all(m.read() == payloads[m.name] for m in members)
+        spooled = next(handler.iter_members(pack, memory_limit=1024))
+        assert not spooled.in_memory and spooled.read() == payloads['tex/t0.png']
+        spooled.close()
+        print("  ✅ Members streamed in order as buffers or spooled files")
+
+        seen = {m.signature for m in members[:5]}
+        rest = [m.name for m in handler.iter_members(pack, skip_signatures=seen)]
+        assert rest == list(payloads)[5:]
+        collided = {(m.size + 1, m.crc) for m in members}
+        assert len(list(handler.iter_members(pack, skip_signatures=collided))) == 20
+        print("  ✅ Members with known size and CRC skipped")
+
+        out = tmp / 'out'
+        assert handler.extract_archive(pack, out) == out
+        (out / 'tex' / 't3.png').write_bytes(b'stale')
+        calls = []
+        handler.extract_archive(pack, out, progress_callback=lambda *a: calls.append(a))
+        assert len(calls) == 21
+        assert (out / 'tex' / 't3.png').read_bytes() == payloads['tex/t3.png']
+        assert (out / 'tex' / 'readme.txt').read_text() == 'not a texture'
+        print("  ✅ Parallel extraction restores changed members")
+
+        nested = tmp / 'nested.zip'
+        with zipfile.ZipFile(nested, 'w') as zf:
+            for d in range(5):
+                for i in range(20):
+                    zf.writestr(f'a/b{d}/c/f{i}.png', b'x' * 100)
+        for attempt in range(5):
+            dest = tmp / f'nested{attempt}'
+            assert handler.extract_archive(nested, dest, max_workers=4) == dest
+        assert len(list((tmp / 'nested0').rglob('*.png'))) == 100
+        print("  ✅ Members sharing folders extract in parallel without races")
+
+        try:
+            from ui.organizer_panel_qt import OrganizerWorker
+            from organizer.run_journal import RunJournal
+        except ImportError as exc:
+            print(f"  ⚠️  Organizer check skipped (import failed: {exc})")
+            return
+        src = tmp / 'src'
+        src.mkdir()
+        os.replace(pack, src / 'pack.zip')
+        target = tmp / 'organized'
+        worker = OrganizerWorker({'use_ai': False, 'confidence_threshold': 0.0})
+        folder, _ = worker._heuristic_classification(Path('t0.png'))
+        (target / folder).mkdir(parents=True)
+        (target / folder / 't0.png').write_bytes(b'old')
+        journal = RunJournal(tmp / 'run.ndjson')
+        journal.start(source=str(src), output=str(target))
+        placed, _ = worker._organize_archives(src, target, None, 0, journal)
+        assert placed == 20
+        assert (target / folder / 't0.png').read_bytes() == payloads['tex/t0.png']
+        assert not list(target.rglob('*.tmp'))
+        journal.close()
+        journal = RunJournal(tmp / 'run.ndjson')
+        assert journal.start(resume=True) == 20
+        assert worker._organize_archives(src, target, None, 0, journal)[0] == 0
+        journal.close()
+        assert RunJournal(tmp / 'run.ndjson').undo()['removed'] == 20
+        assert not list(target.rglob('*.png'))
+        print("  ✅ Organizer journals archive members and replaces existing files")
+
+
+def test_learning_system_indexed_suggestions():
+    """AILearningSystem suggestions come from the incremental part index"""
+    print("\ntest_learning_system_indexed_suggestions ...")
+    import sys, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from organizer.learning_system import AILearningSystem
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ls = AILearningSystem(Path(tmp))
+        ls.create_new_profile("Test Game")
+        ls.add_learning("kratos_head_01.png", "x", "Characters/Kratos", 0.9, True)
+        ls.add_learning("wall_brick_02.png", "x", "Env/Walls", 0.8, True)
+        ls.add_learning("wall_brick_03.png", "x", "Junk", 1.0, False)
+
+        top = ls.get_suggestion("kratos_head_17.dds")
+        assert top[0][0] == "Characters/Kratos"
+        assert abs(top[0][1] - 0.9) < 1e-9, "full wildcard match scores 1.0 x confidence"
+        assert "Junk" not in dict(ls.get_suggestion("wall_brick_99.png"))
+        print("  ✅ Exact and partial matches scored, rejected entries ignored")
+
+        # Added after the index was built: updated in place
+        ls.add_learning("kratos_head_05.png", "x", "Characters/Kratos", 0.5, True)
+        assert abs(dict(ls.get_suggestion("kratos_head_17.dds"))["Characters/Kratos"] - 1.4) < 1e-9
+        # Replaced or edited outside add_learning: rebuilt on the next query
+        path = ls.save_profile()
+        ls.clear_learning_history()
+        assert ls.get_suggestion("kratos_head_17.dds") == []
+        ls.load_profile(path)
+        assert ls.get_suggestion("kratos_head_17.dds")[0][0] == "Characters/Kratos"
+        print("  ✅ Index follows add_learning, clear and load")
+
+
+def test_search_filter_columnar_index():
+    """SearchFilter evaluates criteria as masks over a MetadataIndex"""
+    print("\ntest_search_filter_columnar_index ...")
+    import sys, os, tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from features.search_filter import SearchFilter, FilterCriteria
+        from features.metadata_index import MetadataIndex
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        files = []
+        for i, name in enumerate(['wall_01.png', 'Wall_02.DDS', 'sky_03.png', 'sword_04.jpg']):
+            path = tmp / name
+            path.write_bytes(b'x' * (1000 * (i + 1)))
+            os.utime(path, (1e9 + i * 1e8, 1e9 + i * 1e8))
+            files.append(path)
+        files.append(tmp / 'gone.png')  # stat fails
+        meta = {files[0]: {'category': 'walls', 'width': 256, 'height': 256},
+                files[2]: {'category': 'sky', 'width': 64, 'height': 64}}
+        sf = SearchFilter(tmp / 'presets.json')
+        sf.mark_favorite(files[3])
+
+        criteria_cases = [
+            (FilterCriteria(name='WALL', min_size=1500), "AND"),
+            (FilterCriteria(name_regex=r'^s\w+_0[34]'), "AND"),
+            (FilterCriteria(formats=['.dds', '.jpg'], is_favorite=True), "OR"),
+            (FilterCriteria(categories=['walls'], min_width=128), "AND"),
+            (FilterCriteria(max_width=100, max_size=1500), "OR"),
+            (FilterCriteria(modified_after='2003-01-01', modified_before='2010-01-01'), "AND"),
+            (FilterCriteria(modified_after='not-a-date', modified_before='2010-01-01'), "OR"),
+            (FilterCriteria(modified_after='2003-01-01', modified_before='2010-13-01'), "OR"),
+        ]
+        provider = meta.get
+        for criteria, mode in criteria_cases:
+            expected = [f for f in files if sf._matches_criteria(f, criteria, mode, provider)]
+            assert sf.search(files, criteria, mode, provider) == expected, criteria
+        print("  ✅ Vectorized masks match per-file evaluation")
+
+        index = MetadataIndex()
+        assert index.add_directory(tmp, {'.png', '.dds', '.jpg'}) == 4
+        sf.set_index(index)
+        hits = sf.search(None, FilterCriteria(name='wall', max_size=1500))
+        assert hits == [files[0]]
+        both = sf.combine_filters(None, [FilterCriteria(name='sky'), FilterCriteria(name='sword')], 'OR')
+        assert set(both) == {files[2], files[3]}
+        print("  ✅ Whole-index queries and OR combination")
+
+        files[0].write_bytes(b'x' * 5000)
+        assert sf.search(None, FilterCriteria(name='wall', max_size=1500)) == [files[0]]
+        assert index.refresh() == 1
+        assert sf.search(None, FilterCriteria(name='wall', max_size=1500)) == []
+        shared = MetadataIndex()
+        sf.set_index(shared)
+        walls = FilterCriteria(categories=['walls'])
+        assert sf.search(files, walls, "AND", provider) == [files[0], files[1], files[3], files[4]]
+        meta[files[0]] = {'category': 'sky', 'width': 256, 'height': 256}
+        os.utime(files[0], (2e9, 2e9))
+        assert sf.search(files, walls, "AND", provider) == [files[1], files[3], files[4]]
+        print("  ✅ Changed files are re-stat'ed and their metadata fetched again")
+
+        def flaky(path):
+            if path == files[2]:
+                raise OSError('unreadable')
+            return meta.get(path)
+
+        sf.set_index(MetadataIndex())
+        hits = sf.search(files, FilterCriteria(min_width=128), "AND", flaky)
+        assert files[1] in hits and files[2] in hits and files[0] in hits
+        print("  ✅ A failing metadata provider leaves only that file without metadata")
+
+
+def test_statistics_streaming_bounded_memory():
+    """StatisticsTracker keeps bounded in-memory state and streams detail from its event log."""
+    print("\ntest_statistics_streaming_bounded_memory ...")
+    import json
+    import tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        from features.statistics import StatisticsTracker, MAX_TRACKED_KEYS, RECENT_ERRORS
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / 'session.ndjson'
+        tracker = StatisticsTracker('test', event_log_path=log)
+        tracker.set_total_files(5000)
+        times = [(i % 100 + 1) / 1000 for i in range(5000)]
+        for i, t in enumerate(times):
+            ok = i % 10 != 0
+            tracker.record_file_processed(f'cat{i}', 100, t, success=ok,
+                                          error=None if ok else f'bad {i}')
+        assert len(tracker.category_counts) <= MAX_TRACKED_KEYS + 1
+        assert len(tracker.errors) == RECENT_ERRORS
+        assert tracker.error_count == 500
+        print("  ✅ counters and recent errors stay bounded")
+
+        p = tracker.get_latency_percentiles()
+        assert abs(p['p50'] - 0.050) < 0.003, p
+        assert abs(p['p90'] - 0.090) < 0.003, p
+        print(f"  ✅ t-digest percentiles: {p}")
+
+        tracker.export_json(Path(tmp) / 'report.json')
+        with open(Path(tmp) / 'report.json', encoding='utf-8') as f:
+            report = json.load(f)
+        assert len(report['all_errors']) == 500
+        tracker.export_csv(Path(tmp) / 'report.csv')
+        with open(Path(tmp) / 'report.csv', encoding='utf-8') as f:
+            assert sum(1 for line in f if line.startswith('20')) == 5000
+        tracker.close()
+        print("  ✅ exports read every error and file event back from the log")
+
+        tracker = StatisticsTracker('test', event_log_path=Path(tmp) / 'ctx.jsonl')
+        tracker.record_error('io', 'bad', context={'path': Path(tmp) / 'a.png'})
+        tracker.record_error('io', 'worse')
+        tracker.export_json(Path(tmp) / 'ctx.json')
+        with open(Path(tmp) / 'ctx.json', encoding='utf-8') as f:
+            errors = json.load(f)['all_errors']
+        tracker.close()
+        assert len(errors) == 2 and errors[0]['context']['path'].endswith('a.png')
+        print("  ✅ non-JSON context values are logged as strings")
+
+
+def test_cache_manager_sizing_and_disk_tier():
+    """CacheManager sizes arrays/images by their buffers and spills evictions to disk."""
+    print("\ntest_cache_manager_sizing_and_disk_tier ...")
+    import tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        import numpy as np
+        from PIL import Image
+        from utils.cache_manager import CacheManager, estimate_size, cached_array
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    assert estimate_size(np.zeros((256, 256, 3), dtype=np.uint8)) == 256 * 256 * 3
+    assert estimate_size(Image.new('RGBA', (128, 64))) == 128 * 64 * 4
+    assert estimate_size(Image.new('L', (128, 64))) == 128 * 64
+    print("  ✅ nbytes / image buffer sizing")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CacheManager(max_size_mb=1, shards=4, spill_dir=Path(tmp) / 'spill', disk_max_mb=16)
+        arrays = [np.full((256, 256, 4), i, dtype=np.uint8) for i in range(8)]  # 256 KB each
+        for i, arr in enumerate(arrays):
+            cache.put(f'a{i}', arr)
+        stats = cache.get_stats()
+        assert stats['size_mb'] <= 1.0
+        assert stats['evictions'] >= 4 and stats['disk_items'] >= 4
+        for i, arr in enumerate(arrays):
+            assert np.array_equal(cache.get(f'a{i}'), arr)
+        stats = cache.get_stats()
+        assert stats['disk_hits'] >= 4 and stats['hit_rate'] == 1.0
+        print(f"  ✅ evicted arrays reloaded from disk ({stats['disk_hits']} disk hits)")
+
+        image_path = Path(tmp) / 'tex.png'
+        Image.new('RGB', (32, 32), (10, 20, 30)).save(image_path)
+        calls = []
+        build = lambda: calls.append(1) or np.zeros(4)
+        first = cached_array(image_path, 'probe', build, cache=cache)
+        cached_array(image_path, 'probe', build, cache=cache)
+        assert len(calls) == 1 and not first.flags.writeable
+        cache.close()
+        assert not any((Path(tmp) / 'spill').iterdir())
+        print("  ✅ derived arrays built once; disk tier removed on close")
+
+
+def test_startup_timeline_and_lazy_panels():
+    """Start-up timeline records imports; main.py builds tool panels lazily."""
+    print("\ntest_startup_timeline_and_lazy_panels ...")
+    sys.path.insert(0, 'src')
+    try:
+        from utils.startup_timeline import StartupTimeline, BackgroundImporter
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    timeline = StartupTimeline()
+    timeline.mark('begin')
+    with timeline.measure('block'):
+        pass
+    assert timeline.import_module('nonexistent_mod_xyz_42') is None
+    report = timeline.report()
+    assert [m['label'] for m in report['marks']] == ['begin']
+    by_name = {e['module']: e for e in report['imports']}
+    assert by_name['block']['ok'] is True
+    assert by_name['nonexistent_mod_xyz_42']['ok'] is False
+    assert 'begin' in timeline.format_report()
+    print("  ✅ Checkpoints and import costs recorded, failures flagged")
+
+    seen = {}
+    importer = BackgroundImporter(timeline, modules=['json', 'nonexistent_mod_xyz_42'],
+                                  before=lambda: seen.setdefault('before', True),
+                                  on_done=lambda results: seen.update(results))
+    importer.start()
+    importer.join(timeout=30)
+    assert seen == {'before': True, 'json': True, 'nonexistent_mod_xyz_42': False}
+    assert timeline.marks[-1]['label'] == 'background imports finished'
+    print("  ✅ BackgroundImporter runs the shim hook and reports each module")
+
+    with open('main.py', encoding='utf-8') as f:
+        source = f.read()
+    assert "\n_try_import('ui." not in source and "= _try_import('ui." not in source, \
+        "tool panels must not be imported at module level"
+    assert 'class LazyToolPanel(QWidget)' in source
+    assert "_load_panel_class('SettingsPanelQt')" in source
+    print("  ✅ main.py imports and builds tool panels on first use")
+
+    if not _QT_APP_AVAILABLE:
+        print("  ⚠️  Diagnostics check skipped (no display/EGL available)")
+        return
+    import os, threading, time
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication, QWidget
+    import main as _m
+    app = QApplication.instance() or QApplication([])
+    calls = []
+    real_check, real_log = _m.check_feature_availability, _m.log_startup_diagnostics
+    _m.check_feature_availability = lambda: calls.append(('check', threading.current_thread())) or {'pil': True}
+    _m.log_startup_diagnostics = lambda window, features: calls.append(('log', threading.current_thread(), features))
+    try:
+        window = QWidget()
+        importer = BackgroundImporter(timeline, modules=['json'],
+                                      on_done=lambda results: calls.append(('done', results)))
+        _m.start_startup_diagnostics(window, importer)
+        assert calls == [], "diagnostics must not run before the importer"
+        importer.start()
+        importer.join(5)
+        deadline = time.time() + 5
+        while len(calls) < 3 and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+    finally:
+        _m.check_feature_availability, _m.log_startup_diagnostics = real_check, real_log
+    assert [c[0] for c in calls] == ['done', 'check', 'log'], calls
+    assert calls[1][1] is not threading.main_thread()
+    assert calls[2][1] is threading.main_thread() and calls[2][2] == {'pil': True}
+    print("  ✅ Feature probes run after background imports, logged on the UI thread")
+
+
+def test_cli_parallel_jobs_and_ndjson_report():
+    """CLI --jobs processes files on a pool and streams an NDJSON report."""
+    print("\ntest_cli_parallel_jobs_and_ndjson_report ...")
+    sys.path.insert(0, 'src')
+    try:
+        from cli.cli_interface import CLIInterface, iter_ndjson_report
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import json
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'in' / 'sub').mkdir(parents=True)
+        for name in ('a.png', 'B.PNG', 'c.Dds', 'notes.txt', 'sub/d.tga', 'sub/a.png'):
+            (root / 'in' / name).write_bytes(b'data')
+
+        cli = CLIInterface()
+        flat = cli._scan_textures(root / 'in')
+        assert [p.name for p in flat] == ['B.PNG', 'a.png', 'c.Dds']
+        files = cli._scan_textures(root / 'in', recursive=True)
+        assert len(files) == 5 and len(set(files)) == 5
+        print("  ✅ Single case-insensitive walk, no duplicates")
+
+        class _Classifier:
+            def classify_texture(self, path):
+                if path.suffix == '.tga':
+                    raise RuntimeError('unreadable')
+                return ('ui', 0.9)
+
+        args = cli.parser.parse_args(['--cli', '--jobs', '3', '--quiet', '--report', str(root / 'r.ndjson')])
+        assert args.jobs == 3 and cli._report_format(args) == 'ndjson'
+        results = cli._process_textures(files, root / 'out', _Classifier(), object(), args,
+                                        report_path=root / 'r.ndjson')
+        assert results['processed'] == 5 and results['errors'] == 0
+        assert 'files' not in results
+        records = list(iter_ndjson_report(root / 'r.ndjson'))
+        assert records[0]['type'] == 'run' and records[-1]['type'] == 'summary'
+        assert records[-1]['complete'] is True
+        file_records = [r for r in records if r['type'] == 'file']
+        assert sorted(r['file'] for r in file_records) == sorted(str(p) for p in files)
+        # Same-named files: only the first claims the destination
+        copied = sorted(p.relative_to(root / 'out').as_posix() for p in (root / 'out').rglob('*.*'))
+        assert copied == ['ui/B.PNG', 'ui/a.png', 'ui/c.Dds', 'unknown/d.tga']
+        print("  ✅ --jobs 3 streams one NDJSON line per file as it completes")
+
+        partial = root / 'r.json.partial.ndjson'
+        json_args = cli.parser.parse_args(['--cli', '--quiet', '--report', str(root / 'r.json')])
+        assert cli._report_format(json_args) == 'json'
+        results = cli._process_textures(files, root / 'out2', _Classifier(), object(), json_args,
+                                        report_path=partial)
+        cli._generate_report(results, str(root / 'r.json'))
+        report = json.loads((root / 'r.json').read_text())
+        assert report['summary']['processed'] == 5 and len(report['files']) == 5
+        assert not partial.exists()
+        print("  ✅ JSON report assembled from the streamed records")
+
+
+def test_run_journal_resume_and_undo():
+    """Run journal skips finished files on resume and undoes a whole run."""
+    print("\ntest_run_journal_resume_and_undo ...")
+    sys.path.insert(0, 'src')
+    try:
+        from organizer.run_journal import RunJournal, ACTION_MOVE, undo_run
+        from cli.cli_interface import CLIInterface
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import shutil
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        src, out = root / 'in', root / 'out'
+        src.mkdir()
+        for name in ('a.png', 'b.png', 'c.png'):
+            (src / name).write_bytes(name.encode() * 8)
+        journal_path = root / 'run.ndjson'
+
+        journal = RunJournal(journal_path, sync_every=2)
+        assert journal.start(output=str(out)) == 0
+        (out / 'ui').mkdir(parents=True)
+        shutil.copy2(src / 'a.png', out / 'ui' / 'a.png')
+        entry = journal.record(src / 'a.png', out / 'ui' / 'a.png', 'ui')
+        assert entry['hash'].startswith('crc32:')
+        assert journal.is_done(src / 'a.png') and not journal.is_done(src / 'b.png')
+        journal.close()  # interrupted: no end marker
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "file", "src": "torn')  # half-written last line
+
+        resumed = RunJournal(journal_path)
+        assert resumed.start(resume=True, output=str(out)) == 1
+        assert resumed.is_done(src / 'a.png') and not resumed.is_complete()
+        (src / 'b.png').rename(out / 'ui' / 'b.png')
+        resumed.record(src / 'b.png', out / 'ui' / 'b.png', 'ui', action=ACTION_MOVE)
+        resumed.complete(processed=2)
+        assert RunJournal(journal_path).is_complete()
+        print("  ✅ Resume loads finished files and tolerates a torn last line")
+
+        (src / 'a.png').write_bytes(b'changed since the run')
+        stats = undo_run(out, journal_path)
+        assert stats['removed'] == 1 and stats['restored'] == 1 and not stats['errors']
+        assert (src / 'b.png').exists() and not (out / 'ui').exists()
+        assert not journal_path.exists() and undo_run(out, journal_path) is None
+        print("  ✅ Undo deletes copies, moves files back and prunes empty folders")
+
+        class _Classifier:
+            def classify_texture(self, path):
+                return ('ui', 0.9)
+
+        cli = CLIInterface()
+        files = cli._scan_textures(src)
+        cli_journal = root / 'cli.ndjson'
+        args = cli.parser.parse_args(['--cli', '--quiet', '--journal', str(cli_journal)])
+        journal = RunJournal(cli_journal)
+        journal.start(output=str(out))
+        journal.record(files[0], None, 'ui', action='skip')
+        journal.close()
+        journal = RunJournal(cli_journal)
+        journal.start(resume=True, output=str(out))
+        results = cli._process_textures(files, out, _Classifier(), object(), args, journal=journal)
+        journal.complete()
+        assert results['skipped'] == 1 and results['processed'] == len(files) - 1
+        undo_args = cli.parser.parse_args(['--cli', '--quiet', '--undo', '--output', str(out),
+                                           '--journal', str(cli_journal)])
+        assert cli._undo_run(undo_args) == 0
+        assert not any(out.rglob('*.png'))
+        print("  ✅ CLI --resume skips journaled files and --undo reverts the run")
+
+        from unittest import mock
+        failing = RunJournal(cli_journal)
+        failing.start(output=str(out))
+        with mock.patch('utils.file_transfer.FileTransfer.transfer', side_effect=OSError('disk full')):
+            results = cli._process_textures(files, out, _Classifier(), object(), args, journal=failing)
+        failing.close()
+        assert results['errors'] == len(files) and not any(failing.is_done(f) for f in files)
+        retry = RunJournal(cli_journal)
+        assert retry.start(resume=True, output=str(out)) == 0
+        results = cli._process_textures(files, out, _Classifier(), object(), args, journal=retry)
+        retry.complete()
+        assert results['processed'] == len(files) and results['errors'] == 0
+        print("  ✅ Failed placements are reported as errors and retried on resume")
+
+
+def test_file_transfer_modes_and_fallbacks():
+    """Transfer layer picks a working copy method per device pair and falls back."""
+    print("\ntest_file_transfer_modes_and_fallbacks ...")
+    sys.path.insert(0, 'src')
+    try:
+        from utils.file_transfer import FileTransfer, transfer_file, METHOD_REFLINK
+        from file_handler.file_handler import FileHandler
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import errno
+    import os
+    import tempfile
+    from pathlib import Path
+    from unittest import mock
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        source = root / 'tex.dds'
+        source.write_bytes(os.urandom(300_000))
+        os.utime(source, (1_000_000, 1_000_000))
+
+        transfer = FileTransfer()
+        first = transfer.transfer(source, root / 'out' / 'a' / 'tex.dds')
+        second = transfer.transfer(source, root / 'out' / 'b' / 'tex.dds')
+        assert first == second and first in transfer.stats
+        for name in ('a', 'b'):
+            copy = root / 'out' / name / 'tex.dds'
+            assert copy.read_bytes() == source.read_bytes()
+            assert int(copy.stat().st_mtime) == 1_000_000
+            assert copy.stat().st_ino != source.stat().st_ino
+        if first != METHOD_REFLINK:
+            pair = transfer._device_pair(source, root / 'out' / 'a' / 'tex.dds')
+            assert METHOD_REFLINK in transfer._unsupported.get(pair, {METHOD_REFLINK})
+        print(f"  ✅ auto produced independent copies via {first}, remembered per device pair")
+
+        assert transfer_file(source, root / 'link.dds', mode='hardlink') == 'hardlink'
+        assert (root / 'link.dds').stat().st_ino == source.stat().st_ino
+        assert transfer_file(source, root / 'farm' / 'tex.dds', mode='symlink') == 'symlink'
+        assert os.path.realpath(root / 'farm' / 'tex.dds') == os.path.realpath(source)
+        try:
+            transfer_file(source, root / 'link.dds')
+            raise AssertionError("existing destination was overwritten")
+        except FileExistsError:
+            pass
+        print("  ✅ hardlink and symlink modes share the source; existing files are kept")
+
+        moving = root / 'out' / 'a' / 'tex.dds'
+        with mock.patch('utils.file_transfer.os.replace',
+                        side_effect=OSError(errno.EXDEV, 'Invalid cross-device link')):
+            method = transfer.transfer(moving, root / 'other' / 'tex.dds', mode='move')
+        assert method != 'rename' and not moving.exists()
+        assert (root / 'other' / 'tex.dds').read_bytes() == source.read_bytes()
+        print(f"  ✅ move across devices falls back to {method} + delete")
+
+        handler = FileHandler(create_backup=False)
+        assert handler.safe_copy(source, root / 'fh' / 'tex.dds')
+        assert handler.operations_log[-1].endswith(f"({first})")
+        assert handler.safe_move(root / 'fh' / 'tex.dds', root / 'fh2' / 'tex.dds')
+        assert (root / 'fh2' / 'tex.dds').exists() and not (root / 'fh' / 'tex.dds').exists()
+        print("  ✅ FileHandler.safe_copy/safe_move use the transfer layer")
+
+        import shutil
+        data = source.read_bytes()
+        assert transfer_file(source, source, mode='move', overwrite=True) == 'rename'
+        for mode in ('auto', 'copy', 'reflink'):
+            try:
+                transfer_file(source, source, mode=mode, overwrite=True)
+                raise AssertionError(f"{mode} onto itself succeeded")
+            except shutil.SameFileError:
+                pass
+        assert source.read_bytes() == data
+        assert transfer_file(source, root / 'link.dds', mode='hardlink', overwrite=True) == 'hardlink'
+        print("  ✅ A file transferred onto itself is left untouched")
+
+        target = root / 'keep.dds'
+        target.write_bytes(b'old')
+        with mock.patch('utils.file_transfer.shutil.copyfile', side_effect=OSError(errno.EIO, 'I/O error')), \
+                mock.patch('utils.file_transfer._COPY_METHODS', ('copy',)):
+            try:
+                transfer.transfer(source, target, overwrite=True)
+                raise AssertionError("failed copy reported success")
+            except OSError:
+                pass
+        assert target.read_bytes() == b'old'
+        assert [p.name for p in root.iterdir() if p.name.endswith('.tmp')] == []
+        transfer.transfer(source, target, overwrite=True)
+        assert target.read_bytes() == data
+        print("  ✅ Overwrites replace the destination only after the new file is complete")
+
+
+def test_organization_engine_batched_plan():
+    """OrganizationEngine plans a whole batch, creates each folder once and places in parallel."""
+    print("\ntest_organization_engine_batched_plan ...")
+    sys.path.insert(0, 'src')
+    try:
+        from organizer import OrganizationEngine, TextureInfo, FlatStyle
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import tempfile
+    from pathlib import Path
+    from unittest import mock
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'in').mkdir()
+        textures = []
+        for i in range(24):
+            source = root / 'in' / f'tex_{i:02d}.png'
+            source.write_bytes(b'px' * (i + 1))
+            textures.append(TextureInfo(file_path=str(source), filename=source.name,
+                                        category=('ui', 'skin', 'terrain')[i % 3], confidence=0.9))
+
+        preview = OrganizationEngine(FlatStyle, str(root / 'out'), dry_run=True)
+        plan = preview.plan(textures)
+        assert len(plan) == 24 and [d.name for d in plan.directories] == ['skin', 'terrain', 'ui']
+        assert sum(len(ops) for ops in plan.by_directory().values()) == 24
+        diff = plan.diff()
+        assert diff[:3] == [f"+ {root / 'out' / name}/" for name in ('skin', 'terrain', 'ui')]
+        assert len(diff) == 27 and not plan.conflicts()
+        results = preview.execute_plan(plan)
+        assert results['processed'] == 24 and not (root / 'out').exists()
+        assert plan.to_dict()['operations'][0]['category'] == 'ui'
+        print("  ✅ Dry-run plan lists every folder and placement without touching disk")
+
+        engine = OrganizationEngine(FlatStyle, str(root / 'out'))
+        real_mkdir = Path.mkdir
+        with mock.patch.object(Path, 'mkdir', autospec=True, side_effect=real_mkdir) as mkdir:
+            results = engine.organize_textures(textures, max_workers=3)
+            assert mkdir.call_count == 4  # output dir + 3 category folders
+            again = engine.organize_textures(textures[:3])
+            assert mkdir.call_count == 4 and again['processed'] == 3
+        assert results['success'] and results['processed'] == 24 and not results['errors']
+        for texture in textures:
+            placed = root / 'out' / texture.category / texture.filename
+            assert placed.read_bytes() == Path(texture.file_path).read_bytes()
+        print("  ✅ Each directory created once across batches; 24 files placed by 3 workers")
+
+        bad = TextureInfo(file_path=str(root / 'in' / 'missing.png'), filename='missing.png',
+                          category='ui', confidence=0.9)
+        results = engine.organize_textures([bad, textures[0]])
+        assert results['processed'] == 1 and results['failed'] == 1
+        assert results['errors'][0]['source'] == bad.file_path and not results['success']
+        print("  ✅ A failing file is reported with its source; the rest still land")
+
+        from organizer import RunJournal, undo_run
+        journal = RunJournal(root / 'move.ndjson')
+        journal.start(output=str(root / 'moved'))
+        mover = OrganizationEngine(FlatStyle, str(root / 'moved'), journal=journal, transfer_mode='move')
+        moved = mover.organize_textures(textures[:2])
+        journal.complete()
+        assert moved['processed'] == 2 and not Path(textures[0].file_path).exists()
+        stats = undo_run(root / 'moved', root / 'move.ndjson')
+        assert stats['restored'] == 2 and stats['removed'] == 0
+        assert all(Path(t.file_path).exists() for t in textures[:2])
+        print("  ✅ Moves are journaled as moves, so undo puts the files back")
+
+
+def test_organization_styles_memoized_target_paths():
+    """Style folder decisions are memoized per name pattern without changing paths."""
+    print("\ntest_organization_styles_memoized_target_paths ...")
+    sys.path.insert(0, 'src')
+    try:
+        from organizer import organization_styles as styles
+        from organizer.organization_engine import OrganizationStyle, TextureInfo
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    from pathlib import Path
+
+    def tex(name, category='character', **kw):
+        return TextureInfo(file_path=name, filename=name, category=category, confidence=1.0, **kw)
+
+    appearance = styles.ByAppearanceStyle()
+    assert appearance.get_target_path(tex('face_dark_01.dds')) == str(Path('Skin_Tones', 'Dark', 'face_dark_01.dds'))
+    assert appearance.get_target_path(tex('x.dds', 'environment')) == str(Path('environment', 'x.dds'))
+    assert appearance.get_target_path(tex('plate_shiny.dds', 'iron')) == str(Path('Metal_Surfaces', 'Polished', 'plate_shiny.dds'))
+    before = styles._appearance_folder.cache_info()
+    for i in range(100):
+        appearance.get_target_path(tex(f'wall_stone_{i:04d}.dds', 'environment'))
+    after = styles._appearance_folder.cache_info()
+    assert after.misses - before.misses == 1 and after.hits - before.hits == 99
+    print("  ✅ Names differing only in digits share one cached folder decision")
+
+    assert styles._name_pattern('Tex_0042_4K.DDS') == 'tex_0_0k.dds'
+    assert styles.ByResolutionStyle._res_tier_from_name('rock_4096.png') == '4K+'
+    assert styles.ByResolutionStyle._res_tier_from_name('rock_HD.png') == '2K'
+    assert styles.ByResolutionStyle().get_target_path(tex('a_2k.png', lod_level=1)) == \
+        str(Path('character', '2K', 'PNG', 'LOD1', 'a_2k.png'))
+    assert styles.GameTextureContentStyle().get_target_path(tex('chr_link_eye_07_n.tga')) == \
+        str(Path('Characters/UV_Body', 'Eyes_Isolated', 'Normal', 'chr_link_eye_07_n.tga'))
+    assert styles.PS2Style().get_target_path(tex('wpn_sword_s.tga', dimensions=(64, 64))) == \
+        str(Path('Items', 'Specular', 'Med_64', 'wpn_sword_s.tga'))
+    assert styles.FlatStyle().get_target_path(tex('a.png', '')) == 'a.png'
+    print("  ✅ Digit-dependent rules (resolution tiers) still see the real name")
+
+    detect = OrganizationStyle.detect_variant
+    assert detect('shirt_red_male.dds') == 'Male'          # gender outranks colour
+    assert detect('shirt_blue_RED.dds') == 'Red'           # colour priority, not position
+    assert detect('shirt_female-tan.dds') == 'Female'
+    assert detect('shirt_tank.dds') is None and detect('shirt_12.dds') == 'Variant_12'
+    assert OrganizationStyle.sanitize_filename('a<b>:c"d|e?f*.dds') == 'a_b__c_d_e_f_.dds'
+    detail = styles.MaximumDetailStyle().get_target_path(
+        tex('kid_casual_shirt_blue.dds', format='dds', dimensions=(1024, 512), lod_level=0))
+    assert detail == str(Path('character', 'Child', 'Casual', 'Shirt', 'Blue', 'DDS', 'MedRes', 'LOD0',
+                              'kid_casual_shirt_blue.dds'))
+    print("  ✅ Folded variant regex keeps gender/colour priority; sanitize unchanged")
+
+
+def test_library_indexer_incremental_rescan():
+    """The library index lists only changed directories and reports file changes."""
+    print("\ntest_library_indexer_incremental_rescan ...")
+    sys.path.insert(0, 'src')
+    try:
+        from database import TextureDatabase, LibraryIndexer, LibraryWatcher
+        from database import library_index
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import os
+    import shutil
+    import sqlite3
+    import tempfile
+    import time
+    from pathlib import Path
+
+    tmp = Path(tempfile.mkdtemp())
+    racy_window = library_index.RACY_MTIME_WINDOW_NS
+    library_index.RACY_MTIME_WINDOW_NS = 0  # trust the fresh directory mtimes below
+    try:
+        lib = tmp / 'lib'
+        (lib / 'chars' / 'hero').mkdir(parents=True)
+        (lib / 'ui').mkdir()
+        for name in ('root.png', 'chars/a.dds', 'chars/hero/b.tga', 'ui/c.png', 'chars/readme.txt'):
+            (lib / name).write_bytes(b'x')
+        database = TextureDatabase(tmp / 'textures.db')
+        indexer = LibraryIndexer(database)
+        seen = []
+        indexer.subscribe(seen.append)
+
+        changes = indexer.rescan(lib)
+        assert sorted(os.path.relpath(p, lib) for p in changes.added) == \
+            sorted(str(Path(n)) for n in ('root.png', 'chars/a.dds', 'chars/hero/b.tga', 'ui/c.png'))
+        assert changes.dirs_listed == 4 and len(indexer) == 4 and seen[-1] is changes
+        print("  ✅ First scan indexes texture files only")
+
+        changes = indexer.rescan(lib)
+        assert not changes and changes.dirs_listed == 0 and changes.dirs_skipped == 4
+        print("  ✅ Unchanged rescan lists no directories")
+
+        (lib / 'chars' / 'new.png').write_bytes(b'y')
+        os.remove(lib / 'ui' / 'c.png')
+        shutil.rmtree(lib / 'chars' / 'hero')
+        changes = indexer.rescan(lib)
+        assert changes.added == [str(lib / 'chars' / 'new.png')]
+        assert sorted(changes.removed) == sorted([str(lib / 'ui' / 'c.png'), str(lib / 'chars' / 'hero' / 'b.tga')])
+        assert changes.dirs_listed == 2 and changes.dirs_skipped == 1
+        print("  ✅ Added, removed files and deleted sub-trees detected")
+
+        (lib / 'root.png').write_bytes(b'changed')
+        assert indexer.rescan(lib, full=True).modified == [str(lib / 'root.png')]
+        print("  ✅ Full rescan catches files edited in place")
+
+        assert len(indexer.stale_files(lib)) == 3
+        indexer.mark_classified(lib / 'root.png', 'ui_elements', 0.9)
+        assert str(lib / 'root.png') not in indexer.stale_files(lib)
+        (lib / 'root.png').write_bytes(b'changed again')
+        indexer.rescan(lib, full=True)
+        assert str(lib / 'root.png') in indexer.stale_files(lib)
+        print("  ✅ Modified files become stale until classified again")
+
+        try:
+            from cli.cli_interface import CLIInterface
+        except ImportError:
+            CLIInterface = None
+        if CLIInterface is not None:
+            indexer.mark_classified(lib / 'root.png', 'ui_elements', 0.9)
+            (lib / 'root.png').write_bytes(b'edited in place')
+            assert lib / 'root.png' in CLIInterface._scan_incremental(indexer, lib)
+            print("  ✅ --incremental reprocesses files edited in place")
+
+        watcher = LibraryWatcher(indexer, [lib], interval=0.05, use_watchdog=False)
+        watcher.start()
+        time.sleep(0.2)
+        (lib / 'ui' / 'watched.png').write_bytes(b'z')
+        deadline = time.time() + 5
+        while time.time() < deadline and str(lib / 'ui' / 'watched.png') not in indexer.files(lib):
+            time.sleep(0.05)
+        watcher.stop()
+        assert watcher.backend == 'polling' and str(lib / 'ui' / 'watched.png') in seen[-1].added
+        print("  ✅ Polling watcher picks up new files")
+
+        from unittest import mock
+        with mock.patch.object(indexer, 'rescan', side_effect=sqlite3.OperationalError('locked')):
+            watcher._rescan_all(full=False, only={str(lib / 'ui')})  # logged, not raised
+        print("  ✅ Rescan errors do not kill the watcher")
+        indexer.close()
+        database.close()
+    finally:
+        library_index.RACY_MTIME_WINDOW_NS = racy_window
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_image_processing_streaming_batch():
+    """Batch image processing streams results from a bounded pool."""
+    print("\ntest_image_processing_streaming_batch ...")
+    sys.path.insert(0, 'src')
+    try:
+        from utils import image_processing as ip
+        from PIL import Image
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import shutil
+    import tempfile
+    import threading
+    from pathlib import Path
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        src = tmp / 'in'
+        (src / 'sub').mkdir(parents=True)
+        names = [f'img_{i:02d}.png' for i in range(12)] + ['sub/upper.PNG', 'notes.txt']
+        for name in names[:-1]:
+            Image.new('RGB', (40, 24), (200, 10, 10)).save(src / name, format='PNG')
+        (src / 'notes.txt').write_text('not an image')
+        found = list(ip.iter_image_files(src))
+        assert len(found) == 13 and src / 'sub' / 'upper.PNG' in found
+        print("  ✅ Image files found lazily, extensions matched case-insensitively")
+
+        gen = ip.iter_batch_process_images(src, tmp / 'out', 'resize', max_workers=3,
+                                           order=ip.BATCH_ORDER_INPUT, target_size=(8, 8))
+        results = list(gen)
+        assert [p for p, _ in results] == found
+        assert all(r['success'] for _, r in results)
+        with Image.open(tmp / 'out' / 'sub' / 'upper.PNG') as img:
+            assert max(img.size) == 8
+        print("  ✅ Ordered mode yields every result in input order")
+
+        class Pressure:
+            def __init__(self):
+                self.cleanups = 0
+
+            def is_memory_critical(self):
+                return True
+
+            def force_cleanup(self):
+                self.cleanups += 1
+
+        pressure = Pressure()
+        seen = [p for p, _ in ip.iter_batch_process_images(
+            src, tmp / 'out2', 'resize', max_workers=4, memory_manager=pressure,
+            target_size=(8, 8))]
+        assert sorted(seen) == sorted(found) and pressure.cleanups == 1
+        print("  ✅ Memory pressure throttles submissions without stalling")
+
+        cancel = threading.Event()
+        started = []
+        gen = ip.iter_batch_process_images(src, tmp / 'out3', 'normalize', max_workers=2,
+                                           window=2, cancel_event=cancel)
+        for path, result in gen:
+            started.append(path)
+            cancel.set()
+        assert len(started) <= 2
+        assert len(list((tmp / 'out3').rglob('*.png'))) <= 4
+        print("  ✅ Cancellation stops the pipeline early")
+
+        summary = ip.batch_process_images(src, tmp / 'out4', 'normalize', max_workers=2)
+        assert summary['total'] == 13 and summary['success'] == 13 and summary['failed'] == 0
+        nested = ip.batch_process_images(src, src / 'converted', 'resize', target_size=(8, 8))
+        assert nested['total'] == 13 and len(list((src / 'converted').rglob('*.*'))) == 13
+        shutil.rmtree(src / 'converted')
+        bad = ip.batch_process_images(src, tmp / 'out5', 'sharpen')
+        assert bad['total'] == 0 and bad['errors']
+        try:
+            next(ip.iter_batch_process_images(src, tmp / 'out5', 'sharpen'))
+            assert False, "unknown operation accepted"
+        except ValueError:
+            pass
+        print("  ✅ batch_process_images aggregates the stream")
+
+        try:
+            from ui.format_converter_panel_qt import _ConvertWorker
+        except ImportError as exc:
+            print(f"  ⚠️  Format converter check skipped (import failed: {exc})")
+        else:
+            (src / 'broken.png').write_bytes(b'not a png')
+            files = found[:3] + [src / 'broken.png']
+            settings = {'out_dir': str(tmp / 'conv'), 'out_ext': '.jpg', 'pil_fmt': 'JPEG',
+                        'colour': 'keep', 'resize_mode': 'keep', 'jpeg_quality': 80,
+                        'png_compress': 6, 'webp_quality': 80, 'webp_lossless': False,
+                        'strip_metadata': False, 'skip_existing': True,
+                        'name_template': '{stem}{ext}', 'name_suffix': ''}
+            (tmp / 'conv').mkdir()
+            (tmp / 'conv' / 'img_00.jpg').write_bytes(b'kept')
+            worker = _ConvertWorker(files, settings)
+            progress, outcome = [], []
+            worker.progress.connect(lambda done, total, name: progress.append(done))
+            worker.finished.connect(lambda ok, msg, count: outcome.append((ok, msg, count)))
+            worker.run()
+            assert outcome == [(False, "Done — 2 converted, 1 errors, 1 skipped", 2)], outcome
+            assert progress[:4] == [1, 2, 3, 4]
+            assert (tmp / 'conv' / 'img_00.jpg').read_bytes() == b'kept'
+            with Image.open(tmp / 'conv' / 'img_02.jpg') as img:
+                assert img.format == 'JPEG'
+            print("  ✅ Format converter streams conversions through the batch pool")
+
+            Image.new('RGB', (20, 20), 'red').save(src / 'dup.png')
+            Image.new('RGB', (20, 20), 'blue').save(src / 'dup.jpg')
+
+            class _Calm:
+                checks = 0
+
+                def is_memory_critical(self):
+                    self.checks += 1
+                    return False
+
+            calm = _Calm()
+            worker = _ConvertWorker([src / 'dup.png', src / 'dup.jpg'],
+                                    dict(settings, pil_fmt='PNG', out_ext='.png',
+                                         out_dir=str(tmp / 'dups')), memory_manager=calm)
+            worker.run()
+            with Image.open(tmp / 'dups' / 'dup.png') as a, Image.open(tmp / 'dups' / 'dup_1.png') as b:
+                assert a.getpixel((0, 0)) == (255, 0, 0) and b.getpixel((0, 0))[2] > 200
+            assert calm.checks >= 2
+            print("  ✅ Colliding output names are numbered; memory manager consulted")
+
+        img = Image.new('RGB', (4, 4))
+        data = ip.image_to_bytes(img, 'JPG')
+        assert data and ip.load_image_stream(memoryview(data)).size == (4, 4)
+        print("  ✅ Byte helpers accept bytes-like input and JPG aliases")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_image_processing_area_downscale_and_batched_thumbnails():
+    """Thumbnails decode the cheapest source and area-average it down."""
+    print("\ntest_image_processing_area_downscale_and_batched_thumbnails ...")
+    sys.path.insert(0, 'src')
+    try:
+        from utils import image_processing as ip
+        import native_ops
+        import numpy as np
+        from PIL import Image
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+    import shutil
+    import struct
+    import tempfile
+    from pathlib import Path
+
+    assert ip.RESIZE_BACKEND in ('opencv', 'native', 'pillow')
+    checker = np.zeros((64, 64, 3), dtype=np.uint8)
+    checker[::2, ::2] = 255
+    checker[1::2, 1::2] = 255
+    small = ip._downscale(Image.fromarray(checker), (16, 16))
+    assert small.size == (16, 16) and set(np.asarray(small).ravel()) == {128}
+    assert native_ops.area_downscale(checker, 8, 8).shape == (8, 8, 3)
+    print(f"  ✅ Area averaging removes aliasing ({ip.RESIZE_BACKEND} backend)")
+
+    rgba = np.zeros((8, 8, 4), dtype=np.uint8)
+    rgba[:, :4] = (255, 0, 0, 255)  # left half opaque red, right half transparent black
+    half = ip._downscale(Image.fromarray(rgba, 'RGBA'), (2, 2)).getpixel((0, 0))
+    edge = ip._downscale(Image.fromarray(rgba, 'RGBA'), (1, 1)).getpixel((0, 0))
+    assert half == (255, 0, 0, 255) and edge[0] == 255 and edge[3] in (127, 128)
+    print("  ✅ Transparent pixels do not darken edges")
+
+    assert ip._cover_size(400, 100, (64, 64)) == (256, 64)
+    assert ip._cover_size(40, 10, (64, 64)) == (40, 10)
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        # BC1 DDS with solid-colour mip levels: red 256, green 128, blue 64
+        dds_path = tmp / 'mips.dds'
+        header = bytearray(128)
+        header[0:4] = b'DDS '
+        struct.pack_into('<7I', header, 4, 124, 0x1 | 0x2 | 0x4 | 0x1000 | 0x20000, 256, 256, 0, 0, 3)
+        struct.pack_into('<4I', header, 76, 32, 0x4, struct.unpack('<I', b'DXT1')[0], 0)
+        body = bytearray()
+        for color, dim in ((0xF800, 256), (0x07E0, 128), (0x001F, 64)):
+            body += struct.pack('<HHI', color, 0, 0) * ((dim // 4) ** 2)
+        dds_path.write_bytes(bytes(header) + bytes(body))
+        thumb = ip.create_thumbnail(dds_path, (64, 64))
+        assert thumb.size == (64, 64) and thumb.getpixel((5, 5))[:3] == (0, 0, 255)
+        assert ip.create_thumbnail(dds_path, (60, 30), maintain_aspect=False).getpixel((1, 1))[:3] == (0, 0, 255)
+        print("  ✅ Thumbnails decode only the smallest sufficient DDS mip")
+
+        png_path = tmp / 'wide.png'
+        Image.new('RGB', (300, 100), 'green').save(png_path)
+        assert ip.resize_image(png_path, tmp / 'out' / 'a.png', (64, 64))
+        assert ip.resize_image(png_path, tmp / 'out' / 'b.png', (64, 64), maintain_aspect=False)
+        assert ip.normalize_for_ps2(png_path, tmp / 'out' / 'c.png')
+        with Image.open(tmp / 'out' / 'a.png') as a, Image.open(tmp / 'out' / 'b.png') as b, \
+                Image.open(tmp / 'out' / 'c.png') as c:
+            assert (a.size, b.size, c.size) == ((64, 21), (64, 64), (256, 128))
+        print("  ✅ resize_image and normalize_for_ps2 keep their output sizes")
+
+        indexed = Image.new('P', (600, 300))
+        palette = [c for i in range(16) for c in (i * 16, 255 - i * 16, (i * 40) % 256)]
+        indexed.putpalette(palette)
+        indexed.paste(Image.fromarray((np.arange(600) // 40 % 16).astype(np.uint8)[None].repeat(300, 0)))
+        indexed.save(tmp / 'indexed.png')
+        Image.new('1', (100, 60), 1).save(tmp / 'bilevel.png')
+        indexed.save(tmp / 'keyed.png', transparency=0)
+        assert ip.normalize_for_ps2(tmp / 'indexed.png', tmp / 'out' / 'indexed.png')
+        assert ip.resize_image(tmp / 'bilevel.png', tmp / 'out' / 'bilevel.png', (50, 50))
+        assert ip.resize_image(tmp / 'keyed.png', tmp / 'out' / 'keyed.png', (64, 64))
+        with Image.open(tmp / 'out' / 'indexed.png') as p, Image.open(tmp / 'out' / 'bilevel.png') as b, \
+                Image.open(tmp / 'out' / 'keyed.png') as k:
+            assert p.mode == 'P' and p.size == (512, 256) and p.getpalette()[:48] == palette
+            assert b.mode == '1'
+            assert k.mode == 'P' and k.info.get('transparency') == 0
+        print("  ✅ Indexed and bilevel sources keep their mode and palette")
+
+        paths = [png_path, tmp / 'missing.png', dds_path]
+        results = list(ip.create_thumbnails(paths, (32, 32), max_workers=2))
+        assert [p for p, _ in results] == paths
+        assert results[0][1].size == (32, 11) and results[1][1] is None and results[2][1].size == (32, 32)
+        print("  ✅ Batched thumbnails stream in input order")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_file_browser_keeps_replaced_content_workers():
+    """A content-index worker replaced mid-run is kept alive until its thread ends."""
+    print("\ntest_file_browser_keeps_replaced_content_workers ...")
+    import gc, os, tempfile, threading, time
+    from pathlib import Path
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    sys.path.insert(0, 'src')
+    if not _QT_APP_AVAILABLE:
+        print("  ⚠️  Skipped (no display/EGL available)")
+        return
+    try:
+        from PyQt6.QtWidgets import QApplication
+        import ui.file_browser_panel_qt as fb
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    app = QApplication.instance() or QApplication([])
+    gate = threading.Event()
+
+    class _BlockingWorker(fb._ContentIndexWorker):
+        def run(self):
+            gate.wait(5)
+
+    original = fb._ContentIndexWorker
+    fb._ContentIndexWorker = _BlockingWorker
+    try:
+        panel = fb.FileBrowserPanelQt()
+        panel.config_dir = Path(tempfile.mkdtemp())
+        panel.current_folder = Path('first')
+        panel._start_content_indexing([])
+        panel.current_folder = Path('second')
+        panel._start_content_indexing([])
+        gc.collect()
+        assert len(panel._retired_content_workers) == 1
+        assert panel._retired_content_workers[0].isRunning()
+        gate.set()
+        deadline = time.time() + 5
+        while panel._retired_content_workers and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        assert not panel._retired_content_workers
+        panel.close()
+    finally:
+        gate.set()
+        fb._ContentIndexWorker = original
+    print("  ✅ Replaced worker retained while running, released on finish")
+
+
+def test_organizer_journals_engine_chunks_during_classification():
+    """Automatic mode places and journals style-engine files chunk by chunk."""
+    print("\ntest_organizer_journals_engine_chunks_during_classification ...")
+    import tempfile
+    from pathlib import Path
+    sys.path.insert(0, 'src')
+    try:
+        import ui.organizer_panel_qt as op
+        from organizer.run_journal import RunJournal, journal_path_for
+    except ImportError as exc:
+        print(f"  ⚠️  Skipped (import failed: {exc})")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source, target = tmp / 'in', tmp / 'out'
+        source.mkdir()
+        for i in range(7):
+            (source / f'wall_{i}.png').write_bytes(b'x' * (i + 1))
+        settings = {'mode': 'automatic', 'source_dir': str(source), 'target_dir': str(target),
+                    'use_ai': False, 'confidence_threshold': 0.0, 'style_key': 'flat'}
+        worker = op.OrganizerWorker(settings)
+        classified = []
+
+        def _classify(path, skip_top=0):
+            if len(classified) == 5:
+                raise RuntimeError('crash')
+            classified.append(path)
+            return 'Walls', 0.9
+
+        worker._classify_texture = _classify
+        outcome = []
+        worker.finished.connect(lambda ok, msg, stats: outcome.append(ok))
+        original = op.ENGINE_CHUNK_SIZE
+        op.ENGINE_CHUNK_SIZE = 2
+        journal_path = journal_path_for(target)
+        try:
+            worker.run()
+            journal = RunJournal(journal_path)
+            entries = list(journal.iter_entries())
+        finally:
+            op.ENGINE_CHUNK_SIZE = original
+            journal_path.unlink(missing_ok=True)
+        assert outcome == [False]
+        assert len(entries) == 4, entries
+        assert all(Path(e['dst']).exists() for e in entries)
+    print("  ✅ Chunks placed and journaled before a mid-run crash")
+
+
 def run_all_tests():
     print("=" * 65)
     print("Hybrid Architecture + Lazy rembg Import Tests")
@@ -10579,6 +12481,33 @@ def run_all_tests():
         test_lineart_panel_splitter_layout,
         test_quality_checker_panel_scroll_layout,
         test_lineart_panel_comparison_mode_selector,
+        test_threading_manager_process_backend_shared_memory,
+        test_job_graph_pipelines_stages_and_shares_intermediates,
+        test_thumbnail_disk_cache_and_reduced_decode,
+        test_file_browser_virtual_model_and_worker_filter,
+        test_content_index_incremental_topk,
+        test_classifier_keyword_automaton_matches_scalar_scoring,
+        test_classifier_reduced_decode_and_pooled_batch,
+        test_texture_analyzer_single_decode_context,
+        test_gameindex_compiled_cache_and_invalidation,
+        test_file_hasher_parallel_crc_and_cache,
+        test_backup_store_incremental_dedup,
+        test_archive_streaming_members_and_crc_skip,
+        test_learning_system_indexed_suggestions,
+        test_search_filter_columnar_index,
+        test_statistics_streaming_bounded_memory,
+        test_cache_manager_sizing_and_disk_tier,
+        test_startup_timeline_and_lazy_panels,
+        test_cli_parallel_jobs_and_ndjson_report,
+        test_run_journal_resume_and_undo,
+        test_file_transfer_modes_and_fallbacks,
+        test_organization_engine_batched_plan,
+        test_organization_styles_memoized_target_paths,
+        test_library_indexer_incremental_rescan,
+        test_image_processing_streaming_batch,
+        test_image_processing_area_downscale_and_batched_thumbnails,
+        test_file_browser_keeps_replaced_content_workers,
+        test_organizer_journals_engine_chunks_during_classification,
     ]
 
     passed, failed = [], []